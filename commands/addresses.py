@@ -0,0 +1,469 @@
+"""
+Address encodings for vultitool
+Hashes and encoders that turn derived public keys into chain addresses
+"""
+
+import hashlib
+
+try:
+    from Crypto.Hash import keccak as _pycryptodome_keccak
+    PYCRYPTODOME_AVAILABLE = True
+except ImportError:
+    PYCRYPTODOME_AVAILABLE = False
+
+from curves import compress_secp256k1, uncompress_secp256k1, CURVE_SECP256K1, CURVE_ED25519
+
+# --- Hash functions not guaranteed by hashlib ---
+
+_KECCAK_ROUND_CONSTANTS = [
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+]
+# Rotation offset for lane (x, y), indexed as x + 5 * y
+_KECCAK_ROTATIONS = [
+    0, 1, 62, 28, 27,
+    36, 44, 6, 55, 20,
+    3, 10, 43, 25, 39,
+    41, 45, 15, 21, 8,
+    18, 2, 61, 56, 14,
+]
+# Destination lane of the pi step for lane (x, y): (y, 2x + 3y)
+_KECCAK_PI = [y + 5 * ((2 * x + 3 * y) % 5) for y in range(5) for x in range(5)]
+_MASK64 = (1 << 64) - 1
+
+
+# (source lane, rotation, destination lane) for the combined rho and pi steps
+_KECCAK_RHO_PI = [(i, _KECCAK_ROTATIONS[i], _KECCAK_PI[i]) for i in range(25)]
+# (lane, next lane in row, lane after that) for the chi step
+_KECCAK_CHI = [(i, (i + 1) % 5 + i - i % 5, (i + 2) % 5 + i - i % 5) for i in range(25)]
+
+
+def _keccak_f1600(lanes):
+    b = [0] * 25
+    for rc in _KECCAK_ROUND_CONSTANTS:
+        # theta
+        c0 = lanes[0] ^ lanes[5] ^ lanes[10] ^ lanes[15] ^ lanes[20]
+        c1 = lanes[1] ^ lanes[6] ^ lanes[11] ^ lanes[16] ^ lanes[21]
+        c2 = lanes[2] ^ lanes[7] ^ lanes[12] ^ lanes[17] ^ lanes[22]
+        c3 = lanes[3] ^ lanes[8] ^ lanes[13] ^ lanes[18] ^ lanes[23]
+        c4 = lanes[4] ^ lanes[9] ^ lanes[14] ^ lanes[19] ^ lanes[24]
+        d = (
+            c4 ^ (((c1 << 1) | (c1 >> 63)) & _MASK64),
+            c0 ^ (((c2 << 1) | (c2 >> 63)) & _MASK64),
+            c1 ^ (((c3 << 1) | (c3 >> 63)) & _MASK64),
+            c2 ^ (((c4 << 1) | (c4 >> 63)) & _MASK64),
+            c3 ^ (((c0 << 1) | (c0 >> 63)) & _MASK64),
+        )
+        # rho and pi
+        for i, r, dest in _KECCAK_RHO_PI:
+            lane = lanes[i] ^ d[i % 5]
+            b[dest] = ((lane << r) | (lane >> (64 - r))) & _MASK64
+        # chi
+        lanes = [b[i] ^ ((b[j] ^ _MASK64) & b[k]) for i, j, k in _KECCAK_CHI]
+        # iota
+        lanes[0] ^= rc
+    return lanes
+
+
+def keccak256(data):
+    """Original Keccak-256 (as used by Ethereum, not NIST SHA3-256)"""
+    if PYCRYPTODOME_AVAILABLE:
+        return _pycryptodome_keccak.new(digest_bits=256, data=bytes(data)).digest()
+    rate = 136
+    padded = bytearray(data)
+    padded.append(0x01)
+    padded.extend(b'\x00' * (-len(padded) % rate))
+    padded[-1] |= 0x80
+
+    lanes = [0] * 25
+    for offset in range(0, len(padded), rate):
+        block = padded[offset:offset + rate]
+        for i in range(rate // 8):
+            lanes[i] ^= int.from_bytes(block[8 * i:8 * i + 8], 'little')
+        lanes = _keccak_f1600(lanes)
+    return b''.join(lane.to_bytes(8, 'little') for lane in lanes[:4])
+
+
+def _ripemd160_pure(data):
+    """Pure-Python RIPEMD-160 for OpenSSL builds that no longer ship it"""
+    def rol(x, n):
+        return ((x << n) | (x >> (32 - n))) & 0xFFFFFFFF
+
+    fns = [
+        lambda x, y, z: x ^ y ^ z,
+        lambda x, y, z: (x & y) | (~x & z),
+        lambda x, y, z: (x | ~y) ^ z,
+        lambda x, y, z: (x & z) | (y & ~z),
+        lambda x, y, z: x ^ (y | ~z),
+    ]
+    kl = [0x00000000, 0x5A827999, 0x6ED9EBA1, 0x8F1BBCDC, 0xA953FD4E]
+    kr = [0x50A28BE6, 0x5C4DD124, 0x6D703EF3, 0x7A6D76E9, 0x00000000]
+    rl = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15,
+          7, 4, 13, 1, 10, 6, 15, 3, 12, 0, 9, 5, 2, 14, 11, 8,
+          3, 10, 14, 4, 9, 15, 8, 1, 2, 7, 0, 6, 13, 11, 5, 12,
+          1, 9, 11, 10, 0, 8, 12, 4, 13, 3, 7, 15, 14, 5, 6, 2,
+          4, 0, 5, 9, 7, 12, 2, 10, 14, 1, 3, 8, 11, 6, 15, 13]
+    rr = [5, 14, 7, 0, 9, 2, 11, 4, 13, 6, 15, 8, 1, 10, 3, 12,
+          6, 11, 3, 7, 0, 13, 5, 10, 14, 15, 8, 12, 4, 9, 1, 2,
+          15, 5, 1, 3, 7, 14, 6, 9, 11, 8, 12, 2, 10, 0, 4, 13,
+          8, 6, 4, 1, 3, 11, 15, 0, 5, 12, 2, 13, 9, 7, 10, 14,
+          12, 15, 10, 4, 1, 5, 8, 7, 6, 2, 13, 14, 0, 3, 9, 11]
+    sl = [11, 14, 15, 12, 5, 8, 7, 9, 11, 13, 14, 15, 6, 7, 9, 8,
+          7, 6, 8, 13, 11, 9, 7, 15, 7, 12, 15, 9, 11, 7, 13, 12,
+          11, 13, 6, 7, 14, 9, 13, 15, 14, 8, 13, 6, 5, 12, 7, 5,
+          11, 12, 14, 15, 14, 15, 9, 8, 9, 14, 5, 6, 8, 6, 5, 12,
+          9, 15, 5, 11, 6, 8, 13, 12, 5, 12, 13, 14, 11, 8, 5, 6]
+    sr = [8, 9, 9, 11, 13, 15, 15, 5, 7, 7, 8, 11, 14, 14, 12, 6,
+          9, 13, 15, 7, 12, 8, 9, 11, 7, 7, 12, 7, 6, 15, 13, 11,
+          9, 7, 15, 11, 8, 6, 6, 14, 12, 13, 5, 14, 13, 13, 7, 5,
+          15, 5, 8, 11, 14, 14, 6, 14, 6, 9, 12, 9, 12, 5, 15, 8,
+          8, 5, 12, 9, 12, 5, 14, 6, 8, 13, 6, 5, 15, 13, 11, 11]
+
+    h = [0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0]
+    msg = bytearray(data)
+    bit_len = len(msg) * 8
+    msg.append(0x80)
+    msg.extend(b'\x00' * ((56 - len(msg)) % 64))
+    msg.extend(bit_len.to_bytes(8, 'little'))
+
+    for offset in range(0, len(msg), 64):
+        x = [int.from_bytes(msg[offset + 4 * i:offset + 4 * i + 4], 'little') for i in range(16)]
+        al, bl, cl, dl, el = h
+        ar, br, cr, dr, er = h
+        for j in range(80):
+            rnd = j // 16
+            t = rol((al + fns[rnd](bl, cl, dl) + x[rl[j]] + kl[rnd]) & 0xFFFFFFFF, sl[j]) + el
+            al, el, dl, cl, bl = el, dl, rol(cl, 10), bl, t & 0xFFFFFFFF
+            t = rol((ar + fns[4 - rnd](br, cr, dr) + x[rr[j]] + kr[rnd]) & 0xFFFFFFFF, sr[j]) + er
+            ar, er, dr, cr, br = er, dr, rol(cr, 10), br, t & 0xFFFFFFFF
+        t = (h[1] + cl + dr) & 0xFFFFFFFF
+        h[1] = (h[2] + dl + er) & 0xFFFFFFFF
+        h[2] = (h[3] + el + ar) & 0xFFFFFFFF
+        h[3] = (h[4] + al + br) & 0xFFFFFFFF
+        h[4] = (h[0] + bl + cr) & 0xFFFFFFFF
+        h[0] = t
+    return b''.join(v.to_bytes(4, 'little') for v in h)
+
+
+try:
+    hashlib.new('ripemd160')
+    def ripemd160(data):
+        return hashlib.new('ripemd160', data).digest()
+except ValueError:
+    ripemd160 = _ripemd160_pure
+
+
+def hash160(data):
+    """RIPEMD-160 of SHA-256, the Bitcoin-family public key hash"""
+    return ripemd160(hashlib.sha256(data).digest())
+
+
+# --- Encodings ---
+
+_BECH32_CHARSET = 'qpzry9x8gf2tvdw0s3jn54khce6mua7l'
+_BECH32_GENERATORS = [0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3]
+_BECH32_CONST = 1
+_BECH32M_CONST = 0x2BC830A3
+_B58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+
+
+def _bech32_polymod(values):
+    chk = 1
+    for value in values:
+        top = chk >> 25
+        chk = (chk & 0x1FFFFFF) << 5 ^ value
+        for i in range(5):
+            if (top >> i) & 1:
+                chk ^= _BECH32_GENERATORS[i]
+    return chk
+
+
+def _bech32_hrp_expand(hrp):
+    return [ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 31 for c in hrp]
+
+
+def convertbits(data, from_bits, to_bits, pad=True):
+    """Regroup a sequence of from_bits-wide values into to_bits-wide values"""
+    acc = 0
+    bits = 0
+    out = []
+    maxv = (1 << to_bits) - 1
+    for value in data:
+        acc = (acc << from_bits) | value
+        bits += from_bits
+        while bits >= to_bits:
+            bits -= to_bits
+            out.append((acc >> bits) & maxv)
+    if pad and bits:
+        out.append((acc << (to_bits - bits)) & maxv)
+    elif not pad and (bits >= from_bits or (acc << (to_bits - bits)) & maxv):
+        raise ValueError("invalid padding")
+    return out
+
+
+def bech32_encode(hrp, data5):
+    """Encode 5-bit groups as a BIP-173 bech32 string"""
+    values = _bech32_hrp_expand(hrp) + list(data5)
+    polymod = _bech32_polymod(values + [0] * 6) ^ 1
+    checksum = [(polymod >> 5 * (5 - i)) & 31 for i in range(6)]
+    return hrp + '1' + ''.join(_BECH32_CHARSET[d] for d in list(data5) + checksum)
+
+
+def bech32_decode(address):
+    """
+    Decode a bech32 string
+
+    Returns:
+        (hrp, data5) with the checksum stripped
+
+    Raises:
+        ValueError: If the string is not valid bech32
+    """
+    hrp, data, const = _bech32_parse(address)
+    if const != _BECH32_CONST:
+        raise ValueError("bad bech32 checksum")
+    return hrp, data
+
+
+def _bech32_parse(address):
+    """Split and checksum a bech32/bech32m string; returns (hrp, data5, checksum constant)"""
+    if address.lower() != address and address.upper() != address:
+        raise ValueError("mixed-case bech32")
+    address = address.lower()
+    pos = address.rfind('1')
+    if pos < 1 or pos + 7 > len(address) or len(address) > 90:
+        raise ValueError("bad bech32 separator or length")
+    hrp = address[:pos]
+    try:
+        data = [_BECH32_CHARSET.index(c) for c in address[pos + 1:]]
+    except ValueError:
+        raise ValueError("bad bech32 character")
+    const = _bech32_polymod(_bech32_hrp_expand(hrp) + data)
+    if const not in (_BECH32_CONST, _BECH32M_CONST):
+        raise ValueError("bad bech32 checksum")
+    return hrp, data[:-6], const
+
+
+def segwit_decode(hrp, address):
+    """
+    Decode a segwit address (BIP-173 for v0, BIP-350 bech32m for v1+)
+
+    Returns:
+        (witness_version, program_bytes)
+
+    Raises:
+        ValueError: If the address is malformed or for another network
+    """
+    found_hrp, data, const = _bech32_parse(address)
+    if found_hrp != hrp:
+        raise ValueError(f"expected '{hrp}' prefix, got '{found_hrp}'")
+    if not data or data[0] > 16:
+        raise ValueError("bad witness version")
+    version = data[0]
+    program = bytes(convertbits(data[1:], 5, 8, pad=False))
+    if (version == 0) != (const == _BECH32_CONST):
+        raise ValueError("wrong checksum variant for witness version")
+    if version == 0 and len(program) not in (20, 32) or not 2 <= len(program) <= 40:
+        raise ValueError("bad witness program length")
+    return version, program
+
+
+def b58encode(data):
+    """Plain base58 (Bitcoin alphabet)"""
+    n = int.from_bytes(data, 'big')
+    out = []
+    while n:
+        n, rem = divmod(n, 58)
+        out.append(_B58_ALPHABET[rem])
+    leading = len(data) - len(data.lstrip(b'\x00'))
+    return '1' * leading + ''.join(reversed(out))
+
+
+def b58decode(text):
+    """Inverse of b58encode"""
+    n = 0
+    for c in text:
+        idx = _B58_ALPHABET.find(c)
+        if idx < 0:
+            raise ValueError("bad base58 character")
+        n = n * 58 + idx
+    body = n.to_bytes((n.bit_length() + 7) // 8, 'big')
+    leading = len(text) - len(text.lstrip('1'))
+    return b'\x00' * leading + body
+
+
+def b58check_encode(payload):
+    """Base58 with a 4-byte double-SHA256 checksum"""
+    checksum = hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4]
+    return b58encode(payload + checksum)
+
+
+def b58check_decode(text):
+    """Inverse of b58check_encode; raises ValueError on a bad checksum"""
+    raw = b58decode(text)
+    payload, checksum = raw[:-4], raw[-4:]
+    if len(raw) < 5 or hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] != checksum:
+        raise ValueError("bad base58check checksum")
+    return payload
+
+
+def eip55(address_bytes):
+    """Mixed-case checksummed Ethereum address"""
+    hex_addr = address_bytes.hex()
+    digest = keccak256(hex_addr.encode()).hex()
+    return '0x' + ''.join(c.upper() if int(digest[i], 16) >= 8 else c for i, c in enumerate(hex_addr))
+
+
+def normalize_address(address):
+    """
+    Canonical form of an address for lookups
+
+    Hex (0x...) and bech32 addresses are case-insensitive and are lowered;
+    base58 addresses are case-sensitive and kept as-is.
+    """
+    address = address.strip()
+    lowered = address.lower()
+    if lowered.startswith('0x'):
+        return lowered
+    try:
+        _bech32_parse(address)
+        return lowered
+    except ValueError:
+        return address
+
+
+# --- Chain registry ---
+
+class Chain:
+    """How one chain turns a public key into an address, and how it checks one"""
+
+    def __init__(self, name, curve, account_path, encode, validate):
+        self.name = name
+        self.curve = curve
+        self.account_path = account_path
+        self.encode = encode
+        self.validate = validate
+
+    @property
+    def default_path(self):
+        """Receive-address path template with an 'i' index placeholder"""
+        if self.account_path is None:
+            return None
+        return self.account_path + "/0/i"
+
+
+def _segwit_v0(hrp):
+    def encode(point):
+        return bech32_encode(hrp, [0] + convertbits(hash160(compress_secp256k1(point)), 8, 5))
+    return encode
+
+
+def _cosmos(hrp):
+    def encode(point):
+        return bech32_encode(hrp, convertbits(hash160(compress_secp256k1(point)), 8, 5))
+    return encode
+
+
+def _p2pkh(version):
+    def encode(point):
+        return b58check_encode(bytes([version]) + hash160(compress_secp256k1(point)))
+    return encode
+
+
+def _ethereum(point):
+    return eip55(keccak256(uncompress_secp256k1(point)[1:])[-20:])
+
+
+def _solana(key_bytes):
+    return b58encode(key_bytes)
+
+
+def _check_segwit(hrp, *legacy_versions):
+    def validate(address):
+        if not address.lower().startswith(hrp + '1'):
+            try:
+                _bech32_parse(address)
+            except ValueError:
+                _check_base58_versions(address, legacy_versions)
+                return
+        # Either our prefix or bech32 for another network (reported as such)
+        segwit_decode(hrp, address)
+    return validate
+
+
+def _check_cosmos(hrp):
+    def validate(address):
+        found_hrp, data = bech32_decode(address)
+        if found_hrp != hrp:
+            raise ValueError(f"expected '{hrp}' prefix, got '{found_hrp}'")
+        if len(convertbits(data, 5, 8, pad=False)) not in (20, 32):
+            raise ValueError("bad address length")
+    return validate
+
+
+def _check_p2pkh(*versions):
+    def validate(address):
+        _check_base58_versions(address, versions)
+    return validate
+
+
+def _check_base58_versions(address, versions):
+    payload = b58check_decode(address)
+    if len(payload) != 21:
+        raise ValueError("bad address length")
+    if payload[0] not in versions:
+        raise ValueError(f"unexpected version byte 0x{payload[0]:02x}")
+
+
+def _check_ethereum(address):
+    if len(address) != 42 or not address.startswith('0x'):
+        raise ValueError("expected 0x followed by 40 hex digits")
+    raw = bytes.fromhex(address[2:])
+    body = address[2:]
+    # All-lowercase or all-uppercase addresses carry no checksum
+    if body != body.lower() and body != body.upper() and eip55(raw) != address:
+        raise ValueError("bad EIP-55 checksum")
+
+
+def _check_solana(address):
+    if len(b58decode(address)) != 32:
+        raise ValueError("expected a 32-byte base58 public key")
+
+
+def check_address(chain, address):
+    """
+    Check that an address is well-formed for a chain
+
+    Returns:
+        None if the address is valid, otherwise the reason it is not
+    """
+    try:
+        chain.validate(address)
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+# Account paths follow the Vultisig apps; EdDSA chains use the root key as-is
+CHAINS = {
+    'bitcoin': Chain('bitcoin', CURVE_SECP256K1, "m/84'/0'/0'", _segwit_v0('bc'),
+                     _check_segwit('bc', 0x00, 0x05)),
+    'litecoin': Chain('litecoin', CURVE_SECP256K1, "m/84'/2'/0'", _segwit_v0('ltc'),
+                      _check_segwit('ltc', 0x30, 0x32, 0x05)),
+    'dogecoin': Chain('dogecoin', CURVE_SECP256K1, "m/44'/3'/0'", _p2pkh(0x1E),
+                      _check_p2pkh(0x1E, 0x16)),
+    'dash': Chain('dash', CURVE_SECP256K1, "m/44'/5'/0'", _p2pkh(0x4C),
+                  _check_p2pkh(0x4C, 0x10)),
+    'ethereum': Chain('ethereum', CURVE_SECP256K1, "m/44'/60'/0'", _ethereum, _check_ethereum),
+    'thorchain': Chain('thorchain', CURVE_SECP256K1, "m/44'/931'/0'", _cosmos('thor'),
+                       _check_cosmos('thor')),
+    'mayachain': Chain('mayachain', CURVE_SECP256K1, "m/44'/931'/0'", _cosmos('maya'),
+                       _check_cosmos('maya')),
+    'cosmos': Chain('cosmos', CURVE_SECP256K1, "m/44'/118'/0'", _cosmos('cosmos'),
+                    _check_cosmos('cosmos')),
+    'solana': Chain('solana', CURVE_ED25519, None, _solana, _check_solana),
+}
@@ -0,0 +1,262 @@
+"""
+Address-to-vault reverse index for vultitool
+Pre-derives receive/change addresses per vault into a compact sorted hash table
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from addresses import CHAINS, normalize_address
+from derive import NodeCache, parse_path
+
+INDEX_MAGIC = b'VTAI'
+INDEX_VERSION = 1
+
+# magic, version, reserved, vault count, entry count, metadata offset, metadata length
+_HEADER = struct.Struct('<4sHHIQQI')
+# address hash, vault number, chain number, branch (0 receive / 1 change), address index
+_ENTRY = struct.Struct('<QIBBI')
+
+BRANCH_RECEIVE = 0
+BRANCH_CHANGE = 1
+
+
+class AddressIndexError(Exception):
+    """Raised for unreadable or incompatible index files"""
+
+
+def address_hash(address):
+    """64-bit hash of a normalized address, the index key"""
+    digest = hashlib.blake2b(normalize_address(address).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def _vault_key(vault):
+    return f"{vault['public_key_ecdsa'].lower()}:{vault['hex_chain_code'].lower()}"
+
+
+def _derive_entries(job):
+    """
+    Worker entry point: derive the missing address ranges for one vault
+
+    Args:
+        job: (vault_number, vault_meta, [(chain_number, chain_name, first, count), ...])
+
+    Returns:
+        List of entry tuples for _ENTRY
+    """
+    vault_number, vault, ranges = job
+    entries = []
+    nodes = None
+    for chain_number, chain_name, first, count in ranges:
+        chain = CHAINS[chain_name]
+        if chain.account_path is None:
+            # EdDSA chains have a single root-key address
+            if first == 0 and vault.get('public_key_eddsa'):
+                address = chain.encode(bytes.fromhex(vault['public_key_eddsa']))
+                entries.append((address_hash(address), vault_number, chain_number, BRANCH_RECEIVE, 0))
+            continue
+
+        if nodes is None:
+            nodes = NodeCache(vault['public_key_ecdsa'], vault['hex_chain_code'])
+        account, _ = parse_path(chain.account_path)
+        for branch in (BRANCH_RECEIVE, BRANCH_CHANGE):
+            for index, point in nodes.derive_range(account + (branch,), first, count):
+                entries.append((address_hash(chain.encode(point)), vault_number, chain_number, branch, index))
+    return entries
+
+
+class AddressIndex:
+    """Read side of an index file: mmap plus binary search over sorted hashes"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise AddressIndexError(f"{path} is empty")
+
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise AddressIndexError(f"{path} is not an address index")
+        magic, version, _, vault_count, entry_count, meta_offset, meta_len = _HEADER.unpack_from(self._map, 0)
+        if magic != INDEX_MAGIC:
+            self.close()
+            raise AddressIndexError(f"{path} is not an address index")
+        if version != INDEX_VERSION:
+            self.close()
+            raise AddressIndexError(f"{path} has unsupported index version {version}")
+
+        self.entry_count = entry_count
+        self.meta = json.loads(self._map[meta_offset:meta_offset + meta_len])
+        if len(self.meta['vaults']) != vault_count:
+            self.close()
+            raise AddressIndexError(f"{path} is corrupt (vault table size mismatch)")
+
+    def close(self):
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _hash_at(self, position):
+        return struct.unpack_from('<Q', self._map, _HEADER.size + position * _ENTRY.size)[0]
+
+    def entries(self):
+        """Iterate over every raw entry tuple in hash order"""
+        for position in range(self.entry_count):
+            yield _ENTRY.unpack_from(self._map, _HEADER.size + position * _ENTRY.size)
+
+    def lookup(self, address):
+        """
+        Find which vaults own an address
+
+        Returns:
+            List of match dicts (usually zero or one)
+        """
+        target = address_hash(address)
+        lo, hi = 0, self.entry_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._hash_at(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        matches = []
+        chains = self.meta['chains']
+        while lo < self.entry_count:
+            key, vault_number, chain_number, branch, index = _ENTRY.unpack_from(
+                self._map, _HEADER.size + lo * _ENTRY.size)
+            if key != target:
+                break
+            vault = self.meta['vaults'][vault_number]
+            chain = CHAINS[chains[chain_number]]
+            path = 'm' if chain.account_path is None else f"{chain.account_path}/{branch}/{index}"
+            matches.append({
+                'address': address,
+                'chain': chain.name,
+                'path': path,
+                'branch': 'change' if branch == BRANCH_CHANGE else 'receive',
+                'index': index,
+                'vault': vault['name'],
+                'public_key_ecdsa': vault['public_key_ecdsa'],
+                'files': vault['files'],
+            })
+            lo += 1
+        return matches
+
+
+def build_index(index_path, vaults, chain_names, count, jobs=1):
+    """
+    Create or incrementally extend an index file
+
+    Vaults already in the index only get the chains and indexes they are
+    missing; new vaults are derived from scratch. Derivation runs across
+    worker processes and the file is replaced atomically.
+
+    Args:
+        index_path: Index file to create or update
+        vaults: dicts with name, public_key_ecdsa, public_key_eddsa, hex_chain_code, file
+        chain_names: Chains to index
+        count: Receive and change addresses per chain
+        jobs: Worker processes
+
+    Returns:
+        dict of build statistics
+    """
+    index_path = Path(index_path)
+    meta = {'chains': [], 'vaults': []}
+    entries = []
+
+    if index_path.exists():
+        with AddressIndex(index_path) as existing:
+            meta = existing.meta
+            entries = list(existing.entries())
+
+    chain_numbers = {name: i for i, name in enumerate(meta['chains'])}
+    for name in chain_names:
+        if name not in chain_numbers:
+            chain_numbers[name] = len(meta['chains'])
+            meta['chains'].append(name)
+    if len(meta['chains']) > 255:
+        raise AddressIndexError("An index can hold at most 255 chains")
+
+    vault_numbers = {_vault_key(v): i for i, v in enumerate(meta['vaults'])}
+    jobs_to_run = {}
+    new_vaults = 0
+
+    for vault in vaults:
+        key = _vault_key(vault)
+        number = vault_numbers.get(key)
+        if number is None:
+            number = len(meta['vaults'])
+            vault_numbers[key] = number
+            meta['vaults'].append({
+                'name': vault['name'],
+                'public_key_ecdsa': vault['public_key_ecdsa'],
+                'public_key_eddsa': vault.get('public_key_eddsa', ''),
+                'hex_chain_code': vault['hex_chain_code'],
+                'files': [],
+                'depth': {},
+            })
+            new_vaults += 1
+        record = meta['vaults'][number]
+        if vault['file'] not in record['files']:
+            record['files'].append(vault['file'])
+
+        missing = []
+        for name in chain_names:
+            have = record['depth'].get(name, 0)
+            if have < count:
+                missing.append((chain_numbers[name], name, have, count - have))
+                record['depth'][name] = count
+        if missing:
+            jobs_to_run.setdefault(number, []).extend(missing)
+
+    work = [(number, meta['vaults'][number], ranges) for number, ranges in jobs_to_run.items()]
+    if jobs > 1 and len(work) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for batch in pool.map(_derive_entries, work):
+                entries.extend(batch)
+    else:
+        for job in work:
+            entries.extend(_derive_entries(job))
+
+    entries.sort()
+    _write_index(index_path, meta, entries)
+    return {
+        'vaults': len(meta['vaults']),
+        'new_vaults': new_vaults,
+        'derived_vaults': len(work),
+        'entries': len(entries),
+        'chains': meta['chains'],
+    }
+
+
+def _write_index(index_path, meta, entries):
+    meta_bytes = json.dumps(meta, separators=(',', ':')).encode()
+    meta_offset = _HEADER.size + len(entries) * _ENTRY.size
+    tmp_path = index_path.with_name(index_path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0, len(meta['vaults']), len(entries),
+                             meta_offset, len(meta_bytes)))
+        pack = _ENTRY.pack
+        f.write(b''.join(pack(*entry) for entry in entries))
+        f.write(meta_bytes)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, index_path)
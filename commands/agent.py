@@ -0,0 +1,156 @@
+"""
+Agent command implementation for vultitool
+Holds vault passwords in memory for unattended batch runs, like ssh-agent
+"""
+
+import os
+import sys
+import json
+import getpass
+
+import metrics
+
+from credentials import (AGENT_SOCKET_ENV, DEFAULT_TTL, AgentClient, AgentServer, CredentialError,
+                         CredentialStore, default_socket_path, load_password_file, parse_selector)
+
+class AgentCommands:
+    @staticmethod
+    def setup_parser(parser):
+        """Setup agent command parser with subcommands"""
+        subparsers = parser.add_subparsers(dest='agent_action', help='Agent operations')
+
+        # Start command
+        start_parser = subparsers.add_parser('start', help='Start an agent on a Unix socket')
+        start_parser.add_argument('--socket', help=f'Socket path (default: ${AGENT_SOCKET_ENV} or a per-user path)')
+        start_parser.add_argument('--ttl', type=int, default=DEFAULT_TTL,
+                                  help=f'Seconds each credential is kept (default: {DEFAULT_TTL}, 0: forever)')
+        start_parser.add_argument('--password-file', metavar='FILE', help='Preload credentials from a password file')
+        start_parser.add_argument('--derive', action='store_true',
+                                  help='Keep only derived AES keys, never the passwords themselves')
+        start_parser.add_argument('--daemon', '-d', action='store_true',
+                                  help='Fork into the background and print the shell export line')
+
+        # Add command
+        add_parser = subparsers.add_parser('add', help='Add a password for a path glob, vault name or public key')
+        add_parser.add_argument('selector', help="'path:GLOB', 'name:NAME', 'pubkey:HEX' or a bare path glob")
+        add_parser.add_argument('--ttl', type=int, help='Seconds to keep it (default: the agent --ttl)')
+        add_parser.add_argument('--derive', action='store_true', help='Store the derived AES key instead')
+        add_parser.add_argument('--stdin', action='store_true', help='Read the password from stdin instead of prompting')
+        add_parser.add_argument('--socket', help='Agent socket path')
+
+        # List command
+        list_parser = subparsers.add_parser('list', help='List stored selectors (never the secrets)')
+        list_parser.add_argument('--json', action='store_true', help='Output as JSON')
+        list_parser.add_argument('--socket', help='Agent socket path')
+
+        # Remove / clear / stop commands
+        remove_parser = subparsers.add_parser('remove', help='Forget the credential for a selector')
+        remove_parser.add_argument('selector', help='Selector as given to add')
+        remove_parser.add_argument('--socket', help='Agent socket path')
+        clear_parser = subparsers.add_parser('clear', help='Forget every credential')
+        clear_parser.add_argument('--socket', help='Agent socket path')
+        stop_parser = subparsers.add_parser('stop', help='Stop the agent')
+        stop_parser.add_argument('--socket', help='Agent socket path')
+
+    @staticmethod
+    def handle(args):
+        """Route agent commands to appropriate handlers"""
+        try:
+            if args.agent_action == 'start':
+                return AgentCommands.start(args)
+            elif args.agent_action == 'add':
+                return AgentCommands.add(args)
+            elif args.agent_action == 'list':
+                return AgentCommands.list_credentials(args)
+            elif args.agent_action in ('remove', 'clear', 'stop'):
+                return AgentCommands.control(args)
+            else:
+                print("No agent action specified. Use --help for usage.")
+                return 1
+        except CredentialError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+
+    @staticmethod
+    def start(args):
+        """Serve credentials until stopped"""
+        socket_path = args.socket or default_socket_path()
+        ttl = args.ttl or None
+        store = CredentialStore()
+        if args.password_file:
+            store = load_password_file(args.password_file, derive=args.derive, ttl=ttl)
+        server = AgentServer(socket_path, store, ttl=ttl, derive=args.derive)
+
+        export = f"{AGENT_SOCKET_ENV}={socket_path}; export {AGENT_SOCKET_ENV};"
+        if args.daemon:
+            pid = os.fork()
+            if pid:
+                print(export)
+                print(f"echo Agent pid {pid};")
+                return 0
+            os.setsid()
+            metrics.after_fork()
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull, fd)
+        else:
+            print(export)
+            print(f"🔐 Agent listening on {socket_path} ({len(store)} credential(s) loaded); Ctrl-C to stop",
+                  file=sys.stderr)
+            sys.stdout.flush()
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+
+    @staticmethod
+    def add(args):
+        """Send one password to the agent"""
+        parse_selector(args.selector)
+        if args.stdin:
+            password = sys.stdin.readline().rstrip('\n')
+        else:
+            password = getpass.getpass(prompt=f'Password for {args.selector}: ')
+        if not password:
+            print("Error: Empty password", file=sys.stderr)
+            return 1
+
+        request = {'selector': args.selector, 'password': password, 'derive': args.derive}
+        if args.ttl is not None:
+            request['ttl'] = args.ttl or None
+        AgentClient(args.socket).request('add', **request)
+        print(f"🔑 Added {args.selector}")
+        return 0
+
+    @staticmethod
+    def list_credentials(args):
+        """Show what the agent holds"""
+        credentials = AgentClient(args.socket).request('list')['credentials']
+        if args.json:
+            print(json.dumps(credentials, indent=2))
+            return 0
+        if not credentials:
+            print("The agent holds no credentials")
+        for entry in credentials:
+            expiry = f"expires in {entry['expires_in']}s" if entry['expires_in'] is not None else "no expiry"
+            print(f"🔑 {entry['selector']} ({entry['type']}, {expiry})")
+        return 0
+
+    @staticmethod
+    def control(args):
+        """remove / clear / stop"""
+        client = AgentClient(args.socket)
+        if args.agent_action == 'remove':
+            removed = client.request('remove', selector=args.selector)['removed']
+            print(f"🗑️  Removed {removed} credential(s)")
+        elif args.agent_action == 'clear':
+            removed = client.request('clear')['removed']
+            print(f"🗑️  Cleared {removed} credential(s)")
+        else:
+            client.request('stop')
+            print("🛑 Agent stopped")
+        return 0
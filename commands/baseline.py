@@ -0,0 +1,235 @@
+"""
+Benchmark baselines for vultitool
+Per-stage timings from repeated benchmark rounds, saved with their environment and compared with confidence intervals
+"""
+
+import hashlib
+import json
+import math
+import platform
+import sys
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+BASELINE_FORMAT = 1
+
+VERDICT_REGRESSION = 'regression'
+VERDICT_SLOWER = 'slower'
+VERDICT_FASTER = 'faster'
+VERDICT_UNCHANGED = 'unchanged'
+VERDICT_NEW = 'new'
+
+# A regression must also add at least this much per call: below it, cache and allocator effects
+# move stages of a few microseconds by tens of percent between runs
+MIN_REGRESSION_US = 5.0
+
+# A fixed stdlib workload timed between the benchmark's loads, measuring the machine rather than vultitool
+CALIBRATION = 'calibration'
+_CALIBRATION_DATA = bytes(range(256)) * 256
+
+# Two-sided 95% critical values of Student's t for 1..30 degrees of freedom
+_T95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+
+class BaselineError(Exception):
+    """Raised for unreadable or incompatible baseline files; reason is a short machine-readable tag"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+def t95(df):
+    """Two-sided 95% critical t value; beyond the table it approaches 1.96"""
+    if df < 1:
+        return float('inf')
+    if df <= len(_T95):
+        return _T95[int(df) - 1]
+    return 1.96 + (_T95[-1] - 1.96) * len(_T95) / df
+
+
+def summarize(samples):
+    """Mean, sample standard deviation and 95% confidence half-width of per-round values"""
+    n = len(samples)
+    mean = sum(samples) / n
+    stdev = math.sqrt(sum((x - mean) ** 2 for x in samples) / (n - 1)) if n > 1 else 0.0
+    return {
+        'mean_us': mean,
+        'stdev_us': stdev,
+        'ci95_us': t95(n - 1) * stdev / math.sqrt(n) if n > 1 else float('inf'),
+        'rounds': [round(x, 3) for x in samples],
+    }
+
+
+def calibrate():
+    """
+    Run the calibration workload: hashing, compression, JSON and interpreter loops
+
+    Runs on the same host drift together by 20% or more (clock scaling,
+    neighbours on shared machines), more than the rounds of one run vary.
+    Timing this workload alongside the stages lets compare() take the
+    drift out.
+    """
+    hashlib.sha256(_CALIBRATION_DATA).digest()
+    zlib.compress(_CALIBRATION_DATA, 6)
+    json.dumps({f"k{i}": [i, str(i)] for i in range(300)})
+    total = 0
+    for i in range(20000):
+        total += i * i % 7
+    return total
+
+
+def speed_factor(base, current):
+    """How much slower the machine ran than for base (current / baseline calibration time), or 1.0 if unknown"""
+    before, after = base['stages'].get(CALIBRATION), current['stages'].get(CALIBRATION)
+    if not before or not after or not before['mean_us']:
+        return 1.0
+    return after['mean_us'] / before['mean_us']
+
+
+def environment(version):
+    """What a baseline is only comparable under"""
+    try:
+        from google.protobuf.internal import api_implementation
+        protobuf_backend = api_implementation.Type()
+    except ImportError:
+        protobuf_backend = 'unknown'
+    return {
+        'version': version,
+        'protobuf_backend': protobuf_backend,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'cpu': _cpu_model(),
+        'machine': platform.machine(),
+        'platform': sys.platform,
+    }
+
+
+def _cpu_model():
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or 'unknown'
+
+
+def build(version, stages, count, extra=None):
+    """
+    A baseline document
+
+    Args:
+        version: vultitool version
+        stages: {stage: [per-round mean microseconds per call]}
+        count: Vaults loaded per round
+        extra: Other results to keep alongside (e.g. backend throughput)
+    """
+    document = {
+        'format': BASELINE_FORMAT,
+        'created': datetime.now(timezone.utc).isoformat(),
+        'environment': environment(version),
+        'count': count,
+        'rounds': max((len(v) for v in stages.values()), default=0),
+        'stages': {name: summarize(samples) for name, samples in stages.items()},
+    }
+    if extra:
+        document.update(extra)
+    return document
+
+
+def default_path(version):
+    return Path(f"bench-baseline-{version}.json")
+
+
+def load(path):
+    """
+    Read a baseline file
+
+    Raises:
+        BaselineError: If it is unreadable or from a newer format
+    """
+    try:
+        with open(path) as f:
+            document = json.load(f)
+    except (OSError, ValueError) as e:
+        raise BaselineError('read', f"Cannot read baseline {path}: {e}")
+    if document.get('format') != BASELINE_FORMAT or 'stages' not in document:
+        raise BaselineError('format', f"{path} is not a format {BASELINE_FORMAT} vultitool baseline")
+    return document
+
+
+def environment_differences(base, current):
+    """Environment keys whose values differ, as {key: (baseline, current)}"""
+    base_env, env = base.get('environment', {}), current.get('environment', {})
+    return {key: (base_env.get(key), env.get(key)) for key in env if base_env.get(key) != env.get(key)}
+
+
+def compare(base, current, threshold):
+    """
+    Compare each stage of current against base
+
+    A stage is a regression when even the low end of Welch's 95%
+    confidence interval for the change in its mean exceeds threshold (a
+    fraction of the baseline mean) and MIN_REGRESSION_US. The intervals
+    come from the rounds of one run and do not capture drift between
+    runs, so a point estimate past the threshold is not enough. A significant change short of that is
+    'slower' or 'faster'; one whose interval includes zero is
+    'unchanged', however large the point estimate. Current timings are
+    first divided by speed_factor(), so a machine that is slower overall
+    than when the baseline was saved does not show up as a regression.
+
+    Returns:
+        List of per-stage dicts: stage, verdict, base_us, current_us,
+        change (fraction), ci95_low and ci95_high (fractions)
+    """
+    factor = speed_factor(base, current)
+    rows = []
+    for name, stage in current['stages'].items():
+        if name == CALIBRATION:
+            continue
+        stage = dict(stage, mean_us=stage['mean_us'] / factor, stdev_us=stage['stdev_us'] / factor)
+        before = base['stages'].get(name)
+        if before is None:
+            rows.append({'stage': name, 'verdict': VERDICT_NEW, 'current_us': stage['mean_us']})
+            continue
+        rows.append(_compare_stage(name, before, stage, threshold))
+    return rows
+
+
+def _compare_stage(name, before, after, threshold):
+    n1, n2 = len(before['rounds']), len(after['rounds'])
+    m1, m2 = before['mean_us'], after['mean_us']
+    v1, v2 = before['stdev_us'] ** 2 / n1, after['stdev_us'] ** 2 / n2
+    delta = m2 - m1
+    spread = v1 + v2
+    if spread > 0 and n1 > 1 and n2 > 1:
+        # Welch-Satterthwaite degrees of freedom
+        df = spread ** 2 / ((v1 ** 2 / (n1 - 1) if v1 else 0) + (v2 ** 2 / (n2 - 1) if v2 else 0))
+        half = t95(df) * math.sqrt(spread)
+    else:
+        half = 0.0 if spread == 0 and n1 > 1 and n2 > 1 else float('inf')
+    low, high = delta - half, delta + half
+    change = delta / m1 if m1 else 0.0
+
+    if m1 and low / m1 > threshold and low > MIN_REGRESSION_US:
+        verdict = VERDICT_REGRESSION
+    elif low > 0:
+        verdict = VERDICT_SLOWER
+    elif high < 0:
+        verdict = VERDICT_FASTER
+    else:
+        verdict = VERDICT_UNCHANGED
+    return {
+        'stage': name,
+        'verdict': verdict,
+        'base_us': m1,
+        'current_us': m2,
+        'change': change,
+        'ci95_low': low / m1 if m1 else 0.0,
+        'ci95_high': high / m1 if m1 else 0.0,
+    }
@@ -0,0 +1,203 @@
+"""
+Batch scanning for vultitool
+Walks files and directories of .vult files and aggregates per-file results
+"""
+
+from collections import Counter
+from pathlib import Path
+
+from loader import auto_io_depth, load_vault, load_vaults, VaultLoadError
+from rules import RuleEngine
+from pack import PACK_SUFFIX, pack_path
+from bundle import BUNDLE_SUFFIX, BundleError, member_paths
+from objectstore import is_s3_url, iter_objects
+from metrics import observe_scan
+
+# Fields every scan record carries regardless of the selected rules
+RECORD_FIELDS = frozenset(['name', 'public_key_ecdsa', 'local_party_id', 'lib_type'])
+
+
+def iter_vault_files(paths, pattern='*.vult', packs=True):
+    """
+    Expand a list of files and directories into vault file paths
+
+    Directories are searched recursively for files matching pattern and
+    yielded in sorted order so batch output is reproducible. With packs,
+    a .vultpack sidecar at least as new as its .vult is read instead of it,
+    and sidecars without a .vult are included. A bundle named directly
+    expands to its members ('team.vultb#member'); bundles inside
+    directories are not opened, as they usually repeat the files beside them.
+    An s3://bucket/prefix source is listed page by page (see objectstore).
+
+    Raises:
+        S3Error: If an s3:// source cannot be listed
+    """
+    for entry in paths:
+        if is_s3_url(entry):
+            yield from iter_objects(entry, pattern)
+            continue
+        path = Path(entry)
+        if path.is_dir():
+            found = [p for p in path.rglob(pattern) if p.is_file()]
+            if packs:
+                found = _prefer_packs(found, [p for p in path.rglob('*' + PACK_SUFFIX) if p.is_file()])
+            yield from sorted(found)
+        elif packs and path.suffix == BUNDLE_SUFFIX and path.is_file():
+            try:
+                yield from member_paths(path)
+            except BundleError:
+                # Reported by the loader as an undecodable file
+                yield path
+        else:
+            yield path
+
+
+def _prefer_packs(vults, sidecars):
+    sidecars = set(sidecars)
+    chosen = []
+    for vult in vults:
+        sidecar = pack_path(vult)
+        if sidecar in sidecars:
+            sidecars.discard(sidecar)
+            if sidecar.stat().st_mtime >= vult.stat().st_mtime:
+                chosen.append(sidecar)
+                continue
+        chosen.append(vult)
+    return chosen + list(sidecars)
+
+
+class ScanSummary:
+    """Aggregated counts over a batch of scan records"""
+
+    def __init__(self):
+        self.files = 0
+        self.loaded = 0
+        self.passed = 0
+        self.failed = 0
+        self.encrypted = 0
+        self.load_errors = Counter()
+        self.rule_hits = Counter()
+        self.severity_hits = Counter()
+        self.lib_types = Counter()
+
+    def add(self, record):
+        """Fold one scan record into the totals"""
+        self.files += 1
+        if record.get('error'):
+            self.load_errors[record['error']] += 1
+            self.failed += 1
+            return
+
+        self.loaded += 1
+        if record.get('encrypted'):
+            self.encrypted += 1
+        self.lib_types[record.get('lib_type', 'UNKNOWN')] += 1
+
+        # Count each rule at most once per file
+        for rule_name in {f['rule'] for f in record['findings']}:
+            self.rule_hits[rule_name] += 1
+        for finding in record['findings']:
+            self.severity_hits[finding['severity']] += 1
+
+        if record['passed']:
+            self.passed += 1
+        else:
+            self.failed += 1
+
+    def merge(self, other):
+        """Add another summary's totals to this one"""
+        for name in ('files', 'loaded', 'passed', 'failed', 'encrypted'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for name in ('load_errors', 'rule_hits', 'severity_hits', 'lib_types'):
+            getattr(self, name).update(getattr(other, name))
+
+    @classmethod
+    def from_dict(cls, totals):
+        """Rebuild a summary from to_dict(), e.g. to continue a checkpointed scan"""
+        summary = cls()
+        for name in ('files', 'loaded', 'passed', 'failed', 'encrypted'):
+            setattr(summary, name, totals[name])
+        for name in ('load_errors', 'rule_hits', 'severity_hits', 'lib_types'):
+            setattr(summary, name, Counter(totals[name]))
+        return summary
+
+    def to_dict(self):
+        return {
+            'files': self.files,
+            'loaded': self.loaded,
+            'passed': self.passed,
+            'failed': self.failed,
+            'encrypted': self.encrypted,
+            'load_errors': dict(self.load_errors),
+            'rule_hits': dict(self.rule_hits),
+            'severity_hits': dict(self.severity_hits),
+            'lib_types': dict(self.lib_types),
+        }
+
+
+class BatchScanner:
+    """Loads vault files with only the fields the rule engine needs and runs the rules"""
+
+    def __init__(self, engine=None, password=None, backend='python', workers=1, io_depth=1):
+        self.engine = engine or RuleEngine()
+        self.password = password
+        self.backend = backend
+        self.workers = workers
+        # Reads in flight with the Python backend, or 'auto' to overlap them only on network filesystems
+        self.io_depth = io_depth
+        self.fields = self.engine.fields | RECORD_FIELDS
+        self.summary = ScanSummary()
+
+    def scan_file(self, path):
+        """Scan a single file and return its record"""
+        try:
+            data = load_vault(path, password=self.password, json_mode=True,
+                              fields=self.fields, prompt=False)
+        except VaultLoadError as e:
+            data = e
+        return self._record(path, data)
+
+    def _record(self, path, data):
+        """Build the record for one loaded vault (or its VaultLoadError)"""
+        record = {'path': str(path)}
+        if isinstance(data, VaultLoadError):
+            record.update(error=data.reason, message=str(data), passed=False, findings=[])
+            return record
+
+        vault = data.get('vault', {})
+        findings = self.engine.run(vault)
+        record.update(
+            error=None,
+            encrypted=data['container']['is_encrypted'],
+            name=vault.get('name', ''),
+            public_key_ecdsa=vault.get('public_key_ecdsa', ''),
+            local_party_id=vault.get('local_party_id', ''),
+            lib_type=vault.get('lib_type', 'UNKNOWN'),
+            passed=not RuleEngine.has_errors(findings),
+            findings=findings,
+        )
+        return record
+
+    def scan(self, paths, skip=None):
+        """
+        Yield a record per vault file under paths, updating the summary as it goes
+
+        Args:
+            paths: Files and directories to scan
+            skip: Predicate on a file path; files it is true for are not loaded
+                (e.g. those a checkpoint has already finished)
+
+        Raises:
+            GoBackendError: With backend 'go', if the workers cannot be started or die
+        """
+        files = iter_vault_files(paths)
+        if skip is not None:
+            files = (path for path in files if not skip(path))
+        io_depth = auto_io_depth(list(paths)) if self.io_depth == 'auto' else self.io_depth
+        loaded = load_vaults(files, password=self.password, fields=self.fields,
+                             backend=self.backend, workers=self.workers, io_depth=io_depth)
+        for path, data in loaded:
+            record = self._record(path, data)
+            self.summary.add(record)
+            observe_scan(record)
+            yield record
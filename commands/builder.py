@@ -0,0 +1,388 @@
+"""
+Bulk KeysignPayload construction for vultitool
+Turns payout rows (CSV or NDJSON) into KeysignPayload messages built from per-chain prototypes
+"""
+
+import csv
+import io
+import json
+from decimal import Decimal, InvalidOperation
+
+from google.protobuf.descriptor import FieldDescriptor
+
+from payloads import KeysignPayload
+from addresses import CHAINS, check_address
+from derive import derive_addresses, DerivationError
+
+# Native coin of each chain and the blockchain_specific variant its payloads carry.
+# 'defaults' pre-fill the variant; rows override them column by column.
+CHAIN_TEMPLATES = {
+    'bitcoin': {'coin': {'chain': 'Bitcoin', 'ticker': 'BTC', 'decimals': 8},
+                'specific': 'utxo_specific', 'defaults': {}},
+    'litecoin': {'coin': {'chain': 'Litecoin', 'ticker': 'LTC', 'decimals': 8},
+                 'specific': 'utxo_specific', 'defaults': {}},
+    'dogecoin': {'coin': {'chain': 'Dogecoin', 'ticker': 'DOGE', 'decimals': 8},
+                 'specific': 'utxo_specific', 'defaults': {}},
+    'dash': {'coin': {'chain': 'Dash', 'ticker': 'DASH', 'decimals': 8},
+             'specific': 'utxo_specific', 'defaults': {}},
+    'ethereum': {'coin': {'chain': 'Ethereum', 'ticker': 'ETH', 'decimals': 18},
+                 'specific': 'ethereum_specific', 'defaults': {'gas_limit': '21000'}},
+    'thorchain': {'coin': {'chain': 'THORChain', 'ticker': 'RUNE', 'decimals': 8},
+                  'specific': 'thorchain_specific', 'defaults': {}},
+    'mayachain': {'coin': {'chain': 'MayaChain', 'ticker': 'CACAO', 'decimals': 10},
+                  'specific': 'maya_specific', 'defaults': {}},
+    'cosmos': {'coin': {'chain': 'Cosmos', 'ticker': 'ATOM', 'decimals': 6},
+               'specific': 'cosmos_specific', 'defaults': {'gas': 200000}},
+    'solana': {'coin': {'chain': 'Solana', 'ticker': 'SOL', 'decimals': 9},
+               'specific': 'solana_specific', 'defaults': {}},
+}
+
+# Row columns with a fixed meaning; any other column must name a field of the chain's variant
+ROW_COLUMNS = frozenset(['chain', 'to_address', 'to_amount', 'amount', 'memo', 'utxos',
+                         'ticker', 'contract_address', 'decimals'])
+
+_TRUE = frozenset(['1', 'true', 'yes', 'y'])
+_FALSE = frozenset(['', '0', 'false', 'no', 'n'])
+
+
+class PayloadBuildError(ValueError):
+    """Raised when a row cannot be turned into a payload"""
+
+
+def merge_templates(overrides):
+    """
+    Overlay user templates ({chain: {coin: {...}, defaults: {...}}}) on the built-in ones
+
+    Raises:
+        PayloadBuildError: For unknown chains or variants
+    """
+    templates = {name: {'coin': dict(t['coin']), 'specific': t['specific'], 'defaults': dict(t['defaults'])}
+                 for name, t in CHAIN_TEMPLATES.items()}
+    for name, override in (overrides or {}).items():
+        if name not in templates:
+            raise PayloadBuildError(f"Template for unknown chain '{name}' (choose from {', '.join(CHAIN_TEMPLATES)})")
+        template = templates[name]
+        template['coin'].update(override.get('coin', {}))
+        template['defaults'].update(override.get('defaults', {}))
+        if 'specific' in override:
+            template['specific'] = override['specific']
+    oneof = KeysignPayload.DESCRIPTOR.oneofs_by_name['blockchain_specific']
+    variants = {f.name for f in oneof.fields}
+    for name, template in templates.items():
+        if template['specific'] not in variants:
+            raise PayloadBuildError(f"Unknown blockchain_specific variant '{template['specific']}' for {name}")
+    return templates
+
+
+def _coercer(field):
+    """Return a function converting a row value to the field's Python type"""
+    if field.type == FieldDescriptor.TYPE_ENUM:
+        values = field.enum_type.values_by_name
+
+        def coerce_enum(value):
+            value = str(value).strip()
+            if value.isdigit():
+                return int(value)
+            if value not in values:
+                raise ValueError(f"expected one of {', '.join(values)}")
+            return values[value].number
+        return coerce_enum
+    if field.cpp_type == FieldDescriptor.CPPTYPE_BOOL:
+        def coerce_bool(value):
+            if isinstance(value, bool):
+                return value
+            text = str(value).strip().lower()
+            if text not in _TRUE | _FALSE:
+                raise ValueError("expected true/false")
+            return text in _TRUE
+        return coerce_bool
+    if field.cpp_type in (FieldDescriptor.CPPTYPE_INT32, FieldDescriptor.CPPTYPE_INT64,
+                          FieldDescriptor.CPPTYPE_UINT32, FieldDescriptor.CPPTYPE_UINT64):
+        def coerce_int(value):
+            text = str(value).strip()
+            try:
+                return int(text)
+            except ValueError:
+                raise ValueError(f"expected an integer, got '{text}'")
+        return coerce_int
+    if field.cpp_type == FieldDescriptor.CPPTYPE_STRING:
+        return lambda value: str(value).strip()
+    return None
+
+
+def parse_amount(row, decimals):
+    """
+    Read the payout amount in base units
+
+    'to_amount' is taken as an integer in base units; 'amount' is a decimal
+    in whole coins and must not have more precision than the coin allows.
+    """
+    if row.get('to_amount') not in (None, ''):
+        text = str(row['to_amount']).strip()
+        if not text.isdigit():
+            raise PayloadBuildError(f"to_amount must be a whole number of base units, got '{text}'")
+        units = int(text)
+    elif row.get('amount') not in (None, ''):
+        try:
+            value = Decimal(str(row['amount']).strip())
+        except InvalidOperation:
+            raise PayloadBuildError(f"amount '{row['amount']}' is not a number")
+        if not value.is_finite():
+            raise PayloadBuildError(f"amount '{row['amount']}' is not a number")
+        scaled = value.scaleb(decimals)
+        if scaled != scaled.to_integral_value():
+            raise PayloadBuildError(f"amount {value} has more than {decimals} decimal places")
+        units = int(scaled)
+    else:
+        raise PayloadBuildError("missing to_amount or amount")
+    if units <= 0:
+        raise PayloadBuildError("amount must be positive")
+    return units
+
+
+def parse_utxos(value):
+    """
+    Parse UTXOs as a list of {hash, index, amount} dicts or 'txid:vout:amount' items
+    separated by ';' or whitespace
+
+    Returns:
+        List of (hash, index, amount)
+    """
+    if isinstance(value, list):
+        items = [(u.get('hash', ''), u.get('index', 0), u.get('amount', 0)) for u in value]
+    else:
+        items = []
+        for token in str(value).replace(';', ' ').split():
+            parts = token.split(':')
+            if len(parts) != 3:
+                raise PayloadBuildError(f"UTXO '{token}' is not txid:vout:amount")
+            items.append(tuple(parts))
+
+    utxos = []
+    for txid, index, amount in items:
+        txid = str(txid).strip().lower()
+        if len(txid) != 64 or any(c not in '0123456789abcdef' for c in txid):
+            raise PayloadBuildError(f"UTXO hash '{txid}' is not a 32-byte hex txid")
+        try:
+            index, amount = int(index), int(amount)
+        except (TypeError, ValueError):
+            raise PayloadBuildError(f"UTXO {txid} has a non-integer index or amount")
+        if index < 0 or amount <= 0:
+            raise PayloadBuildError(f"UTXO {txid}:{index} has a negative index or non-positive amount")
+        utxos.append((txid, index, amount))
+    return utxos
+
+
+def read_rows(stream, fmt):
+    """
+    Yield (row_number, dict) from a CSV (with header) or NDJSON text stream
+
+    Raises:
+        PayloadBuildError: For NDJSON lines that are not JSON objects
+    """
+    if fmt == 'csv':
+        for number, row in enumerate(csv.DictReader(stream), 1):
+            yield number, {k.strip(): v for k, v in row.items() if k is not None}
+        return
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise PayloadBuildError(f"row {number}: invalid JSON: {e}")
+        if not isinstance(row, dict):
+            raise PayloadBuildError(f"row {number}: expected a JSON object")
+        yield number, row
+
+
+class _ChainPlan:
+    """Prototype payload and column setters for one chain, built once per batch"""
+
+    def __init__(self, chain_name, template, vault):
+        chain = CHAINS[chain_name]
+        self.chain = chain
+        self.decimals = int(template['coin'].get('decimals', 0))
+        self.specific = template['specific']
+
+        # Coin address and key come from the vault's first receive address
+        try:
+            derived = next(derive_addresses(vault['public_key_ecdsa'], vault['hex_chain_code'], chain,
+                                            public_key_eddsa=vault.get('public_key_eddsa')))
+        except DerivationError as e:
+            raise PayloadBuildError(f"Cannot derive a {chain_name} address from the vault: {e}")
+
+        prototype = KeysignPayload()
+        coin = prototype.coin
+        coin.is_native_token = True
+        for key, value in template['coin'].items():
+            setattr(coin, key, value)
+        coin.address = derived['address']
+        coin.hex_public_key = derived['public_key']
+        prototype.vault_public_key_ecdsa = vault['public_key_ecdsa']
+        prototype.vault_local_party_id = vault.get('local_party_id', '')
+        prototype.lib_type = vault.get('lib_type', '')
+
+        specific = getattr(prototype, self.specific)
+        specific.SetInParent()
+        self.setters = {}
+        for field in specific.DESCRIPTOR.fields:
+            coerce = _coercer(field)
+            if coerce is not None and field.label != FieldDescriptor.LABEL_REPEATED:
+                self.setters[field.name] = coerce
+        for key, value in template['defaults'].items():
+            if key not in self.setters:
+                raise PayloadBuildError(f"{chain_name} template default '{key}' is not a {self.specific} field")
+            setattr(specific, key, self.setters[key](value))
+        self.prototype = prototype
+
+
+class PayloadBuilder:
+    """
+    Builds KeysignPayloads for one vault from payout rows
+
+    Each chain gets a fully populated prototype (coin, vault fields, variant
+    defaults) on first use; rows only copy it and fill in what differs.
+    Address checks are cached so repeated payees are validated once.
+    """
+
+    def __init__(self, vault, templates=None, default_chain=None):
+        self.vault = vault
+        self.templates = merge_templates(templates)
+        self.default_chain = default_chain
+        self._plans = {}
+        self._address_checks = {}
+
+    def _plan(self, chain_name):
+        plan = self._plans.get(chain_name)
+        if plan is None:
+            if chain_name not in self.templates:
+                raise PayloadBuildError(f"Unknown chain '{chain_name}' (choose from {', '.join(self.templates)})")
+            plan = _ChainPlan(chain_name, self.templates[chain_name], self.vault)
+            self._plans[chain_name] = plan
+        return plan
+
+    def _check_address(self, chain, address):
+        key = (chain.name, address)
+        reason = self._address_checks.get(key, False)
+        if reason is False:
+            reason = check_address(chain, address)
+            self._address_checks[key] = reason
+        return reason
+
+    def build(self, row):
+        """
+        Build one payload from a row
+
+        Raises:
+            PayloadBuildError: Listing every problem found in the row
+        """
+        chain_name = str(row.get('chain') or self.default_chain or '').strip().lower()
+        if not chain_name:
+            raise PayloadBuildError("missing chain (add a chain column or pass --chain)")
+        plan = self._plan(chain_name)
+
+        problems = []
+        payload = KeysignPayload()
+        payload.CopyFrom(plan.prototype)
+        coin = payload.coin
+
+        decimals = plan.decimals
+        for key in ('ticker', 'contract_address', 'decimals'):
+            value = row.get(key)
+            if value in (None, ''):
+                continue
+            if key == 'decimals':
+                try:
+                    decimals = int(value)
+                except ValueError:
+                    problems.append(f"decimals '{value}' is not an integer")
+                    continue
+                coin.decimals = decimals
+            else:
+                setattr(coin, key, str(value).strip())
+        if coin.contract_address:
+            coin.is_native_token = False
+
+        to_address = str(row.get('to_address') or '').strip()
+        if not to_address:
+            problems.append("missing to_address")
+        else:
+            reason = self._check_address(plan.chain, to_address)
+            if reason:
+                problems.append(f"to_address {to_address} is not a valid {chain_name} address: {reason}")
+            payload.to_address = to_address
+
+        try:
+            amount = parse_amount(row, decimals)
+            payload.to_amount = str(amount)
+        except PayloadBuildError as e:
+            amount = None
+            problems.append(str(e))
+
+        if row.get('memo') not in (None, ''):
+            payload.memo = str(row['memo'])
+
+        if row.get('utxos') not in (None, ''):
+            if plan.specific != 'utxo_specific':
+                problems.append(f"utxos given for non-UTXO chain {chain_name}")
+            else:
+                try:
+                    utxos = parse_utxos(row['utxos'])
+                    for txid, index, value in utxos:
+                        payload.utxo_info.add(hash=txid, index=index, amount=value)
+                    total = sum(value for _, _, value in utxos)
+                    if amount is not None and total < amount:
+                        problems.append(f"UTXOs total {total} is less than the amount {amount}")
+                except PayloadBuildError as e:
+                    problems.append(str(e))
+
+        specific = getattr(payload, plan.specific)
+        for key, value in row.items():
+            if key in ROW_COLUMNS or value in (None, ''):
+                continue
+            coerce = plan.setters.get(key)
+            if coerce is None:
+                problems.append(f"unknown column '{key}' for {plan.specific}")
+                continue
+            try:
+                setattr(specific, key, coerce(value))
+            except (TypeError, ValueError) as e:
+                problems.append(f"{key}: {e}")
+
+        if problems:
+            raise PayloadBuildError('; '.join(problems))
+        return payload
+
+    def build_all(self, rows):
+        """
+        Validate and build every row before anything is written
+
+        Returns:
+            (payloads, errors): [(row_number, KeysignPayload)] and [(row_number, message)]
+        """
+        payloads = []
+        errors = []
+        for number, row in rows:
+            try:
+                payloads.append((number, self.build(row)))
+            except PayloadBuildError as e:
+                errors.append((number, str(e)))
+        return payloads, errors
+
+
+def detect_format(path, fmt='auto'):
+    """Pick csv or ndjson from an explicit choice or the file extension"""
+    if fmt != 'auto':
+        return fmt
+    name = str(path).lower()
+    if name.endswith(('.ndjson', '.jsonl', '.json')):
+        return 'ndjson'
+    return 'csv'
+
+
+def open_rows(path, stdin):
+    """Open a rows file (or stdin for '-') as a text stream"""
+    if path == '-':
+        return io.TextIOWrapper(stdin.buffer, encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
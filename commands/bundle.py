@@ -0,0 +1,214 @@
+"""
+Vault bundles for vultitool
+Many vault files in one .vultb file, with a footer index for random access by member, public key, party or name
+"""
+
+import json
+import mmap
+import struct
+from pathlib import Path
+
+from pack import PackError, is_pack, pack, unpack
+
+BUNDLE_SUFFIX = '.vultb'
+BUNDLE_MAGIC = b'\x89VBN'
+BUNDLE_FORMAT = 1
+# Separates a bundle path from a member selector: team.vultb#iPhone-15.vult
+MEMBER_SEPARATOR = '#'
+
+_HEADER = struct.Struct('>4sB3x')
+# index offset, index length, magic again so a truncated file is detected
+_TRAILER = struct.Struct('>QI4s')
+
+# Member metadata the index is keyed by, as selector kinds
+SELECTOR_KINDS = {'pubkey': 'public_key_ecdsa', 'party': 'local_party_id', 'name': 'vault_name'}
+
+
+class BundleError(Exception):
+    """Raised for malformed bundles and unknown or ambiguous members; reason is a short machine-readable tag"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+def split_member_path(path):
+    """
+    Split 'bundle.vultb#selector' into (bundle path, selector)
+
+    Returns (path, None) for anything that is not a member reference,
+    including existing files whose names contain '#'.
+    """
+    text = str(path)
+    if MEMBER_SEPARATOR not in text or Path(text).exists():
+        return Path(text), None
+    bundle, _, selector = text.rpartition(MEMBER_SEPARATOR)
+    return Path(bundle), selector
+
+
+def is_bundle(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(BUNDLE_MAGIC)) == BUNDLE_MAGIC
+    except OSError:
+        return False
+
+
+def write_bundle(members):
+    """
+    Serialize a bundle
+
+    Args:
+        members: List of dicts with 'member' (unique name), 'data' (the
+            .vult or .vultpack bytes) and the metadata fields in
+            SELECTOR_KINDS plus 'encrypted' (None where unknown)
+
+    Returns:
+        The bundle bytes
+
+    Raises:
+        BundleError: For duplicate member names
+        PackError: If a member is not a vault container
+    """
+    chunks = [_HEADER.pack(BUNDLE_MAGIC, BUNDLE_FORMAT)]
+    offset = _HEADER.size
+    entries = []
+    keys = {kind: {} for kind in SELECTOR_KINDS}
+    seen = set()
+    for number, member in enumerate(members):
+        if member['member'] in seen:
+            raise BundleError('duplicate', f"Duplicate member name '{member['member']}'")
+        seen.add(member['member'])
+        # Members are stored packed, so reading one needs no base64 decoding
+        data = member['data'] if is_pack(member['data']) else pack(member['data'])
+        chunks.append(data)
+        entry = {'member': member['member'], 'offset': offset, 'length': len(data), 'encrypted': member.get('encrypted')}
+        for kind, field in SELECTOR_KINDS.items():
+            entry[field] = member.get(field)
+            if member.get(field):
+                keys[kind].setdefault(_key(kind, member[field]), []).append(number)
+        entries.append(entry)
+        offset += len(data)
+
+    index = json.dumps({'format': BUNDLE_FORMAT, 'members': entries, 'keys': keys},
+                       separators=(',', ':')).encode()
+    chunks.append(index)
+    chunks.append(_TRAILER.pack(offset, len(index), BUNDLE_MAGIC))
+    return b''.join(chunks)
+
+
+def _key(kind, value):
+    return value.lower() if kind == 'pubkey' else value
+
+
+class Bundle:
+    """A memory-mapped bundle; members are slices of the map"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        try:
+            with open(self.path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise BundleError('open', f"Cannot open bundle {self.path}: {e}")
+        size = len(self._map)
+        if size < _HEADER.size + _TRAILER.size or self._map[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+            raise BundleError('format', f"{self.path} is not a vault bundle")
+        magic, fmt = _HEADER.unpack_from(self._map)
+        if fmt != BUNDLE_FORMAT:
+            raise BundleError('format', f"Unsupported bundle format {fmt}")
+        index_offset, index_length, tail = _TRAILER.unpack_from(self._map, size - _TRAILER.size)
+        if tail != BUNDLE_MAGIC or index_offset + index_length + _TRAILER.size != size:
+            raise BundleError('format', f"{self.path} has a damaged or truncated index")
+        try:
+            index = json.loads(self._map[index_offset:index_offset + index_length])
+        except ValueError as e:
+            raise BundleError('format', f"{self.path} has an unreadable index: {e}")
+        self.members = index['members']
+        self._keys = index['keys']
+        self._by_member = {m['member']: i for i, m in enumerate(self.members)}
+
+    def select(self, selector):
+        """
+        The member entry a selector names
+
+        A selector is a member name (or its name without extension), or
+        'pubkey:HEX', 'party:ID' or 'name:VAULT NAME'; several can be
+        joined with ',' and must all match.
+
+        Raises:
+            BundleError: If no member or more than one member matches
+        """
+        if selector in self._by_member:
+            return self.members[self._by_member[selector]]
+        matches = None
+        for part in selector.split(','):
+            found = self._lookup(part.strip())
+            matches = found if matches is None else matches & found
+        if not matches:
+            raise BundleError('member', f"No member of {self.path} matches '{selector}'")
+        if len(matches) > 1:
+            names = ', '.join(self.members[i]['member'] for i in sorted(matches))
+            raise BundleError('ambiguous', f"'{selector}' matches several members of {self.path}: {names}")
+        return self.members[matches.pop()]
+
+    def _lookup(self, part):
+        kind, sep, value = part.partition(':')
+        if sep and kind in SELECTOR_KINDS:
+            return set(self._keys[kind].get(_key(kind, value), []))
+        if part in self._by_member:
+            return {self._by_member[part]}
+        return {i for i, m in enumerate(self.members) if Path(m['member']).stem == part}
+
+    def read(self, entry):
+        """The stored (packed) bytes of a member: a slice of the map, nothing else is read"""
+        return self._map[entry['offset']:entry['offset'] + entry['length']]
+
+    def original(self, entry):
+        """The member's original .vult bytes"""
+        try:
+            return unpack(self.read(entry))
+        except PackError as e:
+            raise BundleError('member', f"Member {entry['member']} is damaged: {e}")
+
+    def close(self):
+        self._map.close()
+
+
+# Bundles opened by this process, so reading many members maps each bundle once
+_OPEN = {}
+
+
+def open_bundle(path):
+    """A cached Bundle for path, reopened if the file has changed"""
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError as e:
+        raise BundleError('open', f"Cannot open bundle {path}: {e}")
+    key = str(path.absolute())
+    cached = _OPEN.get(key)
+    if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+        return cached[1]
+    if cached is not None:
+        cached[1].close()
+    bundle = Bundle(path)
+    _OPEN[key] = ((stat.st_mtime_ns, stat.st_size), bundle)
+    return bundle
+
+
+def read_member(path):
+    """
+    The stored bytes of 'bundle.vultb#selector'
+
+    Raises:
+        BundleError: If the bundle cannot be read or the selector does not name one member
+    """
+    bundle_path, selector = split_member_path(path)
+    bundle = open_bundle(bundle_path)
+    return bundle.read(bundle.select(selector))
+
+
+def member_paths(path):
+    """'bundle.vultb#member' paths for every member, in bundle order"""
+    return [Path(f"{path}{MEMBER_SEPARATOR}{m['member']}") for m in open_bundle(path).members]
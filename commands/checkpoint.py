@@ -0,0 +1,218 @@
+"""
+Checkpoint journals for vultitool
+Append-only record of the inputs a batch command has finished, so a killed run resumes where it stopped
+"""
+
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from pathlib import Path
+
+CHECKPOINT_MAGIC = b'VCKP'
+CHECKPOINT_FORMAT = 1
+
+# Header: magic, format, length of the JSON job identity that follows
+_HEADER = struct.Struct('>4sBI')
+# One finished input: tag, 64-bit key of its absolute path, 64-bit digest of its result
+_ENTRY = struct.Struct('>c8s8s')
+# A commit: tag, length of its JSON state; followed by the state and a CRC-32
+_COMMIT = struct.Struct('>cI')
+_CRC = struct.Struct('>I')
+_ENTRY_TAG = b'E'
+_COMMIT_TAG = b'C'
+
+# Entries are buffered and made durable together, at most this often and this many at a time
+COMMIT_SECONDS = 1.0
+COMMIT_ENTRIES = 1024
+
+
+class CheckpointError(Exception):
+    """Raised for unusable checkpoint journals; reason is a short machine-readable tag"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+def path_key(path):
+    """The 64-bit journal key of an input path (bundle members keep their '#member' suffix)"""
+    digest = hashlib.blake2b(absolute(path).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def absolute(path):
+    """A local path made absolute; URLs (s3://...) are already"""
+    path = str(path)
+    return path if '://' in path else os.path.abspath(path)
+
+
+def result_digest(record):
+    """64-bit digest of a result record, independent of key order"""
+    return hashlib.blake2b(json.dumps(record, sort_keys=True).encode(), digest_size=8).digest()
+
+
+class Checkpoint:
+    """
+    Journal of finished inputs with exactly-once output
+
+    Results are written to the output first; entries for them go to the
+    journal in groups, each closed by a commit holding the output's length
+    and the caller's running state (e.g. the scan summary), checksummed
+    with the entries before it. A commit is made durable only after the
+    output it covers, so on resume the output is cut back to the last
+    commit and every input after it is redone: no result is lost or
+    written twice. Entries are 17 bytes, so the journal of a million
+    files is about 17 MB and fsyncs happen about once a second.
+    """
+
+    def __init__(self, path, identity, resume=False, output=None):
+        """
+        Open or create a checkpoint
+
+        Args:
+            path: Journal file
+            identity: JSON-able description of the job (command, inputs,
+                options); resuming a journal from a different job is refused
+            resume: Continue an existing journal; without it, an existing
+                journal is an error rather than silently discarded
+            output: File results are written to, or None for stdout (whose
+                results cannot be taken back after a crash)
+
+        Raises:
+            CheckpointError: If the journal cannot be used
+        """
+        self.path = Path(path)
+        self.identity = identity
+        self.finished = set()
+        self.state = None
+        self.resumed = 0
+        self._pending = bytearray()
+        self._count = 0
+        self._last_commit = time.monotonic()
+        offset = 0
+
+        if self.path.exists():
+            if not resume:
+                raise CheckpointError('exists', f"Checkpoint {self.path} already exists; "
+                                                "pass --resume to continue it or delete it to start over")
+            end, offset = self._load()
+            self._file = open(self.path, 'r+b')
+            self._file.truncate(end)
+            self._file.seek(end)
+        else:
+            if resume:
+                raise CheckpointError('missing', f"No checkpoint to resume at {self.path}")
+            header = json.dumps(identity, sort_keys=True).encode()
+            self._file = open(self.path, 'wb')
+            self._file.write(_HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_FORMAT, len(header)) + header)
+            self._sync(self._file)
+
+        self.output_path = Path(output) if output else None
+        if self.output_path is not None:
+            mode = 'r+' if resume and self.output_path.exists() else 'w'
+            self.output = open(self.output_path, mode, encoding='utf-8')
+            if resume:
+                if mode == 'w' and offset:
+                    raise CheckpointError('output', f"{self.output_path} is missing; the checkpoint covers "
+                                                    f"{offset:,} bytes of it")
+                # Drop results written after the last commit; their inputs are redone
+                self.output.truncate(offset)
+                self.output.seek(offset)
+        else:
+            self.output = sys.stdout
+
+    def _load(self):
+        """Read the committed entries; returns (journal bytes to keep, output offset)"""
+        try:
+            data = self.path.read_bytes()
+        except OSError as e:
+            raise CheckpointError('read', f"Cannot read checkpoint {self.path}: {e}")
+        if len(data) < _HEADER.size:
+            raise CheckpointError('format', f"{self.path} is not a vultitool checkpoint")
+        magic, fmt, length = _HEADER.unpack_from(data)
+        if magic != CHECKPOINT_MAGIC or fmt != CHECKPOINT_FORMAT:
+            raise CheckpointError('format', f"{self.path} is not a format {CHECKPOINT_FORMAT} vultitool checkpoint")
+        try:
+            identity = json.loads(data[_HEADER.size:_HEADER.size + length])
+        except ValueError:
+            raise CheckpointError('format', f"{self.path} has a damaged header")
+        if identity != json.loads(json.dumps(self.identity)):
+            raise CheckpointError('mismatch', f"Checkpoint {self.path} belongs to a different job: {identity}")
+
+        pos = end = _HEADER.size + length
+        offset = 0
+        pending = []
+        group_start = pos
+        while pos < len(data):
+            tag = data[pos:pos + 1]
+            if tag == _ENTRY_TAG and pos + _ENTRY.size <= len(data):
+                pending.append(int.from_bytes(data[pos + 1:pos + 9], 'big'))
+                pos += _ENTRY.size
+                continue
+            if tag != _COMMIT_TAG or pos + _COMMIT.size > len(data):
+                break
+            size = _COMMIT.unpack_from(data, pos)[1]
+            body_end = pos + _COMMIT.size + size
+            if body_end + _CRC.size > len(data):
+                break
+            body = data[pos + _COMMIT.size:body_end]
+            if _CRC.unpack_from(data, body_end)[0] != zlib.crc32(body, zlib.crc32(data[group_start:pos])):
+                break
+            commit = json.loads(body)
+            self.finished.update(pending)
+            pending = []
+            self.state = commit['state']
+            offset = commit['output_bytes'] or 0
+            pos = end = group_start = body_end + _CRC.size
+        # Anything after the last good commit was never acknowledged and is redone
+        self.resumed = len(self.finished)
+        return end, offset
+
+    def is_finished(self, path):
+        return path_key(path) in self.finished
+
+    def add(self, path, record, state=None):
+        """
+        Note a finished input whose result has been written to the output
+
+        Args:
+            path: The input
+            record: Its result, digested into the entry
+            state: Zero-argument callable returning the state to store if
+                this entry triggers a commit
+        """
+        self._pending += _ENTRY.pack(_ENTRY_TAG, path_key(path).to_bytes(8, 'big'), result_digest(record))
+        self._count += 1
+        if self._count >= COMMIT_ENTRIES or time.monotonic() - self._last_commit >= COMMIT_SECONDS:
+            self.commit(state() if state else None)
+
+    def commit(self, state=None):
+        """Make the output and every entry so far durable, in that order"""
+        self.output.flush()
+        output_bytes = None
+        if self.output_path is not None:
+            self._sync(self.output)
+            output_bytes = self.output.tell()
+        body = json.dumps({'entries': self._count, 'output_bytes': output_bytes, 'state': state}).encode()
+        self._file.write(bytes(self._pending) + _COMMIT.pack(_COMMIT_TAG, len(body)) + body
+                         + _CRC.pack(zlib.crc32(body, zlib.crc32(self._pending))))
+        self._sync(self._file)
+        self._pending.clear()
+        self._count = 0
+        self._last_commit = time.monotonic()
+
+    @staticmethod
+    def _sync(f):
+        f.flush()
+        os.fsync(f.fileno())
+
+    def close(self, state=None):
+        """Commit what is left and close the journal and output file"""
+        self.commit(state)
+        self._file.close()
+        if self.output_path is not None:
+            self.output.close()
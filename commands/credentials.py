@@ -0,0 +1,381 @@
+"""
+Vault credentials for vultitool
+Password files, the in-memory credential store and the `vultitool agent` Unix socket protocol
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import yaml
+
+import metrics
+
+# Like SSH_AUTH_SOCK: batch commands ask the agent behind this socket for credentials
+AGENT_SOCKET_ENV = 'VULTITOOL_AGENT_SOCK'
+DEFAULT_TTL = 3600
+
+SELECTOR_KINDS = ('path', 'name', 'pubkey')
+
+# Operations the agent answers
+_OPS = ('get', 'add', 'list', 'remove', 'clear', 'stop')
+
+# Longest request line the agent reads
+_MAX_REQUEST = 1 << 16
+
+
+class CredentialError(Exception):
+    """Raised for unreadable password files, bad selectors or agent failures; reason is a short machine-readable tag"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+def derive_key(password):
+    """The AES-256 key Vultisig's codec derives from a password (SHA-256); salted codecs have no reusable key"""
+    return hashlib.sha256(password.encode()).digest()
+
+
+def parse_selector(text):
+    """
+    Split 'kind:value' into (kind, value); a bare value is a path glob
+
+    Raises:
+        CredentialError: For an empty selector
+    """
+    kind, sep, value = text.partition(':')
+    if not (sep and kind in SELECTOR_KINDS):
+        kind, value = 'path', text
+    if not value:
+        raise CredentialError('selector', f"Empty selector '{text}'")
+    if kind == 'pubkey':
+        value = value.lower()
+    return kind, value
+
+
+class Credential:
+    """A password or an already-derived AES key for the vaults a selector matches"""
+
+    __slots__ = ('kind', 'value', 'password', 'key', 'expires')
+
+    def __init__(self, selector, password=None, key=None, ttl=None):
+        self.kind, self.value = parse_selector(selector)
+        if password is None and key is None:
+            raise CredentialError('secret', f"No password or key for '{selector}'")
+        self.password = password
+        self.key = key
+        self.expires = time.time() + ttl if ttl else None
+
+    @property
+    def selector(self):
+        return f"{self.kind}:{self.value}"
+
+    def matches_path(self, path):
+        """True if this is a path selector whose glob matches path (as given or absolute)"""
+        if self.kind != 'path':
+            return False
+        return fnmatch.fnmatch(str(path), self.value) or fnmatch.fnmatch(str(Path(path).absolute()), self.value)
+
+    def matches_vault(self, name, public_key_ecdsa):
+        """Confirm a decrypted vault is the one a name/pubkey selector means (path selectors always pass)"""
+        if self.kind == 'name':
+            return name == self.value
+        if self.kind == 'pubkey':
+            return public_key_ecdsa.lower() == self.value
+        return True
+
+    def to_wire(self):
+        record = {'selector': self.selector}
+        if self.key is not None:
+            record['key'] = self.key.hex()
+        else:
+            record['password'] = self.password
+        return record
+
+    @classmethod
+    def from_wire(cls, record):
+        key = bytes.fromhex(record['key']) if 'key' in record else None
+        return cls(record['selector'], password=record.get('password'), key=key)
+
+
+class CredentialStore:
+    """
+    Credentials indexed for lookup by vault file
+
+    Path selectors are matched against the file path before decryption;
+    name and pubkey selectors can only be confirmed after decryption, so
+    they are returned as further candidates for the loader to try.
+    """
+
+    def __init__(self):
+        self._credentials = []
+        self._lock = threading.Lock()
+
+    def add(self, credential):
+        with self._lock:
+            self._credentials = [c for c in self._credentials if c.selector != credential.selector]
+            self._credentials.append(credential)
+
+    def remove(self, selector):
+        kind, value = parse_selector(selector)
+        with self._lock:
+            before = len(self._credentials)
+            self._credentials = [c for c in self._credentials if (c.kind, c.value) != (kind, value)]
+            return before - len(self._credentials)
+
+    def clear(self):
+        with self._lock:
+            count = len(self._credentials)
+            self._credentials = []
+            return count
+
+    def _live(self):
+        now = time.time()
+        with self._lock:
+            self._credentials = [c for c in self._credentials if c.expires is None or c.expires > now]
+            return list(self._credentials)
+
+    def candidates(self, path):
+        """Credentials to try for a vault file, most specific path glob first"""
+        live = self._live()
+        by_path = sorted((c for c in live if c.matches_path(path)), key=lambda c: -len(c.value))
+        return by_path + [c for c in live if c.kind != 'path']
+
+    def listing(self):
+        """Selectors and expiry times, without secrets"""
+        return [{'selector': c.selector, 'type': 'key' if c.key is not None else 'password',
+                 'expires_in': round(c.expires - time.time()) if c.expires else None}
+                for c in self._live()]
+
+    def __len__(self):
+        return len(self._live())
+
+
+def load_password_file(path, derive=False, ttl=None):
+    """
+    Read a password file into a CredentialStore
+
+    The file is a YAML (or JSON) mapping of selector to secret, where a
+    selector is 'path:GLOB', 'name:NAME', 'pubkey:HEX' or a bare path glob,
+    and a secret is a password string or {key: <hex AES key>}.
+
+    Raises:
+        CredentialError: If the file cannot be read or an entry is malformed
+    """
+    try:
+        mode = os.stat(path).st_mode
+        with open(path, 'r') as f:
+            entries = yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        raise CredentialError('file', f"Cannot read password file {path}: {e}")
+    if mode & (stat.S_IRWXG | stat.S_IRWXO):
+        print(f"⚠️  Password file {path} is accessible by other users (chmod 600 it)", file=sys.stderr)
+    if not isinstance(entries, dict):
+        raise CredentialError('file', f"Password file {path} must map selectors to passwords")
+
+    store = CredentialStore()
+    for selector, secret in entries.items():
+        if isinstance(secret, dict) and 'key' in secret:
+            try:
+                key = bytes.fromhex(str(secret['key']))
+            except ValueError:
+                raise CredentialError('file', f"Invalid hex key for '{selector}' in {path}")
+            store.add(Credential(str(selector), key=key, ttl=ttl))
+        elif isinstance(secret, (str, int)):
+            password = str(secret)
+            if derive:
+                store.add(Credential(str(selector), key=derive_key(password), ttl=ttl))
+            else:
+                store.add(Credential(str(selector), password=password, ttl=ttl))
+        else:
+            raise CredentialError('file', f"Entry '{selector}' in {path} needs a password or {{key: HEX}}")
+    return store
+
+
+# --- Agent ---
+#
+# One JSON object per line in each direction over a Unix socket that only the
+# owner can open (0700 directory, 0600 socket) and whose peers are checked
+# with SO_PEERCRED where available.
+
+def default_socket_path():
+    """Agent socket from the environment, else a per-user path under XDG_RUNTIME_DIR or the temp dir"""
+    if os.environ.get(AGENT_SOCKET_ENV):
+        return os.environ[AGENT_SOCKET_ENV]
+    base = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(base, f"vultitool-{os.getuid()}", 'agent.sock')
+
+
+class _AgentHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        if not self.server.peer_allowed(self.request):
+            return
+        for line in self.rfile:
+            if len(line) > _MAX_REQUEST:
+                break
+            try:
+                response = self.server.dispatch(json.loads(line))
+            except (ValueError, KeyError, TypeError, CredentialError) as e:
+                response = {'ok': False, 'error': str(e)}
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+            if response.get('stopping'):
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class AgentServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves a CredentialStore to processes of the same user"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, store=None, ttl=DEFAULT_TTL, derive=False):
+        self.store = store or CredentialStore()
+        self.ttl = ttl
+        self.derive = derive
+        directory = os.path.dirname(socket_path) or '.'
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.stat(directory).st_uid != os.getuid():
+            raise CredentialError('socket', f"Socket directory {directory} is not owned by you")
+        if os.path.exists(socket_path):
+            if _agent_alive(socket_path):
+                raise CredentialError('socket', f"An agent is already listening on {socket_path}")
+            os.unlink(socket_path)
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _AgentHandler)
+        finally:
+            os.umask(old_umask)
+        os.chmod(socket_path, 0o600)
+        self.socket_path = socket_path
+
+    def peer_allowed(self, connection):
+        if not hasattr(socket, 'SO_PEERCRED'):
+            return True
+        creds = connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+        _, uid, _ = struct.unpack('3i', creds)
+        return uid == os.getuid()
+
+    def dispatch(self, request):
+        op = request.get('op')
+        metrics.AGENT_REQUESTS.inc(op if op in _OPS else 'unknown')
+        if op == 'get':
+            return {'ok': True, 'credentials': [c.to_wire() for c in self.store.candidates(request['path'])]}
+        if op == 'add':
+            ttl = request.get('ttl', self.ttl)
+            password = request.get('password')
+            key = bytes.fromhex(request['key']) if 'key' in request else None
+            if password is not None and (self.derive or request.get('derive')):
+                password, key = None, derive_key(password)
+            self.store.add(Credential(request['selector'], password=password, key=key, ttl=ttl))
+            return {'ok': True}
+        if op == 'list':
+            return {'ok': True, 'credentials': self.store.listing()}
+        if op == 'remove':
+            return {'ok': True, 'removed': self.store.remove(request['selector'])}
+        if op == 'clear':
+            return {'ok': True, 'removed': self.store.clear()}
+        if op == 'stop':
+            return {'ok': True, 'stopping': True}
+        return {'ok': False, 'error': f"Unknown op '{op}'"}
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+
+def _agent_alive(socket_path):
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+class AgentClient:
+    """Talks to a running agent; usable wherever a CredentialStore is"""
+
+    def __init__(self, socket_path=None, timeout=5.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._connection = None
+        self._reader = None
+
+    def request(self, op, **fields):
+        """
+        Send one request and return the response dict
+
+        Raises:
+            CredentialError: If the agent cannot be reached or reports an error
+        """
+        try:
+            if self._connection is None:
+                self._connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._connection.settimeout(self.timeout)
+                self._connection.connect(self.socket_path)
+                self._reader = self._connection.makefile('rb')
+            self._connection.sendall(json.dumps(dict(fields, op=op)).encode() + b'\n')
+            line = self._reader.readline()
+        except OSError as e:
+            self.close()
+            raise CredentialError('agent', f"Cannot reach agent at {self.socket_path}: {e}")
+        if not line:
+            self.close()
+            raise CredentialError('agent', f"Agent at {self.socket_path} closed the connection")
+        response = json.loads(line)
+        if not response.get('ok'):
+            raise CredentialError('agent', response.get('error', 'agent error'))
+        return response
+
+    def candidates(self, path):
+        return [Credential.from_wire(r) for r in self.request('get', path=str(path))['credentials']]
+
+    def close(self):
+        if self._connection is not None:
+            self._reader.close()
+            self._connection.close()
+        self._connection = None
+        self._reader = None
+
+
+# Source the loader consults when a command gives no --password
+_configured = None
+
+
+def configure(password_file=None):
+    """
+    Select the credential source for this process: a --password-file if
+    given, else the agent named by VULTITOOL_AGENT_SOCK if that is set
+
+    Raises:
+        CredentialError: If the password file cannot be read
+    """
+    global _configured
+    if password_file:
+        _configured = load_password_file(password_file)
+    elif os.environ.get(AGENT_SOCKET_ENV):
+        _configured = AgentClient(os.environ[AGENT_SOCKET_ENV])
+    else:
+        _configured = None
+    return _configured
+
+
+def configured_source():
+    """The source chosen by configure(), or None"""
+    return _configured
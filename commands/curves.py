@@ -0,0 +1,338 @@
+"""
+Elliptic-curve point checks for vultitool
+Validates and decompresses secp256k1 (ECDSA) and ed25519 (EdDSA) public keys
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from cryptography.hazmat.primitives.asymmetric import ec
+    _SECP256K1 = ec.SECP256K1()
+    OPENSSL_SECP256K1 = True
+except ImportError:
+    OPENSSL_SECP256K1 = False
+
+# secp256k1: y^2 = x^3 + 7 over F_p
+SECP256K1_P = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F
+SECP256K1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+SECP256K1_G = (
+    0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+    0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8,
+)
+SECP256K1_B = 7
+# p % 4 == 3, so a square root of a is a^((p+1)/4)
+_SECP256K1_SQRT_EXP = (SECP256K1_P + 1) // 4
+
+# ed25519: -x^2 + y^2 = 1 + d x^2 y^2 over F_p
+ED25519_P = 2**255 - 19
+ED25519_D = (-121665 * pow(121666, -1, ED25519_P)) % ED25519_P
+_ED25519_SQRT_M1 = pow(2, (ED25519_P - 1) // 4, ED25519_P)
+_ED25519_EXP = (ED25519_P - 5) // 8
+
+CURVE_SECP256K1 = 'secp256k1'
+CURVE_ED25519 = 'ed25519'
+
+
+class InvalidPointError(ValueError):
+    """Raised when bytes do not encode a point on the expected curve; reason is a short tag"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+def decompress_secp256k1(data):
+    """
+    Decompress a 33-byte SEC1 compressed secp256k1 public key
+
+    Returns:
+        (x, y) affine coordinates
+
+    Raises:
+        InvalidPointError: If the bytes are not a valid compressed point
+    """
+    if len(data) != 33:
+        raise InvalidPointError('bad-length', f"expected 33 bytes, got {len(data)}")
+    prefix = data[0]
+    if prefix not in (2, 3):
+        raise InvalidPointError('bad-prefix', f"expected 02/03 prefix, got {prefix:02x}")
+    x = int.from_bytes(data[1:], 'big')
+    if x >= SECP256K1_P:
+        raise InvalidPointError('x-out-of-range', "x coordinate is not a field element")
+
+    if OPENSSL_SECP256K1:
+        # OpenSSL decompresses and checks the curve equation in C
+        try:
+            key = ec.EllipticCurvePublicKey.from_encoded_point(_SECP256K1, bytes(data))
+        except ValueError:
+            raise InvalidPointError('not-on-curve', "x has no matching y on secp256k1")
+        return x, key.public_numbers().y
+
+    rhs = (x * x * x + SECP256K1_B) % SECP256K1_P
+    y = pow(rhs, _SECP256K1_SQRT_EXP, SECP256K1_P)
+    if y * y % SECP256K1_P != rhs:
+        raise InvalidPointError('not-on-curve', "x has no matching y on secp256k1")
+    if y & 1 != prefix & 1:
+        y = SECP256K1_P - y
+    return x, y
+
+
+def decode_ed25519(data):
+    """
+    Decode a 32-byte ed25519 public key (RFC 8032 section 5.1.3)
+
+    Returns:
+        (x, y) affine coordinates
+
+    Raises:
+        InvalidPointError: If the bytes are not a valid encoded point
+    """
+    if len(data) != 32:
+        raise InvalidPointError('bad-length', f"expected 32 bytes, got {len(data)}")
+    encoded = int.from_bytes(data, 'little')
+    sign = encoded >> 255
+    y = encoded & ((1 << 255) - 1)
+    if y >= ED25519_P:
+        raise InvalidPointError('y-out-of-range', "y coordinate is not canonical")
+
+    p = ED25519_P
+    yy = y * y % p
+    u = (yy - 1) % p
+    v = (ED25519_D * yy + 1) % p
+    # x = u v^3 (u v^7)^((p-5)/8) is a square root of u/v when one exists
+    v3 = v * v % p * v % p
+    x = u * v3 % p * pow(u * v3 % p * v3 % p * v % p, _ED25519_EXP, p) % p
+    vxx = v * x % p * x % p
+    if vxx == u:
+        pass
+    elif vxx == (p - u) % p:
+        x = x * _ED25519_SQRT_M1 % p
+    else:
+        raise InvalidPointError('not-on-curve', "y has no matching x on ed25519")
+
+    if x == 0 and sign:
+        raise InvalidPointError('bad-sign', "sign bit set for x = 0")
+    if x & 1 != sign:
+        x = p - x
+    return x, y
+
+
+def compress_secp256k1(point):
+    """Serialize an affine secp256k1 point in 33-byte SEC1 compressed form"""
+    x, y = point
+    return bytes([2 + (y & 1)]) + x.to_bytes(32, 'big')
+
+
+def uncompress_secp256k1(point):
+    """Serialize an affine secp256k1 point in 65-byte SEC1 uncompressed form"""
+    x, y = point
+    return b'\x04' + x.to_bytes(32, 'big') + y.to_bytes(32, 'big')
+
+
+# --- secp256k1 group arithmetic (Jacobian coordinates, a = 0) ---
+
+_INFINITY = (1, 1, 0)
+# Fixed-base comb: _G_TABLE[i][j] = j * 2^(8i) * G, built on first use
+_G_WINDOW_BITS = 8
+_G_TABLE = None
+
+
+def _jacobian_double(point):
+    X, Y, Z = point
+    p = SECP256K1_P
+    if Z == 0 or Y == 0:
+        return _INFINITY
+    YY = Y * Y % p
+    S = 4 * X * YY % p
+    M = 3 * X * X % p
+    X3 = (M * M - 2 * S) % p
+    Y3 = (M * (S - X3) - 8 * YY * YY) % p
+    Z3 = 2 * Y * Z % p
+    return X3, Y3, Z3
+
+
+def _jacobian_add_affine(point, affine):
+    X1, Y1, Z1 = point
+    x2, y2 = affine
+    p = SECP256K1_P
+    if Z1 == 0:
+        return x2, y2, 1
+    Z1Z1 = Z1 * Z1 % p
+    H = (x2 * Z1Z1 - X1) % p
+    r = (y2 * Z1 * Z1Z1 - Y1) % p
+    if H == 0:
+        return _jacobian_double(point) if r == 0 else _INFINITY
+    HH = H * H % p
+    HHH = H * HH % p
+    V = X1 * HH % p
+    X3 = (r * r - HHH - 2 * V) % p
+    Y3 = (r * (V - X3) - Y1 * HHH) % p
+    Z3 = Z1 * H % p
+    return X3, Y3, Z3
+
+
+def _to_affine(point):
+    X, Y, Z = point
+    if Z == 0:
+        raise InvalidPointError('infinity', "result is the point at infinity")
+    p = SECP256K1_P
+    z_inv = pow(Z, -1, p)
+    z_inv2 = z_inv * z_inv % p
+    return X * z_inv2 % p, Y * z_inv2 % p * z_inv % p
+
+
+def _build_g_table():
+    global _G_TABLE
+    table = []
+    base = SECP256K1_G
+    size = 1 << _G_WINDOW_BITS
+    for _ in range(256 // _G_WINDOW_BITS):
+        row = [None, base]
+        acc = (base[0], base[1], 1)
+        for _ in range(2, size):
+            acc = _jacobian_add_affine(acc, base)
+            row.append(_to_affine(acc))
+        table.append(row)
+        # Next window's base is size * base
+        base = _to_affine(_jacobian_add_affine(acc, base))
+    _G_TABLE = table
+
+
+def secp256k1_base_mult_add(scalar, point=None):
+    """
+    Compute scalar * G (+ point) on secp256k1
+
+    Uses a precomputed fixed-base table so each call costs 32 mixed
+    additions and a single field inversion.
+
+    Args:
+        scalar: Integer in [1, n)
+        point: Optional affine point to add to the product
+
+    Returns:
+        Affine (x, y) of the result
+    """
+    if _G_TABLE is None:
+        _build_g_table()
+    mask = (1 << _G_WINDOW_BITS) - 1
+    acc = _INFINITY
+    for row in _G_TABLE:
+        digit = scalar & mask
+        if digit:
+            acc = _jacobian_add_affine(acc, row[digit])
+        scalar >>= _G_WINDOW_BITS
+    if point is not None:
+        acc = _jacobian_add_affine(acc, point)
+    return _to_affine(acc)
+
+
+_DECODERS = {
+    CURVE_SECP256K1: decompress_secp256k1,
+    CURVE_ED25519: decode_ed25519,
+}
+
+
+def curve_for_key(key_hex):
+    """Guess the curve of a hex public key from its length"""
+    if len(key_hex) == 66:
+        return CURVE_SECP256K1
+    if len(key_hex) == 64:
+        return CURVE_ED25519
+    return None
+
+
+def check_key(curve, key_hex):
+    """
+    Check one hex-encoded public key
+
+    Returns:
+        None if the key is a valid point, otherwise a short failure reason
+    """
+    if curve is None:
+        curve = curve_for_key(key_hex)
+        if curve is None:
+            return 'bad-length'
+    try:
+        data = bytes.fromhex(key_hex)
+    except ValueError:
+        return 'bad-hex'
+    try:
+        _DECODERS[curve](data)
+    except InvalidPointError as e:
+        return e.reason
+    return None
+
+
+def _check_chunk(items):
+    """Worker entry point: check a list of (curve, key_hex) pairs"""
+    return [check_key(curve, key_hex) for curve, key_hex in items]
+
+
+class PointChecker:
+    """
+    Validates many public keys at once
+
+    Repeated keys (every share of a vault carries the same public keys) are
+    answered from a cache, and large batches of unseen keys are split across
+    worker processes.
+    """
+
+    # Below this many unseen keys a process pool costs more than it saves
+    PARALLEL_THRESHOLD = 20000
+    CHUNK_SIZE = 5000
+
+    def __init__(self, jobs=1, max_cache=1_000_000):
+        self.jobs = jobs
+        self.max_cache = max_cache
+        self._cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def check(self, curve, key_hex):
+        """Check one key, consulting the cache"""
+        cache_key = (curve, key_hex)
+        if cache_key in self._cache:
+            self.hits += 1
+            return self._cache[cache_key]
+        self.misses += 1
+        reason = check_key(curve, key_hex)
+        self._remember(cache_key, reason)
+        return reason
+
+    def check_many(self, items):
+        """
+        Check a batch of (curve, key_hex) pairs
+
+        Returns:
+            List of failure reasons (None for valid keys) in input order
+        """
+        items = list(items)
+        answers = {}
+        pending = []
+        for item in items:
+            if item in answers:
+                self.hits += 1
+            elif item in self._cache:
+                self.hits += 1
+                answers[item] = self._cache[item]
+            else:
+                answers[item] = None
+                pending.append(item)
+        self.misses += len(pending)
+
+        if self.jobs > 1 and len(pending) >= self.PARALLEL_THRESHOLD:
+            chunks = [pending[i:i + self.CHUNK_SIZE] for i in range(0, len(pending), self.CHUNK_SIZE)]
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                results = [r for chunk_results in pool.map(_check_chunk, chunks) for r in chunk_results]
+        else:
+            results = _check_chunk(pending)
+
+        for item, reason in zip(pending, results):
+            answers[item] = reason
+            self._remember(item, reason)
+        return [answers[item] for item in items]
+
+    def _remember(self, cache_key, reason):
+        if len(self._cache) >= self.max_cache:
+            self._cache.clear()
+        self._cache[cache_key] = reason
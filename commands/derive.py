@@ -0,0 +1,174 @@
+"""
+Watch-only key derivation for vultitool
+BIP32 public child derivation from a vault's ECDSA public key and chain code
+"""
+
+import hashlib
+import hmac
+from collections import OrderedDict
+
+from curves import (decompress_secp256k1, compress_secp256k1, secp256k1_base_mult_add,
+                    SECP256K1_N)
+
+# Path component that expands to a range of indexes
+INDEX_PLACEHOLDER = 'i'
+HARDENED_OFFSET = 0x80000000
+
+
+class DerivationError(ValueError):
+    """Raised for malformed paths or keys that cannot be derived from"""
+
+
+def parse_path(path):
+    """
+    Parse a derivation path such as m/44'/0'/0'/0/i
+
+    Hardened markers are accepted and derived non-hardened: an MPC vault has
+    no single private key to harden with, and Vultisig's TSS libraries strip
+    the marker the same way. At most one 'i' placeholder may appear and it
+    must be the last component.
+
+    Returns:
+        (prefix, placeholder): tuple of int indexes and whether the path ends in 'i'
+    """
+    parts = path.strip().split('/')
+    if not parts or parts[0] != 'm':
+        raise DerivationError(f"Derivation path must start with 'm': {path}")
+
+    indexes = []
+    placeholder = False
+    for position, part in enumerate(parts[1:], 1):
+        part = part.rstrip("'hH")
+        if part == INDEX_PLACEHOLDER:
+            if position != len(parts) - 1:
+                raise DerivationError(f"'{INDEX_PLACEHOLDER}' must be the last path component: {path}")
+            placeholder = True
+            continue
+        if not part.isdigit() or int(part) >= HARDENED_OFFSET:
+            raise DerivationError(f"Invalid path component '{part}' in {path}")
+        indexes.append(int(part))
+    return tuple(indexes), placeholder
+
+
+def ckd_pub(point, chain_code, index):
+    """
+    BIP32 CKDpub: derive a non-hardened child public key
+
+    Returns:
+        (child_point, child_chain_code)
+    """
+    data = compress_secp256k1(point) + index.to_bytes(4, 'big')
+    digest = hmac.new(chain_code, data, hashlib.sha512).digest()
+    tweak = int.from_bytes(digest[:32], 'big')
+    if tweak >= SECP256K1_N:
+        raise DerivationError(f"Index {index} yields an invalid child; use the next index")
+    return secp256k1_base_mult_add(tweak, point), digest[32:]
+
+
+class NodeCache:
+    """
+    Derivation tree for one vault with its intermediate nodes cached
+
+    Account-level nodes (everything above the final index) are shared by all
+    addresses under them, so they are derived once and kept; leaf keys are
+    returned without being cached to keep memory flat for large ranges.
+    """
+
+    def __init__(self, public_key_ecdsa, hex_chain_code):
+        try:
+            root_point = decompress_secp256k1(bytes.fromhex(public_key_ecdsa))
+            chain_code = bytes.fromhex(hex_chain_code)
+        except ValueError as e:
+            raise DerivationError(f"Cannot derive from vault key: {e}")
+        if len(chain_code) != 32:
+            raise DerivationError("Chain code must be 32 bytes")
+        self._nodes = {(): (root_point, chain_code)}
+
+    def node(self, indexes):
+        """Return (point, chain_code) at the given path, reusing the longest cached prefix"""
+        indexes = tuple(indexes)
+        depth = len(indexes)
+        while indexes[:depth] not in self._nodes:
+            depth -= 1
+        point, chain_code = self._nodes[indexes[:depth]]
+        for d in range(depth, len(indexes)):
+            point, chain_code = ckd_pub(point, chain_code, indexes[d])
+            self._nodes[indexes[:d + 1]] = (point, chain_code)
+        return point, chain_code
+
+    def derive_range(self, prefix, start, count):
+        """
+        Derive consecutive children under a shared prefix
+
+        Yields:
+            (index, child_point) for index in [start, start + count)
+        """
+        point, chain_code = self.node(prefix)
+        for index in range(start, start + count):
+            yield index, ckd_pub(point, chain_code, index)[0]
+
+
+class NodeCacheRegistry:
+    """Bounded LRU of NodeCache objects keyed by vault public key and chain code"""
+
+    def __init__(self, max_vaults=1024):
+        self.max_vaults = max_vaults
+        self._caches = OrderedDict()
+
+    def get(self, public_key_ecdsa, hex_chain_code):
+        key = (public_key_ecdsa.lower(), hex_chain_code.lower())
+        cache = self._caches.get(key)
+        if cache is None:
+            cache = NodeCache(*key)
+            self._caches[key] = cache
+            if len(self._caches) > self.max_vaults:
+                self._caches.popitem(last=False)
+        else:
+            self._caches.move_to_end(key)
+        return cache
+
+
+# Process-wide registry: shares of one vault reuse the same derived nodes
+NODE_CACHES = NodeCacheRegistry()
+
+
+def derive_addresses(public_key_ecdsa, hex_chain_code, chain, path=None, start=0, count=1,
+                     public_key_eddsa=None):
+    """
+    Derive child public keys and addresses for one vault on one chain
+
+    Args:
+        public_key_ecdsa: Vault root ECDSA public key (hex, compressed)
+        hex_chain_code: Vault chain code (hex)
+        chain: addresses.Chain to encode for
+        path: Path template (defaults to the chain's receive path)
+        start, count: Range substituted for the 'i' placeholder
+        public_key_eddsa: Root EdDSA key, used as-is by EdDSA chains
+
+    Yields:
+        dicts with path, public_key and address
+    """
+    if chain.account_path is None:
+        # EdDSA chains use the vault's root EdDSA key without derivation
+        if not public_key_eddsa:
+            raise DerivationError(f"{chain.name} needs the vault EdDSA public key")
+        yield {'path': 'm', 'public_key': public_key_eddsa,
+               'address': chain.encode(bytes.fromhex(public_key_eddsa))}
+        return
+
+    template = (path or chain.default_path).strip()
+    prefix, placeholder = parse_path(template)
+    cache = NODE_CACHES.get(public_key_ecdsa, hex_chain_code)
+
+    if not placeholder:
+        point = cache.node(prefix)[0]
+        yield {'path': template, 'public_key': compress_secp256k1(point).hex(),
+               'address': chain.encode(point)}
+        return
+
+    # Keep the caller's spelling (hardened markers included) in reported paths: m/0/i' gives m/0/0', m/0/1', ...
+    base, _, last = template.rpartition('/')
+    marker = last[len(INDEX_PLACEHOLDER):]
+    for index, point in cache.derive_range(prefix, start, count):
+        yield {'path': f"{base}/{index}{marker}", 'public_key': compress_secp256k1(point).hex(),
+               'address': chain.encode(point)}
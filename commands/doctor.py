@@ -3,11 +3,32 @@ Doctor command implementation for vultitool
 Provides health checks, self-tests, and diagnostic capabilities
 """
 
+import os
 import sys
+import json
+import time
+import argparse
+import importlib
+import io
+import random
 import subprocess
+import yaml
 from pathlib import Path
 from datetime import datetime
 
+from loader import load_vaults, read_vault_bytes, VaultLoadError
+from gobackend import GoBackendError, find_go_binary
+from vaultcodecs import CODECS, CodecError, ScryptKdf
+from profiler import profile_call, top_allocations, top_functions
+from health import PROBES, STATUS_FAIL, STATUS_PASS, run_probes, version as health_version
+from rekey import write_atomic
+import baseline
+import timings
+
+# Encrypted fixture decrypted over and over by `doctor bench`
+BENCH_VAULT = Path(__file__).parent.parent / "tests" / "fixtures" / "qa-fast-share2of2.vult"
+BENCH_PASSWORD = "vulticli01"
+
 
 class DoctorCommands:
     @staticmethod
@@ -22,9 +43,51 @@ class DoctorCommands:
         
         # Health check command
         health_parser = subparsers.add_parser('health', help='Quick health check')
+        health_parser.add_argument('--json', action='store_true', help='Output as JSON (for readiness probes)')
+        health_parser.add_argument('--only', metavar='PROBES', help='Comma-separated probes to run (default: all)')
+        health_parser.add_argument('--timeout', type=float, metavar='SECONDS',
+                                   help='Timeout for every probe (default: per probe)')
         
         # Environment check command
         env_parser = subparsers.add_parser('env', help='Check environment and dependencies')
+        
+        # Benchmark command
+        bench_parser = subparsers.add_parser('bench', help='Compare Python and Go decryption throughput')
+        bench_parser.add_argument('--count', '-n', type=int, default=200, help='Encrypted vaults to load per backend')
+        bench_parser.add_argument('--backend', default='python,go', help='Comma-separated backends to run')
+        bench_parser.add_argument('--go-workers', type=int, default=os.cpu_count() or 1, help='Go worker processes')
+        bench_parser.add_argument('--json', action='store_true', help='Output as JSON')
+        bench_parser.add_argument('--repeat', '-r', type=int, default=7,
+                                  help='Rounds of per-stage timings for --save and --compare')
+        bench_parser.add_argument('--save', nargs='?', const='', metavar='FILE',
+                                  help='Save per-stage timings as a baseline (default: bench-baseline-VERSION.json)')
+        bench_parser.add_argument('--compare', metavar='FILE', help='Compare per-stage timings against a baseline')
+        bench_parser.add_argument('--threshold', type=float, default=10.0,
+                                  help='Percent slowdown of a significant change that fails --compare')
+        
+        # Codecs command
+        codecs_parser = subparsers.add_parser('codecs', help='List vault container codecs and benchmark their cost')
+        codecs_parser.add_argument('--bench', action='store_true', help='Time key derivation and decryption per codec')
+        codecs_parser.add_argument('--count', '-n', type=int, default=5, help='Decryptions timed per codec')
+        codecs_parser.add_argument('--scrypt-log2n', default='14,15,16,17',
+                                   help='Comma-separated scrypt work factors (log2 N) to benchmark')
+        codecs_parser.add_argument('--scrypt-r', type=int, default=8, help='scrypt block size r')
+        codecs_parser.add_argument('--scrypt-p', type=int, default=1, help='scrypt parallelism p')
+        codecs_parser.add_argument('--json', action='store_true', help='Output as JSON')
+        
+        # Profile command
+        profile_parser = subparsers.add_parser('profile', help='Profile CPU time and allocations of any vultitool command')
+        profile_parser.add_argument('--output-dir', '-o', default='profile',
+                                    help='Directory for profile.json, stacks.collapsed and cpu.pstats')
+        profile_parser.add_argument('--sample', action='store_true',
+                                    help='Sampling only, for long batch runs: no cProfile, no tracemalloc unless --alloc')
+        profile_parser.add_argument('--interval', type=float, default=1.0, help='Milliseconds between stack samples')
+        profile_parser.add_argument('--alloc', action=argparse.BooleanOptionalAction, default=None,
+                                    help='Trace allocations with tracemalloc (default: on unless --sample)')
+        profile_parser.add_argument('--alloc-frames', type=int, default=1, help='Frames kept per allocation traceback')
+        profile_parser.add_argument('--top', type=int, default=15, help='Functions and allocation sites to report')
+        profile_parser.add_argument('profiled', nargs=argparse.REMAINDER, metavar='-- COMMAND',
+                                    help='vultitool command to run, after --')
     
     @staticmethod
     def handle(args):
@@ -35,6 +98,12 @@ class DoctorCommands:
             return DoctorCommands.health(args)
         elif args.doctor_action == 'env':
             return DoctorCommands.environment_check(args)
+        elif args.doctor_action == 'bench':
+            return DoctorCommands.bench(args)
+        elif args.doctor_action == 'codecs':
+            return DoctorCommands.codecs(args)
+        elif args.doctor_action == 'profile':
+            return DoctorCommands.profile(args)
         else:
             print("No doctor action specified. Use --help for usage.")
             return 1
@@ -66,128 +135,43 @@ class DoctorCommands:
     
     @staticmethod
     def health(args):
-        """Quick health check"""
-        # Get version from VERSION file
+        """Quick health check: independent probes run concurrently, each with its own timeout"""
         try:
-            version_file = Path(__file__).parent.parent / "VERSION"
-            if version_file.exists():
-                version = version_file.read_text().strip()
-            else:
-                version = "unknown"
-        except Exception:
-            version = "unknown"
-            
-        print(":: Vultitool Health Check 🩺 👀 ")
-        print(f":: Version: vultitool {version} ")
-        print(f":: Timestamp: {datetime.now().astimezone().strftime('%Y-%m-%d %H:%M:%S %Z')} ")
-        print()
-        
-        issues = []
-        
-        # Check if vultitool is executable
-        vultitool_path = Path("./vultitool")
-        if not vultitool_path.exists():
-            issues.append("vultitool binary not found")
-        elif not vultitool_path.is_file():
-            issues.append("vultitool is not a file")
-        elif not vultitool_path.stat().st_mode & 0o111:
-            issues.append("vultitool is not executable")
-        else:
-            print("✅ vultitool binary: OK")
-        
-        # Check for protobuf bindings
-        generated_path = Path("generated")
-        if not generated_path.exists():
-            issues.append("Generated protobuf bindings not found")
-        else:
-            proto_files = list(generated_path.glob("**/*.py"))
-            if len(proto_files) == 0:
-                issues.append("No protobuf Python files found in generated/")
-            else:
-                print(f"✅ Protobuf bindings: {len(proto_files)} files found")
-        
-        # Check for test files - look for all .vult files in tests/fixtures
-        test_fixtures_path = Path("tests/fixtures")
-        if test_fixtures_path.exists():
-            vult_files = list(test_fixtures_path.glob("*.vult"))
-            if len(vult_files) == 0:
-                issues.append("No test .vult files found in tests/fixtures/")
-            else:
-                print(f"✅ Test files: {len(vult_files)} .vult files available")
-        else:
-            issues.append("tests/fixtures/ directory not found")
-        
-        # Check Python dependencies
-        try:
-            import base64
-            import json
-            print("✅ Python standard library: OK")
-        except ImportError as e:
-            issues.append(f"Missing Python dependency: {e}")
-        
-        # Check Go binary functionality
-        go_binary_path = Path("./vultitool-go")
-        if not go_binary_path.exists():
-            issues.append("vultitool-go binary not found - run 'make build-go'")
-        elif not go_binary_path.is_file():
-            issues.append("vultitool-go is not a file")
-        elif not go_binary_path.stat().st_mode & 0o111:
-            issues.append("vultitool-go is not executable")
-        else:
-            # Test basic Go functionality
-            try:
-                result = subprocess.run(
-                    ["./vultitool-go", "--help"], 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=5
-                )
-                if result.returncode == 0 and "vultitool" in result.stdout and "Commands:" in result.stdout:
-                    print("✅ Go binary functionality: OK")
-                else:
-                    issues.append("vultitool-go --help failed or returned unexpected output")
-            except subprocess.TimeoutExpired:
-                issues.append("vultitool-go command timed out")
-            except Exception as e:
-                issues.append(f"Failed to execute vultitool-go: {e}")
-        
-        # Check Go module integrity
-        go_mod_path = Path("go.mod")
-        go_sum_path = Path("go.sum")
-        if go_mod_path.exists() and go_sum_path.exists():
-            print("✅ Go modules: OK")
-        elif go_mod_path.exists() and not go_sum_path.exists():
-            issues.append("go.sum missing - run 'go mod download' or 'make build-go'")
-        else:
-            issues.append("Go module files missing - project may not be properly initialized")
+            names = [n.strip() for n in args.only.split(',') if n.strip()] if args.only else None
+            started = time.perf_counter()
+            results = run_probes(names, timeout=args.timeout)
+        except KeyError as e:
+            print(f"Error: Unknown probe {e} (choose from {', '.join(PROBES)})")
+            return 1
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        healthy = all(r['status'] == STATUS_PASS for r in results)
+        timestamp = datetime.now().astimezone()
         
-        # Try a basic command
-        try:
-            result = subprocess.run(
-                ["./vultitool", "--version"], 
-                capture_output=True, 
-                text=True, 
-                timeout=5
-            )
-            if result.returncode == 0:
-                print("✅ Basic command execution: OK")
-            else:
-                issues.append("vultitool --version failed")
-        except subprocess.TimeoutExpired:
-            issues.append("vultitool command timed out")
-        except Exception as e:
-            issues.append(f"Failed to execute vultitool: {e}")
+        if args.json:
+            print(json.dumps({'status': STATUS_PASS if healthy else STATUS_FAIL, 'version': health_version(),
+                              'timestamp': timestamp.isoformat(), 'duration_ms': elapsed_ms,
+                              'probes': results}, indent=2))
+            return 0 if healthy else 1
         
+        print(":: Vultitool Health Check 🩺 👀 ")
+        print(f":: Version: vultitool {health_version()} ")
+        print(f":: Timestamp: {timestamp.strftime('%Y-%m-%d %H:%M:%S %Z')} ")
+        print()
+        for r in results:
+            if r['status'] == STATUS_PASS:
+                print(f"✅ {r['description']}: {r['detail']} ({r['duration_ms']:.1f} ms)")
         print()
         
-        if issues:
+        if not healthy:
             print("❌ Health Check Failed!")
             print("Issues found:")
-            for issue in issues:
-                print(f"  - {issue}")
+            for r in results:
+                if r['status'] != STATUS_PASS:
+                    print(f"  - {r['detail']} [{r['name']}, {r['status']}, {r['duration_ms']:.1f} ms]")
+            print(f"⏱️  {len(results)} probes in {elapsed_ms:.1f} ms")
             return 1
         else:
-            print("✅ All health checks passed!")
+            print(f"✅ All health checks passed! ({len(results)} probes in {elapsed_ms:.1f} ms)")
             print()
             print("💡 Next steps:")
             print("  - Run 'vultitool doctor selftest' for comprehensive testing")
@@ -213,6 +197,7 @@ class DoctorCommands:
         important_paths = [
             "./vultitool",
             "./commands/",
+            "./proto/vultisig.protoset",
             "./generated/",
             "./tests/",
             "./README.md",
@@ -250,3 +235,338 @@ class DoctorCommands:
         
         print(f"\nEnvironment check completed at {datetime.now().isoformat()}")
         return 0
+    
+    @staticmethod
+    def bench(args):
+        """Load the encrypted fixture --count times through each backend and compare throughput"""
+        backends = [b.strip() for b in args.backend.split(',') if b.strip()]
+        unknown = [b for b in backends if b not in ('python', 'go')]
+        if unknown or not backends:
+            print(f"Error: Unknown backend(s): {', '.join(unknown)} (choose from python, go)")
+            return 1
+        if args.count < 1:
+            print("Error: --count must be positive")
+            return 1
+        staged = args.save is not None or args.compare
+        if staged and args.repeat < 2:
+            print("Error: --repeat must be at least 2 for --save and --compare")
+            return 1
+        base = None
+        if args.compare:
+            try:
+                base = baseline.load(args.compare)
+            except baseline.BaselineError as e:
+                print(f"Error: {e}")
+                return 1
+        
+        size = BENCH_VAULT.stat().st_size
+        results = []
+        for backend in backends:
+            if backend == 'go' and find_go_binary() is None:
+                results.append({'backend': backend, 'skipped': "vultitool-go not built (make build-go)"})
+                continue
+            paths = [BENCH_VAULT] * args.count
+            failed = 0
+            start = time.perf_counter()
+            try:
+                for _, data in load_vaults(paths, password=BENCH_PASSWORD, fields=['name'],
+                                           backend=backend, workers=args.go_workers):
+                    if isinstance(data, VaultLoadError):
+                        failed += 1
+            except GoBackendError as e:
+                results.append({'backend': backend, 'skipped': str(e)})
+                continue
+            elapsed = time.perf_counter() - start
+            results.append({
+                'backend': backend,
+                'workers': args.go_workers if backend == 'go' else 1,
+                'vaults': args.count,
+                'failed': failed,
+                'seconds': round(elapsed, 4),
+                'vaults_per_second': round(args.count / elapsed, 1),
+                'mb_per_second': round(args.count * size / elapsed / 1e6, 2),
+            })
+        
+        timed = {r['backend']: r for r in results if 'seconds' in r}
+        speedup = None
+        if 'python' in timed and 'go' in timed:
+            speedup = round(timed['python']['seconds'] / timed['go']['seconds'], 2)
+        
+        report = {'file': str(BENCH_VAULT), 'bytes': size, 'results': results, 'go_speedup': speedup}
+        comparison = None
+        if staged:
+            current = baseline.build(health_version(), DoctorCommands._bench_stages(args.count, args.repeat),
+                                     args.count, {'results': results})
+            if args.save is not None:
+                path = Path(args.save) if args.save else baseline.default_path(health_version())
+                try:
+                    write_atomic(path, (json.dumps(current, indent=2) + '\n').encode(), mode=0o644)
+                except OSError as e:
+                    print(f"Error: Cannot write baseline {path}: {e}")
+                    return 1
+                report['baseline'] = str(path)
+            report['environment'] = current['environment']
+            report['stages'] = current['stages']
+            if base is not None:
+                comparison = {
+                    'baseline': args.compare,
+                    'threshold_percent': args.threshold,
+                    'environment_differences': baseline.environment_differences(base, current),
+                    'speed_factor': baseline.speed_factor(base, current),
+                    'stages': baseline.compare(base, current, args.threshold / 100),
+                }
+                report['comparison'] = comparison
+        
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print(f"⏱️  Decrypt benchmark: {args.count} x {BENCH_VAULT.name} ({size:,} bytes)")
+            for r in results:
+                if 'skipped' in r:
+                    print(f"  {r['backend']:<7} skipped: {r['skipped']}")
+                    continue
+                print(f"  {r['backend']:<7} {r['seconds']:>8.3f}s  {r['vaults_per_second']:>9.1f} vaults/s  "
+                      f"{r['mb_per_second']:>7.2f} MB/s  (workers: {r['workers']}, failed: {r['failed']})")
+            if speedup is not None:
+                print(f"🚀 Go backend speedup: {speedup}x")
+            if staged:
+                DoctorCommands._print_stages(report['stages'], args.repeat, comparison)
+            if 'baseline' in report:
+                print(f"💾 Baseline saved to {report['baseline']}")
+        
+        if any(r.get('failed', 0) for r in results):
+            return 1
+        if comparison and any(row['verdict'] == baseline.VERDICT_REGRESSION for row in comparison['stages']):
+            return 1
+        return 0
+    
+    @staticmethod
+    def _bench_stages(count, repeat):
+        """
+        Per-stage timings of full Python-backend loads and exports of the encrypted fixture
+        
+        The rounds are interleaved: each of the count passes loads one vault
+        for every round, in a fresh random order, so drift over the run
+        (clock scaling, other load on the host) is spread over all rounds
+        instead of landing on the last ones. A 'calibration' stage times a
+        fixed workload after every load, for compare() to scale by.
+        
+        Returns:
+            {stage: [mean microseconds per call in each round]}
+        """
+        totals = [{} for _ in range(repeat + 1)]
+        current = totals[0]
+        
+        def collect(stage, elapsed_ns):
+            entry = current.setdefault(stage, [0, 0])
+            entry[0] += elapsed_ns
+            entry[1] += 1
+        
+        def run_once():
+            for _, data in load_vaults([BENCH_VAULT], password=BENCH_PASSWORD):
+                if isinstance(data, VaultLoadError):
+                    continue
+                # The same work as `vault export`, into memory so disk speed stays out of it
+                with timings.span('export.json'):
+                    json.dump(data, io.StringIO(), indent=2)
+                with timings.span('export.yaml'):
+                    yaml.dump(data, io.StringIO(), default_flow_style=False)
+        
+        timings.add_sink(collect)
+        try:
+            # Round 0 is a warm-up (imports, caches, allocator) and is not kept
+            for _ in range(count):
+                run_once()
+                baseline.calibrate()
+            order = list(range(1, repeat + 1))
+            for _ in range(count):
+                random.shuffle(order)
+                for round_number in order:
+                    current = totals[round_number]
+                    run_once()
+                    with timings.span(baseline.CALIBRATION):
+                        baseline.calibrate()
+        finally:
+            timings.remove_sink(collect)
+        
+        rounds = {}
+        for round_totals in totals[1:]:
+            for stage, (total_ns, calls) in round_totals.items():
+                rounds.setdefault(stage, []).append(total_ns / calls / 1000)
+        return {stage: rounds[stage] for stage in sorted(rounds, key=timings.stage_order)}
+    
+    @staticmethod
+    def _print_stages(stages, repeat, comparison):
+        """Per-stage means with 95% confidence intervals, and the verdicts of a comparison"""
+        rows = {row['stage']: row for row in comparison['stages']} if comparison else {}
+        print(f"📏 Stage timings over {repeat} rounds (µs per call, mean ± 95% CI):")
+        for name, stage in stages.items():
+            line = f"  {name:<18} {stage['mean_us']:>10.1f} ± {stage['ci95_us']:<8.1f}"
+            row = rows.get(name)
+            if row and row['verdict'] != baseline.VERDICT_NEW:
+                line += (f" baseline {row['base_us']:>10.1f}  {row['change']:>+7.1%} "
+                         f"[{row['ci95_low']:+.1%}, {row['ci95_high']:+.1%}]  {row['verdict']}")
+            elif row:
+                line += " not in baseline"
+            print(line.rstrip())
+        if not comparison:
+            return
+        factor = comparison['speed_factor']
+        if factor != 1.0:
+            print(f"🖥️  Machine {'slower' if factor > 1 else 'faster'} than for the baseline by {abs(factor - 1):.1%} "
+                  f"(calibration); timings are scaled to match before comparing")
+        for key, (was, now) in comparison['environment_differences'].items():
+            print(f"⚠️  {key} differs from the baseline: {was} -> {now}")
+        regressions = [row['stage'] for row in comparison['stages'] if row['verdict'] == baseline.VERDICT_REGRESSION]
+        if regressions:
+            print(f"❌ Regression beyond {comparison['threshold_percent']:g}% in: {', '.join(regressions)}")
+        else:
+            print(f"✅ No stage regressed beyond {comparison['threshold_percent']:g}% of {comparison['baseline']}")
+    
+    @staticmethod
+    def codecs(args):
+        """List the codec registry and, with --bench, what each codec costs per vault"""
+        codecs = [c for c in CODECS.values() if c.encrypted]
+        if not args.bench:
+            if args.json:
+                print(json.dumps([c.to_dict() for c in CODECS.values()], indent=2))
+                return 0
+            print("🔐 Vault container codecs (dispatched by container version and is_encrypted)")
+            for codec in CODECS.values():
+                draft = " [draft]" if codec.draft else ""
+                print(f"  {codec.name:<28} {codec.description}{draft}")
+            return 0
+        
+        try:
+            log2_ns = [int(v) for v in args.scrypt_log2n.split(',') if v.strip()]
+        except ValueError:
+            print(f"Error: Invalid --scrypt-log2n '{args.scrypt_log2n}'")
+            return 1
+        if args.count < 1:
+            print("Error: --count must be positive")
+            return 1
+        
+        # Real Vault bytes, so cipher cost reflects a real payload size
+        try:
+            _, vault_bytes = read_vault_bytes(BENCH_VAULT, BENCH_PASSWORD)
+        except VaultLoadError as e:
+            print(f"Error: Cannot prepare benchmark vault: {e}")
+            return 1
+        
+        # Container versions sharing a scheme share its cost, so time each scheme once (newest version)
+        latest = {}
+        for codec in codecs:
+            latest[codec.scheme] = codec
+        runs = []
+        for codec in latest.values():
+            if isinstance(codec.kdf, ScryptKdf):
+                runs.extend((codec, {'log2_n': n, 'r': args.scrypt_r, 'p': args.scrypt_p}) for n in log2_ns)
+            else:
+                runs.append((codec, {}))
+        
+        results = []
+        for codec, params in runs:
+            try:
+                payload = codec.encrypt(vault_bytes, BENCH_PASSWORD, **params)
+                kdf_params, body = codec.kdf.split(payload)
+                start = time.perf_counter()
+                for _ in range(args.count):
+                    key = codec.kdf.derive(BENCH_PASSWORD, kdf_params)
+                kdf_seconds = (time.perf_counter() - start) / args.count
+                start = time.perf_counter()
+                for _ in range(args.count):
+                    opened = codec.cipher.open(key, body)
+                cipher_seconds = (time.perf_counter() - start) / args.count
+            except CodecError as e:
+                results.append({'codec': codec.name, 'kdf': codec.kdf.describe(params or None), 'error': str(e)})
+                continue
+            total = kdf_seconds + cipher_seconds
+            results.append({
+                'codec': codec.name,
+                'kdf': codec.kdf.describe(kdf_params or None),
+                'cipher': codec.cipher.name,
+                'kdf_ms': round(kdf_seconds * 1000, 3),
+                'cipher_ms': round(cipher_seconds * 1000, 3),
+                'vaults_per_second': round(1 / total, 1),
+                'kdf_memory_bytes': codec.kdf.memory(kdf_params) if codec.kdf.salted else 0,
+                'roundtrip': opened == vault_bytes,
+            })
+        
+        if args.json:
+            print(json.dumps({'file': str(BENCH_VAULT), 'bytes': len(vault_bytes), 'count': args.count,
+                              'results': results}, indent=2))
+        else:
+            print(f"⏱️  Codec benchmark: {len(vault_bytes):,} byte vault, {args.count} decryption(s) per codec")
+            for r in results:
+                if 'error' in r:
+                    print(f"  {r['codec']:<28} {r['kdf']:<28} error: {r['error']}")
+                    continue
+                memory = f"{r['kdf_memory_bytes'] / (1 << 20):.0f} MiB" if r['kdf_memory_bytes'] else "-"
+                print(f"  {r['codec']:<28} {r['kdf']:<28} kdf {r['kdf_ms']:>9.3f} ms  cipher {r['cipher_ms']:>7.3f} ms  "
+                      f"{r['vaults_per_second']:>9.1f} vaults/s  mem {memory}")
+            print("💡 Pick the largest scrypt work factor whose kdf time your batch runs can afford per vault")
+        return 0 if all(r.get('roundtrip') for r in results) else 1
+    
+    @staticmethod
+    def profile(args):
+        """Run a vultitool command in this process under the profilers and write the results"""
+        command = args.profiled[1:] if args.profiled[:1] == ['--'] else args.profiled
+        if not command:
+            print("Error: Give the command to profile after --, e.g. doctor profile -- vault parse x.vult")
+            return 1
+        if args.interval <= 0 or args.top < 1:
+            print("Error: --interval and --top must be positive")
+            return 1
+        alloc = not args.sample if args.alloc is None else args.alloc
+        output_dir = Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # The CLI entry point lives beside commands/, not in it
+        sys.path.insert(0, str(Path(__file__).parent.parent))
+        cli = importlib.import_module('vultitool')
+        result = profile_call(lambda: cli.main(command), cpu=not args.sample, alloc=alloc,
+                              interval=args.interval / 1000, alloc_frames=args.alloc_frames)
+        
+        stacks_path = output_dir / 'stacks.collapsed'
+        stacks_path.write_text(''.join(line + '\n' for line in result['sampler'].collapsed()))
+        report = {
+            'command': command,
+            'mode': 'sample' if args.sample else 'deterministic',
+            'exit_code': result['exit_code'],
+            'wall_s': round(result['wall_s'], 6),
+            'cpu_s': round(result['cpu_s'], 6),
+            'samples': result['samples'],
+            'interval_ms': args.interval,
+            'rss_peak_bytes': result['rss_peak_bytes'],
+            'alloc_peak_bytes': result['alloc_peak_bytes'],
+            'stacks': str(stacks_path),
+        }
+        if result['stats'] is not None:
+            pstats_path = output_dir / 'cpu.pstats'
+            result['stats'].dump_stats(pstats_path)
+            report['pstats'] = str(pstats_path)
+            report['top_functions'] = top_functions(result['stats'], args.top)
+        if result['snapshot'] is not None:
+            report['top_allocations'] = top_allocations(result['snapshot'], args.top)
+        with open(output_dir / 'profile.json', 'w') as f:
+            json.dump(report, f, indent=2)
+        
+        # The profiled command owns stdout, so the summary goes to stderr
+        out = sys.stderr
+        print(f"\n🔬 Profiled '{' '.join(command)}' ({report['mode']}): exit {report['exit_code']}, "
+              f"{report['wall_s']:.3f}s wall, {report['cpu_s']:.3f}s CPU, {report['samples']} samples", file=out)
+        alloc_peak = f", traced allocation peak {report['alloc_peak_bytes'] / (1 << 20):.1f} MiB" \
+            if report['alloc_peak_bytes'] is not None else ''
+        print(f"💾 Peak RSS {report['rss_peak_bytes'] / (1 << 20):.1f} MiB{alloc_peak}", file=out)
+        if 'top_functions' in report:
+            print("⏱️  Top functions by own time:", file=out)
+            for row in report['top_functions']:
+                print(f"  {row['own_s'] * 1000:>9.2f} ms own {row['cumulative_s'] * 1000:>9.2f} ms cum "
+                      f"{row['calls']:>8} calls  {row['function']}", file=out)
+        if 'top_allocations' in report:
+            print("📦 Top allocation sites (held at the end of the run):", file=out)
+            for row in report['top_allocations']:
+                print(f"  {row['bytes'] / 1024:>9.1f} KiB {row['blocks']:>7} blocks  {row['site']}", file=out)
+        print(f"📁 Wrote {output_dir / 'profile.json'} and {stacks_path} (flamegraph.pl or speedscope)"
+              + (f" and {report['pstats']}" if 'pstats' in report else ''), file=out)
+        return result['exit_code']
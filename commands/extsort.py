@@ -0,0 +1,347 @@
+"""
+External sorting for vultitool
+Sorts and groups NDJSON result streams larger than memory by spilling sorted runs to disk and merging them
+"""
+
+import heapq
+import json
+import os
+import struct
+import sys
+import tempfile
+from contextlib import contextmanager
+from operator import itemgetter
+from pathlib import Path
+
+# Memory for records held before a sorted run is spilled, unless --memory says otherwise
+DEFAULT_MEMORY = 256 << 20
+# Runs merged at once; more are merged in passes, so open files stay bounded
+MERGE_FANIN = 64
+# Rough per-record cost of the list entry, tuple and two bytes objects around each key and line
+_RECORD_OVERHEAD = 160
+
+# A spilled record: key length, line length; followed by the key and the line
+_FRAME = struct.Struct('>II')
+_RUN_BUFFER = 1 << 20
+# Smaller for reading, as a merge has MERGE_FANIN runs open at once
+_MERGE_BUFFER = 64 << 10
+
+# Key components sort missing/null, then numbers, then strings, then anything else (lists, objects)
+_TAG_NULL = b'\x00'
+_TAG_NUMBER = b'\x01'
+_TAG_STRING = b'\x02'
+_TAG_OTHER = b'\x03'
+_DOUBLE = struct.Struct('>d')
+
+_SIZE_UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+
+
+class SortError(Exception):
+    """Raised for bad sort options and unreadable input records; reason is a short machine-readable tag"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+def parse_size(text):
+    """
+    A memory size such as '512M' in bytes (suffixes K, M and G; bare numbers are bytes)
+
+    Raises:
+        SortError: If text is not a positive size
+    """
+    value = text.strip().upper().removesuffix('B')
+    unit = value[-1:] if value[-1:] in _SIZE_UNITS else ''
+    try:
+        size = int(float(value[:len(value) - len(unit)]) * _SIZE_UNITS[unit])
+    except ValueError:
+        size = 0
+    if size < 1:
+        raise SortError('usage', f"Invalid size '{text}' (e.g. 512M or 2G)")
+    return size
+
+
+def parse_fields(text):
+    """
+    A comma-separated list of record fields
+
+    Raises:
+        SortError: If no field is named
+    """
+    fields = [field.strip() for field in text.split(',') if field.strip()]
+    if not fields:
+        raise SortError('usage', f"No fields in '{text}'")
+    return fields
+
+
+def sort_key(record, fields):
+    """
+    The compact key of a record: its fields' values encoded so that bytes order is value order
+
+    Each component is a type tag and, for numbers, an order-preserving
+    IEEE double, for strings their UTF-8 escaped and terminated so a
+    prefix sorts first. Keys compare with a single memcmp and are
+    spilled beside the line, so merging never parses JSON again.
+    """
+    parts = []
+    for field in fields:
+        value = record.get(field)
+        if type(value) is str:
+            parts.append(_TAG_STRING + _escape(value) + b'\x00\x00')
+        elif value is None:
+            parts.append(_TAG_NULL)
+        elif isinstance(value, (bool, int, float)):
+            bits = _DOUBLE.pack(float(value))
+            # Flip the sign bit of positives and every bit of negatives, so bytes order is numeric order
+            bits = bytes(b ^ 0xff for b in bits) if bits[0] & 0x80 else bytes([bits[0] | 0x80]) + bits[1:]
+            parts.append(_TAG_NUMBER + bits)
+        else:
+            parts.append(_TAG_OTHER + _escape(json.dumps(value, sort_keys=True)) + b'\x00\x00')
+    return b''.join(parts)
+
+
+def _escape(text):
+    return text.encode('utf-8', 'surrogatepass').replace(b'\x00', b'\x00\xff')
+
+
+def iter_lines(paths):
+    """
+    Yield (record, line) for every JSON object line in the given files ('-' is stdin)
+
+    Blank lines are skipped; each line is returned as read, ending in a newline.
+
+    Raises:
+        SortError: If a line is not a JSON object
+        OSError: If a file cannot be read
+    """
+    for entry in paths or ['-']:
+        stream = sys.stdin.buffer if entry == '-' else open(entry, 'rb')
+        label = '<stdin>' if entry == '-' else entry
+        try:
+            for lineno, line in enumerate(stream, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    record = None
+                if not isinstance(record, dict):
+                    raise SortError('input', f"{label}:{lineno}: not a JSON record")
+                yield record, line if line.endswith(b'\n') else line + b'\n'
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+
+class ExternalSorter:
+    """
+    Bounded-memory sort of (key, line) pairs
+
+    Pairs are buffered until their estimated size reaches the memory
+    budget, then sorted and spilled to a run file in a private temporary
+    directory. Reading back merges the runs, MERGE_FANIN at a time, so any
+    number of records is sorted with one pass over the input, a few
+    passes over the runs and memory for one buffer. The sort is stable:
+    records with equal keys keep their input order.
+    """
+
+    def __init__(self, memory=DEFAULT_MEMORY, tmp_dir=None, reverse=False):
+        self.memory = memory
+        self.tmp_dir = tmp_dir
+        self.reverse = reverse
+        self.records = 0
+        self.runs = 0
+        self.passes = 0
+        self._files = 0
+        self._buffer = []
+        self._buffered = 0
+        self._workdir = None
+        self._spilled = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def add(self, key, line):
+        self._buffer.append((key, line))
+        self._buffered += len(key) + len(line) + _RECORD_OVERHEAD
+        self.records += 1
+        if self._buffered >= self.memory:
+            self._spill()
+
+    def _sorted_buffer(self):
+        self._buffer.sort(key=itemgetter(0), reverse=self.reverse)
+        buffer, self._buffer, self._buffered = self._buffer, [], 0
+        return buffer
+
+    def _spill(self):
+        if self._workdir is None:
+            self._workdir = tempfile.TemporaryDirectory(prefix='vultitool-sort-', dir=self.tmp_dir)
+        self._spilled.append(self._write_run(self._sorted_buffer()))
+        self.runs += 1
+
+    def _write_run(self, pairs):
+        """Write sorted pairs to a new run file and return its path"""
+        path = Path(self._workdir.name) / f"run-{self._files:06d}"
+        self._files += 1
+        with open(path, 'wb', buffering=_RUN_BUFFER) as f:
+            for key, line in pairs:
+                f.write(_FRAME.pack(len(key), len(line)))
+                f.write(key)
+                f.write(line)
+        return path
+
+    @staticmethod
+    def _read_run(path):
+        """Yield the pairs of a run file, deleting it once read"""
+        with open(path, 'rb', buffering=_MERGE_BUFFER) as f:
+            while True:
+                header = f.read(_FRAME.size)
+                if not header:
+                    break
+                key_size, line_size = _FRAME.unpack(header)
+                yield f.read(key_size), f.read(line_size)
+        os.unlink(path)
+
+    def _merge(self, runs):
+        return heapq.merge(*(self._read_run(path) for path in runs), key=itemgetter(0), reverse=self.reverse)
+
+    def sorted(self):
+        """Yield every (key, line) added, in key order"""
+        if not self._spilled:
+            yield from self._sorted_buffer()
+            return
+        if self._buffer:
+            self._spill()
+        runs = self._spilled
+        self._spilled = []
+        # Earlier runs hold earlier input, so merging neighbours in order keeps the sort stable
+        while len(runs) > MERGE_FANIN:
+            self.passes += 1
+            runs = [self._write_run(self._merge(runs[i:i + MERGE_FANIN])) for i in range(0, len(runs), MERGE_FANIN)]
+        self.passes += 1
+        yield from self._merge(runs)
+
+    def close(self):
+        """Remove the spilled runs"""
+        if self._workdir is not None:
+            self._workdir.cleanup()
+            self._workdir = None
+
+
+def sort_records(paths, fields, out, memory=DEFAULT_MEMORY, tmp_dir=None, reverse=False):
+    """
+    Write the records of NDJSON files to out, ordered by fields
+
+    Lines are written back byte for byte; records missing a field sort
+    before those that have it.
+
+    Args:
+        paths: NDJSON files ('-' is stdin)
+        fields: Record fields to order by, most significant first
+        out: Binary stream to write to
+        memory: Bytes of records held before a run is spilled
+        tmp_dir: Directory for spilled runs (default: the system temporary directory)
+        reverse: Descending order
+
+    Returns:
+        The ExternalSorter, for its records, runs and passes counts
+
+    Raises:
+        SortError: If a line is not a JSON record
+        OSError: If an input cannot be read or a run cannot be written
+    """
+    with ExternalSorter(memory, tmp_dir, reverse) as sorter:
+        for record, line in iter_lines(paths):
+            sorter.add(sort_key(record, fields), line)
+        for _, line in sorter.sorted():
+            out.write(line)
+    return sorter
+
+
+def group_records(paths, fields, out, collect=(), min_count=1, memory=DEFAULT_MEMORY, tmp_dir=None):
+    """
+    Write one NDJSON line per distinct value of fields, in key order
+
+    Each group line holds the key fields, 'count' and, for every collect
+    field, the list of that field's values over the group's records in
+    input order. Only one group's collected values are held in memory.
+
+    Args:
+        paths: NDJSON files ('-' is stdin)
+        fields: Record fields to group by
+        out: Binary stream to write to
+        collect: Record fields to list per group
+        min_count: Only write groups with at least this many records
+        memory: Bytes of records held before a run is spilled
+        tmp_dir: Directory for spilled runs
+
+    Returns:
+        (ExternalSorter, number of groups written)
+
+    Raises:
+        SortError: If a field is both grouped and collected or named 'count', or a line is not a JSON record
+        OSError: If an input cannot be read or a run cannot be written
+    """
+    clashes = (set(fields) & set(collect)) | ({'count'} & (set(fields) | set(collect)))
+    if clashes:
+        raise SortError('usage', f"Field(s) {', '.join(sorted(clashes))} cannot be both grouped and collected, "
+                                 "or named 'count'")
+    groups = 0
+    with ExternalSorter(memory, tmp_dir) as sorter:
+        for record, line in iter_lines(paths):
+            sorter.add(sort_key(record, fields), line)
+
+        current_key = group = None
+        for key, line in sorter.sorted():
+            if key != current_key:
+                if group is not None and group['count'] >= min_count:
+                    out.write(json.dumps(group).encode() + b'\n')
+                    groups += 1
+                current_key = key
+                record = json.loads(line)
+                group = {field: record.get(field) for field in fields}
+                group['count'] = 0
+                group.update((field, []) for field in collect)
+            elif collect:
+                record = json.loads(line)
+            group['count'] += 1
+            for field in collect:
+                group[field].append(record.get(field))
+        if group is not None and group['count'] >= min_count:
+            out.write(json.dumps(group).encode() + b'\n')
+            groups += 1
+    return sorter, groups
+
+
+@contextmanager
+def open_output(path):
+    """
+    A binary stream for path, replaced atomically once complete, or stdout for None
+
+    The whole input is read before anything is written, so path may also
+    be one of the inputs (sorting a file in place).
+    """
+    if path is None:
+        yield sys.stdout.buffer
+        sys.stdout.buffer.flush()
+        return
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb', buffering=_RUN_BUFFER) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,172 @@
+"""
+Go decryption backend for vultitool
+Pipelines encrypted vault payloads through long-lived `vultitool-go decrypt --serve` workers
+"""
+
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import threading
+from collections import deque
+from pathlib import Path
+
+from vaultcodecs import SCHEME_AES_GCM_SHA256
+
+# Built by `make build-go`; VULTITOOL_GO overrides the location
+GO_BINARY = Path(__file__).parent.parent / "vultitool-go"
+
+# Encryption schemes `decrypt --serve` implements; other codecs stay in Python
+GO_SCHEMES = frozenset([SCHEME_AES_GCM_SHA256])
+
+# Requests outstanding per worker before results are collected
+DEFAULT_WINDOW = 32
+
+_LENGTH = struct.Struct('>I')
+_PASSWORD_LENGTH = struct.Struct('>H')
+_STATUS_OK = 0
+
+
+class GoBackendError(Exception):
+    """Raised when no Go worker can be started or a worker dies; reason is a short machine-readable tag"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+def find_go_binary():
+    """Path of the vultitool-go binary, or None if it has not been built"""
+    override = os.environ.get('VULTITOOL_GO')
+    if override:
+        return override if os.access(override, os.X_OK) else None
+    if os.access(GO_BINARY, os.X_OK):
+        return str(GO_BINARY)
+    return shutil.which('vultitool-go')
+
+
+class _Worker:
+    """One `decrypt --serve` process with a writer thread feeding its stdin"""
+
+    def __init__(self, binary):
+        try:
+            self.process = subprocess.Popen([binary, 'decrypt', '--serve'], stdin=subprocess.PIPE,
+                                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            raise GoBackendError('start', f"Cannot start Go worker {binary}: {e}")
+        self.requests = queue.Queue()
+        self.writer = threading.Thread(target=self._write_requests, daemon=True)
+        self.writer.start()
+
+    def _write_requests(self):
+        stdin = self.process.stdin
+        try:
+            while True:
+                frame = self.requests.get()
+                if frame is None:
+                    break
+                stdin.write(frame)
+                if self.requests.empty():
+                    stdin.flush()
+        except (BrokenPipeError, OSError):
+            pass
+        finally:
+            try:
+                stdin.close()
+            except OSError:
+                pass
+
+    def submit(self, data, password):
+        secret = password.encode()
+        body = _PASSWORD_LENGTH.pack(len(secret)) + secret + data
+        self.requests.put(_LENGTH.pack(len(body)) + body)
+
+    def receive(self):
+        """Read the next response: (plaintext, None) or (None, error message)"""
+        stdout = self.process.stdout
+        header = stdout.read(_LENGTH.size)
+        if len(header) < _LENGTH.size:
+            raise GoBackendError('worker', f"Go worker exited with status {self.process.poll()}")
+        (length,) = _LENGTH.unpack(header)
+        body = stdout.read(length)
+        if len(body) < length or length == 0:
+            raise GoBackendError('worker', "Go worker sent a truncated response")
+        if body[0] == _STATUS_OK:
+            return body[1:], None
+        return None, body[1:].decode('utf-8', 'replace')
+
+    def close(self):
+        self.requests.put(None)
+        # Closing our end first stops a worker still writing unread responses
+        self.process.stdout.close()
+        self.writer.join()
+        self.process.wait()
+
+
+class DecryptPool:
+    """
+    A set of Go decryption workers shared by a batch
+
+    Requests are spread round-robin and pipelined: up to `window` per worker
+    are in flight while results are read back, oldest first, so output order
+    matches input order.
+    """
+
+    def __init__(self, workers=1, binary=None, window=DEFAULT_WINDOW):
+        binary = binary or find_go_binary()
+        if binary is None:
+            raise GoBackendError('missing', "vultitool-go not found; run 'make build-go' or set VULTITOOL_GO")
+        self.window = max(1, window) * max(1, workers)
+        self.workers = []
+        try:
+            for _ in range(max(1, workers)):
+                self.workers.append(_Worker(binary))
+        except GoBackendError:
+            self.close()
+            raise
+
+    def decrypt_many(self, items):
+        """
+        Decrypt a stream of payloads
+
+        Args:
+            items: Iterable of (key, data, password); items whose data is None
+                pass straight through without reaching a worker
+
+        Yields:
+            (key, plaintext, error) in input order, with error None on success
+        """
+        pending = deque()
+        turn = 0
+        for key, data, password in items:
+            if data is None:
+                pending.append((None, key))
+            else:
+                worker = self.workers[turn % len(self.workers)]
+                turn += 1
+                worker.submit(data, password)
+                pending.append((worker, key))
+            while len(pending) > self.window or (pending and pending[0][0] is None):
+                yield self._collect(pending.popleft())
+        while pending:
+            yield self._collect(pending.popleft())
+
+    @staticmethod
+    def _collect(entry):
+        worker, key = entry
+        if worker is None:
+            return key, None, None
+        plaintext, error = worker.receive()
+        return key, plaintext, error
+
+    def close(self):
+        for worker in self.workers:
+            worker.close()
+        self.workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,189 @@
+"""
+Health probes for vultitool
+Independent readiness checks that run concurrently, each with its own timeout and measured duration
+"""
+
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+from schema import SchemaError, message_types
+from gobackend import find_go_binary
+
+ROOT = Path(__file__).parent.parent
+
+STATUS_PASS = 'pass'
+STATUS_FAIL = 'fail'
+STATUS_TIMEOUT = 'timeout'
+
+DEFAULT_TIMEOUT = 2.0
+
+
+class ProbeFailed(Exception):
+    """Raised by a probe whose check failed; the message is the issue reported"""
+
+
+class Probe:
+    """A named check; func(timeout) returns a detail string or raises ProbeFailed"""
+
+    def __init__(self, name, func, description, timeout=DEFAULT_TIMEOUT):
+        self.name = name
+        self.func = func
+        self.description = description
+        self.timeout = timeout
+
+
+# Registry of all probes keyed by name, run in registration order
+PROBES = {}
+
+
+def probe(name, description, timeout=DEFAULT_TIMEOUT):
+    """Decorator registering a probe function"""
+    def register(func):
+        if name in PROBES:
+            raise ValueError(f"Duplicate probe: {name}")
+        PROBES[name] = Probe(name, func, description, timeout)
+        return func
+    return register
+
+
+def version():
+    """The version in the VERSION file, or 'unknown'"""
+    try:
+        return (ROOT / "VERSION").read_text().strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+@probe('cli', "vultitool entry point")
+def _cli(timeout):
+    # In-process: the commands are already imported, so only the launcher itself can be broken
+    launcher = ROOT / "vultitool"
+    if not launcher.exists():
+        raise ProbeFailed("vultitool binary not found")
+    if not launcher.is_file():
+        raise ProbeFailed("vultitool is not a file")
+    if not os.access(launcher, os.X_OK):
+        raise ProbeFailed("vultitool is not executable")
+    return f"vultitool {version()}"
+
+
+@probe('schema', "Protobuf descriptor set")
+def _schema(timeout):
+    try:
+        return f"{len(message_types())} message types"
+    except SchemaError as e:
+        raise ProbeFailed(str(e))
+
+
+@probe('python', "Python dependencies")
+def _python(timeout):
+    missing = []
+    for module in ('google.protobuf', 'yaml', 'cryptography.hazmat.primitives.ciphers.aead'):
+        try:
+            __import__(module)
+        except ImportError:
+            missing.append(module.split('.')[0])
+    if missing:
+        raise ProbeFailed(f"Missing Python dependency: {', '.join(missing)}")
+    return "protobuf, yaml, cryptography"
+
+
+@probe('fixtures', "Test fixtures")
+def _fixtures(timeout):
+    fixtures = ROOT / "tests" / "fixtures"
+    try:
+        # One directory listing; the fixtures are not searched recursively
+        with os.scandir(fixtures) as entries:
+            count = sum(1 for entry in entries if entry.name.endswith('.vult'))
+    except FileNotFoundError:
+        raise ProbeFailed("tests/fixtures/ directory not found")
+    if count == 0:
+        raise ProbeFailed("No test .vult files found in tests/fixtures/")
+    return f"{count} .vult files available"
+
+
+@probe('go-binary', "vultitool-go binary", timeout=5.0)
+def _go_binary(timeout):
+    binary = find_go_binary()
+    if binary is None:
+        raise ProbeFailed("vultitool-go binary not found - run 'make build-go'")
+    try:
+        result = subprocess.run([binary, "--help"], capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise ProbeFailed("vultitool-go command timed out")
+    except OSError as e:
+        raise ProbeFailed(f"Failed to execute vultitool-go: {e}")
+    if result.returncode != 0 or "vultitool" not in result.stdout or "Commands:" not in result.stdout:
+        raise ProbeFailed("vultitool-go --help failed or returned unexpected output")
+    return binary
+
+
+@probe('go-modules', "Go modules")
+def _go_modules(timeout):
+    if not (ROOT / "go.mod").exists():
+        raise ProbeFailed("Go module files missing - project may not be properly initialized")
+    if not (ROOT / "go.sum").exists():
+        raise ProbeFailed("go.sum missing - run 'go mod download' or 'make build-go'")
+    return "go.mod and go.sum present"
+
+
+def run_probes(names=None, timeout=None):
+    """
+    Run probes concurrently
+
+    Each probe runs in its own daemon thread, so one that hangs past its
+    timeout is reported as timed out without holding up the others or the
+    process exit.
+
+    Args:
+        names: Probe names to run, or None for all of them
+        timeout: Seconds to allow each probe, overriding its own timeout
+
+    Returns:
+        List of result dicts (name, description, status, detail,
+        duration_ms) in registration order
+
+    Raises:
+        KeyError: For an unknown probe name
+    """
+    selected = [PROBES[name] for name in names] if names else list(PROBES.values())
+    results = [None] * len(selected)
+    # Each result is set once, by the probe or by its timeout, whichever takes the lock first
+    lock = threading.Lock()
+    threads = []
+    for i, item in enumerate(selected):
+        limit = timeout if timeout is not None else item.timeout
+        thread = threading.Thread(target=_run_one, args=(item, limit, results, i, lock), name=f"probe-{item.name}",
+                                  daemon=True)
+        thread.start()
+        threads.append((item, limit, thread, time.perf_counter()))
+
+    for i, (item, limit, thread, started) in enumerate(threads):
+        thread.join(max(0.0, started + limit - time.perf_counter()))
+        with lock:
+            if results[i] is None:
+                results[i] = {'name': item.name, 'description': item.description, 'status': STATUS_TIMEOUT,
+                              'detail': f"No answer within {limit:g}s",
+                              'duration_ms': round((time.perf_counter() - started) * 1000, 3)}
+    # A copy, so a probe still running cannot change what the caller reports
+    with lock:
+        return list(results)
+
+
+def _run_one(item, timeout, results, index, lock):
+    started = time.perf_counter()
+    try:
+        status, detail = STATUS_PASS, item.func(timeout)
+    except ProbeFailed as e:
+        status, detail = STATUS_FAIL, str(e)
+    except Exception as e:
+        status, detail = STATUS_FAIL, f"{type(e).__name__}: {e}"
+    result = {'name': item.name, 'description': item.description, 'status': status, 'detail': detail,
+              'duration_ms': round((time.perf_counter() - started) * 1000, 3)}
+    # A probe that finishes after its deadline keeps the timeout already reported
+    with lock:
+        if results[index] is None:
+            results[index] = result
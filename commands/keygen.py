@@ -0,0 +1,64 @@
+"""
+Keygen command implementation for vultitool
+Decodes KeygenMessage / ReshareMessage session setups captured from QR codes and relay logs
+"""
+
+import os
+import sys
+import json
+
+from payloads import KEYGEN_TYPES, FRAMINGS, PayloadDecodeError, decode_keygen, iter_inputs
+
+class KeygenCommands:
+    @staticmethod
+    def setup_parser(parser):
+        """Setup keygen command parser with subcommands"""
+        subparsers = parser.add_subparsers(dest='keygen_action', help='Keygen operations')
+
+        # Decode command
+        decode_parser = subparsers.add_parser('decode', help='Decode keygen and reshare messages to NDJSON')
+        decode_parser.add_argument('inputs', nargs='*',
+                                   help="Files with raw, base64, compressed or deep-link messages (default/'-': stdin)")
+        decode_parser.add_argument('--type', choices=['auto'] + list(KEYGEN_TYPES), default='auto',
+                                   help='Message type (default: auto-detect)')
+        decode_parser.add_argument('--framing', choices=FRAMINGS, default='lines',
+                                   help='Input framing: one message per line, or length-prefixed raw messages')
+    
+    @staticmethod
+    def handle(args):
+        """Route keygen commands to appropriate handlers"""
+        if args.keygen_action == 'decode':
+            return KeygenCommands.decode(args)
+        else:
+            print("No keygen action specified. Use --help for usage.")
+            return 1
+
+    @staticmethod
+    def decode(args):
+        """Decode each input and stream one JSON record per message"""
+        decoded = 0
+        failed = 0
+        write = sys.stdout.write
+        try:
+            for source, data in iter_inputs(args.inputs, args.framing):
+                try:
+                    record = {'source': source}
+                    record.update(decode_keygen(data, args.type))
+                    decoded += 1
+                except PayloadDecodeError as e:
+                    record = {'source': source, 'error': e.reason, 'message': str(e)}
+                    failed += 1
+                write(json.dumps(record) + '\n')
+        except BrokenPipeError:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+        except PayloadDecodeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            failed += 1
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        sys.stdout.flush()
+
+        print(f"🔑 Decoded {decoded} message(s), {failed} failed", file=sys.stderr)
+        return 0 if failed == 0 else 1
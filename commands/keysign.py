@@ -0,0 +1,239 @@
+"""
+Keysign command implementation for vultitool
+Decodes keysign messages and payloads captured from QR codes, deep links and relay logs
+"""
+
+import os
+import sys
+import json
+import yaml
+
+from payloads import (MESSAGE_TYPES, FRAMINGS, COMPRESSORS, PayloadDecodeError, decode, frame,
+                      iter_inputs, unwrap)
+from utxostats import (UtxoColumns, WireError, analyze, DEFAULT_DUST, DEFAULT_FEE_RATES,
+                       NUMPY_AVAILABLE)
+from builder import CHAIN_TEMPLATES, PayloadBuilder, PayloadBuildError, detect_format, open_rows, read_rows
+from loader import load_vault, VaultLoadError
+from credentials import CredentialError, configure as configure_credentials
+
+class KeysignCommands:
+    @staticmethod
+    def setup_parser(parser):
+        """Setup keysign command parser with subcommands"""
+        subparsers = parser.add_subparsers(dest='keysign_action', help='Keysign operations')
+
+        # Decode command
+        decode_parser = subparsers.add_parser('decode', help='Decode keysign messages or payloads to NDJSON')
+        decode_parser.add_argument('inputs', nargs='*',
+                                   help="Files with raw, base64, compressed or deep-link payloads (default/'-': stdin)")
+        decode_parser.add_argument('--type', choices=['auto'] + list(MESSAGE_TYPES), default='auto',
+                                   help='Top-level message type (default: auto-detect)')
+        decode_parser.add_argument('--summary', action='store_true',
+                                   help='Emit one flat row of key facts per payload instead of the full message')
+        decode_parser.add_argument('--framing', choices=FRAMINGS, default='lines',
+                                   help='Input framing: one payload per line, or length-prefixed raw payloads')
+
+        # Encode command
+        encode_parser = subparsers.add_parser('encode', help='Build KeysignPayloads from CSV/NDJSON payout rows')
+        encode_parser.add_argument('rows', help="CSV (with header) or NDJSON rows file ('-' for stdin)")
+        encode_parser.add_argument('--vault', required=True, help='Vault file the payloads are signed by')
+        encode_parser.add_argument('--password', '-p', help='Password for an encrypted vault')
+        encode_parser.add_argument('--password-file', metavar='FILE',
+                                   help='YAML map of path globs, vault names or public keys to passwords')
+        encode_parser.add_argument('--chain', choices=list(CHAIN_TEMPLATES),
+                                   help='Chain for rows without a chain column')
+        encode_parser.add_argument('--format', choices=['auto', 'csv', 'ndjson'], default='auto',
+                                   help='Rows format (default: from the file extension, else CSV)')
+        encode_parser.add_argument('--template', help='JSON/YAML per-chain overrides for coin fields and variant defaults')
+        encode_parser.add_argument('--framing', choices=FRAMINGS, default='lines',
+                                   help='Output framing (default: one base64 payload per line)')
+        encode_parser.add_argument('--compress', choices=list(COMPRESSORS), default='none',
+                                   help='Compress each payload before framing')
+        encode_parser.add_argument('--output', '-o', help='Output file (default: stdout)')
+        encode_parser.add_argument('--skip-invalid', action='store_true',
+                                   help='Write the valid rows even if some rows fail validation')
+        
+        # UTXO statistics command
+        utxo_parser = subparsers.add_parser('utxo-stats', help='Analyze utxo_info across many keysign payloads')
+        utxo_parser.add_argument('inputs', nargs='*', help="Payload files as for decode (default/'-': stdin)")
+        utxo_parser.add_argument('--type', choices=['auto'] + list(MESSAGE_TYPES), default='auto',
+                                 help='Top-level message type (default: auto-detect)')
+        utxo_parser.add_argument('--framing', choices=FRAMINGS, default='lines',
+                                 help='Input framing: one payload per line, or length-prefixed raw payloads')
+        utxo_parser.add_argument('--dust', type=int, default=DEFAULT_DUST,
+                                 help=f'Dust threshold in base units (default: {DEFAULT_DUST})')
+        utxo_parser.add_argument('--fee-rates', default=','.join(str(r) for r in DEFAULT_FEE_RATES),
+                                 help='Comma-separated fee rates in base units per vbyte')
+        utxo_parser.add_argument('--no-numpy', action='store_true', help='Use the pure-Python implementation')
+        utxo_parser.add_argument('--json', action='store_true', help='Output as JSON')
+    
+    @staticmethod
+    def handle(args):
+        """Route keysign commands to appropriate handlers"""
+        try:
+            configure_credentials(getattr(args, 'password_file', None))
+        except CredentialError as e:
+            print(f"Error: {e}")
+            return 1
+        
+        if args.keysign_action == 'decode':
+            return KeysignCommands.decode(args)
+        elif args.keysign_action == 'encode':
+            return KeysignCommands.encode(args)
+        elif args.keysign_action == 'utxo-stats':
+            return KeysignCommands.utxo_stats(args)
+        else:
+            print("No keysign action specified. Use --help for usage.")
+            return 1
+
+    @staticmethod
+    def decode(args):
+        """Decode each input and stream one JSON record per payload"""
+        decoded = 0
+        failed = 0
+        write = sys.stdout.write
+        try:
+            for source, data in iter_inputs(args.inputs, args.framing):
+                try:
+                    record = {'source': source}
+                    record.update(decode(data, args.type, args.summary))
+                    decoded += 1
+                except PayloadDecodeError as e:
+                    record = {'source': source, 'error': e.reason, 'message': str(e)}
+                    failed += 1
+                write(json.dumps(record) + '\n')
+        except BrokenPipeError:
+            # Downstream (head, jq -c ... | head) closed early; silence the flush at exit
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+        except PayloadDecodeError as e:
+            # A broken length prefix leaves no way to resynchronize the stream
+            print(f"Error: {e}", file=sys.stderr)
+            failed += 1
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        sys.stdout.flush()
+
+        print(f"📦 Decoded {decoded} payload(s), {failed} failed", file=sys.stderr)
+        return 0 if failed == 0 else 1
+    
+    @staticmethod
+    def encode(args):
+        """Validate every row, then serialize and frame the payloads"""
+        try:
+            data = load_vault(args.vault, password=args.password, json_mode=True, prompt=False,
+                              fields=['name', 'public_key_ecdsa', 'public_key_eddsa', 'hex_chain_code',
+                                      'local_party_id', 'lib_type'])
+        except VaultLoadError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        vault = data.get('vault', {})
+        
+        templates = None
+        if args.template:
+            try:
+                with open(args.template, 'r') as f:
+                    templates = yaml.safe_load(f) or {}
+            except (OSError, yaml.YAMLError) as e:
+                print(f"Error: Cannot read template {args.template}: {e}", file=sys.stderr)
+                return 1
+        
+        try:
+            builder = PayloadBuilder(vault, templates, default_chain=args.chain)
+            with open_rows(args.rows, sys.stdin) as stream:
+                payloads, errors = builder.build_all(read_rows(stream, detect_format(args.rows, args.format)))
+        except (OSError, PayloadBuildError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        
+        for number, message in errors:
+            print(f"❌ Row {number}: {message}", file=sys.stderr)
+        if errors and not args.skip_invalid:
+            print(f"❌ {len(errors)} invalid row(s); nothing written", file=sys.stderr)
+            return 1
+        
+        compress = COMPRESSORS[args.compress]
+        chunks = []
+        for _, payload in payloads:
+            raw = payload.SerializeToString()
+            chunks.append(frame(compress(raw) if compress else raw, args.framing))
+        
+        try:
+            if args.output:
+                with open(args.output, 'wb') as f:
+                    f.write(b''.join(chunks))
+            else:
+                sys.stdout.buffer.write(b''.join(chunks))
+                sys.stdout.buffer.flush()
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        
+        print(f"📦 Encoded {len(payloads)} payload(s) for vault {vault.get('name', '')}"
+              + (f", skipped {len(errors)} invalid row(s)" if errors else ""), file=sys.stderr)
+        return 1 if errors else 0
+    
+    @staticmethod
+    def utxo_stats(args):
+        """Load utxo_info from every payload into columns and report set statistics"""
+        try:
+            fee_rates = [int(r) for r in args.fee_rates.split(',') if r.strip()]
+        except ValueError:
+            print(f"Error: --fee-rates must be comma-separated integers, got '{args.fee_rates}'")
+            return 1
+        
+        columns = UtxoColumns()
+        failed = 0
+        try:
+            for source, data in iter_inputs(args.inputs, args.framing):
+                try:
+                    raw, _ = unwrap(data)
+                    columns.add_payload(source, raw, args.type)
+                except (PayloadDecodeError, WireError) as e:
+                    print(f"⚠️  Skipping {source}: {e}", file=sys.stderr)
+                    failed += 1
+        except PayloadDecodeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            failed += 1
+        except OSError as e:
+            print(f"Error: {e}")
+            return 1
+        
+        report = analyze(columns, dust=args.dust, fee_rates=fee_rates, use_numpy=not args.no_numpy)
+        report['failed'] = failed
+        
+        if args.json:
+            print(json.dumps(report, indent=2))
+            return 0 if failed == 0 else 1
+        
+        print(f"📦 Payloads: {report['payloads']} ({report['payloads_with_utxos']} with UTXOs, {failed} failed)")
+        for chain, counts in sorted(report['by_chain'].items()):
+            print(f"  - {chain}: {counts['payloads']} payload(s), {counts['utxos']} UTXO(s)")
+        print(f"🪙 UTXOs: {report['utxos']} totalling {report['total']}")
+        if report['utxos']:
+            print(f"📏 Min/median/mean/max: {report['min']} / {report['median']:g} / {report['mean']:g} / {report['max']}")
+        dust = report['dust']
+        print(f"🧹 Dust (< {dust['threshold']}): {dust['count']} UTXO(s), {dust['amount']} total")
+        duplicates = report['duplicates']
+        print(f"🔁 Duplicate outpoints: {duplicates['within_payload']} within a payload, "
+              f"{duplicates['across_payloads']} spent by several payloads")
+        for outpoint in duplicates['examples']:
+            print(f"  - {outpoint}")
+        if report['malformed_txids']:
+            print(f"⚠️  Malformed txids: {report['malformed_txids']}")
+        
+        print("📊 Amount histogram:")
+        for bucket in report['histogram']:
+            if bucket['count']:
+                print(f"  {bucket['range']:>24}: {bucket['count']:>8}  ({bucket['amount']})")
+        
+        print("💸 Estimated spend cost:")
+        for row in report['fees']:
+            print(f"  {row['rate']:>4}/vB: {row['vbytes']} vB, fee {row['fee']} ({row['fee_pct']}%), "
+                  f"{row['uneconomic_utxos']} uneconomic UTXO(s)")
+        if report['payload_fee']['vbytes']:
+            print(f"  payload byte_fee: {report['payload_fee']['vbytes']} vB, fee {report['payload_fee']['fee']}")
+        if not args.no_numpy and not NUMPY_AVAILABLE:
+            print("ℹ️  NumPy not installed; used the pure-Python implementation")
+        return 0 if failed == 0 else 1
@@ -0,0 +1,219 @@
+"""
+Reshare lineage for vultitool
+Joins captured KeygenMessage / ReshareMessage sessions to catalogued vault files
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+
+# Placeholder prefix for a generation whose reshare_prefix no capture or vault file names
+UNKNOWN_PREFIX = '?'
+
+
+class Generation:
+    """One party set of a vault: every share file with the same key, chain code and reshare_prefix"""
+
+    __slots__ = ('key', 'prefix', 'name', 'signers', 'lib_type', 'created_at', 'files', 'parent_edge')
+
+    def __init__(self, key, prefix, name='', signers=None, lib_type=None, created_at=None):
+        self.key = key
+        self.prefix = prefix
+        self.name = name
+        self.signers = signers
+        self.lib_type = lib_type
+        self.created_at = created_at
+        self.files = []
+        self.parent_edge = None
+
+    @property
+    def catalogued(self):
+        return bool(self.files)
+
+    def to_dict(self):
+        return {
+            'reshare_prefix': self.prefix,
+            'name': self.name,
+            'signers': sorted(self.signers) if self.signers is not None else None,
+            'lib_type': self.lib_type,
+            'created_at': self.created_at,
+            'catalogued': self.catalogued,
+            'files': self.files,
+            'reshare_session': self.parent_edge['session_id'] if self.parent_edge else None,
+        }
+
+
+def _key(public_key, chain_code):
+    return public_key.lower(), chain_code.lower()
+
+
+class Lineage:
+    """
+    Reshare lineage graph over a vault catalogue
+
+    Vault generations are indexed by (public_key_ecdsa, hex_chain_code) and
+    then reshare_prefix, and by chain code alone for KeygenMessages (which
+    carry no public key), so each captured session is attached with a couple
+    of dict lookups and a binary search however long the history is.
+    """
+
+    def __init__(self):
+        self.generations = {}                   # (pk, cc) -> {prefix: Generation}
+        self.by_chain_code = defaultdict(set)   # cc -> {(pk, cc)}
+        self.keygens = defaultdict(list)        # (pk, cc) -> [session]
+        self.edges = defaultdict(list)          # (pk, cc) -> [edge]
+        self.unmatched = []
+
+    def add_vault(self, vault, file_path):
+        """Catalogue one loaded vault file (dict with the loader's field names)"""
+        key = _key(vault.get('public_key_ecdsa', ''), vault.get('hex_chain_code', ''))
+        prefix = vault.get('reshare_prefix', '')
+        generations = self.generations.setdefault(key, {})
+        generation = generations.get(prefix)
+        if generation is None or not generation.catalogued:
+            generation = generations[prefix] = Generation(
+                key, prefix, vault.get('name', ''), frozenset(vault.get('signers', [])),
+                vault.get('lib_type'), (vault.get('created_at') or {}).get('seconds'))
+            self.by_chain_code[key[1]].add(key)
+        generation.files.append(file_path)
+
+    def add_sessions(self, sessions):
+        """
+        Attach decoded sessions to the catalogue
+
+        Args:
+            sessions: Iterable of (source, type, message dict) as produced by payloads.decode_keygen
+        """
+        reshares = defaultdict(list)
+        for source, type_name, message in sessions:
+            session = {'source': source, 'type': type_name, 'session_id': message.get('session_id', '')}
+            chain_code = message.get('hex_chain_code', '').lower()
+            if type_name == 'KeygenMessage':
+                keys = self.by_chain_code.get(chain_code)
+                if not keys:
+                    self._unmatch(session, 'no catalogued vault has this chain code')
+                    continue
+                for key in keys:
+                    self.keygens[key].append(dict(session, vault_name=message.get('vault_name', '')))
+                continue
+
+            key = _key(message.get('public_key_ecdsa', ''), chain_code)
+            if key not in self.generations:
+                self._unmatch(session, 'no catalogued vault has this public key and chain code')
+                continue
+            reshares[key].append((session, message))
+
+        for key, entries in reshares.items():
+            self._link(key, entries)
+
+    def _unmatch(self, session, reason):
+        self.unmatched.append(dict(session, reason=reason))
+
+    def _link(self, key, entries):
+        """Turn the reshare sessions of one vault into parent -> child edges"""
+        generations = self.generations[key]
+        # Every prefix a session reshared from is itself a generation, even if no file of it was found
+        for _, message in entries:
+            prefix = message.get('old_reshare_prefix', '')
+            if prefix not in generations:
+                generations[prefix] = Generation(key, prefix, message.get('vault_name', ''),
+                                                 frozenset(message.get('old_parties', [])))
+
+        unclaimed = _Unclaimed(generations.values())
+        for session, message in entries:
+            parent = generations[message.get('old_reshare_prefix', '')]
+            old_parties = frozenset(message.get('old_parties', []))
+            child = unclaimed.claim(parent)
+            if child is None:
+                child = Generation(key, UNKNOWN_PREFIX, message.get('vault_name', '') or parent.name)
+                generations[f"{UNKNOWN_PREFIX}{session['session_id']}"] = child
+
+            edge = dict(session, parent=parent.prefix, child=child.prefix,
+                        old_parties=sorted(old_parties),
+                        party_mismatch=parent.signers is not None and parent.signers != old_parties)
+            if child.signers is not None:
+                edge['added'] = sorted(child.signers - old_parties)
+                edge['removed'] = sorted(old_parties - child.signers)
+            child.parent_edge = edge
+            self.edges[key].append(edge)
+
+    def report(self, only_with_sessions=False):
+        """
+        Summarize the graph
+
+        Returns:
+            dict with one entry per vault (generations in lineage order and
+            reshare edges), the sessions that matched nothing, and counts
+        """
+        vaults = []
+        for key, generations in self.generations.items():
+            if only_with_sessions and not self.edges.get(key) and not self.keygens.get(key):
+                continue
+            roots = sorted((g for g in generations.values() if g.parent_edge is None),
+                           key=lambda g: (g.prefix != '', g.created_at or 0, g.prefix))
+            children = defaultdict(list)
+            for generation in generations.values():
+                if generation.parent_edge is not None:
+                    children[generation.parent_edge['parent']].append(generation)
+            ordered = []
+            stack = list(reversed(roots))
+            while stack:
+                generation = stack.pop()
+                ordered.append(generation)
+                if generation.prefix != UNKNOWN_PREFIX:
+                    stack.extend(reversed(children.pop(generation.prefix, [])))
+            name = next((g.name for g in ordered if g.catalogued), ordered[0].name if ordered else '')
+            vaults.append({
+                'name': name,
+                'public_key_ecdsa': key[0],
+                'hex_chain_code': key[1],
+                'keygen_sessions': self.keygens.get(key, []),
+                'generations': [g.to_dict() for g in ordered],
+                'reshares': self.edges.get(key, []),
+            })
+        vaults.sort(key=lambda v: (v['name'], v['public_key_ecdsa']))
+        return {
+            'vaults': vaults,
+            'unmatched': self.unmatched,
+            'stats': {
+                'vaults': len(self.generations),
+                'generations': sum(len(g) for g in self.generations.values()),
+                'keygen_sessions': sum(len(s) for s in self.keygens.values()),
+                'reshares': sum(len(e) for e in self.edges.values()),
+                'unmatched': len(self.unmatched),
+            },
+        }
+
+
+class _Unclaimed:
+    """
+    The generations of one vault no reshare has produced yet, in the order
+    a reshare's child is picked: catalogued files before prefixes only seen
+    in other sessions, then by creation time and prefix
+
+    The child of a reshare of parent is the first of these created no
+    earlier than parent (generations of unknown age are never excluded), so
+    it is found by binary search and removed when claimed, rather than by
+    rescanning every generation for every session.
+    """
+
+    def __init__(self, generations):
+        # (catalogued, seen only in sessions): sorted lists of (created_at, prefix, generation)
+        self.ranked = ([], [])
+        for generation in generations:
+            if generation.parent_edge is None and generation.prefix != '':
+                created = generation.created_at if generation.created_at is not None else float('inf')
+                self.ranked[not generation.catalogued].append((created, generation.prefix, generation))
+        for entries in self.ranked:
+            # Prefixes are unique per vault, so the generations themselves are never compared
+            entries.sort()
+
+    def claim(self, parent):
+        """Remove and return the generation a reshare of parent produced, or None if there is none left"""
+        floor = parent.created_at if parent.created_at is not None else float('-inf')
+        for entries in self.ranked:
+            index = bisect_left(entries, (floor,))
+            if index < len(entries) and entries[index][2] is parent:
+                index += 1
+            if index < len(entries):
+                return entries.pop(index)[2]
+        return None
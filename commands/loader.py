@@ -0,0 +1,596 @@
+"""
+Vault file loader for vultitool
+Decodes .vult files into the structured dict used by every vault command
+"""
+
+import asyncio
+import base64
+import functools
+import sys
+import json
+import getpass
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from datetime import datetime
+
+# Add commands path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from schema import enum_value, message_class
+from crypto import VaultDecryptor
+from vaultcodecs import CodecError, codec_for
+from gobackend import GO_SCHEMES, DecryptPool
+from credentials import CredentialError, configured_source
+from pack import FLAG_ENCRYPTED, FLAG_RAW_CONTAINER, FLAG_RAW_TEXT, is_pack, read_pack
+from timings import span
+import metrics
+from bundle import BUNDLE_MAGIC, BundleError, read_member, split_member_path
+from objectstore import DEFAULT_CONCURRENCY, S3Error, fetch as fetch_object, is_s3_url
+
+VaultContainer = message_class('vultisig.vault.v1.VaultContainer')
+Vault = message_class('vultisig.vault.v1.Vault')
+LIB_TYPE_GG20 = enum_value('vultisig.keygen.v1.LibType', 'LIB_TYPE_GG20')
+LIB_TYPE_DKLS = enum_value('vultisig.keygen.v1.LibType', 'LIB_TYPE_DKLS')
+
+# Every field the loader can produce under result['vault'].
+# 'keyshare_data' is the (expensive) base64+JSON decode of each key share.
+VAULT_FIELDS = frozenset([
+    'name', 'public_key_ecdsa', 'public_key_eddsa', 'local_party_id',
+    'hex_chain_code', 'reshare_prefix', 'lib_type', 'signers',
+    'key_shares', 'keyshare_data', 'created_at',
+])
+
+
+# Reads kept in flight by the overlapped loader unless told otherwise
+DEFAULT_IO_DEPTH = 8
+
+# Filesystem types whose reads wait on a network, where overlapping reads pays off
+REMOTE_FILESYSTEMS = frozenset(['nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', '9p', 'ceph', 'glusterfs', 'lustre',
+                                'gpfs', 'beegfs', 'afs', 'fuse.sshfs', 'fuse.s3fs', 'fuse.rclone',
+                                'fuse.gcsfuse', 'fuse.juicefs', 'fuse.goofys'])
+
+
+class VaultLoadError(Exception):
+    """Raised when a vault file cannot be loaded; reason is a short machine-readable tag"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+def lib_type_name(lib_type):
+    """Convert a LibType enum value to its short display name"""
+    if lib_type == LIB_TYPE_GG20:
+        return "GG20"
+    elif lib_type == LIB_TYPE_DKLS:
+        return "DKLS"
+    return "UNKNOWN"
+
+
+def load_vault(file_path, password=None, json_mode=False, fields=None, prompt=True, credentials=None, raw=None):
+    """
+    Load and parse a vault file
+
+    Args:
+        file_path: Path to the .vult file
+        password: Vault password (if encrypted)
+        json_mode: Keep stdout clean for JSON output
+        fields: Subset of VAULT_FIELDS to decode, or None for all of them
+        prompt: Ask for a password interactively when one is needed
+        credentials: CredentialStore or AgentClient to try before prompting
+            (default: the source chosen by credentials.configure())
+        raw: The file's bytes if already read (see read_raw)
+
+    Returns:
+        Structured vault data dict
+
+    Raises:
+        VaultLoadError: If the file is missing, undecodable or cannot be decrypted
+    """
+    wanted = VAULT_FIELDS if fields is None else frozenset(fields)
+    with span('load'):
+        result, vault_bytes, codec = read_container(file_path, raw)
+        if not codec.encrypted:
+            return _finish(result, vault_bytes, wanted)
+
+        source = credentials if credentials is not None else configured_source()
+        return _open(result, vault_bytes, codec, file_path, password, source, wanted, prompt, json_mode)
+
+
+def read_vault_bytes(file_path, password=None):
+    """
+    Read a vault file's Vault protobuf bytes, decrypting them if the container is encrypted
+
+    Returns:
+        (codec for the container, Vault bytes)
+
+    Raises:
+        VaultLoadError: If the file cannot be read or decrypted
+    """
+    _, vault_bytes, codec = read_container(file_path)
+    if not codec.encrypted:
+        return codec, vault_bytes
+    if password is None:
+        raise VaultLoadError('encrypted', "Vault is encrypted and no password was provided")
+    try:
+        return codec, codec.decrypt(vault_bytes, password)
+    except CodecError as e:
+        raise VaultLoadError('decrypt', f"Failed to decrypt vault with provided password: {e}")
+
+
+def _open(result, vault_bytes, codec, file_path, password, source, wanted, prompt, json_mode):
+    """Decrypt an encrypted container with the password, stored credentials or a prompt"""
+    if password is None:
+        tried = False
+        if source is not None:
+            with span('credentials'):
+                candidates = _candidates(source, file_path)
+            tried = bool(candidates)
+            data = _try_credentials(result, vault_bytes, codec, candidates, wanted)
+            if data is not None:
+                return data
+        if not prompt:
+            if tried:
+                raise VaultLoadError('decrypt', "No stored credential decrypts this vault")
+            raise VaultLoadError('encrypted', "Vault is encrypted and no password was provided")
+        password = getpass.getpass(prompt='Enter vault password: ')
+
+    # Use silent mode in JSON mode to avoid polluting stdout
+    decryptor = VaultDecryptor(silent=json_mode, codec=codec)
+    vault_binary = decryptor.decrypt_vault_data(vault_bytes, password)
+
+    if not vault_binary:
+        raise VaultLoadError('decrypt', "Failed to decrypt vault with provided password")
+    return _finish(result, vault_binary, wanted)
+
+
+def _candidates(source, file_path):
+    try:
+        return source.candidates(file_path)
+    except CredentialError as e:
+        raise VaultLoadError('credentials', str(e))
+
+
+def _try_credentials(result, vault_bytes, codec, candidates, wanted):
+    """
+    Decrypt with the first credential that works and, for name/pubkey
+    selectors, names the vault it decrypts; None if none does
+    """
+    decryptor = VaultDecryptor(silent=True, codec=codec)
+    for credential in candidates:
+        if credential.key is not None:
+            plaintext = decryptor.decrypt_with_key(vault_bytes, credential.key)
+        else:
+            plaintext = decryptor.decrypt_vault_data(vault_bytes, credential.password)
+        data = _accept(result, plaintext, credential, wanted)
+        if data is not None:
+            return data
+    return None
+
+
+def _accept(result, plaintext, credential, wanted):
+    """Finish a vault decrypted with credential if it is the vault the credential is for"""
+    if not plaintext:
+        return None
+    try:
+        vault = parse_vault(plaintext)
+    except VaultLoadError:
+        return None
+    if not credential.matches_vault(vault.name, vault.public_key_ecdsa):
+        return None
+    result['vault'] = _vault_to_dict(vault, wanted)
+    return result
+
+
+def load_vaults(paths, password=None, fields=None, backend='python', workers=1, credentials=None, io_depth=1):
+    """
+    Load many vault files, decrypting with the Python or Go backend
+
+    With backend 'go' the encrypted payloads are pipelined through a pool of
+    long-lived vultitool-go workers instead of being decrypted one by one.
+    Without a password, each encrypted file is tried with its credentials
+    (see load_vault); the Go workers take the first password candidate and
+    the rest are tried in Python.
+
+    Args:
+        paths: Iterable of vault file paths
+        password: Password for encrypted vaults (never prompted for)
+        fields: Subset of VAULT_FIELDS to decode, or None for all of them
+        backend: 'python' or 'go'
+        workers: Number of Go workers
+        credentials: CredentialStore or AgentClient (default: credentials.configure()'s choice)
+        io_depth: With backend 'python', files read at once; above 1 the reads
+            overlap the decoding through aload_vaults
+
+    Yields:
+        (path, data) in input order, where data is the load_vault dict or the
+        VaultLoadError for that file
+
+    Raises:
+        GoBackendError: If the Go workers cannot be started or die mid-batch
+    """
+    if backend != 'go' and io_depth > 1:
+        yield from _drive(aload_vaults(paths, password=password, fields=fields, credentials=credentials,
+                                       depth=io_depth))
+        return
+    if backend != 'go':
+        for path in paths:
+            try:
+                yield path, load_vault(path, password=password, json_mode=True, fields=fields, prompt=False,
+                                       credentials=credentials)
+            except VaultLoadError as e:
+                yield path, e
+        return
+
+    wanted = VAULT_FIELDS if fields is None else frozenset(fields)
+    source = credentials if credentials is not None else configured_source()
+
+    def requests():
+        # key: (path, result, ready, candidates) where ready is an error, the
+        # plain vault bytes or a finished dict, or None when a worker decrypts
+        # with candidates[0] (or the password when candidates is None)
+        for path in paths:
+            try:
+                result, vault_bytes, codec = read_container(path)
+            except VaultLoadError as e:
+                yield (path, None, e, None), None, None
+                continue
+            if not codec.encrypted:
+                yield (path, result, vault_bytes, None), None, None
+                continue
+            if codec.scheme not in GO_SCHEMES:
+                # The workers only implement Vultisig's scheme; other codecs decrypt here
+                try:
+                    data = _open(result, vault_bytes, codec, path, password, source, wanted, False, True)
+                except VaultLoadError as e:
+                    data = e
+                yield (path, result, data, None), None, None
+                continue
+            if password is not None:
+                yield (path, result, None, None), vault_bytes, password
+                continue
+            try:
+                candidates = _candidates(source, path) if source is not None else []
+            except VaultLoadError as e:
+                yield (path, result, e, None), None, None
+                continue
+            if candidates and candidates[0].password is not None:
+                yield (path, result, None, (candidates, vault_bytes, codec)), vault_bytes, candidates[0].password
+                continue
+            data = _try_credentials(result, vault_bytes, codec, candidates, wanted)
+            if data is None:
+                data = VaultLoadError('decrypt', "No stored credential decrypts this vault") if candidates else \
+                    VaultLoadError('encrypted', "Vault is encrypted and no password was provided")
+            yield (path, result, data, None), None, None
+
+    with DecryptPool(workers) as pool:
+        for (path, result, ready, pending), plaintext, error in pool.decrypt_many(requests()):
+            if ready is None and pending is not None:
+                candidates, vault_bytes, codec = pending
+                ready = _accept(result, plaintext, candidates[0], wanted) if error is None else None
+                if ready is None:
+                    ready = _try_credentials(result, vault_bytes, codec, candidates[1:], wanted) or \
+                        VaultLoadError('decrypt', "No stored credential decrypts this vault")
+            elif ready is None:
+                if error is not None:
+                    ready = VaultLoadError('decrypt', "Failed to decrypt vault with provided password")
+                else:
+                    ready = plaintext
+            if isinstance(ready, (VaultLoadError, dict)):
+                yield path, ready
+                continue
+            try:
+                yield path, _finish(result, ready, wanted)
+            except VaultLoadError as e:
+                yield path, e
+
+
+async def aload_vaults(paths, password=None, fields=None, credentials=None, depth=DEFAULT_IO_DEPTH, decoders=1):
+    """
+    Load many vault files with their reads overlapped, for slow or remote storage
+
+        async for path, data in aload_vaults(paths):
+            ...
+
+    File reads have no asyncio interface, so each one is a blocking read
+    in one of depth reader threads, and up to depth files are being read
+    at once. As each file's bytes arrive they are decoded, decrypted and
+    parsed in a decoder thread (CPU-bound and holding the GIL, so more
+    than one decoder rarely helps). Results come back in input order and
+    at most depth files are read ahead of the consumer: a slow consumer
+    holds back the reads rather than the archive piling up in memory.
+
+    Args:
+        paths: Iterable of vault file paths
+        password: Password for encrypted vaults (never prompted for)
+        fields: Subset of VAULT_FIELDS to decode, or None for all of them
+        credentials: CredentialStore or AgentClient (default: credentials.configure()'s choice)
+        depth: Reads in flight
+        decoders: Decoder threads
+
+    Yields:
+        (path, data) in input order, where data is the load_vault dict or the
+        VaultLoadError for that file
+    """
+    loop = asyncio.get_running_loop()
+    readers = ThreadPoolExecutor(depth, thread_name_prefix='vultitool-read')
+    decoder = ThreadPoolExecutor(decoders, thread_name_prefix='vultitool-decode')
+    decode = functools.partial(load_vault, password=password, json_mode=True, fields=fields, prompt=False,
+                               credentials=credentials)
+
+    async def load(path):
+        try:
+            raw = await loop.run_in_executor(readers, read_raw, path)
+            return await loop.run_in_executor(decoder, functools.partial(decode, path, raw=raw))
+        except VaultLoadError as e:
+            return e
+
+    window = deque()
+    try:
+        for path in paths:
+            window.append((path, asyncio.ensure_future(load(path))))
+            if len(window) >= depth:
+                path, task = window.popleft()
+                yield path, await task
+        while window:
+            path, task = window.popleft()
+            yield path, await task
+    finally:
+        for _, task in window:
+            task.cancel()
+        readers.shutdown(wait=False, cancel_futures=True)
+        decoder.shutdown(wait=False, cancel_futures=True)
+
+
+def auto_io_depth(paths):
+    """
+    DEFAULT_IO_DEPTH if the first path is on a network filesystem, more
+    for object storage, else 1
+
+    On local disks the reads are fast enough that handing them to threads
+    costs more than it overlaps; mounts are read from /proc/mounts, so
+    elsewhere this is always 1.
+    """
+    if not paths:
+        return 1
+    if is_s3_url(paths[0]):
+        return DEFAULT_CONCURRENCY
+    target = os.path.realpath(split_member_path(Path(paths[0]))[0])
+    try:
+        with open('/proc/mounts') as f:
+            mounts = [line.split()[1:3] for line in f]
+    except OSError:
+        return 1
+    best, fstype = '', None
+    for mount_point, kind in mounts:
+        mount_point = mount_point.replace('\\040', ' ')
+        inside = target == mount_point or target.startswith(mount_point.rstrip('/') + '/')
+        if inside and len(mount_point) >= len(best):
+            best, fstype = mount_point, kind
+    return DEFAULT_IO_DEPTH if fstype in REMOTE_FILESYSTEMS else 1
+
+
+def _drive(agen):
+    """Iterate an async generator from synchronous code; the loop runs only while the next item is wanted"""
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                item = loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        loop.run_until_complete(agen.aclose())
+        loop.close()
+
+
+def read_raw(file_path):
+    """
+    Read the bytes of a .vult file, .vultpack sidecar, bundle member ('team.vultb#member')
+    or object ('s3://bucket/key'), undecoded
+
+    Raises:
+        VaultLoadError: If the file, member or object is missing or unreadable
+    """
+    if is_s3_url(file_path):
+        with span('read'):
+            try:
+                raw = fetch_object(file_path)
+            except S3Error as e:
+                raise VaultLoadError(e.reason, str(e))
+        metrics.BYTES.inc(amount=len(raw))
+        return raw
+
+    path = Path(file_path)
+    bundle_path, selector = split_member_path(path)
+    if not bundle_path.exists():
+        raise VaultLoadError('missing', f"File {bundle_path} does not exist")
+
+    with span('read'):
+        if selector is not None:
+            try:
+                # Only the member's slice of the mapped bundle is read
+                raw = read_member(path)
+            except BundleError as e:
+                raise VaultLoadError(e.reason, str(e))
+        else:
+            try:
+                with open(path, 'rb') as f:
+                    raw = f.read()
+            except OSError as e:
+                raise VaultLoadError('decode', f"Failed to decode vault container: {e}")
+
+    metrics.BYTES.inc(amount=len(raw))
+    return raw
+
+
+def read_container(file_path, raw=None):
+    """
+    Read the container of a .vult file, its .vultpack sidecar or a bundle member ('team.vultb#member')
+
+    Args:
+        file_path: Path to the file or member
+        raw: Its bytes if already read (see read_raw)
+
+    Returns:
+        (result dict with file_info and container, inner vault bytes - still
+        encrypted if the container is, the codec for the container)
+
+    Raises:
+        VaultLoadError: If the file or member is missing or undecodable, or its container version is unsupported
+    """
+    path = Path(file_path)
+    if raw is None:
+        raw = read_raw(file_path)
+    if raw[:len(BUNDLE_MAGIC)] == BUNDLE_MAGIC:
+        raise VaultLoadError('bundle', f"{file_path} is a bundle; name a member as {file_path}#MEMBER")
+
+    try:
+        file_info = {'path': str(file_path) if is_s3_url(file_path) else str(path)}
+        if is_pack(raw):
+            # A packed sidecar: the inner vault bytes are stored raw
+            with span('decode.pack'):
+                container, vault_bytes = _read_pack(raw)
+            file_info['format'] = 'pack'
+            file_info['size_bytes'] = len(raw)
+        else:
+            # Read and decode file
+            with span('decode.base64'):
+                base64_content = raw.strip()
+                binary_data = base64.b64decode(base64_content)
+            file_info['size_chars'] = len(base64_content)
+            file_info['size_bytes'] = len(binary_data)
+
+            # Parse container
+            with span('decode.container'):
+                container = VaultContainer()
+                container.ParseFromString(binary_data)
+            vault_bytes = None
+    except Exception as e:
+        raise VaultLoadError('decode', f"Failed to decode vault container: {e}")
+
+    result = {
+        'file_info': file_info,
+        'container': {
+            'version': container.version,
+            'is_encrypted': container.is_encrypted,
+            'vault_data_length': len(container.vault) if vault_bytes is None else 4 * ((len(vault_bytes) + 2) // 3)
+        }
+    }
+
+    try:
+        # Dispatch on the container header alone; the payload is never trial-decrypted
+        codec = codec_for(container.version, container.is_encrypted)
+    except CodecError as e:
+        raise VaultLoadError(e.reason, str(e))
+    result['container']['scheme'] = codec.scheme
+
+    if vault_bytes is None:
+        try:
+            # The inner vault is base64 in both the plain and encrypted cases
+            with span('decode.payload'):
+                vault_bytes = base64.b64decode(container.vault)
+        except Exception as e:
+            raise VaultLoadError('decode', f"Failed to decode vault payload: {e}")
+    return result, vault_bytes, codec
+
+
+def _read_pack(raw):
+    """
+    (container, inner vault bytes or None) from a pack; the container
+    carries only the header fields unless the pack stores it whole
+    """
+    flags, version, _, _, payload = read_pack(raw)
+    if flags & FLAG_RAW_TEXT:
+        container = VaultContainer()
+        container.ParseFromString(base64.b64decode(payload.strip()))
+        return container, None
+    if flags & FLAG_RAW_CONTAINER:
+        container = VaultContainer()
+        container.ParseFromString(payload)
+        return container, None
+    container = VaultContainer()
+    container.version = version
+    container.is_encrypted = bool(flags & FLAG_ENCRYPTED)
+    return container, payload
+
+
+def _finish(result, vault_binary, wanted):
+    """Parse the decrypted Vault bytes into result['vault']"""
+    if not vault_binary:
+        return result
+
+    result['vault'] = _vault_to_dict(parse_vault(vault_binary), wanted)
+    return result
+
+
+def parse_vault(vault_binary):
+    try:
+        with span('vault.parse'):
+            vault = Vault()
+            vault.ParseFromString(vault_binary)
+    except Exception as e:
+        raise VaultLoadError('decode', f"Failed to decode vault: {e}")
+    return vault
+
+
+def _vault_to_dict(vault, wanted):
+    """Convert a Vault message into a dict holding only the wanted fields"""
+    with span('vault.fields'):
+        return _fields(vault, wanted)
+
+
+def _fields(vault, wanted):
+    data = {}
+    if 'name' in wanted:
+        data['name'] = vault.name
+    if 'public_key_ecdsa' in wanted:
+        data['public_key_ecdsa'] = vault.public_key_ecdsa
+    if 'public_key_eddsa' in wanted:
+        data['public_key_eddsa'] = vault.public_key_eddsa
+    if 'local_party_id' in wanted:
+        data['local_party_id'] = vault.local_party_id
+    if 'hex_chain_code' in wanted:
+        data['hex_chain_code'] = vault.hex_chain_code
+    if 'reshare_prefix' in wanted:
+        data['reshare_prefix'] = vault.reshare_prefix
+    if 'lib_type' in wanted:
+        data['lib_type'] = lib_type_name(vault.lib_type)
+    if 'signers' in wanted:
+        data['signers'] = list(vault.signers)
+
+    if 'key_shares' in wanted or 'keyshare_data' in wanted:
+        decode_keyshares = 'keyshare_data' in wanted
+        key_shares = []
+        for share in vault.key_shares:
+            share_data = {
+                'public_key': share.public_key,
+                'keyshare_length': len(share.keyshare)
+            }
+
+            # Try to decode keyshare data
+            if decode_keyshares and share.keyshare:
+                with span('vault.keyshares'):
+                    try:
+                        decoded_keyshare = base64.b64decode(share.keyshare)
+                        decoded_str = decoded_keyshare.decode('utf-8')
+                        keyshare_json = json.loads(decoded_str)
+                        share_data['keyshare_data'] = keyshare_json
+                    except Exception:
+                        share_data['keyshare_data'] = '[binary/encrypted]'
+
+            key_shares.append(share_data)
+        data['key_shares'] = key_shares
+
+    # Add timestamp if present
+    if 'created_at' in wanted and vault.HasField('created_at'):
+        data['created_at'] = {
+            'seconds': vault.created_at.seconds,
+            'nanos': vault.created_at.nanos,
+            'datetime': datetime.fromtimestamp(vault.created_at.seconds).isoformat()
+        }
+
+    return data
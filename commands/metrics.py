@@ -0,0 +1,277 @@
+"""
+Prometheus metrics for vultitool
+Counters and histograms for batch and daemon runs, served over HTTP or written for the node_exporter textfile collector
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import timings
+
+# Prometheus text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Stage latencies run from microseconds (base64 of a small vault) to seconds (scrypt)
+STAGE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Registry of all metrics keyed by name, rendered in registration order
+METRICS = {}
+
+
+class Metric:
+    """A named metric with fixed label names; values are keyed by label value tuples"""
+
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+        self._lock = threading.Lock()
+        if name in METRICS:
+            raise ValueError(f"Duplicate metric: {name}")
+        METRICS[name] = self
+
+    def _label_text(self, values, extra=()):
+        pairs = list(zip(self.labels, values)) + list(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + '}'
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self.values.items())
+        for labels, value in items:
+            lines.extend(self._samples(labels, value))
+        return lines
+
+    def _samples(self, labels, value):
+        return [f"{self.name}{self._label_text(labels)} {_number(value)}"]
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value, *labels):
+        with self._lock:
+            self.values[labels] = value
+
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram; observing is one bisect and two additions"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=STAGE_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        with self._lock:
+            state = self.values.get(labels)
+            if state is None:
+                # per-bucket counts (the last is +Inf), then the sum
+                state = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][bisect_left(self.buckets, value)] += 1
+            state[1] += value
+
+    def _samples(self, labels, state):
+        counts, total = state
+        lines = []
+        running = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            running += count
+            le = '+Inf' if bound == float('inf') else _number(bound)
+            lines.append(f"{self.name}_bucket{self._label_text(labels, [('le', le)])} {running}")
+        lines.append(f"{self.name}_sum{self._label_text(labels)} {_number(total)}")
+        lines.append(f"{self.name}_count{self._label_text(labels)} {running}")
+        return lines
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+FILES = Counter('vultitool_files_total', "Vault files processed by batch commands, by outcome", ['result'])
+BYTES = Counter('vultitool_bytes_decoded_total', "Bytes of vault files and bundle members read and decoded")
+LOAD_FAILURES = Counter('vultitool_load_failures_total', "Vault files that could not be loaded, by reason "
+                        "(decrypt, encrypted, decode, credentials, ...)", ['reason'])
+RULE_FAILURES = Counter('vultitool_rule_findings_total', "Validation findings, by rule and severity",
+                        ['rule', 'severity'])
+REWRITES = Counter('vultitool_rewrite_files_total', "Files handled by rekey, encrypt and decrypt-out, by status",
+                   ['op', 'status'])
+AGENT_REQUESTS = Counter('vultitool_agent_requests_total', "Requests answered by the credential agent", ['op'])
+STAGE_SECONDS = Histogram('vultitool_stage_duration_seconds', "Time spent in each load stage", ['stage'])
+RUN_START = Gauge('vultitool_run_start_time_seconds', "Unix time the command started", ['command'])
+RUN_DURATION = Gauge('vultitool_run_duration_seconds', "Wall time of the finished command", ['command'])
+RUN_EXIT = Gauge('vultitool_run_exit_code', "Exit code of the finished command", ['command'])
+
+
+def render():
+    """All metrics in the Prometheus text format"""
+    lines = []
+    for metric in METRICS.values():
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def observe_scan(record):
+    """Count one batch scan record"""
+    if record.get('error'):
+        FILES.inc('failed')
+        LOAD_FAILURES.inc(record['error'])
+        return
+    FILES.inc('passed' if record['passed'] else 'findings')
+    for finding in record['findings']:
+        RULE_FAILURES.inc(finding['rule'], finding['severity'])
+
+
+def _observe_stage(stage, elapsed_ns):
+    STAGE_SECONDS.observe(elapsed_ns / 1e9, stage)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def parse_listen(value):
+    """'PORT' or 'HOST:PORT' as (host, port); the host defaults to localhost"""
+    host, _, port = value.rpartition(':')
+    try:
+        return host or '127.0.0.1', int(port)
+    except ValueError:
+        raise ValueError(f"Invalid --metrics-listen '{value}' (use PORT or HOST:PORT)")
+
+
+def write_textfile(path):
+    """Write the metrics for the textfile collector; the rename makes each write atomic"""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(render())
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+class _Exporter:
+    def __init__(self, listen, textfile, interval, command):
+        self.listen = listen
+        self.textfile = textfile
+        self.interval = interval
+        self.command = command
+        self.started = time.time()
+        self.server = None
+        self._done = threading.Event()
+        if listen:
+            self.server = ThreadingHTTPServer(parse_listen(listen), _Handler)
+            self.server.daemon_threads = True
+        RUN_START.set(self.started, command)
+        self.start_threads()
+
+    def start_threads(self):
+        """(Re)start the serving and writing threads; needed again in a forked child"""
+        if self.server is not None:
+            threading.Thread(target=self.server.serve_forever, name='vultitool-metrics', daemon=True).start()
+        if self.textfile:
+            threading.Thread(target=self._write_loop, name='vultitool-metrics-file', daemon=True).start()
+
+    def _write_loop(self):
+        while not self._done.wait(self.interval):
+            self._write()
+
+    def _write(self):
+        try:
+            write_textfile(self.textfile)
+        except OSError as e:
+            print(f"⚠️  Cannot write metrics to {self.textfile}: {e}", file=sys.stderr)
+
+    def finish(self, exit_code):
+        self._done.set()
+        RUN_DURATION.set(time.time() - self.started, self.command)
+        RUN_EXIT.set(exit_code, self.command)
+        if self.textfile:
+            self._write()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+_exporter = None
+
+
+def configure(listen=None, textfile=None, interval=15.0, command=''):
+    """
+    Start exporting metrics for this run
+
+    Args:
+        listen: 'PORT' or 'HOST:PORT' to serve /metrics on, or None
+        textfile: Path to rewrite every interval seconds and at exit, or None
+        interval: Seconds between textfile writes
+        command: Value of the command label on the run gauges
+
+    Raises:
+        ValueError: For a malformed listen address
+        OSError: If the port cannot be bound
+    """
+    global _exporter
+    if not listen and not textfile:
+        return
+    _exporter = _Exporter(listen, textfile, interval, command)
+    # Per-stage latency comes from the load path's timing spans
+    timings.add_sink(_observe_stage)
+
+
+def enabled():
+    return _exporter is not None
+
+
+def after_fork():
+    """Restart the exporter threads in a forked child (threads do not survive fork)"""
+    if _exporter is not None:
+        _exporter.start_threads()
+
+
+def finish(exit_code):
+    """Record the run's outcome and write the final textfile"""
+    if _exporter is not None:
+        _exporter.finish(exit_code)
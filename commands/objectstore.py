@@ -0,0 +1,349 @@
+"""
+S3-compatible object storage for vultitool
+Lists and fetches vault objects from s3://bucket/prefix sources over pooled connections, with an opt-in ETag-keyed cache
+"""
+
+import fnmatch
+import hashlib
+import hmac
+import http.client
+import os
+import random
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+SCHEME = 's3://'
+
+# Reads the batch loader keeps in flight for object storage when --io-depth is auto
+DEFAULT_CONCURRENCY = 16
+
+# Requests made per GET or listing page before giving up on throttling, 5xx and dropped connections
+ATTEMPTS = 4
+_BACKOFF = 0.1
+_RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+# Directory to cache fetched objects in. Unset, nothing is written to disk: unencrypted
+# containers hold key shares, so keeping copies of them has to be asked for
+CACHE_ENV = 'VULTITOOL_S3_CACHE'
+
+_EMPTY_SHA256 = hashlib.sha256(b'').hexdigest()
+_S3_NS = '{http://s3.amazonaws.com/doc/2006-03-01/}'
+
+
+class S3Error(Exception):
+    """Raised for failed listings and fetches; reason is a short machine-readable tag"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+class S3Object(str):
+    """
+    An object's s3:// URL, carrying the ETag and size its listing reported
+
+    A str, so it goes wherever a vault path does (records, checkpoints,
+    shards, password-file globs); the ETag lets an unchanged object be
+    read from the cache without a request.
+    """
+
+    def __new__(cls, bucket, key, etag=None, size=None):
+        obj = super().__new__(cls, f"{SCHEME}{bucket}/{key}")
+        obj.bucket = bucket
+        obj.key = key
+        obj.etag = etag
+        obj.size = size
+        return obj
+
+
+def is_s3_url(path):
+    return isinstance(path, str) and path.startswith(SCHEME)
+
+
+def parse_url(url):
+    """'s3://bucket/prefix' as (bucket, prefix)"""
+    bucket, _, prefix = url[len(SCHEME):].partition('/')
+    if not bucket:
+        raise S3Error('url', f"No bucket in {url}")
+    return bucket, prefix
+
+
+class _ConnectionPool:
+    """Idle keep-alive connections to one endpoint, shared by the fetching threads"""
+
+    def __init__(self, scheme, host, port, timeout):
+        self.factory = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self.factory(self.host, self.port, timeout=self.timeout)
+
+    def put(self, connection):
+        with self._lock:
+            self._idle.append(connection)
+
+
+class S3Client:
+    """
+    Minimal S3 client: ListObjectsV2 and GET, signed with AWS Signature Version 4
+
+    Credentials and endpoint come from the standard AWS environment
+    variables; without credentials requests are sent unsigned (public
+    buckets). A custom endpoint (MinIO, Ceph, ...) is addressed path-style,
+    AWS itself virtual-hosted style.
+    """
+
+    def __init__(self, access_key=None, secret_key=None, session_token=None, region='us-east-1', endpoint=None,
+                 cache_dir=None, timeout=30.0):
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.session_token = session_token
+        self.region = region
+        self.endpoint = endpoint.rstrip('/') if endpoint else None
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.timeout = timeout
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        env = os.environ
+        cache = env.get(CACHE_ENV)
+        return cls(access_key=env.get('AWS_ACCESS_KEY_ID'), secret_key=env.get('AWS_SECRET_ACCESS_KEY'),
+                   session_token=env.get('AWS_SESSION_TOKEN'),
+                   region=env.get('AWS_REGION') or env.get('AWS_DEFAULT_REGION') or 'us-east-1',
+                   endpoint=env.get('AWS_ENDPOINT_URL_S3') or env.get('AWS_ENDPOINT_URL'),
+                   cache_dir=cache or None)
+
+    def _location(self, bucket, key):
+        """(scheme, host, port, request path) for an object or, with key '', the bucket"""
+        path = '/' + quote(key, safe='/-_.~')
+        if self.endpoint:
+            parts = urlsplit(self.endpoint)
+            return parts.scheme or 'https', parts.hostname, parts.port, f"/{quote(bucket, safe='')}{path}"
+        return 'https', f"{bucket}.s3.{self.region}.amazonaws.com", None, path
+
+    def _pool(self, scheme, host, port):
+        with self._lock:
+            pool = self._pools.get((scheme, host, port))
+            if pool is None:
+                pool = self._pools[(scheme, host, port)] = _ConnectionPool(scheme, host, port, self.timeout)
+        return pool
+
+    def sign(self, method, host, path, query, headers, now=None):
+        """Add x-amz-* and Authorization headers for a request without a body"""
+        if not self.access_key or not self.secret_key:
+            return headers
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime('%Y%m%dT%H%M%SZ')
+        headers['x-amz-date'] = amz_date
+        headers['x-amz-content-sha256'] = _EMPTY_SHA256
+        if self.session_token:
+            headers['x-amz-security-token'] = self.session_token
+        canonical = {name.lower(): ' '.join(str(value).split()) for name, value in headers.items()}
+        canonical['host'] = host
+        signed = ';'.join(sorted(canonical))
+        request = '\n'.join([
+            method,
+            path,
+            _canonical_query(query),
+            ''.join(f"{name}:{canonical[name]}\n" for name in sorted(canonical)),
+            signed,
+            _EMPTY_SHA256,
+        ])
+        scope = f"{amz_date[:8]}/{self.region}/s3/aws4_request"
+        to_sign = '\n'.join(['AWS4-HMAC-SHA256', amz_date, scope, hashlib.sha256(request.encode()).hexdigest()])
+        key = ('AWS4' + self.secret_key).encode()
+        for part in (amz_date[:8], self.region, 's3', 'aws4_request'):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        signature = hmac.new(key, to_sign.encode(), hashlib.sha256).hexdigest()
+        headers['Authorization'] = (f"AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, "
+                                    f"SignedHeaders={signed}, Signature={signature}")
+        return headers
+
+    def _request(self, bucket, key, query=(), headers=None):
+        """
+        GET with retries over a pooled connection
+
+        Returns:
+            (status, headers dict with lowercase names, body bytes)
+
+        Raises:
+            S3Error: If every attempt fails (dropped connections, throttling, 5xx)
+        """
+        scheme, host, port, path = self._location(bucket, key)
+        host_header = host if port is None else f"{host}:{port}"
+        target = path + ('?' + _canonical_query(query) if query else '')
+        pool = self._pool(scheme, host, port)
+        failure = None
+        for attempt in range(ATTEMPTS):
+            if attempt:
+                time.sleep(_BACKOFF * (2 ** (attempt - 1)) * (1 + random.random()))
+            # An explicit Host, so the header sent is the one signed even for a default port
+            request_headers = self.sign('GET', host_header, path, query, dict(headers or {}, Host=host_header))
+            connection = pool.get()
+            try:
+                connection.request('GET', target, headers=request_headers)
+                response = connection.getresponse()
+                # Read to the end: the connection can then carry the next request
+                body = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                failure = f"{type(e).__name__}: {e}"
+                continue
+            pool.put(connection)
+            if response.status in _RETRY_STATUSES:
+                failure = f"HTTP {response.status}"
+                continue
+            return response.status, {k.lower(): v for k, v in response.getheaders()}, body
+        raise S3Error('unavailable', f"{SCHEME}{bucket}/{key}: giving up after {ATTEMPTS} attempts ({failure})")
+
+    def list(self, bucket, prefix=''):
+        """
+        Yield every object under prefix, following ListObjectsV2 continuation tokens
+
+        Raises:
+            S3Error: If a page cannot be listed
+        """
+        token = None
+        while True:
+            query = [('list-type', '2'), ('prefix', prefix)]
+            if token:
+                query.append(('continuation-token', token))
+            status, _, body = self._request(bucket, '', query)
+            if status != 200:
+                raise S3Error(_reason(status), f"Cannot list {SCHEME}{bucket}/{prefix}: {_message(status, body)}")
+            try:
+                root = ET.fromstring(body)
+            except ET.ParseError as e:
+                raise S3Error('listing', f"Unreadable listing of {SCHEME}{bucket}/{prefix}: {e}")
+            ns = _S3_NS if root.tag.startswith(_S3_NS) else ''
+            for item in root.iter(f"{ns}Contents"):
+                size = item.findtext(f"{ns}Size")
+                yield S3Object(bucket, item.findtext(f"{ns}Key"), item.findtext(f"{ns}ETag"),
+                               int(size) if size else None)
+            token = root.findtext(f"{ns}NextContinuationToken")
+            if root.findtext(f"{ns}IsTruncated") != 'true' or not token:
+                return
+
+    def fetch(self, url):
+        """
+        An object's whole body, from the cache (if one is set) when its ETag is unchanged
+
+        The object is read in one GET with no Range requests, straight
+        into memory for the decoder. An ETag from the listing that matches
+        the cached copy skips the request; without one, the cached ETag is
+        sent as If-None-Match and a 304 answer reuses the copy.
+
+        Raises:
+            S3Error: If the object is missing or cannot be fetched
+        """
+        bucket, key = parse_url(url)
+        etag = getattr(url, 'etag', None)
+        cached = self._cached(bucket, key)
+        if cached is not None and etag is not None and cached[0] == etag:
+            return cached[1]
+        headers = {'If-None-Match': cached[0]} if cached is not None and etag is None else {}
+        status, response_headers, body = self._request(bucket, key, headers=headers)
+        if status == 304 and cached is not None:
+            return cached[1]
+        if status != 200:
+            raise S3Error(_reason(status), f"Cannot fetch {url}: {_message(status, body)}")
+        if response_headers.get('etag'):
+            self._store(bucket, key, response_headers['etag'], body)
+        return body
+
+    def _cache_path(self, bucket, key):
+        digest = hashlib.sha256(f"{bucket}/{key}".encode()).hexdigest()
+        return self.cache_dir / digest[:2] / digest
+
+    def _cached(self, bucket, key):
+        """(etag, body) of the cached copy, or None"""
+        if self.cache_dir is None:
+            return None
+        try:
+            data = self._cache_path(bucket, key).read_bytes()
+        except OSError:
+            return None
+        etag, _, body = data.partition(b'\n')
+        return etag.decode(), body
+
+    def _store(self, bucket, key, etag, body):
+        """Cache an object privately (shares can be unencrypted); a failed write only costs a later GET"""
+        if self.cache_dir is None:
+            return
+        path = self._cache_path(bucket, key)
+        try:
+            os.makedirs(path.parent, mode=0o700, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(prefix='.', suffix='.tmp', dir=path.parent)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(etag.encode() + b'\n' + body)
+            os.replace(tmp_name, path)
+        except OSError:
+            pass
+
+
+def _canonical_query(query):
+    return '&'.join(f"{quote(k, safe='-_.~')}={quote(v, safe='-_.~')}" for k, v in sorted(query))
+
+
+def _reason(status):
+    return {403: 'denied', 404: 'missing'}.get(status, 'unavailable')
+
+
+def _message(status, body):
+    try:
+        code = ET.fromstring(body).findtext('Code')
+    except ET.ParseError:
+        code = None
+    return f"HTTP {status}" + (f" ({code})" if code else '')
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def client():
+    """The process-wide client, configured from the environment on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = S3Client.from_env()
+        return _client
+
+
+def iter_objects(url, pattern='*.vult'):
+    """
+    The objects an s3:// source names
+
+    A URL whose last component matches pattern is that one object;
+    otherwise it is a prefix, listed page by page in key order, and the
+    objects whose names match pattern are yielded.
+
+    Raises:
+        S3Error: If the bucket cannot be listed
+    """
+    bucket, prefix = parse_url(url)
+    if prefix and not prefix.endswith('/') and fnmatch.fnmatch(prefix.rsplit('/', 1)[-1], pattern):
+        yield S3Object(bucket, prefix)
+        return
+    for obj in client().list(bucket, prefix):
+        if fnmatch.fnmatch(obj.key.rsplit('/', 1)[-1], pattern):
+            yield obj
+
+
+def fetch(url):
+    """Fetch an object named by an s3:// URL or S3Object (see S3Client.fetch)"""
+    return client().fetch(url)
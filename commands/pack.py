@@ -0,0 +1,125 @@
+"""
+Packed vault format for vultitool
+A compact binary sidecar for .vult files that skips both base64 layers and reproduces the original exactly
+"""
+
+import base64
+import hashlib
+import struct
+
+from schema import message_class
+
+VaultContainer = message_class('vultisig.vault.v1.VaultContainer')
+
+PACK_SUFFIX = '.vultpack'
+# The first byte is not a base64 character, so a pack is never mistaken for a .vult file
+PACK_MAGIC = b'\x89VPK'
+PACK_FORMAT = 1
+
+# magic, format, flags, container version, SHA-256 of the original .vult, trailing whitespace length
+_HEADER = struct.Struct('>4sBBQ32sB')
+
+FLAG_ENCRYPTED = 0x01
+# The payload is the serialized VaultContainer (its fields did not re-serialize to the same bytes)
+FLAG_RAW_CONTAINER = 0x02
+# The payload is the original file (its base64 was not in canonical form)
+FLAG_RAW_TEXT = 0x04
+
+
+class PackError(Exception):
+    """Raised for malformed packs or a pack that does not reproduce its original; reason is a short machine-readable tag"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+def is_pack(data):
+    return data[:len(PACK_MAGIC)] == PACK_MAGIC
+
+
+def pack_path(vult_path):
+    """The sidecar path for a .vult file"""
+    return vult_path.with_name(vult_path.stem + PACK_SUFFIX) if vult_path.suffix == '.vult' else \
+        vult_path.with_name(vult_path.name + PACK_SUFFIX)
+
+
+def pack(original):
+    """
+    Pack the bytes of a .vult file
+
+    The common case stores the container version, the encrypted flag and
+    the inner vault bytes with both base64 layers removed. Inputs whose
+    base64 or protobuf encoding is not canonical fall back to storing the
+    container, or the whole file, so unpacking is always byte-for-byte.
+
+    Raises:
+        PackError: If the input is not a vault container
+    """
+    stripped = original.rstrip()
+    trailer = original[len(stripped):]
+    digest = hashlib.sha256(original).digest()
+    try:
+        container_bytes = base64.b64decode(stripped)
+        container = VaultContainer()
+        container.ParseFromString(container_bytes)
+        inner = base64.b64decode(container.vault)
+    except Exception as e:
+        raise PackError('decode', f"Not a vault container: {e}")
+
+    flags = FLAG_ENCRYPTED if container.is_encrypted else 0
+    if base64.b64encode(container_bytes) != stripped or len(trailer) > 255:
+        return _HEADER.pack(PACK_MAGIC, PACK_FORMAT, flags | FLAG_RAW_TEXT, container.version, digest, 0) + original
+
+    rebuilt = VaultContainer()
+    rebuilt.version = container.version
+    rebuilt.vault = base64.b64encode(inner).decode()
+    rebuilt.is_encrypted = container.is_encrypted
+    if rebuilt.SerializeToString() != container_bytes:
+        return _HEADER.pack(PACK_MAGIC, PACK_FORMAT, flags | FLAG_RAW_CONTAINER, container.version, digest,
+                            len(trailer)) + trailer + container_bytes
+    return _HEADER.pack(PACK_MAGIC, PACK_FORMAT, flags, container.version, digest, len(trailer)) + trailer + inner
+
+
+def read_pack(data):
+    """
+    Split a pack into its parts without re-encoding anything
+
+    Returns:
+        (flags, container version, original digest, trailer, payload)
+
+    Raises:
+        PackError: If the header is malformed or from a newer format
+    """
+    if len(data) < _HEADER.size or not is_pack(data):
+        raise PackError('format', "Not a vultitool pack")
+    _, fmt, flags, version, digest, trailer_size = _HEADER.unpack_from(data)
+    if fmt != PACK_FORMAT:
+        raise PackError('format', f"Unsupported pack format {fmt}")
+    start = _HEADER.size + trailer_size
+    return flags, version, digest, data[_HEADER.size:start], data[start:]
+
+
+def unpack(data):
+    """
+    Rebuild the original .vult bytes from a pack and check them against its digest
+
+    Raises:
+        PackError: If the pack is malformed or does not reproduce the original
+    """
+    flags, version, digest, trailer, payload = read_pack(data)
+    if flags & FLAG_RAW_TEXT:
+        original = payload
+    else:
+        if flags & FLAG_RAW_CONTAINER:
+            container_bytes = payload
+        else:
+            container = VaultContainer()
+            container.version = version
+            container.vault = base64.b64encode(payload).decode()
+            container.is_encrypted = bool(flags & FLAG_ENCRYPTED)
+            container_bytes = container.SerializeToString()
+        original = base64.b64encode(container_bytes) + trailer
+    if hashlib.sha256(original).digest() != digest:
+        raise PackError('digest', "Unpacked bytes do not match the original's digest")
+    return original
@@ -0,0 +1,472 @@
+"""
+Keysign and keygen message decoding for vultitool
+Unwraps relay/QR encodings and converts KeysignMessage / KeysignPayload / KeygenMessage /
+ReshareMessage protobufs to dicts
+"""
+
+import base64
+import binascii
+import gzip
+import lzma
+import re
+import sys
+import zlib
+from urllib.parse import urlsplit, parse_qs
+
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.message import DecodeError
+from google.protobuf.unknown_fields import UnknownFieldSet
+from schema import message_class
+
+KeysignMessage = message_class('vultisig.keysign.v1.KeysignMessage')
+KeysignPayload = message_class('vultisig.keysign.v1.KeysignPayload')
+KeygenMessage = message_class('vultisig.keygen.v1.KeygenMessage')
+ReshareMessage = message_class('vultisig.keygen.v1.ReshareMessage')
+
+# --type choices for the top-level message
+MESSAGE_TYPES = {
+    'message': KeysignMessage,
+    'payload': KeysignPayload,
+}
+KEYGEN_TYPES = {
+    'keygen': KeygenMessage,
+    'reshare': ReshareMessage,
+}
+
+_XZ_MAGIC = b'\xfd7zXZ\x00'
+_GZIP_MAGIC = b'\x1f\x8b'
+# Legacy .lzma ("alone") header: lc/lp/pb properties byte followed by a little-endian dictionary size
+_LZMA_ALONE_PREFIX = b'\x5d\x00\x00'
+_BASE64_TEXT = re.compile(rb'[A-Za-z0-9+/_=-]+')
+
+
+class PayloadDecodeError(Exception):
+    """Raised when an input cannot be unwrapped or parsed; reason is a short machine-readable tag"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+def looks_like_text(data):
+    """True if data is base64 or deep-link text rather than raw protobuf bytes"""
+    stripped = data.strip()
+    if not stripped:
+        return False
+    return all(token.startswith(b'vultisig://') or _BASE64_TEXT.fullmatch(token)
+               for token in stripped.split())
+
+
+def decompress(data):
+    """
+    Undo the compression used by QR codes and relay uploads
+
+    Returns:
+        (bytes, codec) where codec is 'xz', 'lzma', 'gzip', 'zlib' or None
+    """
+    try:
+        if data.startswith(_XZ_MAGIC):
+            return lzma.decompress(data, format=lzma.FORMAT_XZ), 'xz'
+        if data.startswith(_LZMA_ALONE_PREFIX):
+            return lzma.decompress(data, format=lzma.FORMAT_ALONE), 'lzma'
+        if data.startswith(_GZIP_MAGIC):
+            return gzip.decompress(data), 'gzip'
+    except (lzma.LZMAError, OSError, EOFError) as e:
+        raise PayloadDecodeError('decompress', f"Corrupt compressed payload: {e}")
+
+    # A zlib header is also a plausible protobuf prefix, so fall back to raw on failure
+    if len(data) > 2 and data[0] & 0x0f == 8 and (data[0] << 8 | data[1]) % 31 == 0:
+        try:
+            return zlib.decompress(data), 'zlib'
+        except zlib.error:
+            pass
+    return data, None
+
+
+def unwrap(data):
+    """
+    Turn one input (raw bytes, base64 text or a vultisig:// deep link) into protobuf bytes
+
+    Returns:
+        (bytes, encodings) with the layers removed, outermost first
+    """
+    encodings = []
+    data = data.strip() if looks_like_text(data) else data
+
+    if data.startswith(b'vultisig://'):
+        query = parse_qs(urlsplit(data.decode('ascii', 'replace')).query)
+        if 'jsonData' not in query:
+            raise PayloadDecodeError('link', "Deep link has no jsonData parameter")
+        data = query['jsonData'][0].encode()
+        encodings.append('link')
+
+    if looks_like_text(data):
+        text = b''.join(data.split())
+        # Relay logs mix standard and URL-safe alphabets and often drop padding
+        text = text.replace(b'-', b'+').replace(b'_', b'/')
+        text += b'=' * (-len(text) % 4)
+        try:
+            data = base64.b64decode(text, validate=True)
+        except (binascii.Error, ValueError) as e:
+            raise PayloadDecodeError('base64', f"Invalid base64: {e}")
+        encodings.append('base64')
+
+    data, codec = decompress(data)
+    if codec:
+        encodings.append(codec)
+    return data, encodings
+
+
+# --- Framing ---
+#
+# 'lines' is one base64 payload per line (what decode reads by default);
+# 'varint' is the protobuf delimited format (writeDelimitedTo / parseDelimitedFrom);
+# 'u32' prefixes each payload with a 4-byte big-endian length.
+
+FRAMINGS = ('lines', 'varint', 'u32')
+COMPRESSORS = {
+    'none': None,
+    'xz': lambda data: lzma.compress(data, format=lzma.FORMAT_XZ),
+    'gzip': lambda data: gzip.compress(data, mtime=0),
+}
+
+
+def encode_varint(value):
+    """Protobuf base-128 varint encoding of a non-negative integer"""
+    out = bytearray()
+    while value > 0x7f:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def frame(data, framing):
+    """Wrap one serialized payload for a framed stream"""
+    if framing == 'lines':
+        return base64.b64encode(data) + b'\n'
+    if framing == 'varint':
+        return encode_varint(len(data)) + data
+    return len(data).to_bytes(4, 'big') + data
+
+
+def iter_frames(stream, framing):
+    """
+    Read length-prefixed payloads from a binary stream
+
+    Yields:
+        (frame_number, payload_bytes)
+
+    Raises:
+        PayloadDecodeError: On a truncated frame
+    """
+    number = 0
+    while True:
+        if framing == 'u32':
+            header = stream.read(4)
+            if not header:
+                return
+            if len(header) < 4:
+                raise PayloadDecodeError('frame', "Truncated u32 length prefix")
+            length = int.from_bytes(header, 'big')
+        else:
+            length = 0
+            shift = 0
+            while True:
+                byte = stream.read(1)
+                if not byte:
+                    if shift:
+                        raise PayloadDecodeError('frame', "Truncated varint length prefix")
+                    return
+                length |= (byte[0] & 0x7f) << shift
+                if byte[0] < 0x80:
+                    break
+                shift += 7
+                if shift > 63:
+                    raise PayloadDecodeError('frame', "Varint length prefix too long")
+        data = stream.read(length)
+        if len(data) < length:
+            raise PayloadDecodeError('frame', f"Truncated frame: expected {length} bytes, got {len(data)}")
+        number += 1
+        yield number, data
+
+
+# Bytes read to decide whether a file is line-oriented text or a single raw payload
+SNIFF_SIZE = 4096
+
+
+def iter_inputs(paths, framing='lines'):
+    """
+    Yield (source, data) for every payload in the given files ('-' is stdin)
+
+    With 'lines' framing, text inputs carry one payload per line and a file
+    that is not text is taken as a single raw protobuf payload; 'varint' and
+    'u32' inputs are streams of length-prefixed raw payloads.
+    """
+    for entry in paths or ['-']:
+        if framing != 'lines':
+            stream = sys.stdin.buffer if entry == '-' else open(entry, 'rb')
+            label = '<stdin>' if entry == '-' else entry
+            try:
+                for number, data in iter_frames(stream, framing):
+                    yield f"{label}#{number}", data
+            finally:
+                if stream is not sys.stdin.buffer:
+                    stream.close()
+            continue
+
+        if entry == '-':
+            for lineno, line in enumerate(sys.stdin.buffer, 1):
+                if line.strip():
+                    yield f"<stdin>:{lineno}", line
+            continue
+
+        with open(entry, 'rb') as f:
+            head = f.read(SNIFF_SIZE)
+            if not looks_like_text(head):
+                yield entry, head + f.read()
+                continue
+            f.seek(0)
+            for lineno, line in enumerate(f, 1):
+                if line.strip():
+                    yield f"{entry}:{lineno}", line
+
+
+def parse_message(data, type_name='auto'):
+    """
+    Parse protobuf bytes as a KeysignMessage or KeysignPayload
+
+    With type_name 'auto' the bytes are tried as a KeysignMessage first and
+    accepted only if every field is known and one of its identifying fields
+    is set; otherwise they are parsed as a bare KeysignPayload.
+    """
+    if type_name != 'auto':
+        return _parse(MESSAGE_TYPES[type_name], data)
+
+    try:
+        message = _parse(KeysignMessage, data)
+    except PayloadDecodeError:
+        message = None
+    if message is not None and not len(UnknownFieldSet(message)) and (
+            message.HasField('keysign_payload') or message.HasField('custom_message_payload')
+            or message.session_id):
+        return message
+    return _parse(KeysignPayload, data)
+
+
+def _parse(message_class, data):
+    message = message_class()
+    try:
+        message.ParseFromString(data)
+    except DecodeError as e:
+        raise PayloadDecodeError('protobuf', f"Not a {message_class.DESCRIPTOR.name}: {e}")
+    return message
+
+
+def parse_keygen_message(data, type_name='auto'):
+    """
+    Parse protobuf bytes as a KeygenMessage or ReshareMessage
+
+    The two share field numbers 1-4 and 6-7, so with type_name 'auto' the
+    bytes are read as a KeygenMessage first; fields it does not know (old
+    parties, reshare prefix, vault name at 9, lib type at 20) or a field 4
+    holding a 33-byte public key rather than a 32-byte encryption key mark
+    a ReshareMessage.
+    """
+    if type_name != 'auto':
+        return _parse(KEYGEN_TYPES[type_name], data)
+
+    message = _parse(KeygenMessage, data)
+    field4 = message.encryption_key_hex
+    if len(UnknownFieldSet(message)) or (len(field4) == 66 and field4[:2] in ('02', '03')):
+        return _parse(ReshareMessage, data)
+    return message
+
+
+# --- Message to dict conversion ---
+#
+# Converters are built once per message type from its descriptor, so decoding
+# a payload is a walk over a precomputed field plan instead of reflection on
+# every message. Real oneofs (blockchain_specific, swap_payload) dispatch
+# through a {variant: converter} registry and are emitted as
+# {"type": <variant>, ...fields}.
+
+_CONVERTERS = {}
+
+_KIND_SCALAR = 0
+_KIND_BYTES = 1
+_KIND_ENUM = 2
+_KIND_MESSAGE = 3
+_KIND_MAP = 4
+
+
+def _field_kind(field):
+    if field.type == FieldDescriptor.TYPE_MESSAGE:
+        if field.message_type.GetOptions().map_entry:
+            return _KIND_MAP, _field_kind(field.message_type.fields_by_name['value'])
+        return _KIND_MESSAGE, _converter_for(field.message_type)
+    if field.type == FieldDescriptor.TYPE_ENUM:
+        return _KIND_ENUM, {v.number: v.name for v in field.enum_type.values}
+    if field.type == FieldDescriptor.TYPE_BYTES:
+        return _KIND_BYTES, None
+    return _KIND_SCALAR, None
+
+
+def _convert_value(kind, extra, value):
+    if kind == _KIND_MESSAGE:
+        return extra(value)
+    if kind == _KIND_ENUM:
+        return extra.get(value, value)
+    if kind == _KIND_BYTES:
+        return value.hex()
+    return value
+
+
+def _variant_converter(field):
+    kind, extra = _field_kind(field)
+    if kind == _KIND_MESSAGE:
+        return extra
+    return lambda value: {'value': _convert_value(kind, extra, value)}
+
+
+def _converter_for(descriptor):
+    """Return (building on first use) the dict converter for a message descriptor"""
+    converter = _CONVERTERS.get(descriptor.full_name)
+    if converter is not None:
+        return converter
+
+    plain = []
+    variants = []
+
+    def convert(message):
+        out = {}
+        for name, kind, extra, repeated, presence in plain:
+            value = getattr(message, name)
+            if kind == _KIND_MAP:
+                if value:
+                    out[name] = {str(k): _convert_value(*extra, v) for k, v in value.items()}
+            elif repeated:
+                if value:
+                    out[name] = [_convert_value(kind, extra, v) for v in value]
+            elif presence:
+                if message.HasField(name):
+                    out[name] = _convert_value(kind, extra, value)
+            elif value:
+                out[name] = _convert_value(kind, extra, value)
+        for oneof_name, registry in variants:
+            which = message.WhichOneof(oneof_name)
+            if which is not None:
+                converted = {'type': which}
+                converted.update(registry[which](getattr(message, which)))
+                out[oneof_name] = converted
+        return out
+
+    # Register before walking fields so recursive message types terminate
+    _CONVERTERS[descriptor.full_name] = convert
+
+    for oneof in descriptor.oneofs:
+        # proto3 'optional' fields live in synthetic single-field oneofs named _<field>
+        if len(oneof.fields) == 1 and oneof.name == '_' + oneof.fields[0].name:
+            continue
+        variants.append((oneof.name, {f.name: _variant_converter(f) for f in oneof.fields}))
+    oneof_fields = {name for _, registry in variants for name in registry}
+
+    for field in descriptor.fields:
+        if field.name in oneof_fields:
+            continue
+        kind, extra = _field_kind(field)
+        repeated = field.label == FieldDescriptor.LABEL_REPEATED
+        presence = not repeated and field.has_presence
+        plain.append((field.name, kind, extra, repeated, presence))
+    return convert
+
+
+# Build the plans for the top-level types up front
+for _message_class in list(MESSAGE_TYPES.values()) + list(KEYGEN_TYPES.values()):
+    _converter_for(_message_class.DESCRIPTOR)
+
+
+def message_to_dict(message):
+    """Convert a protobuf message to a JSON-ready dict (default values omitted)"""
+    return _converter_for(message.DESCRIPTOR)(message)
+
+
+def summarize(message):
+    """
+    Flatten a KeysignMessage or KeysignPayload into one row of its key facts
+
+    Returns:
+        dict with chain, ticker, from/to addresses, amount, memo and the oneof variants
+    """
+    row = {'type': message.DESCRIPTOR.name}
+    if isinstance(message, KeysignMessage):
+        row['session_id'] = message.session_id
+        if message.HasField('custom_message_payload'):
+            custom = message.custom_message_payload
+            row.update(custom_method=custom.method,
+                       vault_public_key_ecdsa=custom.vault_public_key_ecdsa)
+        if not message.HasField('keysign_payload'):
+            return row
+        payload = message.keysign_payload
+    else:
+        payload = message
+
+    coin = payload.coin
+    row.update(
+        chain=coin.chain,
+        ticker=coin.ticker,
+        from_address=coin.address,
+        to_address=payload.to_address,
+        to_amount=payload.to_amount,
+        memo=payload.memo if payload.HasField('memo') else None,
+        blockchain_specific=payload.WhichOneof('blockchain_specific'),
+        swap_payload=payload.WhichOneof('swap_payload'),
+        utxo_count=len(payload.utxo_info),
+        vault_public_key_ecdsa=payload.vault_public_key_ecdsa,
+    )
+    return row
+
+
+def decode(data, type_name='auto', summary=False):
+    """
+    Decode one input into a result dict
+
+    Raises:
+        PayloadDecodeError: If the input cannot be unwrapped or parsed
+    """
+    raw, encodings = unwrap(data)
+    message = parse_message(raw, type_name)
+    result = {'encoding': encodings, 'type': message.DESCRIPTOR.name}
+    if summary:
+        result.update(summarize(message))
+    else:
+        result['message'] = message_to_dict(message)
+    return result
+
+
+def decode_keygen(data, type_name='auto'):
+    """
+    Decode one keygen/reshare input into a result dict
+
+    Raises:
+        PayloadDecodeError: If the input cannot be unwrapped or parsed
+    """
+    raw, encodings = unwrap(data)
+    message = parse_keygen_message(raw, type_name)
+    return {'encoding': encodings, 'type': message.DESCRIPTOR.name, 'message': message_to_dict(message)}
+
+
+def decode_as(data, message_class):
+    """
+    Decode one input as the given message class (any type in the descriptor set)
+
+    Raises:
+        PayloadDecodeError: If the input cannot be unwrapped or parsed
+    """
+    raw, encodings = unwrap(data)
+    message = _parse(message_class, raw)
+    result = {'encoding': encodings, 'type': message.DESCRIPTOR.full_name, 'message': message_to_dict(message)}
+    unknown = len(UnknownFieldSet(message))
+    if unknown:
+        result['unknown_fields'] = unknown
+    return result
@@ -0,0 +1,151 @@
+"""
+Profiling support for vultitool
+Runs a callable under cProfile, a stack sampler and tracemalloc and reports CPU, stacks and allocations
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+# Python only switches threads this often, so the sampler cannot see the
+# profiled thread more often than this (seconds); lowered while sampling
+_MIN_SWITCH_INTERVAL = 0.0005
+
+
+class StackSampler(threading.Thread):
+    """
+    Samples another thread's Python stack at a fixed interval
+
+    Stacks are counted in collapsed form (root first, frames joined by
+    ';'), the input format of flamegraph.pl and speedscope. Frames at and
+    above stop_code, the profiler's own entry point, and frames whose code
+    is in skip (wrappers between it and the profiled code) are left out.
+    """
+
+    def __init__(self, thread_id, interval, stop_code, skip=()):
+        super().__init__(name='vultitool-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stop_code = stop_code
+        self.skip = frozenset(skip)
+        self.stacks = Counter()
+        self.samples = 0
+        self._labels = {}
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame.f_code is not self.stop_code:
+                if frame.f_code not in self.skip:
+                    stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            # A walk that never met stop_code caught the thread before or after the profiled call
+            if stack and frame is not None:
+                self.stacks[';'.join(reversed(stack))] += 1
+                self.samples += 1
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+    def collapsed(self):
+        """Collapsed-stack lines, heaviest first"""
+        return [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+
+
+def profile_call(func, cpu=True, alloc=True, interval=0.001, alloc_frames=1):
+    """
+    Run func() under the profilers
+
+    Args:
+        func: Callable to profile; its return value is the exit code
+        cpu: Run cProfile (deterministic; every call is counted, with overhead)
+        alloc: Trace allocations with tracemalloc
+        interval: Seconds between stack samples
+        alloc_frames: Frames kept per allocation traceback
+
+    Returns:
+        Profile dict: exit_code, wall_s, cpu_s, samples, sampler (the
+        StackSampler), stats (pstats.Stats or None), snapshot
+        (tracemalloc.Snapshot or None), alloc_peak_bytes, rss_peak_bytes
+    """
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(max(_MIN_SWITCH_INTERVAL, min(switch_interval, interval / 2)))
+    if alloc:
+        tracemalloc.start(alloc_frames)
+    profiler = cProfile.Profile() if cpu else None
+    skip = [cProfile.Profile.runcall.__code__]
+    if hasattr(func, '__code__'):
+        skip.append(func.__code__)
+    sampler = StackSampler(threading.get_ident(), interval, _run.__code__, skip)
+    sampler.start()
+    wall, cpu_time = time.perf_counter(), time.process_time()
+    try:
+        exit_code = _run(func, profiler)
+    finally:
+        wall, cpu_time = time.perf_counter() - wall, time.process_time() - cpu_time
+        sampler.stop()
+        sys.setswitchinterval(switch_interval)
+        snapshot = None
+        alloc_peak = None
+        if alloc:
+            snapshot = tracemalloc.take_snapshot()
+            alloc_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    return {
+        'exit_code': exit_code,
+        'wall_s': wall,
+        'cpu_s': cpu_time,
+        'samples': sampler.samples,
+        'sampler': sampler,
+        'stats': pstats.Stats(profiler, stream=io.StringIO()) if profiler is not None else None,
+        'snapshot': snapshot,
+        'alloc_peak_bytes': alloc_peak,
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        'rss_peak_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024),
+    }
+
+
+def _run(func, profiler):
+    """The sampler's stop frame: everything it records is below this call"""
+    try:
+        if profiler is not None:
+            return profiler.runcall(func)
+        return func()
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+
+
+def top_functions(stats, limit):
+    """The limit functions with the most time spent in their own code"""
+    rows = []
+    for (filename, line, name), (calls, _, own, cumulative, _) in stats.stats.items():
+        rows.append({'function': f"{name} ({os.path.basename(filename)}:{line})", 'calls': calls,
+                     'own_s': own, 'cumulative_s': cumulative})
+    rows.sort(key=lambda row: row['own_s'], reverse=True)
+    return rows[:limit]
+
+
+def top_allocations(snapshot, limit):
+    """The limit source lines holding the most memory still allocated when the run ended"""
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                       tracemalloc.Filter(False, __file__)])
+    return [{'site': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", 'bytes': stat.size,
+             'blocks': stat.count} for stat in snapshot.statistics('lineno')[:limit]]
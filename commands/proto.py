@@ -0,0 +1,92 @@
+"""
+Proto command implementation for vultitool
+Decodes any message type in the shipped descriptor set, without generated bindings
+"""
+
+import os
+import sys
+import json
+
+from schema import SchemaError, message_class, message_types
+from payloads import FRAMINGS, PayloadDecodeError, decode_as, iter_inputs
+
+class ProtoCommands:
+    @staticmethod
+    def setup_parser(parser):
+        """Setup proto command parser with subcommands"""
+        subparsers = parser.add_subparsers(dest='proto_action', help='Protobuf operations')
+
+        # Decode command
+        decode_parser = subparsers.add_parser('decode', help='Decode messages of any type to NDJSON')
+        decode_parser.add_argument('inputs', nargs='*',
+                                   help="Files with raw, base64, compressed or deep-link messages (default/'-': stdin)")
+        decode_parser.add_argument('--type', required=True,
+                                   help='Message type, e.g. vultisig.keysign.v1.KeysignPayload or KeysignPayload')
+        decode_parser.add_argument('--framing', choices=FRAMINGS, default='lines',
+                                   help='Input framing: one message per line, or length-prefixed raw messages')
+
+        # Types command
+        types_parser = subparsers.add_parser('types', help='List the message types in the descriptor set')
+        types_parser.add_argument('--json', action='store_true', help='Output as JSON')
+    
+    @staticmethod
+    def handle(args):
+        """Route proto commands to appropriate handlers"""
+        if args.proto_action == 'decode':
+            return ProtoCommands.decode(args)
+        elif args.proto_action == 'types':
+            return ProtoCommands.list_types(args)
+        else:
+            print("No proto action specified. Use --help for usage.")
+            return 1
+
+    @staticmethod
+    def decode(args):
+        """Decode each input as --type and stream one JSON record per message"""
+        try:
+            cls = message_class(args.type)
+        except SchemaError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+
+        decoded = 0
+        failed = 0
+        write = sys.stdout.write
+        try:
+            for source, data in iter_inputs(args.inputs, args.framing):
+                try:
+                    record = {'source': source}
+                    record.update(decode_as(data, cls))
+                    decoded += 1
+                except PayloadDecodeError as e:
+                    record = {'source': source, 'error': e.reason, 'message': str(e)}
+                    failed += 1
+                write(json.dumps(record) + '\n')
+        except BrokenPipeError:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+        except PayloadDecodeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            failed += 1
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        sys.stdout.flush()
+
+        print(f"🧩 Decoded {decoded} {cls.DESCRIPTOR.name} message(s), {failed} failed", file=sys.stderr)
+        return 0 if failed == 0 else 1
+
+    @staticmethod
+    def list_types(args):
+        """List every message type the descriptor set defines"""
+        try:
+            names = message_types()
+        except SchemaError as e:
+            print(f"Error: {e}")
+            return 1
+        if args.json:
+            print(json.dumps(names, indent=2))
+        else:
+            for name in names:
+                print(name)
+        return 0
@@ -0,0 +1,271 @@
+"""
+Container rewriting for vultitool
+Re-encrypts, encrypts and decrypts vault containers in bulk with verified atomic writes and a resumable journal
+"""
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from schema import message_class
+from vaultcodecs import CODECS, DEFAULT_CODEC, SCHEME_NONE, CodecError, codec_named
+from loader import VaultLoadError, parse_vault, read_container, read_vault_bytes
+from credentials import Credential
+
+VaultContainer = message_class('vultisig.vault.v1.VaultContainer')
+
+OP_REKEY = 'rekey'
+OP_ENCRYPT = 'encrypt'
+OP_DECRYPT = 'decrypt-out'
+OPS = (OP_REKEY, OP_ENCRYPT, OP_DECRYPT)
+
+# Journal statuses that mean a source needs no further work
+_FINISHED = ('done', 'already')
+
+
+class RekeyError(Exception):
+    """Raised for unusable output locations or journals; reason is a short machine-readable tag"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+def encode_container(codec, payload):
+    """Serialize a VaultContainer around a payload sealed by codec, base64-encoded as .vult files are"""
+    container = VaultContainer()
+    container.version = codec.version
+    container.vault = base64.b64encode(payload).decode()
+    container.is_encrypted = codec.encrypted
+    return base64.b64encode(container.SerializeToString())
+
+
+def write_atomic(path, data, mode=0o600, verify=None):
+    """
+    Write data to path through a temporary file in the same directory
+
+    The temporary file is fsynced and, if given, passed to verify(tmp_path)
+    before it is renamed over path, so path only ever holds a complete,
+    checked file. The directory is fsynced after the rename.
+
+    Raises:
+        OSError: If the file cannot be written
+        Whatever verify raises, after removing the temporary file
+    """
+    directory = path.parent
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, mode)
+        if verify is not None:
+            verify(Path(tmp_name))
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+class Journal:
+    """
+    Append-only NDJSON record of finished files, so an interrupted batch can be rerun
+
+    Each line is one outcome; a source whose latest record for the same
+    operation is 'done' or 'already' is skipped on the next run.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.finished = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        record = json.loads(line)
+                        key = (record['op'], record['source'])
+                        if record['status'] in _FINISHED:
+                            self.finished[key] = record
+                        else:
+                            self.finished.pop(key, None)
+            except (OSError, ValueError, KeyError) as e:
+                raise RekeyError('journal', f"Cannot read journal {self.path}: {e}")
+        self._file = open(self.path, 'a')
+
+    def is_finished(self, op, source):
+        return (op, str(Path(source).absolute())) in self.finished
+
+    def record(self, outcome):
+        """Append one outcome and make it durable before the next file is reported"""
+        self._file.write(json.dumps(outcome) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+def output_path(source, root, output_dir):
+    """Where a rewritten file goes: the same place, or its path relative to root under output_dir"""
+    if output_dir is None:
+        return source
+    relative = source.relative_to(root) if root is not None and root != source else Path(source.name)
+    return Path(output_dir) / relative
+
+
+def plan(sources, op, output_dir=None):
+    """
+    Pair every vault file with its destination
+
+    Args:
+        sources: Iterable of (file path, directory it was found under or None)
+        op: One of OPS
+        output_dir: Directory to write into, or None to rewrite in place
+
+    Raises:
+        RekeyError: If two sources would write the same destination
+    """
+    if op == OP_DECRYPT and output_dir is None:
+        raise RekeyError('output', "decrypt-out writes plaintext vaults and needs --output-dir")
+    seen = {}
+    pairs = []
+    for source, root in sources:
+        dest = output_path(Path(source), root, output_dir)
+        key = str(dest.absolute())
+        if key in seen:
+            raise RekeyError('output', f"{source} and {seen[key]} would both be written to {dest}")
+        seen[key] = source
+        pairs.append((Path(source), dest))
+    return pairs
+
+
+def rewrite_file(job):
+    """
+    Rewrite one container; runs in a worker process
+
+    Args:
+        job: Dict with op, source, dest, target (codec name, or None for the
+            source's own codec when rekeying and the default codec when
+            encrypting), new_password, kdf_params and credentials (wire
+            records to open the source with, most likely first)
+
+    Returns:
+        Outcome dict for the journal and report
+    """
+    source, dest = Path(job['source']), Path(job['dest'])
+    outcome = {'op': job['op'], 'source': str(source.absolute()), 'dest': str(dest.absolute())}
+    try:
+        _, payload, codec = read_container(source)
+        if codec.encrypted:
+            if job['op'] == OP_ENCRYPT:
+                return dict(outcome, status='already', codec=codec.name)
+            vault_bytes = _open_with(codec, payload, job['credentials'])
+            if vault_bytes is None:
+                if job['op'] == OP_REKEY and _opens(codec, payload, job['new_password']):
+                    # Rewritten by an earlier, unjournaled run
+                    return dict(outcome, status='already', codec=codec.name)
+                return dict(outcome, status='failed', reason='decrypt',
+                            error="No password or credential decrypts this vault")
+        else:
+            if job['op'] != OP_ENCRYPT:
+                return dict(outcome, status='failed', reason='plain', error="Vault is not encrypted")
+            vault_bytes = payload
+
+        target = _target_codec(job, codec)
+        sealed = target.encrypt(vault_bytes, job['new_password'], **job['kdf_params']) if target.encrypted \
+            else vault_bytes
+        data = encode_container(target, sealed)
+        digest = hashlib.sha256(vault_bytes).digest()
+
+        def verify(written):
+            # Decrypt what actually reached the disk and compare it with the source plaintext
+            _, reread = read_vault_bytes(written, job['new_password'] if target.encrypted else None)
+            if hashlib.sha256(reread).digest() != digest:
+                raise VaultLoadError('verify', "Written vault does not match the source")
+
+        mode = source.stat().st_mode & 0o777 if dest == source else 0o600
+        write_atomic(dest, data, mode=mode, verify=verify)
+        return dict(outcome, status='done', codec=target.name, sha256=hashlib.sha256(data).hexdigest())
+    except (VaultLoadError, CodecError, RekeyError) as e:
+        return dict(outcome, status='failed', reason=e.reason, error=str(e))
+    except OSError as e:
+        return dict(outcome, status='failed', reason='io', error=str(e))
+
+
+def _open_with(codec, payload, credentials):
+    """Vault bytes from the first credential that opens the payload and names this vault"""
+    for record in credentials:
+        credential = Credential.from_wire(record)
+        try:
+            if credential.key is not None:
+                plaintext = codec.decrypt_with_key(payload, credential.key)
+            else:
+                plaintext = codec.decrypt(payload, credential.password)
+            vault = parse_vault(plaintext)
+        except (CodecError, VaultLoadError):
+            continue
+        if credential.matches_vault(vault.name, vault.public_key_ecdsa):
+            return plaintext
+    return None
+
+
+def _opens(codec, payload, password):
+    try:
+        codec.decrypt(payload, password)
+        return True
+    except CodecError:
+        return False
+
+
+def _target_codec(job, source_codec):
+    if job['op'] == OP_DECRYPT:
+        return CODECS[(source_codec.version, SCHEME_NONE)]
+    if job['target']:
+        return codec_named(job['target'])
+    return source_codec if source_codec.encrypted else DEFAULT_CODEC
+
+
+def run(jobs, journal=None, workers=1):
+    """
+    Rewrite containers in parallel, journaling each outcome as it arrives
+
+    Args:
+        jobs: List of job dicts for rewrite_file
+        journal: Journal to record outcomes in, or None
+        workers: Worker processes
+
+    Yields:
+        Outcome dicts in job order
+    """
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for outcome in pool.map(rewrite_file, jobs, chunksize=max(1, min(16, len(jobs) // (workers * 4)))):
+                outcome['at'] = datetime.now(timezone.utc).isoformat()
+                if journal is not None:
+                    journal.record(outcome)
+                yield outcome
+    else:
+        for job in jobs:
+            outcome = rewrite_file(job)
+            outcome['at'] = datetime.now(timezone.utc).isoformat()
+            if journal is not None:
+                journal.record(outcome)
+            yield outcome
@@ -0,0 +1,272 @@
+"""
+Validation rules engine for vultitool
+Registry of named, severity-tagged checks applied to loaded vault data
+"""
+
+import re
+from datetime import datetime, timezone
+
+from curves import PointChecker, CURVE_SECP256K1, CURVE_ED25519, curve_for_key
+
+SEVERITY_ERROR = 'error'
+SEVERITY_WARNING = 'warning'
+SEVERITY_INFO = 'info'
+SEVERITIES = (SEVERITY_ERROR, SEVERITY_WARNING, SEVERITY_INFO)
+
+_HEX_RE = re.compile(r'^[0-9a-fA-F]*$')
+_ECDSA_RE = re.compile(r'^0[23][0-9a-fA-F]{64}$')
+
+# Vultisig did not exist before this date; anything earlier is a corrupt timestamp
+EARLIEST_CREATED_AT = datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp()
+# Allow some clock skew between the creating device and the auditing host
+MAX_CLOCK_SKEW_SECONDS = 24 * 3600
+
+# Shared across every vault a process validates: shares of one vault repeat its keys
+POINT_CHECKER = PointChecker()
+
+
+class Rule:
+    """A single named validation check"""
+
+    def __init__(self, name, severity, fields, description, check, strict=False):
+        if severity not in SEVERITIES:
+            raise ValueError(f"Unknown severity '{severity}' for rule {name}")
+        self.name = name
+        self.severity = severity
+        self.fields = frozenset(fields)
+        self.description = description
+        self.check = check
+        self.strict = strict
+
+    def run(self, vault):
+        """Return the list of issue messages this rule raises for a vault dict"""
+        return list(self.check(vault) or ())
+
+
+# Registry of all known rules, in registration order
+RULES = {}
+
+
+def rule(name, severity, fields, description, strict=False):
+    """Decorator registering a check function as a named rule"""
+    def register(check):
+        if name in RULES:
+            raise ValueError(f"Duplicate rule name: {name}")
+        RULES[name] = Rule(name, severity, fields, description, check, strict=strict)
+        return check
+    return register
+
+
+def select_rules(spec=None, strict=False):
+    """
+    Resolve a --rules specification into Rule objects
+
+    Args:
+        spec: Comma-separated rule names, 'all', or None for the default set
+        strict: Include strict-only rules in the default set
+
+    Returns:
+        List of Rule objects in registry order
+    """
+    if not spec:
+        return [r for r in RULES.values() if strict or not r.strict]
+
+    names = [n.strip() for n in spec.split(',') if n.strip()]
+    if 'all' in names:
+        return list(RULES.values())
+
+    unknown = [n for n in names if n not in RULES]
+    if unknown:
+        raise ValueError(f"Unknown rule(s): {', '.join(unknown)} (see 'vault rules')")
+    wanted = set(names)
+    return [r for r in RULES.values() if r.name in wanted]
+
+
+class RuleEngine:
+    """Runs a selected set of rules and reports which vault fields they need"""
+
+    def __init__(self, spec=None, strict=False):
+        self.rules = select_rules(spec, strict)
+        self.fields = frozenset().union(*(r.fields for r in self.rules))
+
+    def run(self, vault):
+        """
+        Apply every selected rule to a vault dict
+
+        Returns:
+            List of findings: {'rule', 'severity', 'message'}
+        """
+        findings = []
+        for r in self.rules:
+            for message in r.run(vault):
+                findings.append({'rule': r.name, 'severity': r.severity, 'message': message})
+        return findings
+
+    @staticmethod
+    def has_errors(findings):
+        """True if any finding is error severity"""
+        return any(f['severity'] == SEVERITY_ERROR for f in findings)
+
+
+def _is_hex(value, length=None):
+    if not value or not _HEX_RE.match(value) or len(value) % 2:
+        return False
+    return length is None or len(value) == length
+
+
+# --- Presence checks (the original `vault validate` checks) ---
+
+@rule('name-present', SEVERITY_ERROR, ['name'], 'Vault has a name')
+def _check_name(vault):
+    if not vault.get('name'):
+        yield "Missing vault name"
+
+
+@rule('ecdsa-key-present', SEVERITY_ERROR, ['public_key_ecdsa'], 'Vault has an ECDSA public key')
+def _check_ecdsa_present(vault):
+    if not vault.get('public_key_ecdsa'):
+        yield "Missing ECDSA public key"
+
+
+@rule('signers-present', SEVERITY_ERROR, ['signers'], 'Vault lists at least one signer')
+def _check_signers_present(vault):
+    if not vault.get('signers'):
+        yield "No signers found"
+
+
+@rule('key-shares-present', SEVERITY_ERROR, ['key_shares'], 'Vault carries at least one key share')
+def _check_key_shares_present(vault):
+    if not vault.get('key_shares'):
+        yield "No key shares found"
+
+
+# --- Format checks ---
+
+@rule('ecdsa-key-format', SEVERITY_ERROR, ['public_key_ecdsa'],
+      'ECDSA public key is a 33-byte compressed secp256k1 point in hex')
+def _check_ecdsa_format(vault):
+    key = vault.get('public_key_ecdsa')
+    if key and not _ECDSA_RE.match(key):
+        yield f"ECDSA public key is not 66 hex chars with 02/03 prefix (got {len(key)} chars)"
+
+
+@rule('eddsa-key-format', SEVERITY_ERROR, ['public_key_eddsa'],
+      'EdDSA public key, when present, is 32 bytes of hex')
+def _check_eddsa_format(vault):
+    key = vault.get('public_key_eddsa')
+    if key and not _is_hex(key, 64):
+        yield f"EdDSA public key is not 64 hex chars (got {len(key)} chars)"
+
+
+@rule('chain-code-format', SEVERITY_ERROR, ['hex_chain_code'],
+      'Chain code is 32 bytes of hex')
+def _check_chain_code(vault):
+    chain_code = vault.get('hex_chain_code')
+    if not chain_code:
+        yield "Missing hex chain code"
+    elif not _is_hex(chain_code, 64):
+        yield f"Chain code is not 64 hex chars (got {len(chain_code)} chars)"
+
+
+# --- Curve point checks ---
+
+@rule('ecdsa-key-on-curve', SEVERITY_ERROR, ['public_key_ecdsa'],
+      'ECDSA public key decompresses to a secp256k1 point')
+def _check_ecdsa_point(vault):
+    key = vault.get('public_key_ecdsa')
+    if key and _ECDSA_RE.match(key):
+        reason = POINT_CHECKER.check(CURVE_SECP256K1, key.lower())
+        if reason:
+            yield f"ECDSA public key is not a valid secp256k1 point ({reason})"
+
+
+@rule('eddsa-key-on-curve', SEVERITY_ERROR, ['public_key_eddsa'],
+      'EdDSA public key decodes to an ed25519 point')
+def _check_eddsa_point(vault):
+    key = vault.get('public_key_eddsa')
+    if key and _is_hex(key, 64):
+        reason = POINT_CHECKER.check(CURVE_ED25519, key.lower())
+        if reason:
+            yield f"EdDSA public key is not a valid ed25519 point ({reason})"
+
+
+@rule('share-keys-on-curve', SEVERITY_ERROR, ['key_shares'],
+      'Key share public keys are valid secp256k1 or ed25519 points')
+def _check_share_points(vault):
+    for i, share in enumerate(vault.get('key_shares', [])):
+        key = share.get('public_key') or ''
+        curve = curve_for_key(key)
+        if curve is None or not _is_hex(key):
+            yield f"Key share {i+1} public key is not a 33-byte or 32-byte hex key"
+            continue
+        reason = POINT_CHECKER.check(curve, key.lower())
+        if reason:
+            yield f"Key share {i+1} public key is not a valid {curve} point ({reason})"
+
+
+# --- Consistency checks ---
+
+@rule('local-party-in-signers', SEVERITY_ERROR, ['local_party_id', 'signers'],
+      'local_party_id is one of the vault signers')
+def _check_local_party(vault):
+    party = vault.get('local_party_id')
+    if not party:
+        yield "Missing local party ID"
+    elif party not in vault.get('signers', []):
+        yield f"Local party '{party}' is not in signers"
+
+
+@rule('signers-unique', SEVERITY_WARNING, ['signers'], 'Signer IDs are not repeated')
+def _check_signers_unique(vault):
+    signers = vault.get('signers', [])
+    seen = set()
+    for signer in signers:
+        if signer in seen:
+            yield f"Duplicate signer '{signer}'"
+        seen.add(signer)
+
+
+@rule('share-keys-match', SEVERITY_ERROR, ['key_shares', 'public_key_ecdsa', 'public_key_eddsa'],
+      'Every key share belongs to one of the vault public keys')
+def _check_share_keys(vault):
+    vault_keys = {k for k in (vault.get('public_key_ecdsa'), vault.get('public_key_eddsa')) if k}
+    share_keys = set()
+    for i, share in enumerate(vault.get('key_shares', [])):
+        key = share.get('public_key')
+        share_keys.add(key)
+        if key not in vault_keys:
+            yield f"Key share {i+1} public key does not match any vault key"
+    ecdsa = vault.get('public_key_ecdsa')
+    if ecdsa and share_keys and ecdsa not in share_keys:
+        yield "No key share for the ECDSA public key"
+
+
+@rule('created-at-sane', SEVERITY_WARNING, ['created_at'],
+      'Creation timestamp is neither before 2020 nor in the future')
+def _check_created_at(vault):
+    created = vault.get('created_at')
+    if not created:
+        return
+    seconds = created.get('seconds', 0)
+    now = datetime.now(timezone.utc).timestamp()
+    if seconds < EARLIEST_CREATED_AT:
+        yield f"Creation time {created.get('datetime')} predates Vultisig"
+    elif seconds > now + MAX_CLOCK_SKEW_SECONDS:
+        yield f"Creation time {created.get('datetime')} is in the future"
+    if not 0 <= created.get('nanos', 0) < 1_000_000_000:
+        yield "Creation time has out-of-range nanos"
+
+
+# --- Strict-only checks ---
+
+@rule('lib-type-known', SEVERITY_ERROR, ['lib_type'], 'lib_type is GG20 or DKLS', strict=True)
+def _check_lib_type(vault):
+    if vault.get('lib_type') not in ['GG20', 'DKLS']:
+        yield "Unknown lib_type"
+
+
+@rule('signer-share-count', SEVERITY_ERROR, ['signers', 'key_shares'],
+      'Number of signers equals number of key shares', strict=True)
+def _check_signer_share_count(vault):
+    if len(vault.get('signers', [])) != len(vault.get('key_shares', [])):
+        yield "Mismatch between signers and key shares count"
@@ -0,0 +1,112 @@
+"""
+Protobuf schema for vultitool
+Builds message classes from the precompiled FileDescriptorSet shipped in proto/
+"""
+
+from pathlib import Path
+
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+
+# `make protoset` regenerates this from every .proto file under proto/
+PROTOSET_PATH = Path(__file__).parent.parent / "proto" / "vultisig.protoset"
+
+_POOL = None
+_FILES = ()
+_CLASSES = {}
+
+
+class SchemaError(Exception):
+    """Raised for a missing descriptor set or an unknown type name; reason is a short machine-readable tag"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+def load_pool():
+    """
+    Return the descriptor pool built from the descriptor set (loaded once per process)
+
+    Raises:
+        SchemaError: If the descriptor set is missing or unreadable
+    """
+    global _POOL, _FILES
+    if _POOL is not None:
+        return _POOL
+
+    protoset = PROTOSET_PATH
+    file_set = descriptor_pb2.FileDescriptorSet()
+    try:
+        file_set.ParseFromString(protoset.read_bytes())
+    except OSError as e:
+        raise SchemaError('missing', f"Cannot read descriptor set {protoset} (run 'make protoset'): {e}")
+    except Exception as e:
+        raise SchemaError('decode', f"Invalid descriptor set {protoset}: {e}")
+
+    pool = descriptor_pool.DescriptorPool()
+    # protoc --include_imports writes dependencies before their dependents
+    for file_proto in file_set.file:
+        pool.Add(file_proto)
+    _POOL = pool
+    _FILES = tuple(file_proto.name for file_proto in file_set.file)
+    return pool
+
+
+def message_types():
+    """Sorted full names of every message type in the descriptor set, nested types included"""
+    names = []
+
+    def walk(descriptors):
+        for descriptor in descriptors:
+            names.append(descriptor.full_name)
+            walk(descriptor.nested_types)
+
+    pool = load_pool()
+    for file_name in _FILES:
+        walk(pool.FindFileByName(file_name).message_types_by_name.values())
+    return sorted(names)
+
+
+def resolve_type(name):
+    """
+    Expand a type name to its full name: full names pass through, and a
+    short name (KeysignPayload) or partial suffix (keysign.v1.KeysignPayload)
+    is accepted when it matches exactly one message type
+
+    Raises:
+        SchemaError: If the name matches no type or several
+    """
+    pool = load_pool()
+    try:
+        return pool.FindMessageTypeByName(name).full_name
+    except KeyError:
+        pass
+    matches = [full for full in message_types() if full.endswith('.' + name)]
+    if len(matches) == 1:
+        return matches[0]
+    if matches:
+        raise SchemaError('ambiguous', f"Type '{name}' is ambiguous: {', '.join(matches)}")
+    raise SchemaError('unknown', f"Unknown message type '{name}' (see 'vultitool proto types')")
+
+
+def message_class(name):
+    """
+    Return the message class for a type name (see resolve_type), built once and cached
+
+    Raises:
+        SchemaError: If the type is unknown or the descriptor set cannot be loaded
+    """
+    cls = _CLASSES.get(name)
+    if cls is None:
+        full_name = resolve_type(name)
+        cls = _CLASSES.get(full_name)
+        if cls is None:
+            cls = message_factory.GetMessageClass(load_pool().FindMessageTypeByName(full_name))
+            _CLASSES[full_name] = cls
+        _CLASSES[name] = cls
+    return cls
+
+
+def enum_value(full_name, value_name):
+    """Number of an enum value, e.g. enum_value('vultisig.keygen.v1.LibType', 'LIB_TYPE_DKLS')"""
+    return load_pool().FindEnumTypeByName(full_name).values_by_name[value_name].number
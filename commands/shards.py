@@ -0,0 +1,212 @@
+"""
+Sharded scanning for vultitool
+Deterministic partitioning of scan inputs by path hash, and partial results that merge associatively
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from batch import ScanSummary
+
+PARTIAL_FORMAT = 'vultitool-scan-partial'
+PARTIAL_VERSION = 1
+
+# Record fields kept in each catalog row
+CATALOG_FIELDS = ('path', 'name', 'public_key_ecdsa', 'local_party_id', 'lib_type', 'encrypted', 'passed', 'error')
+
+
+class ShardError(Exception):
+    """Raised for bad shard specs and unmergeable partials; reason is a short machine-readable tag"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+def parse_shard(spec):
+    """
+    'i/N' as (i, N), with shards numbered 0 to N-1
+
+    Raises:
+        ShardError: If spec is malformed or i is out of range
+    """
+    index, _, count = spec.partition('/')
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise ShardError('spec', f"Invalid shard '{spec}' (use i/N, e.g. 0/4)")
+    if count < 1 or not 0 <= index < count:
+        raise ShardError('spec', f"Invalid shard '{spec}': i must be from 0 to N-1")
+    return index, count
+
+
+def shard_of(path, count):
+    """
+    The shard a path belongs to
+
+    The hash is of the path as the scan names it (relative paths stay
+    relative), so every host must name the inputs the same way - e.g. run
+    from the same directory on the same mount layout.
+    """
+    digest = hashlib.blake2b(str(path).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % count
+
+
+class ScanPartial:
+    """
+    A self-describing share of a scan: which shards it covers, its summary,
+    its reconcile groups and its catalog rows
+
+    Merging is associative and commutative - counts add, groups combine
+    per public key, catalog rows are kept sorted by path - so partials can
+    be merged in any order and in any tree shape. Overlapping shards or
+    partials of differently configured scans are refused.
+    """
+
+    def __init__(self, rules, count, shards=(), summary=None):
+        self.rules = list(rules)
+        self.count = count
+        self.shards = set(shards)
+        self.summary = summary if summary is not None else ScanSummary()
+        # public_key_ecdsa -> {'name', 'files', 'parties': {party: shares found}}
+        self.groups = {}
+        self.catalog = []
+
+    def add(self, record):
+        """Add one scan record's catalog row and group membership (the summary is kept by the scanner)"""
+        self.catalog.append({field: record.get(field) for field in CATALOG_FIELDS})
+        key = record.get('public_key_ecdsa')
+        if record.get('error') or not key:
+            return
+        group = self.groups.setdefault(key, {'name': '', 'files': 0, 'parties': {}})
+        group['files'] += 1
+        party = record.get('local_party_id') or ''
+        group['parties'][party] = group['parties'].get(party, 0) + 1
+        group['name'] = _first_name(group['name'], record.get('name'))
+
+    def merge(self, other):
+        """
+        Fold another partial into this one
+
+        Raises:
+            ShardError: If the partials come from different scans or share a shard
+        """
+        if other.rules != self.rules:
+            raise ShardError('mismatch', f"Partials ran different rules: {', '.join(self.rules)} "
+                                         f"vs {', '.join(other.rules)}")
+        if other.count != self.count:
+            raise ShardError('mismatch', f"Partials split the inputs {self.count} and {other.count} ways")
+        overlap = self.shards & other.shards
+        if overlap:
+            raise ShardError('overlap', f"Shard(s) {_shard_list(overlap)} of {self.count} are in more than one partial")
+        self.shards |= other.shards
+        self.summary.merge(other.summary)
+        for key, theirs in other.groups.items():
+            group = self.groups.setdefault(key, {'name': '', 'files': 0, 'parties': {}})
+            group['files'] += theirs['files']
+            for party, shares in theirs['parties'].items():
+                group['parties'][party] = group['parties'].get(party, 0) + shares
+            group['name'] = _first_name(group['name'], theirs['name'])
+        self.catalog.extend(other.catalog)
+        self.catalog.sort(key=lambda row: row['path'])
+
+    @property
+    def missing(self):
+        """Shards not yet covered"""
+        return sorted(set(range(self.count)) - self.shards)
+
+    def reconcile(self):
+        """Counts over the groups: vaults, those with one party's share found more than once, and single-share vaults"""
+        return {
+            'vaults': len(self.groups),
+            'duplicate_shares': sum(1 for g in self.groups.values() if any(n > 1 for n in g['parties'].values())),
+            'single_share': sum(1 for g in self.groups.values() if len(g['parties']) == 1),
+        }
+
+    def to_dict(self):
+        return {
+            'format': PARTIAL_FORMAT,
+            'version': PARTIAL_VERSION,
+            'rules': self.rules,
+            'shard_count': self.count,
+            'shards': sorted(self.shards),
+            'summary': self.summary.to_dict(),
+            'groups': {key: self.groups[key] for key in sorted(self.groups)},
+            'catalog': sorted(self.catalog, key=lambda row: row['path']),
+        }
+
+    @classmethod
+    def from_dict(cls, document):
+        partial = cls(document['rules'], document['shard_count'], document['shards'],
+                      ScanSummary.from_dict(document['summary']))
+        partial.groups = document['groups']
+        partial.catalog = document['catalog']
+        return partial
+
+    def write(self, path):
+        """Write the partial atomically, so a half-written file is never merged"""
+        path = Path(path)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.to_dict(), f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+
+def load_partial(path):
+    """
+    Read a partial result file
+
+    Raises:
+        ShardError: If it is unreadable or not a partial
+    """
+    try:
+        with open(path) as f:
+            document = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ShardError('read', f"Cannot read partial {path}: {e}")
+    if document.get('format') != PARTIAL_FORMAT or document.get('version') != PARTIAL_VERSION:
+        raise ShardError('format', f"{path} is not a version {PARTIAL_VERSION} vultitool scan partial")
+    try:
+        return ScanPartial.from_dict(document)
+    except (KeyError, TypeError) as e:
+        raise ShardError('format', f"{path} is missing {e}")
+
+
+def merge_partials(partials):
+    """
+    Merge partials into a new one, leaving the inputs unchanged
+
+    Raises:
+        ShardError: If there are none, or they cannot be merged
+    """
+    if not partials:
+        raise ShardError('empty', "No partials to merge")
+    first = partials[0]
+    merged = ScanPartial(first.rules, first.count)
+    for partial in partials:
+        merged.merge(partial)
+    return merged
+
+
+def _first_name(current, candidate):
+    """The smaller non-empty name, so merge order cannot change which one a group keeps"""
+    if not candidate:
+        return current
+    return min(current, candidate) if current else candidate
+
+
+def _shard_list(shards):
+    return ', '.join(str(s) for s in sorted(shards))
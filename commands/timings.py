@@ -0,0 +1,207 @@
+"""
+Stage timings for vultitool
+Spans around the stages of the load path, reported as a breakdown for one file or as histograms for a batch
+"""
+
+import json
+import math
+import os
+import sys
+import time
+
+# '1' prints the report; any other value is also a path to write the JSON report to
+ENV_VAR = 'VULTITOOL_TIMINGS'
+
+# Stage names, in pipeline order. All but 'export' run inside the whole-file 'load' span;
+# 'vault.keyshares' runs inside 'vault.fields'
+STAGES = (
+    'load',
+    'read',
+    'decode.base64',
+    'decode.container',
+    'decode.payload',
+    'decode.pack',
+    'credentials',
+    'decrypt.kdf',
+    'decrypt.cipher',
+    'vault.parse',
+    'vault.fields',
+    'vault.keyshares',
+    'export',
+)
+
+# Stages timed outside 'load', so not shown as a share of it
+_OUTSIDE_LOAD = frozenset(['load', 'export'])
+
+# Histogram buckets are powers of two in microseconds: bucket 0 holds durations under 1 µs,
+# bucket i > 0 those in [2^(i-1), 2^i) µs
+_BUCKETS = 24
+
+
+class _NullSpan:
+    """The span handed out while timings are off: entering and leaving it does nothing"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter_ns() - self.start
+        for sink in _sinks:
+            sink(self.name, elapsed)
+        return False
+
+
+class Recorder:
+    """Durations per stage, in nanoseconds"""
+
+    def __init__(self):
+        self.samples = {}
+        self.started = time.perf_counter_ns()
+
+    def add(self, name, elapsed_ns):
+        self.samples.setdefault(name, []).append(elapsed_ns)
+
+    @property
+    def files(self):
+        return len(self.samples.get('load', ()))
+
+    def stats(self):
+        """Per-stage count, total, mean, p50, p95 and max (ms) and a log2 µs histogram"""
+        stats = {}
+        for name in sorted(self.samples, key=stage_order):
+            samples = sorted(self.samples[name])
+            histogram = [0] * _BUCKETS
+            for sample in samples:
+                histogram[min(_BUCKETS - 1, (sample // 1000).bit_length())] += 1
+            stats[name] = {
+                'count': len(samples),
+                'total_ms': sum(samples) / 1e6,
+                'mean_ms': sum(samples) / len(samples) / 1e6,
+                'p50_ms': _percentile(samples, 0.50) / 1e6,
+                'p95_ms': _percentile(samples, 0.95) / 1e6,
+                'max_ms': samples[-1] / 1e6,
+                'histogram_us_log2': histogram,
+            }
+        return stats
+
+    def to_dict(self):
+        return {
+            'files': self.files,
+            'wall_ms': (time.perf_counter_ns() - self.started) / 1e6,
+            'stages': self.stats(),
+        }
+
+    def report(self, out=sys.stderr):
+        """Print a stage breakdown, or histograms when more than one file was loaded"""
+        stats = self.stats()
+        if not stats:
+            print("⏱️  No timed stages ran", file=out)
+            return
+        load_total = stats['load']['total_ms'] if 'load' in stats else None
+        if self.files <= 1:
+            print("⏱️  Stage timings:", file=out)
+            for name, stage in stats.items():
+                share = f"{stage['total_ms'] / load_total:6.1%}" if load_total and name not in _OUTSIDE_LOAD else ''
+                calls = f" ({stage['count']} calls)" if stage['count'] > 1 else ''
+                print(f"  {name:<18} {stage['total_ms']:10.3f} ms {share}{calls}", file=out)
+            return
+        print(f"⏱️  Stage timings over {self.files} files (ms):", file=out)
+        print(f"  {'stage':<18} {'count':>7} {'total':>10} {'p50':>9} {'p95':>9} {'max':>9}  histogram (µs, log2)",
+              file=out)
+        for name, stage in stats.items():
+            print(f"  {name:<18} {stage['count']:>7} {stage['total_ms']:>10.2f} {stage['p50_ms']:>9.3f} "
+                  f"{stage['p95_ms']:>9.3f} {stage['max_ms']:>9.3f}  {_sparkline(stage['histogram_us_log2'])}",
+                  file=out)
+
+
+def stage_order(name):
+    """Sort key putting stages in pipeline order, unknown ones last"""
+    return (STAGES.index(name), name) if name in STAGES else (len(STAGES), name)
+
+
+def _percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def _sparkline(histogram):
+    """Bars for the occupied range of a histogram, labelled with its bounds in µs"""
+    occupied = [i for i, count in enumerate(histogram) if count]
+    low, high = occupied[0], occupied[-1]
+    peak = max(histogram)
+    bars = ''.join(' ▁▂▃▄▅▆▇█'[math.ceil(8 * count / peak)] for count in histogram[low:high + 1])
+    return f"{1 << (low - 1) if low else 0}…{1 << high} {bars}"
+
+
+_recorder = None
+_json_path = None
+# Callables given (stage, nanoseconds) for every finished span: the recorder, metrics
+_sinks = []
+
+
+def configure(flag=False, json_path=None):
+    """
+    Turn timings on for this process from the --timings flags or VULTITOOL_TIMINGS
+
+    Args:
+        flag: --timings was given
+        json_path: --timings-json FILE, or None
+    """
+    global _recorder, _json_path
+    env = os.environ.get(ENV_VAR, '')
+    if not json_path and env not in ('', '0', '1'):
+        json_path = env
+    if flag or json_path or env == '1':
+        _recorder = Recorder()
+        _json_path = json_path
+        add_sink(_recorder.add)
+
+
+def add_sink(sink):
+    """Also send every span to sink(stage, nanoseconds); spans are only timed while a sink is registered"""
+    _sinks.append(sink)
+
+
+def remove_sink(sink):
+    """Stop sending spans to a sink added with add_sink"""
+    _sinks.remove(sink)
+
+
+def enabled():
+    return _recorder is not None
+
+
+def span(name):
+    """A context manager timing one stage; a shared no-op object while nothing collects timings"""
+    if not _sinks:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def finish():
+    """Print the report to stderr and write the JSON report if one was asked for"""
+    if _recorder is None:
+        return
+    _recorder.report()
+    if _json_path:
+        with open(_json_path, 'w') as f:
+            json.dump(_recorder.to_dict(), f, indent=2)
+        print(f"⏱️  Timings written to {_json_path}", file=sys.stderr)
@@ -0,0 +1,450 @@
+"""
+UTXO set analytics for vultitool
+Reads KeysignPayload.utxo_info straight from the protobuf wire format into array-backed columns
+"""
+
+import hashlib
+import statistics
+from array import array
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# KeysignMessage field numbers; a top level made only of these with field 5
+# set is a message wrapping its payload in field 5
+_MESSAGE_FIELDS = frozenset([1, 2, 4, 5, 6, 7, 8])
+_MESSAGE_PAYLOAD = 5
+# KeysignPayload field numbers used here
+_PAYLOAD_COIN = 1
+_PAYLOAD_TO_AMOUNT = 3
+_PAYLOAD_UTXO_SPECIFIC = 4
+_PAYLOAD_UTXO_INFO = 20
+_COIN_CHAIN = 1
+_UTXO_SPECIFIC_BYTE_FEE = 1
+_UTXO_SPECIFIC_SEND_MAX = 2
+_UTXO_HASH = 1
+_UTXO_AMOUNT = 2
+_UTXO_INDEX = 3
+
+# Estimated virtual sizes: (overhead, per input, per output)
+SIZE_P2WPKH = (11, 68, 31)
+SIZE_P2PKH = (10, 148, 34)
+CHAIN_SIZES = {
+    'Bitcoin': SIZE_P2WPKH,
+    'Litecoin': SIZE_P2WPKH,
+    'Dogecoin': SIZE_P2PKH,
+    'Dash': SIZE_P2PKH,
+    'Bitcoin-Cash': SIZE_P2PKH,
+}
+DEFAULT_FEE_RATES = (1, 5, 10, 25, 50)
+DEFAULT_DUST = 546
+# Upper bounds of the amount histogram buckets (base units); the last bucket is open
+HISTOGRAM_EDGES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+# Conflicting outpoints listed in the report
+MAX_EXAMPLES = 10
+
+
+class WireError(ValueError):
+    """Raised for truncated or malformed protobuf bytes"""
+
+
+def _read_varint(buf, pos):
+    byte = buf[pos]
+    if byte < 0x80:
+        return byte, pos + 1
+    result = byte & 0x7f
+    shift = 7
+    while True:
+        pos += 1
+        byte = buf[pos]
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, pos + 1
+        shift += 7
+        if shift > 63:
+            raise WireError("varint too long")
+
+
+def _iter_fields(buf, pos, end):
+    """
+    Walk the fields of one message
+
+    Yields:
+        (field_number, wire_type, value) where value is an int for varints and
+        a (start, end) span for length-delimited fields
+    """
+    try:
+        while pos < end:
+            key, pos = _read_varint(buf, pos)
+            number, wire_type = key >> 3, key & 7
+            if wire_type == 0:
+                value, pos = _read_varint(buf, pos)
+            elif wire_type == 2:
+                length, pos = _read_varint(buf, pos)
+                value = (pos, pos + length)
+                pos += length
+            elif wire_type == 1:
+                value = None
+                pos += 8
+            elif wire_type == 5:
+                value = None
+                pos += 4
+            else:
+                raise WireError(f"unsupported wire type {wire_type}")
+            if pos > end:
+                raise WireError("field runs past the end of the message")
+            yield number, wire_type, value
+    except IndexError:
+        raise WireError("truncated message")
+
+
+# Tag bytes of UtxoInfo fields: (field << 3) | wire type
+_TAG_HASH = _UTXO_HASH << 3 | 2
+_TAG_AMOUNT = _UTXO_AMOUNT << 3
+_TAG_INDEX = _UTXO_INDEX << 3
+
+
+def _read_utxo(buf, pos, end):
+    """
+    Decode one UtxoInfo submessage (the hot loop, hence no generator)
+
+    Returns:
+        (txid_bytes, amount, index)
+    """
+    txid = b''
+    amount = 0
+    index = 0
+    try:
+        while pos < end:
+            tag = buf[pos]
+            if tag == _TAG_HASH:
+                length = buf[pos + 1]
+                if length < 0x80:
+                    txid = buf[pos + 2:pos + 2 + length]
+                    pos += 2 + length
+                    continue
+            elif tag == _TAG_AMOUNT:
+                amount, pos = _read_varint(buf, pos + 1)
+                if amount >= 1 << 63:
+                    amount -= 1 << 64
+                continue
+            elif tag == _TAG_INDEX:
+                index, pos = _read_varint(buf, pos + 1)
+                index &= 0xffffffff
+                continue
+            # Anything else (unknown fields, long hashes) goes through the generic walker
+            for number, wire_type, value in _iter_fields(buf, pos, end):
+                if number == _UTXO_HASH and wire_type == 2:
+                    txid = buf[value[0]:value[1]]
+                elif number == _UTXO_AMOUNT and wire_type == 0:
+                    amount = value - (1 << 64) if value >= 1 << 63 else value
+                elif number == _UTXO_INDEX and wire_type == 0:
+                    index = value & 0xffffffff
+            break
+    except IndexError:
+        raise WireError("truncated UtxoInfo")
+    if pos > end:
+        raise WireError("UtxoInfo runs past its length")
+    return txid, amount, index
+
+
+def _txid_bytes(txids, columns):
+    """Convert hex txids to 32 bytes each, in one fromhex call when they are all well-formed"""
+    if all(len(txid) == 64 for txid in txids):
+        try:
+            joined = bytes.fromhex(b''.join(txids).decode('ascii'))
+            # fromhex skips whitespace, which would shift every later txid
+            if len(joined) == 32 * len(txids):
+                return joined
+        except (UnicodeDecodeError, ValueError):
+            pass
+    out = bytearray()
+    for txid in txids:
+        try:
+            digest = bytes.fromhex(txid.decode('ascii'))
+            if len(digest) != 32:
+                raise ValueError
+        except (UnicodeDecodeError, ValueError):
+            # Keep malformed txids comparable for duplicate detection
+            digest = hashlib.sha256(txid).digest()
+            columns.bad_hashes += 1
+        out += digest
+    return out
+
+
+def _payload_span(buf):
+    """Locate the KeysignPayload inside raw bytes that may be a KeysignMessage"""
+    numbers = set()
+    payload = None
+    for number, wire_type, value in _iter_fields(buf, 0, len(buf)):
+        numbers.add(number)
+        if number == _PAYLOAD_UTXO_INFO:
+            # Only a payload has field 20
+            return 0, len(buf)
+        if number == _MESSAGE_PAYLOAD and wire_type == 2:
+            payload = value
+    if numbers <= _MESSAGE_FIELDS:
+        # A message without keysign_payload (e.g. a custom message) has no UTXOs
+        return payload if payload is not None else (0, 0)
+    return 0, len(buf)
+
+
+class UtxoColumns:
+    """
+    Column store of UTXOs from many payloads
+
+    One entry per UTXO in each array (amount, output index, owning payload,
+    32-byte txid in a shared bytearray) plus a small list of per-payload facts.
+    """
+
+    def __init__(self):
+        self.amounts = array('q')
+        self.indexes = array('I')
+        self.payload_ids = array('I')
+        self.hashes = bytearray()
+        self.payloads = []
+        self.bad_hashes = 0
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def add_payload(self, source, raw, type_name='auto'):
+        """
+        Append the UTXOs of one serialized KeysignMessage/KeysignPayload
+
+        Raises:
+            WireError: If the bytes are not a well-formed message
+        """
+        if type_name == 'payload':
+            start, end = 0, len(raw)
+        elif type_name == 'message':
+            start, end = (0, 0)
+            for number, wire_type, value in _iter_fields(raw, 0, len(raw)):
+                if number == _MESSAGE_PAYLOAD and wire_type == 2:
+                    start, end = value
+        else:
+            start, end = _payload_span(raw)
+
+        info = {'source': source, 'chain': '', 'byte_fee': None, 'send_max': False,
+                'to_amount': 0, 'utxos': 0}
+        # Collected locally so a malformed payload leaves the columns untouched
+        amounts = []
+        indexes = []
+        txids = []
+
+        for number, wire_type, value in _iter_fields(raw, start, end):
+            if number == _PAYLOAD_UTXO_INFO and wire_type == 2:
+                txid, amount, index = _read_utxo(raw, value[0], value[1])
+                txids.append(txid)
+                amounts.append(amount)
+                indexes.append(index)
+            elif number == _PAYLOAD_COIN and wire_type == 2:
+                for sub_number, sub_type, sub_value in _iter_fields(raw, value[0], value[1]):
+                    if sub_number == _COIN_CHAIN and sub_type == 2:
+                        info['chain'] = raw[sub_value[0]:sub_value[1]].decode('utf-8', 'replace')
+            elif number == _PAYLOAD_TO_AMOUNT and wire_type == 2:
+                text = raw[value[0]:value[1]]
+                info['to_amount'] = int(text) if text.isdigit() else 0
+            elif number == _PAYLOAD_UTXO_SPECIFIC and wire_type == 2:
+                for sub_number, sub_type, sub_value in _iter_fields(raw, value[0], value[1]):
+                    if sub_number == _UTXO_SPECIFIC_BYTE_FEE and sub_type == 2:
+                        text = raw[sub_value[0]:sub_value[1]]
+                        info['byte_fee'] = int(text) if text.isdigit() else None
+                    elif sub_number == _UTXO_SPECIFIC_SEND_MAX and sub_type == 0:
+                        info['send_max'] = bool(sub_value)
+
+        count = len(amounts)
+        self.amounts.extend(amounts)
+        self.indexes.extend(indexes)
+        self.hashes += _txid_bytes(txids, self)
+        self.payload_ids.extend([len(self.payloads)] * count)
+        info['utxos'] = count
+        self.payloads.append(info)
+        return count
+
+
+def _sizes(info):
+    return CHAIN_SIZES.get(info['chain'], SIZE_P2WPKH)
+
+
+def _payload_vbytes(info):
+    overhead, per_input, per_output = _sizes(info)
+    outputs = 1 if info['send_max'] else 2
+    return overhead + info['utxos'] * per_input + outputs * per_output
+
+
+def _bucket_labels():
+    labels = []
+    lower = 0
+    for edge in HISTOGRAM_EDGES:
+        labels.append(f"{lower}-{edge - 1}")
+        lower = edge
+    labels.append(f">={lower}")
+    return labels
+
+
+def analyze(columns, dust=DEFAULT_DUST, fee_rates=DEFAULT_FEE_RATES, use_numpy=True):
+    """
+    Compute UTXO statistics over every payload in one pass per column
+
+    Args:
+        columns: Populated UtxoColumns
+        dust: Amounts below this many base units count as dust
+        fee_rates: Fee rates (base units per vbyte) to estimate consolidation cost at
+        use_numpy: Use the NumPy implementation when it is installed
+
+    Returns:
+        dict report (identical for both implementations)
+    """
+    if use_numpy and NUMPY_AVAILABLE:
+        report = _analyze_numpy(columns, dust, fee_rates)
+    else:
+        report = _analyze_python(columns, dust, fee_rates)
+
+    by_chain = {}
+    for info in columns.payloads:
+        chain = by_chain.setdefault(info['chain'] or 'unknown', {'payloads': 0, 'utxos': 0})
+        chain['payloads'] += 1
+        chain['utxos'] += info['utxos']
+    report['by_chain'] = by_chain
+    report['payloads'] = len(columns.payloads)
+    report['payloads_with_utxos'] = sum(1 for info in columns.payloads if info['utxos'])
+    report['malformed_txids'] = columns.bad_hashes
+
+    # Each payload's own byte_fee, where it has one
+    own_vbytes = own_fee = 0
+    for info in columns.payloads:
+        if info['utxos'] and info['byte_fee'] is not None:
+            vbytes = _payload_vbytes(info)
+            own_vbytes += vbytes
+            own_fee += vbytes * info['byte_fee']
+    report['payload_fee'] = {'vbytes': own_vbytes, 'fee': own_fee}
+    return report
+
+
+def _fee_rows(total, vbytes_total, fee_rates, uneconomic_counts):
+    rows = []
+    for rate, uneconomic in zip(fee_rates, uneconomic_counts):
+        fee = vbytes_total * rate
+        rows.append({
+            'rate': rate,
+            'vbytes': vbytes_total,
+            'fee': fee,
+            'fee_pct': round(100.0 * fee / total, 4) if total else 0.0,
+            'uneconomic_utxos': uneconomic,
+        })
+    return rows
+
+
+def _analyze_python(columns, dust, fee_rates):
+    amounts = columns.amounts
+    count = len(amounts)
+    total = sum(amounts)
+    ordered = sorted(amounts)
+
+    labels = _bucket_labels()
+    hist_counts = [0] * len(labels)
+    hist_amounts = [0] * len(labels)
+    dust_count = dust_amount = 0
+    for amount in amounts:
+        bucket = 0
+        while bucket < len(HISTOGRAM_EDGES) and amount >= HISTOGRAM_EDGES[bucket]:
+            bucket += 1
+        hist_counts[bucket] += 1
+        hist_amounts[bucket] += amount
+        if amount < dust:
+            dust_count += 1
+            dust_amount += amount
+
+    # Duplicates: the same outpoint twice in one payload, or spent by several payloads
+    hashes = columns.hashes
+    seen = {}
+    within = 0
+    for position in range(count):
+        key = (bytes(hashes[position * 32:(position + 1) * 32]), columns.indexes[position])
+        owners = seen.setdefault(key, [])
+        payload_id = columns.payload_ids[position]
+        if payload_id in owners:
+            within += 1
+        else:
+            owners.append(payload_id)
+    conflicts = sorted(f"{h.hex()}:{i}" for (h, i), owners in seen.items() if len(owners) > 1)
+
+    input_sizes = [_sizes(info)[1] for info in columns.payloads]
+    vbytes_total = sum(_payload_vbytes(info) for info in columns.payloads if info['utxos'])
+    uneconomic = []
+    for rate in fee_rates:
+        uneconomic.append(sum(1 for position in range(count)
+                              if amounts[position] < rate * input_sizes[columns.payload_ids[position]]))
+
+    return {
+        'utxos': count,
+        'total': total,
+        'min': ordered[0] if count else 0,
+        'max': ordered[-1] if count else 0,
+        'mean': round(total / count, 4) if count else 0.0,
+        'median': float(statistics.median(ordered)) if count else 0.0,
+        'dust': {'threshold': dust, 'count': dust_count, 'amount': dust_amount},
+        'histogram': [{'range': label, 'count': c, 'amount': a}
+                      for label, c, a in zip(labels, hist_counts, hist_amounts)],
+        'duplicates': {'within_payload': within, 'across_payloads': len(conflicts),
+                       'examples': conflicts[:MAX_EXAMPLES]},
+        'fees': _fee_rows(total, vbytes_total, fee_rates, uneconomic),
+    }
+
+
+def _analyze_numpy(columns, dust, fee_rates):
+    count = len(columns)
+    amounts = np.frombuffer(columns.amounts, dtype=np.int64) if count else np.zeros(0, dtype=np.int64)
+    indexes = np.frombuffer(columns.indexes, dtype=np.uint32) if count else np.zeros(0, dtype=np.uint32)
+    payload_ids = np.frombuffer(columns.payload_ids, dtype=np.uint32) if count else np.zeros(0, dtype=np.uint32)
+    total = int(amounts.sum())
+
+    buckets = np.searchsorted(np.array(HISTOGRAM_EDGES, dtype=np.int64), amounts, side='right')
+    labels = _bucket_labels()
+    hist_counts = np.bincount(buckets, minlength=len(labels))
+    # bincount weights would go through float64; integer sums stay exact
+    hist_amounts = [int(amounts[buckets == b].sum()) if hist_counts[b] else 0 for b in range(len(labels))]
+    is_dust = amounts < dust
+
+    within = 0
+    conflicts = []
+    if count:
+        words = np.frombuffer(bytes(columns.hashes), dtype='>u8').reshape(-1, 4)
+        order = np.lexsort((payload_ids, indexes, words[:, 3], words[:, 2], words[:, 1], words[:, 0]))
+        words, sorted_idx, sorted_pay = words[order], indexes[order], payload_ids[order]
+        same = np.all(words[1:] == words[:-1], axis=1) & (sorted_idx[1:] == sorted_idx[:-1])
+        repeat = same & (sorted_pay[1:] == sorted_pay[:-1])
+        within = int(repeat.sum())
+        # Drop the in-payload repeats, then any remaining neighbour with the same outpoint is another payload
+        keep = np.concatenate(([True], ~repeat))
+        words, sorted_idx = words[keep], sorted_idx[keep]
+        shared = np.all(words[1:] == words[:-1], axis=1) & (sorted_idx[1:] == sorted_idx[:-1])
+        starts = np.flatnonzero(shared & ~np.concatenate(([False], shared[:-1])))
+        for position in starts:
+            txid = words[position].astype('>u8').tobytes().hex()
+            conflicts.append(f"{txid}:{int(sorted_idx[position])}")
+        conflicts.sort()
+
+    input_sizes = np.array([_sizes(info)[1] for info in columns.payloads], dtype=np.int64)
+    per_utxo_input = input_sizes[payload_ids] if count else np.zeros(0, dtype=np.int64)
+    vbytes_total = sum(_payload_vbytes(info) for info in columns.payloads if info['utxos'])
+    uneconomic = [int((amounts < rate * per_utxo_input).sum()) for rate in fee_rates]
+
+    return {
+        'utxos': count,
+        'total': total,
+        'min': int(amounts.min()) if count else 0,
+        'max': int(amounts.max()) if count else 0,
+        'mean': round(total / count, 4) if count else 0.0,
+        'median': float(np.median(amounts)) if count else 0.0,
+        'dust': {'threshold': dust, 'count': int(is_dust.sum()), 'amount': int(amounts[is_dust].sum())},
+        'histogram': [{'range': label, 'count': int(c), 'amount': a}
+                      for label, c, a in zip(labels, hist_counts, hist_amounts)],
+        'duplicates': {'within_payload': within, 'across_payloads': len(conflicts),
+                       'examples': conflicts[:MAX_EXAMPLES]},
+        'fees': _fee_rows(total, vbytes_total, fee_rates, uneconomic),
+    }
@@ -1,24 +1,56 @@
 """
 Vault command implementations for vultitool
-Handles all vault-related operations: parse, inspect, validate, export
+Handles all vault-related operations: parse, inspect, validate, scan, sort, lineage, export, rekey, pack, bundle
 """
 
-import base64
+import os
 import sys
 import json
-import yaml
+import time
 import getpass
+import argparse
+import yaml
+from collections import Counter
 from pathlib import Path
-from datetime import datetime
 
-# Add generated protobuf path and commands path
-sys.path.insert(0, str(Path(__file__).parent.parent / "generated"))
+# Add commands path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from vultisig.vault.v1.vault_container_pb2 import VaultContainer
-from vultisig.vault.v1.vault_pb2 import Vault
-from vultisig.keygen.v1.lib_type_message_pb2 import LibType
-from crypto import VaultDecryptor
+from loader import load_vault, load_vaults, VaultLoadError
+from credentials import Credential, CredentialError, configure as configure_credentials, configured_source
+from rules import RULES, RuleEngine, SEVERITY_ERROR
+from batch import BatchScanner, ScanSummary, iter_vault_files
+from gobackend import GoBackendError
+from curves import PointChecker, curve_for_key, CURVE_SECP256K1, CURVE_ED25519
+from addresses import CHAINS
+from derive import derive_addresses, DerivationError
+from addrindex import AddressIndex, AddressIndexError, build_index
+from lineage import Lineage, UNKNOWN_PREFIX
+from payloads import FRAMINGS, PayloadDecodeError, decode_keygen, iter_inputs
+from vaultcodecs import CodecError, codec_named
+from rekey import OP_DECRYPT, OP_ENCRYPT, OP_REKEY, Journal, RekeyError, plan, run as run_rewrite, write_atomic
+from pack import PACK_SUFFIX, PackError, is_pack, pack, pack_path, unpack
+from timings import span
+import metrics
+from bundle import Bundle, BundleError, open_bundle, write_bundle
+from checkpoint import Checkpoint, CheckpointError, absolute
+from objectstore import S3Error
+from shards import ScanPartial, ShardError, load_partial, merge_partials, parse_shard, shard_of
+from extsort import SortError, group_records, open_output, parse_fields, parse_size, sort_records
+
+
+def _io_depth(value):
+    """--io-depth: 'auto' or a positive number of reads"""
+    if value == 'auto':
+        return value
+    try:
+        depth = int(value)
+    except ValueError:
+        depth = 0
+    if depth < 1:
+        raise argparse.ArgumentTypeError(f"invalid value '{value}' (use a positive number or 'auto')")
+    return depth
+
 
 class VaultCommands:
     @staticmethod
@@ -33,18 +65,218 @@ class VaultCommands:
         parse_parser.add_argument('--summary', action='store_true', help='Brief summary only')
         parse_parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
         parse_parser.add_argument('--password', '-p', help='Vault password (if encrypted)')
+        parse_parser.add_argument('--password-file', metavar='FILE',
+                                  help='YAML map of path globs, vault names or public keys to passwords')
         
         # Inspect command  
         inspect_parser = subparsers.add_parser('inspect', help='Detailed vault inspection')
         inspect_parser.add_argument('file', help='Path to .vult file')
         inspect_parser.add_argument('--show-keyshares', action='store_true', help='Show key share data (sensitive!)')
         inspect_parser.add_argument('--password', '-p', help='Vault password (if encrypted)')
+        inspect_parser.add_argument('--password-file', metavar='FILE',
+                                    help='YAML map of path globs, vault names or public keys to passwords')
         
         # Validate command
         validate_parser = subparsers.add_parser('validate', help='Validate vault format')
-        validate_parser.add_argument('file', help='Path to .vult file')
+        validate_parser.add_argument('file', nargs='+',
+                                     help='Path(s) to .vult files, directories or s3://bucket/prefix sources')
         validate_parser.add_argument('--strict', action='store_true', help='Strict validation')
+        validate_parser.add_argument('--rules', help="Comma-separated rule names to run, or 'all'")
+        validate_parser.add_argument('--json', action='store_true', help='Output as JSON')
         validate_parser.add_argument('--password', '-p', help='Vault password (if encrypted)')
+        validate_parser.add_argument('--password-file', metavar='FILE',
+                                     help='YAML map of path globs, vault names or public keys to passwords')
+        validate_parser.add_argument('--backend', choices=['python', 'go'], default='python',
+                                     help='Decryption backend for batches (go: pipelined vultitool-go workers)')
+        validate_parser.add_argument('--go-workers', type=int, default=1, help='Go worker processes')
+        validate_parser.add_argument('--io-depth', type=_io_depth, default='auto', metavar='N|auto',
+                                     help='Files read at once while others decode (default: auto, overlapping only on network mounts)')
+        validate_parser.add_argument('--checkpoint', metavar='FILE',
+                                     help='Journal finished files to FILE so an interrupted run can be resumed')
+        validate_parser.add_argument('--resume', action='store_true',
+                                     help='Continue the --checkpoint journal, skipping files already finished')
+        validate_parser.add_argument('--output', '-o', metavar='FILE',
+                                     help='Write per-file results to FILE (exactly once across --resume)')
+        
+        # Scan command
+        scan_parser = subparsers.add_parser('scan', help='Batch-scan files and directories of vaults')
+        scan_parser.add_argument('paths', nargs='+',
+                                 help='Paths to .vult files, directories or s3://bucket/prefix sources')
+        scan_parser.add_argument('--strict', action='store_true', help='Include strict rules')
+        scan_parser.add_argument('--rules', help="Comma-separated rule names to run, or 'all'")
+        scan_parser.add_argument('--json', action='store_true', help='Output summary as JSON')
+        scan_parser.add_argument('--ndjson', action='store_true', help='Stream one JSON record per file')
+        scan_parser.add_argument('--password', '-p', help='Password for encrypted vaults')
+        scan_parser.add_argument('--password-file', metavar='FILE',
+                                 help='YAML map of path globs, vault names or public keys to passwords')
+        scan_parser.add_argument('--backend', choices=['python', 'go'], default='python',
+                                 help='Decryption backend (go: pipelined vultitool-go workers)')
+        scan_parser.add_argument('--go-workers', type=int, default=1, help='Go worker processes')
+        scan_parser.add_argument('--io-depth', type=_io_depth, default='auto', metavar='N|auto',
+                                 help='Files read at once while others decode (default: auto, overlapping only on network mounts)')
+        scan_parser.add_argument('--checkpoint', metavar='FILE',
+                                 help='Journal finished files to FILE so an interrupted run can be resumed')
+        scan_parser.add_argument('--resume', action='store_true',
+                                 help='Continue the --checkpoint journal, skipping files already finished')
+        scan_parser.add_argument('--output', '-o', metavar='FILE',
+                                 help='Write per-file results to FILE (exactly once across --resume)')
+        scan_parser.add_argument('--shard', metavar='i/N',
+                                 help='Scan only the files whose path hash falls in shard i of N (0 to N-1)')
+        scan_parser.add_argument('--partial', metavar='FILE',
+                                 help="Write a mergeable partial result (summary, groups, catalog) for 'vault merge'")
+        
+        # Merge command
+        merge_parser = subparsers.add_parser('merge', help='Merge partial results of sharded scans')
+        merge_parser.add_argument('partials', nargs='+', help='Partial result files from vault scan --partial')
+        merge_parser.add_argument('--output', '-o', metavar='FILE', help='Write the merged partial (itself mergeable)')
+        merge_parser.add_argument('--json', action='store_true', help='Output summary as JSON')
+        
+        # Sort and group-by commands over scan records
+        sort_parser = subparsers.add_parser('sort', help='Sort NDJSON scan records by fields, in bounded memory')
+        groupby_parser = subparsers.add_parser('groupby', help='Group NDJSON scan records by fields, in bounded memory')
+        for stream_parser in (sort_parser, groupby_parser):
+            stream_parser.add_argument('inputs', nargs='*',
+                                       help="NDJSON files from vault scan --ndjson/--output (default/'-': stdin)")
+            stream_parser.add_argument('--key', '-k', required=True, metavar='FIELD[,FIELD...]',
+                                       help='Record fields to order by, e.g. public_key_ecdsa or name')
+            stream_parser.add_argument('--output', '-o', metavar='FILE',
+                                       help='Write to FILE (replaced once complete; may be an input)')
+            stream_parser.add_argument('--memory', '-S', default='256M', metavar='SIZE',
+                                       help='Records held in memory before a sorted run is spilled (default: 256M)')
+            stream_parser.add_argument('--tmp-dir', '-T', metavar='DIR',
+                                       help='Directory for spilled runs (default: $TMPDIR or /tmp)')
+        sort_parser.add_argument('--reverse', '-r', action='store_true', help='Descending order')
+        groupby_parser.add_argument('--collect', '-c', metavar='FIELD[,FIELD...]',
+                                    help="Fields to list per group, e.g. local_party_id,path")
+        groupby_parser.add_argument('--min-count', type=int, default=1, metavar='N',
+                                    help='Only output groups of at least N records (2: duplicates)')
+        
+        # Rules command
+        subparsers.add_parser('rules', help='List available validation rules')
+        
+        # Keycheck command
+        keycheck_parser = subparsers.add_parser('keycheck', help='Check that public keys are valid curve points')
+        keycheck_parser.add_argument('paths', nargs='*', help='Paths to .vult files or directories')
+        keycheck_parser.add_argument('--keys-file', help="File with one hex public key per line ('-' for stdin)")
+        keycheck_parser.add_argument('--curve', choices=['auto', CURVE_SECP256K1, CURVE_ED25519], default='auto',
+                                     help='Curve for --keys-file keys (auto: by key length)')
+        keycheck_parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                                     help='Worker processes for large batches')
+        keycheck_parser.add_argument('--json', action='store_true', help='Output as JSON')
+        keycheck_parser.add_argument('--password', '-p', help='Password for encrypted vaults')
+        keycheck_parser.add_argument('--password-file', metavar='FILE',
+                                     help='YAML map of path globs, vault names or public keys to passwords')
+        
+        # Derive command
+        derive_parser = subparsers.add_parser('derive', help='Derive watch-only child keys and addresses')
+        derive_parser.add_argument('paths', nargs='+', help='Paths to .vult files or directories')
+        derive_parser.add_argument('--chain', default='bitcoin',
+                                   help=f"Comma-separated chains ({', '.join(CHAINS)})")
+        derive_parser.add_argument('--path', dest='derivation_path',
+                                   help="Derivation path; 'i' as last component expands to the index range "
+                                        "(default: the chain's receive path)")
+        derive_parser.add_argument('--count', '-n', type=int, default=1, help='Number of indexes to derive')
+        derive_parser.add_argument('--start', type=int, default=0, help='First index')
+        derive_parser.add_argument('--json', action='store_true', help='Stream one JSON record per address')
+        derive_parser.add_argument('--password', '-p', help='Password for encrypted vaults')
+        derive_parser.add_argument('--password-file', metavar='FILE',
+                                   help='YAML map of path globs, vault names or public keys to passwords')
+        
+        # Address index commands
+        index_parser = subparsers.add_parser('index-addresses', help='Build or extend an address-to-vault index')
+        index_parser.add_argument('paths', nargs='+', help='Paths to .vult files or directories')
+        index_parser.add_argument('--index', required=True, help='Index file to create or update')
+        index_parser.add_argument('--chain', default=','.join(CHAINS),
+                                  help='Comma-separated chains to index (default: all)')
+        index_parser.add_argument('--count', '-n', type=int, default=20,
+                                  help='Receive and change addresses per chain')
+        index_parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                                  help='Worker processes for derivation')
+        index_parser.add_argument('--password', '-p', help='Password for encrypted vaults')
+        index_parser.add_argument('--password-file', metavar='FILE',
+                                  help='YAML map of path globs, vault names or public keys to passwords')
+        
+        whose_parser = subparsers.add_parser('whose', help='Find the vault an address belongs to')
+        whose_parser.add_argument('address', help='On-chain address')
+        whose_parser.add_argument('--index', required=True, help='Index file built by index-addresses')
+        whose_parser.add_argument('--json', action='store_true', help='Output as JSON')
+        
+        # Reshare lineage command
+        lineage_parser = subparsers.add_parser('lineage', help='Join keygen/reshare sessions to vault files')
+        lineage_parser.add_argument('paths', nargs='+', help='Paths to .vult files or directories')
+        lineage_parser.add_argument('--sessions', nargs='+', default=[],
+                                    help="Captured keygen/reshare messages, as for 'keygen decode'")
+        lineage_parser.add_argument('--framing', choices=FRAMINGS, default='lines',
+                                    help='Framing of the session files')
+        lineage_parser.add_argument('--all', action='store_true',
+                                    help='Also list vaults no session refers to')
+        lineage_parser.add_argument('--json', action='store_true', help='Output as JSON')
+        lineage_parser.add_argument('--password', '-p', help='Password for encrypted vaults')
+        lineage_parser.add_argument('--password-file', metavar='FILE',
+                                    help='YAML map of path globs, vault names or public keys to passwords')
+        
+        # Rekey / encrypt / decrypt-out commands
+        rewrite_help = {
+            OP_REKEY: 'Re-encrypt vaults under a new password (or codec)',
+            OP_ENCRYPT: 'Encrypt unencrypted vaults',
+            OP_DECRYPT: 'Write unencrypted copies of encrypted vaults',
+        }
+        for op, help_text in rewrite_help.items():
+            rewrite_parser = subparsers.add_parser(op, help=help_text)
+            rewrite_parser.add_argument('paths', nargs='+', help='Paths to .vult files or directories')
+            if op == OP_DECRYPT:
+                rewrite_parser.add_argument('--output-dir', '-o', required=True, help='Directory for the unencrypted copies')
+            else:
+                target = rewrite_parser.add_mutually_exclusive_group(required=True)
+                target.add_argument('--output-dir', '-o', help='Write rewritten vaults under this directory')
+                target.add_argument('--in-place', action='store_true', help='Replace each vault file atomically')
+            if op != OP_ENCRYPT:
+                rewrite_parser.add_argument('--password', '-p', help='Current vault password')
+                rewrite_parser.add_argument('--password-file', metavar='FILE',
+                                            help='YAML map of path globs, vault names or public keys to passwords')
+            if op != OP_DECRYPT:
+                rewrite_parser.add_argument('--new-password', help='New password (prompted for if omitted)')
+                rewrite_parser.add_argument('--codec', help="Codec to seal with, e.g. 'v1/aes-256-gcm+sha256' (see 'doctor codecs')")
+                rewrite_parser.add_argument('--scrypt-log2n', type=int, help='scrypt work factor for scrypt codecs')
+                rewrite_parser.add_argument('--scrypt-r', type=int, help='scrypt block size for scrypt codecs')
+                rewrite_parser.add_argument('--scrypt-p', type=int, help='scrypt parallelism for scrypt codecs')
+            rewrite_parser.add_argument('--journal', metavar='FILE',
+                                        help='Record finished files here and skip them when rerun')
+            rewrite_parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                                        help='Worker processes')
+            rewrite_parser.add_argument('--json', action='store_true', help='Output one JSON record per file')
+        
+        # Pack / unpack commands
+        pack_parser = subparsers.add_parser('pack', help='Write compact binary .vultpack sidecars for faster reads')
+        pack_parser.add_argument('paths', nargs='+', help='Paths to .vult files or directories')
+        pack_parser.add_argument('--output-dir', '-o', help='Write sidecars under this directory instead of beside each file')
+        pack_parser.add_argument('--json', action='store_true', help='Output as JSON')
+        unpack_parser = subparsers.add_parser('unpack', help='Rebuild the original .vult files from .vultpack files')
+        unpack_parser.add_argument('paths', nargs='+', help='Paths to .vultpack files or directories')
+        unpack_parser.add_argument('--output-dir', '-o', help='Write .vult files under this directory instead of beside each pack')
+        unpack_parser.add_argument('--force', action='store_true', help='Overwrite a different existing .vult file')
+        unpack_parser.add_argument('--json', action='store_true', help='Output as JSON')
+        
+        # Bundle commands
+        bundle_parser = subparsers.add_parser('bundle', help='Combine vault files into one indexed .vultb bundle')
+        bundle_subparsers = bundle_parser.add_subparsers(dest='bundle_action', help='Bundle operations')
+        create_parser = bundle_subparsers.add_parser('create', help='Write a bundle of vault files')
+        create_parser.add_argument('output', help='Bundle file to write (.vultb)')
+        create_parser.add_argument('paths', nargs='+', help='Paths to .vult/.vultpack files or directories')
+        create_parser.add_argument('--password', '-p', help='Password for indexing encrypted vaults')
+        create_parser.add_argument('--password-file', metavar='FILE',
+                                   help='YAML map of path globs, vault names or public keys to passwords')
+        create_parser.add_argument('--json', action='store_true', help='Output as JSON')
+        ls_parser = bundle_subparsers.add_parser('ls', help='List the members of a bundle')
+        ls_parser.add_argument('bundle', help='Bundle file')
+        ls_parser.add_argument('--json', action='store_true', help='Output as JSON')
+        extract_parser = bundle_subparsers.add_parser('extract', help='Write bundle members back out as .vult files')
+        extract_parser.add_argument('bundle', help='Bundle file')
+        extract_parser.add_argument('members', nargs='*',
+                                    help="Members to extract: name, 'pubkey:HEX', 'party:ID' or 'name:VAULT' (default: all)")
+        extract_parser.add_argument('--output-dir', '-o', default='.', help='Directory to write into')
+        extract_parser.add_argument('--force', action='store_true', help='Overwrite a different existing .vult file')
+        extract_parser.add_argument('--json', action='store_true', help='Output as JSON')
         
         # Export command
         export_parser = subparsers.add_parser('export', help='Export vault data')
@@ -52,18 +284,52 @@ class VaultCommands:
         export_parser.add_argument('output', help='Output file path')
         export_parser.add_argument('--format', choices=['json', 'yaml'], default='json', help='Output format')
         export_parser.add_argument('--password', '-p', help='Vault password (if encrypted)')
+        export_parser.add_argument('--password-file', metavar='FILE',
+                                   help='YAML map of path globs, vault names or public keys to passwords')
     
     @staticmethod
     def handle(args):
         """Route vault commands to appropriate handlers"""
+        try:
+            configure_credentials(getattr(args, 'password_file', None))
+        except CredentialError as e:
+            print(f"Error: {e}")
+            return 1
+        
         if args.vault_action == 'parse':
             return VaultCommands.parse(args)
         elif args.vault_action == 'inspect':
             return VaultCommands.inspect(args)
         elif args.vault_action == 'validate':
             return VaultCommands.validate(args)
+        elif args.vault_action == 'scan':
+            return VaultCommands.scan(args)
+        elif args.vault_action == 'merge':
+            return VaultCommands.merge(args)
+        elif args.vault_action in ('sort', 'groupby'):
+            return VaultCommands.sort(args)
+        elif args.vault_action == 'rules':
+            return VaultCommands.list_rules(args)
+        elif args.vault_action == 'keycheck':
+            return VaultCommands.keycheck(args)
+        elif args.vault_action == 'derive':
+            return VaultCommands.derive(args)
+        elif args.vault_action == 'index-addresses':
+            return VaultCommands.index_addresses(args)
+        elif args.vault_action == 'whose':
+            return VaultCommands.whose(args)
+        elif args.vault_action == 'lineage':
+            return VaultCommands.lineage(args)
         elif args.vault_action == 'export':
             return VaultCommands.export(args)
+        elif args.vault_action in (OP_REKEY, OP_ENCRYPT, OP_DECRYPT):
+            return VaultCommands.rewrite(args)
+        elif args.vault_action == 'pack':
+            return VaultCommands.pack(args)
+        elif args.vault_action == 'unpack':
+            return VaultCommands.unpack(args)
+        elif args.vault_action == 'bundle':
+            return VaultCommands.bundle(args)
         else:
             print("No vault action specified. Use --help for usage.")
             return 1
@@ -77,7 +343,8 @@ class VaultCommands:
                 return 1
                 
             if args.json:
-                print(json.dumps(vault_data, indent=2))
+                with span('export'):
+                    print(json.dumps(vault_data, indent=2))
             elif args.summary:
                 VaultCommands._print_summary(vault_data)
             else:
@@ -112,38 +379,35 @@ class VaultCommands:
     def validate(args):
         """Validate vault format"""
         try:
-            vault_data = VaultCommands._load_vault(args.file, password=getattr(args, 'password', None))
+            engine = RuleEngine(args.rules, strict=args.strict)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        
+        if (len(args.file) > 1 or Path(args.file[0]).is_dir() or args.json or args.backend == 'go'
+                or args.checkpoint or args.output):
+            return VaultCommands._validate_batch(args, engine)
+        
+        try:
+            vault_data = VaultCommands._load_vault(args.file[0], password=getattr(args, 'password', None),
+                                                   fields=engine.fields)
             if not vault_data:
                 return 1
             
-            issues = []
-            
-            # Basic validation
-            if not vault_data.get('vault', {}).get('name'):
-                issues.append("Missing vault name")
-            
-            if not vault_data.get('vault', {}).get('public_key_ecdsa'):
-                issues.append("Missing ECDSA public key")
-            
-            if not vault_data.get('vault', {}).get('signers'):
-                issues.append("No signers found")
-            
-            if not vault_data.get('vault', {}).get('key_shares'):
-                issues.append("No key shares found")
+            findings = engine.run(vault_data.get('vault', {}))
+            errors = [f for f in findings if f['severity'] == SEVERITY_ERROR]
+            warnings = [f for f in findings if f['severity'] != SEVERITY_ERROR]
             
-            # Strict validation
-            if args.strict:
-                vault = vault_data.get('vault', {})
-                if vault.get('lib_type') not in ['GG20', 'DKLS']:
-                    issues.append("Unknown lib_type")
-                
-                if len(vault.get('signers', [])) != len(vault.get('key_shares', [])):
-                    issues.append("Mismatch between signers and key shares count")
-            
-            if issues:
+            if errors:
                 print("❌ Validation failed:")
-                for issue in issues:
-                    print(f"  - {issue}")
+                for finding in errors:
+                    print(f"  - {finding['message']} [{finding['rule']}]")
+            if warnings:
+                print("⚠️  Warnings:")
+                for finding in warnings:
+                    print(f"  - {finding['message']} [{finding['rule']}]")
+            
+            if errors:
                 return 1
             else:
                 print("✅ Vault validation passed")
@@ -153,6 +417,511 @@ class VaultCommands:
             print(f"Error validating vault: {e}")
             return 1
     
+    @staticmethod
+    def _validate_batch(args, engine):
+        """Validate many files, printing a verdict per file and per-rule totals"""
+        if args.json and (args.checkpoint or args.output):
+            print("Error: --json collects every result into one document; use 'vault scan --ndjson' with --checkpoint")
+            return 1
+        scanner = BatchScanner(engine, password=getattr(args, 'password', None),
+                               backend=args.backend, workers=args.go_workers, io_depth=args.io_depth)
+        records = []
+        
+        def emit(record):
+            if args.json:
+                records.append(record)
+            elif record['error']:
+                print(f"❌ {record['path']}: {record['message']}", file=out)
+            else:
+                print(f"{'✅' if record['passed'] else '❌'} {record['path']}", file=out)
+                for finding in record['findings']:
+                    print(f"    - {finding['message']} [{finding['rule']}]", file=out)
+        
+        try:
+            checkpoint, out = VaultCommands._open_batch_output(args, 'validate', args.file, scanner)
+        except (CheckpointError, OSError) as e:
+            print(f"Error: {e}")
+            return 1
+        if not VaultCommands._run_batch(scanner, args.file, checkpoint, out, emit):
+            return 1
+        
+        if args.json:
+            print(json.dumps({'results': records, 'summary': scanner.summary.to_dict()}, indent=2))
+        else:
+            print()
+            VaultCommands._print_scan_summary(scanner.summary)
+        
+        return 0 if scanner.summary.failed == 0 else 1
+    
+    @staticmethod
+    def scan(args):
+        """Batch-scan vault files and report aggregated counts"""
+        try:
+            engine = RuleEngine(args.rules, strict=args.strict)
+            shard = parse_shard(args.shard) if args.shard else None
+        except (ValueError, ShardError) as e:
+            print(f"Error: {e}")
+            return 1
+        if args.partial and args.checkpoint and not args.output:
+            print("Error: --partial with --checkpoint needs --output, which the partial is rebuilt from on --resume")
+            return 1
+        
+        scanner = BatchScanner(engine, password=args.password, backend=args.backend, workers=args.go_workers,
+                               io_depth=args.io_depth)
+        try:
+            checkpoint, out = VaultCommands._open_batch_output(args, 'scan', args.paths, scanner)
+        except (CheckpointError, OSError) as e:
+            print(f"Error: {e}")
+            return 1
+        
+        partial = None
+        if args.partial:
+            index, count = shard or (0, 1)
+            partial = ScanPartial([rule.name for rule in engine.rules], count, [index], scanner.summary)
+            if checkpoint and checkpoint.resumed:
+                # The records of the files finished before are exactly those left in the output
+                with open(args.output, encoding='utf-8') as f:
+                    for line in f:
+                        partial.add(json.loads(line))
+        
+        def emit(record):
+            if args.ndjson or args.output:
+                print(json.dumps(record), file=out, flush=out is sys.stdout)
+            if partial is not None:
+                partial.add(record)
+        
+        if not VaultCommands._run_batch(scanner, args.paths, checkpoint, out, emit, shard):
+            return 1
+        
+        if partial is not None:
+            try:
+                partial.write(args.partial)
+            except OSError as e:
+                print(f"Error: Cannot write partial {args.partial}: {e}")
+                return 1
+            print(f"🧩 Partial for shard {args.shard or '0/1'} written to {args.partial}", file=sys.stderr)
+        
+        summary = scanner.summary
+        if args.json:
+            print(json.dumps(summary.to_dict(), indent=2))
+        elif not args.ndjson or args.output:
+            VaultCommands._print_scan_summary(summary)
+        return 0 if summary.failed == 0 else 1
+    
+    @staticmethod
+    def merge(args):
+        """Merge the partial results of sharded scans"""
+        try:
+            merged = merge_partials([load_partial(path) for path in args.partials])
+            if args.output:
+                merged.write(args.output)
+        except ShardError as e:
+            print(f"Error: {e}")
+            return 1
+        except OSError as e:
+            print(f"Error: Cannot write {args.output}: {e}")
+            return 1
+        
+        summary = merged.summary
+        reconcile = merged.reconcile()
+        if args.json:
+            print(json.dumps({'shard_count': merged.count, 'shards': sorted(merged.shards), 'missing': merged.missing,
+                              'complete': not merged.missing, 'summary': summary.to_dict(),
+                              'reconcile': reconcile}, indent=2))
+        else:
+            print(f"🧩 Merged {len(args.partials)} partial(s): {len(merged.shards)} of {merged.count} shard(s)")
+            if merged.missing:
+                print(f"⚠️  Incomplete: shard(s) {', '.join(str(s) for s in merged.missing)} missing")
+            VaultCommands._print_scan_summary(summary)
+            print(f"Vaults: {reconcile['vaults']}  Single share found: {reconcile['single_share']}  "
+                  f"Same party's share more than once: {reconcile['duplicate_shares']}")
+            if args.output:
+                print(f"💾 Merged partial written to {args.output}")
+        return 0 if summary.failed == 0 else 1
+    
+    @staticmethod
+    def sort(args):
+        """Sort or group NDJSON scan records with an external merge sort"""
+        try:
+            fields = parse_fields(args.key)
+            memory = parse_size(args.memory)
+            with open_output(args.output) as out:
+                if args.vault_action == 'sort':
+                    sorter = sort_records(args.inputs, fields, out, memory, args.tmp_dir, args.reverse)
+                    done = f"Sorted {sorter.records:,} record(s)"
+                else:
+                    collect = parse_fields(args.collect) if args.collect else []
+                    sorter, groups = group_records(args.inputs, fields, out, collect, args.min_count,
+                                                   memory, args.tmp_dir)
+                    done = f"Grouped {sorter.records:,} record(s) into {groups:,} group(s)"
+        except (SortError, OSError) as e:
+            # stdout may be the sorted stream
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        
+        spilled = f", {sorter.runs:,} run(s) spilled and merged in {sorter.passes} pass(es)" if sorter.runs else ''
+        where = f" to {args.output}" if args.output else ''
+        print(f"🔀 {done} by {', '.join(fields)}{where}{spilled}", file=sys.stderr)
+        return 0
+    
+    @staticmethod
+    def _open_batch_output(args, command, paths, scanner):
+        """
+        Open the --checkpoint journal and --output file of a batch scan
+        
+        On --resume the summary of the files already finished is restored
+        into scanner, so totals and the exit code cover the whole job.
+        
+        Returns:
+            (Checkpoint or None, stream per-file results are written to)
+        
+        Raises:
+            CheckpointError: If the checkpoint cannot be used
+            OSError: If the output file cannot be opened
+        """
+        if not args.checkpoint:
+            if args.resume:
+                raise CheckpointError('usage', "--resume needs --checkpoint FILE")
+            return None, open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        
+        identity = {'command': command, 'paths': [absolute(p) for p in paths],
+                    'rules': [rule.name for rule in scanner.engine.rules]}
+        if getattr(args, 'shard', None):
+            identity['shard'] = args.shard
+        checkpoint = Checkpoint(args.checkpoint, identity, resume=args.resume, output=args.output)
+        if checkpoint.state:
+            scanner.summary = ScanSummary.from_dict(checkpoint.state)
+        if args.resume:
+            print(f"♻️  Resuming {args.checkpoint}: {checkpoint.resumed:,} file(s) already finished", file=sys.stderr)
+        return checkpoint, checkpoint.output
+    
+    @staticmethod
+    def _run_batch(scanner, paths, checkpoint, out, emit, shard=None):
+        """Scan paths (those of one shard), passing each record to emit and journalling it; False if the Go backend or a listing failed"""
+        state = scanner.summary.to_dict
+        skips = []
+        if shard is not None:
+            index, count = shard
+            skips.append(lambda path: shard_of(path, count) != index)
+        if checkpoint:
+            skips.append(checkpoint.is_finished)
+        skip = (lambda path: any(test(path) for test in skips)) if skips else None
+        try:
+            for record in scanner.scan(paths, skip=skip):
+                emit(record)
+                if checkpoint:
+                    checkpoint.add(record['path'], record, state)
+        except (GoBackendError, S3Error) as e:
+            print(f"Error: {e}")
+            return False
+        finally:
+            if checkpoint:
+                checkpoint.close(state())
+            elif out is not sys.stdout:
+                out.close()
+        return True
+    
+    @staticmethod
+    def list_rules(args):
+        """List the registered validation rules"""
+        print(f"{'Rule':<24} {'Severity':<8} {'Set':<8} Description")
+        for rule in RULES.values():
+            rule_set = 'strict' if rule.strict else 'default'
+            print(f"{rule.name:<24} {rule.severity:<8} {rule_set:<8} {rule.description}")
+        return 0
+    
+    @staticmethod
+    def keycheck(args):
+        """Validate vault and key share public keys as curve points, in bulk"""
+        if not args.paths and not args.keys_file:
+            print("Error: Provide vault paths and/or --keys-file")
+            return 1
+        
+        items = []
+        sources = []
+        load_errors = 0
+        
+        for path in iter_vault_files(args.paths):
+            try:
+                data = load_vault(path, password=args.password, json_mode=True, prompt=False,
+                                  fields=['public_key_ecdsa', 'public_key_eddsa', 'key_shares'])
+            except VaultLoadError as e:
+                print(f"⚠️  Skipping {path}: {e}", file=sys.stderr)
+                load_errors += 1
+                continue
+            vault = data.get('vault', {})
+            keys = [vault.get('public_key_ecdsa'), vault.get('public_key_eddsa')]
+            keys += [share['public_key'] for share in vault.get('key_shares', [])]
+            for key in keys:
+                if key:
+                    items.append((curve_for_key(key), key.lower()))
+                    sources.append(str(path))
+        
+        if args.keys_file:
+            stream = sys.stdin if args.keys_file == '-' else open(args.keys_file, 'r')
+            try:
+                curve = None if args.curve == 'auto' else args.curve
+                for line_no, line in enumerate(stream, 1):
+                    key = line.strip()
+                    if key and not key.startswith('#'):
+                        items.append((curve or curve_for_key(key), key.lower()))
+                        sources.append(f"{args.keys_file}:{line_no}")
+            finally:
+                if stream is not sys.stdin:
+                    stream.close()
+        
+        checker = PointChecker(jobs=max(1, args.jobs))
+        start = time.perf_counter()
+        reasons = checker.check_many(items)
+        elapsed = time.perf_counter() - start
+        
+        invalid = [{'source': src, 'curve': curve, 'key': key, 'reason': reason}
+                   for (curve, key), src, reason in zip(items, sources, reasons) if reason]
+        by_reason = Counter(entry['reason'] for entry in invalid)
+        report = {
+            'keys': len(items),
+            'unique_keys': checker.misses,
+            'valid': len(items) - len(invalid),
+            'invalid': len(invalid),
+            'invalid_by_reason': dict(by_reason),
+            'load_errors': load_errors,
+            'elapsed_seconds': round(elapsed, 3),
+            'invalid_keys': invalid,
+        }
+        
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            rate = len(items) / elapsed if elapsed > 0 else 0
+            print(f"🔑 Keys checked: {len(items)} ({checker.misses} unique) in {elapsed:.2f}s ({rate:,.0f} keys/s)")
+            print(f"✅ Valid: {report['valid']}")
+            if invalid:
+                print(f"❌ Invalid: {len(invalid)}")
+                for reason, count in by_reason.most_common():
+                    print(f"  {reason:<16} {count}")
+                for entry in invalid:
+                    print(f"  - {entry['source']}: {entry['key']} ({entry['curve'] or 'unknown curve'}: {entry['reason']})")
+        
+        return 0 if not invalid and not load_errors else 1
+    
+    @staticmethod
+    def derive(args):
+        """Derive child public keys and addresses from vault public keys and chain codes"""
+        chain_names = [c.strip() for c in args.chain.split(',') if c.strip()]
+        unknown = [c for c in chain_names if c not in CHAINS]
+        if unknown:
+            print(f"Error: Unknown chain(s): {', '.join(unknown)} (choose from {', '.join(CHAINS)})")
+            return 1
+        if args.count < 1 or args.start < 0:
+            print("Error: --count must be positive and --start non-negative")
+            return 1
+        
+        fields = ['name', 'public_key_ecdsa', 'public_key_eddsa', 'hex_chain_code']
+        seen = set()
+        status = 0
+        
+        for path in iter_vault_files(args.paths):
+            try:
+                data = load_vault(path, password=args.password, json_mode=True, prompt=False, fields=fields)
+            except VaultLoadError as e:
+                print(f"⚠️  Skipping {path}: {e}", file=sys.stderr)
+                status = 1
+                continue
+            
+            vault = data.get('vault', {})
+            # Every share of a vault derives the same addresses
+            vault_id = (vault.get('public_key_ecdsa'), vault.get('hex_chain_code'))
+            if vault_id in seen:
+                continue
+            seen.add(vault_id)
+            
+            if not args.json:
+                print(f"📁 Vault: {vault.get('name', 'Unnamed')} ({path})")
+            
+            for chain_name in chain_names:
+                try:
+                    for entry in derive_addresses(vault['public_key_ecdsa'], vault['hex_chain_code'],
+                                                  CHAINS[chain_name], path=args.derivation_path,
+                                                  start=args.start, count=args.count,
+                                                  public_key_eddsa=vault.get('public_key_eddsa')):
+                        if args.json:
+                            print(json.dumps({'vault': vault.get('name', ''),
+                                              'public_key_ecdsa': vault['public_key_ecdsa'],
+                                              'chain': chain_name, **entry}))
+                        else:
+                            print(f"  {chain_name:<10} {entry['path']:<24} {entry['address']}")
+                except DerivationError as e:
+                    print(f"Error: {e}", file=sys.stderr)
+                    status = 1
+        
+        return status
+    
+    @staticmethod
+    def index_addresses(args):
+        """Pre-derive addresses for every vault into an on-disk reverse index"""
+        chain_names = [c.strip() for c in args.chain.split(',') if c.strip()]
+        unknown = [c for c in chain_names if c not in CHAINS]
+        if unknown:
+            print(f"Error: Unknown chain(s): {', '.join(unknown)} (choose from {', '.join(CHAINS)})")
+            return 1
+        if args.count < 1:
+            print("Error: --count must be positive")
+            return 1
+        
+        vaults = []
+        skipped = 0
+        fields = ['name', 'public_key_ecdsa', 'public_key_eddsa', 'hex_chain_code']
+        for path in iter_vault_files(args.paths):
+            try:
+                data = load_vault(path, password=args.password, json_mode=True, prompt=False, fields=fields)
+            except VaultLoadError as e:
+                print(f"⚠️  Skipping {path}: {e}", file=sys.stderr)
+                skipped += 1
+                continue
+            vault = data.get('vault', {})
+            if not vault.get('public_key_ecdsa') or not vault.get('hex_chain_code'):
+                print(f"⚠️  Skipping {path}: vault has no ECDSA key or chain code", file=sys.stderr)
+                skipped += 1
+                continue
+            vaults.append(dict(vault, file=str(Path(path).resolve())))
+        
+        start = time.perf_counter()
+        try:
+            stats = build_index(args.index, vaults, chain_names, args.count, jobs=max(1, args.jobs))
+        except (AddressIndexError, DerivationError) as e:
+            print(f"Error: {e}")
+            return 1
+        elapsed = time.perf_counter() - start
+        
+        print(f"🗂️  Index: {args.index}")
+        print(f"📁 Vaults: {stats['vaults']} ({stats['new_vaults']} new, {stats['derived_vaults']} derived)")
+        print(f"🔗 Chains: {', '.join(stats['chains'])}")
+        print(f"📇 Addresses: {stats['entries']} in {elapsed:.2f}s")
+        if skipped:
+            print(f"⚠️  Skipped files: {skipped}")
+        return 0 if not skipped else 1
+    
+    @staticmethod
+    def whose(args):
+        """Look up the vault that owns an address"""
+        start = time.perf_counter()
+        try:
+            with AddressIndex(args.index) as index:
+                matches = index.lookup(args.address)
+        except (OSError, AddressIndexError) as e:
+            print(f"Error: {e}")
+            return 1
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        if args.json:
+            print(json.dumps({'address': args.address, 'matches': matches,
+                              'elapsed_ms': round(elapsed_ms, 3)}, indent=2))
+        elif not matches:
+            print(f"❌ {args.address} is not in the index ({elapsed_ms:.2f} ms)")
+        else:
+            for match in matches:
+                print(f"📁 Vault: {match['vault']}")
+                print(f"🔑 ECDSA Public Key: {match['public_key_ecdsa']}")
+                print(f"🔗 {match['chain']} {match['branch']} address at {match['path']}")
+                for file_path in match['files']:
+                    print(f"  - {file_path}")
+            print(f"⏱️  Lookup: {elapsed_ms:.2f} ms")
+        return 0 if matches else 1
+    
+    @staticmethod
+    def lineage(args):
+        """Build the reshare lineage of the catalogued vaults from captured sessions"""
+        graph = Lineage()
+        skipped = 0
+        fields = ['name', 'public_key_ecdsa', 'hex_chain_code', 'reshare_prefix', 'signers',
+                  'lib_type', 'created_at']
+        for path in iter_vault_files(args.paths):
+            try:
+                data = load_vault(path, password=args.password, json_mode=True, prompt=False, fields=fields)
+            except VaultLoadError as e:
+                print(f"⚠️  Skipping {path}: {e}", file=sys.stderr)
+                skipped += 1
+                continue
+            graph.add_vault(data.get('vault', {}), str(path))
+        
+        sessions = []
+        failed = 0
+        try:
+            for source, data in iter_inputs(args.sessions, args.framing) if args.sessions else ():
+                try:
+                    decoded = decode_keygen(data)
+                except PayloadDecodeError as e:
+                    print(f"⚠️  Skipping {source}: {e}", file=sys.stderr)
+                    failed += 1
+                    continue
+                sessions.append((source, decoded['type'], decoded['message']))
+        except (OSError, PayloadDecodeError) as e:
+            print(f"Error: {e}")
+            return 1
+        graph.add_sessions(sessions)
+        
+        report = graph.report(only_with_sessions=bool(args.sessions) and not args.all)
+        report['stats'].update(skipped_files=skipped, failed_sessions=failed)
+        status = 0 if not (skipped or failed) else 1
+        
+        if args.json:
+            print(json.dumps(report, indent=2))
+            return status
+        
+        for vault in report['vaults']:
+            print(f"📁 Vault: {vault['name']}")
+            print(f"🔑 ECDSA Public Key: {vault['public_key_ecdsa']}")
+            for session in vault['keygen_sessions']:
+                print(f"  🆕 Keygen session {session['session_id']} ({session['source']})")
+            edges = {edge['session_id']: edge for edge in vault['reshares']}
+            for generation in vault['generations']:
+                prefix = generation['reshare_prefix']
+                label = 'original' if prefix == '' else ('uncatalogued' if prefix == UNKNOWN_PREFIX else prefix)
+                signers = ', '.join(generation['signers']) if generation['signers'] is not None else 'unknown'
+                marker = '📄' if generation['catalogued'] else '👻'
+                edge = edges.get(generation['reshare_session'])
+                if edge is not None:
+                    change = ''
+                    if 'added' in edge:
+                        change = f" (+{len(edge['added'])} / -{len(edge['removed'])})"
+                    print(f"  🔁 Reshare {edge['session_id']} from {edge['parent'] or 'original'}{change}")
+                    if edge['party_mismatch']:
+                        print(f"    ⚠️  old_parties {', '.join(edge['old_parties'])} differ from the parent's signers")
+                print(f"  {marker} Generation {label}: {signers}")
+                for file_path in generation['files']:
+                    print(f"    - {file_path}")
+        
+        for session in report['unmatched']:
+            print(f"❓ Unmatched {session['type']} {session['session_id']} ({session['source']}): {session['reason']}")
+        stats = report['stats']
+        print(f"🧬 {stats['vaults']} vault(s), {stats['generations']} generation(s), "
+              f"{stats['reshares']} reshare(s), {stats['keygen_sessions']} keygen session(s), "
+              f"{stats['unmatched']} unmatched")
+        if skipped or failed:
+            print(f"⚠️  Skipped files: {skipped}, undecodable sessions: {failed}")
+        return status
+    
+    @staticmethod
+    def _print_scan_summary(summary):
+        """Print aggregated batch scan counts"""
+        print("=== Scan Summary ===")
+        print(f"Files: {summary.files}  Loaded: {summary.loaded}  Encrypted: {summary.encrypted}")
+        print(f"Passed: {summary.passed}  Failed: {summary.failed}")
+        
+        if summary.load_errors:
+            print("Load errors:")
+            for reason, count in summary.load_errors.most_common():
+                print(f"  {reason:<24} {count}")
+        
+        if summary.lib_types:
+            print("Lib types: " + ", ".join(f"{k}: {v}" for k, v in sorted(summary.lib_types.items())))
+        
+        if summary.rule_hits:
+            print("Rule hits (files):")
+            for rule_name, count in summary.rule_hits.most_common():
+                severity = RULES[rule_name].severity if rule_name in RULES else '?'
+                print(f"  {rule_name:<24} {severity:<8} {count}")
+    
     @staticmethod
     def export(args):
         """Export vault data to file"""
@@ -163,12 +932,13 @@ class VaultCommands:
             
             output_path = Path(args.output)
             
-            if args.format == 'json':
-                with open(output_path, 'w') as f:
-                    json.dump(vault_data, f, indent=2)
-            elif args.format == 'yaml':
-                with open(output_path, 'w') as f:
-                    yaml.dump(vault_data, f, default_flow_style=False)
+            with span('export'):
+                if args.format == 'json':
+                    with open(output_path, 'w') as f:
+                        json.dump(vault_data, f, indent=2)
+                elif args.format == 'yaml':
+                    with open(output_path, 'w') as f:
+                        yaml.dump(vault_data, f, default_flow_style=False)
             
             print(f"Exported vault data to {output_path} ({args.format})")
             return 0
@@ -178,111 +948,309 @@ class VaultCommands:
             return 1
     
     @staticmethod
-    def _load_vault(file_path, password=None, json_mode=False):
-        """Load and parse vault file, return structured data"""
-        path = Path(file_path)
+    def rewrite(args):
+        """Rekey, encrypt or decrypt-out a batch of vault files"""
+        op = args.vault_action
+        new_password = None
+        target = None
+        kdf_params = {}
+        try:
+            if op != OP_DECRYPT:
+                if args.codec:
+                    target = codec_named(args.codec)
+                    if not target.encrypted:
+                        print(f"Error: {args.codec} does not encrypt; use 'vault decrypt-out'")
+                        return 1
+                for name, value in (('log2_n', args.scrypt_log2n), ('r', args.scrypt_r), ('p', args.scrypt_p)):
+                    if value is not None:
+                        kdf_params[name] = value
+                if kdf_params and not (target and target.kdf.salted):
+                    print("Error: --scrypt-* options need a scrypt --codec")
+                    return 1
+                if kdf_params:
+                    target.kdf.new_params(**kdf_params)
+                new_password = args.new_password
+                if new_password is None:
+                    new_password = getpass.getpass(prompt='New vault password: ')
+                    if getpass.getpass(prompt='Repeat new vault password: ') != new_password:
+                        print("Error: Passwords do not match")
+                        return 1
+                if not new_password:
+                    print("Error: Empty new password")
+                    return 1
+            
+            sources = []
+            for entry in args.paths:
+                root = Path(entry) if Path(entry).is_dir() else None
+                sources.extend((path, root) for path in iter_vault_files([entry], packs=False))
+            pairs = plan(sources, op, args.output_dir)
+            journal = Journal(args.journal) if args.journal else None
+        except (CodecError, RekeyError) as e:
+            print(f"Error: {e}")
+            return 1
         
-        if not path.exists():
-            print(f"Error: File {file_path} does not exist")
-            return None
+        password = getattr(args, 'password', None)
+        credential_source = configured_source()
+        jobs = []
+        skipped = 0
+        try:
+            for source, dest in pairs:
+                if journal is not None and journal.is_finished(op, source):
+                    skipped += 1
+                    continue
+                if password is not None:
+                    credentials = [Credential('path:*', password=password).to_wire()]
+                elif credential_source is not None and op != OP_ENCRYPT:
+                    credentials = [c.to_wire() for c in credential_source.candidates(source)]
+                else:
+                    credentials = []
+                jobs.append({'op': op, 'source': str(source), 'dest': str(dest),
+                             'target': target.name if target else None, 'new_password': new_password,
+                             'kdf_params': kdf_params, 'credentials': credentials})
+        except CredentialError as e:
+            print(f"Error: {e}")
+            return 1
         
+        counts = Counter()
+        start = time.perf_counter()
         try:
-            # Read and decode file
-            with open(path, 'r') as f:
-                base64_content = f.read().strip()
-            
-            binary_data = base64.b64decode(base64_content)
-            
-            # Parse container
-            container = VaultContainer()
-            container.ParseFromString(binary_data)
-            
-            result = {
-                'file_info': {
-                    'path': str(path),
-                    'size_chars': len(base64_content),
-                    'size_bytes': len(binary_data)
-                },
-                'container': {
-                    'version': container.version,
-                    'is_encrypted': container.is_encrypted,
-                    'vault_data_length': len(container.vault)
-                }
-            }
-            
-            # Handle encrypted vault
-            if container.is_encrypted:
-                if password is None:
-                    password = getpass.getpass(prompt='Enter vault password: ')
-                
-                # Convert base64 vault data to bytes for decryption
-                encrypted_vault_bytes = base64.b64decode(container.vault)
-                
-                # Use silent mode in JSON mode to avoid polluting stdout
-                decryptor = VaultDecryptor(silent=json_mode)
-                vault_binary = decryptor.decrypt_vault_data(encrypted_vault_bytes, password)
-                
-                if not vault_binary:
-                    print("Error: Failed to decrypt vault with provided password")
-                    return None
-            else:
-                # Parse inner vault if present
-                vault_binary = base64.b64decode(container.vault)
-            
-            # Parse the vault from the binary data
-            if vault_binary:
-                vault = Vault()
-                vault.ParseFromString(vault_binary)
-                
-                # Convert lib_type enum to string
-                lib_type_name = "UNKNOWN"
-                if vault.lib_type == LibType.LIB_TYPE_GG20:
-                    lib_type_name = "GG20"
-                elif vault.lib_type == LibType.LIB_TYPE_DKLS:
-                    lib_type_name = "DKLS"
-                
-                # Extract key shares
-                key_shares = []
-                for share in vault.key_shares:
-                    share_data = {
-                        'public_key': share.public_key,
-                        'keyshare_length': len(share.keyshare)
-                    }
+            for outcome in run_rewrite(jobs, journal=journal, workers=args.jobs):
+                counts[outcome['status']] += 1
+                metrics.REWRITES.inc(op, outcome['status'])
+                if args.json:
+                    print(json.dumps(outcome), flush=True)
+                elif outcome['status'] == 'done':
+                    print(f"✅ {outcome['source']} → {outcome['dest']} ({outcome['codec']})")
+                elif outcome['status'] == 'already':
+                    print(f"⏭️  {outcome['source']}: already {'encrypted' if op == OP_ENCRYPT else 'rekeyed'}")
+                else:
+                    print(f"❌ {outcome['source']}: {outcome['error']}")
+        finally:
+            if journal is not None:
+                journal.close()
+        
+        elapsed = time.perf_counter() - start
+        summary = (f"🔐 {op}: {counts['done']} written, {counts['already']} already done, "
+                   f"{counts['failed']} failed, {skipped} skipped by journal in {elapsed:.2f}s")
+        print(summary, file=sys.stderr if args.json else sys.stdout)
+        return 0 if counts['failed'] == 0 else 1
+    
+    @staticmethod
+    def pack(args):
+        """Write a .vultpack sidecar for every .vult file"""
+        totals = {'files': 0, 'failed': 0, 'vult_bytes': 0, 'pack_bytes': 0}
+        for entry in args.paths:
+            root = Path(entry) if Path(entry).is_dir() else None
+            for source in iter_vault_files([entry], packs=False):
+                totals['files'] += 1
+                try:
+                    original = source.read_bytes()
+                    packed = pack(original)
+                    dest = pack_path(source)
+                    if args.output_dir:
+                        dest = Path(args.output_dir) / (dest.relative_to(root) if root else dest.name)
                     
-                    # Try to decode keyshare data
-                    if share.keyshare:
-                        try:
-                            decoded_keyshare = base64.b64decode(share.keyshare)
-                            decoded_str = decoded_keyshare.decode('utf-8')
-                            keyshare_json = json.loads(decoded_str)
-                            share_data['keyshare_data'] = keyshare_json
-                        except:
-                            share_data['keyshare_data'] = '[binary/encrypted]'
+                    def verify(written):
+                        if unpack(written.read_bytes()) != original:
+                            raise PackError('verify', "Written pack does not reproduce the original")
                     
-                    key_shares.append(share_data)
-                
-                result['vault'] = {
-                    'name': vault.name,
-                    'public_key_ecdsa': vault.public_key_ecdsa,
-                    'public_key_eddsa': vault.public_key_eddsa,
-                    'local_party_id': vault.local_party_id,
-                    'hex_chain_code': vault.hex_chain_code,
-                    'reshare_prefix': vault.reshare_prefix,
-                    'lib_type': lib_type_name,
-                    'signers': list(vault.signers),
-                    'key_shares': key_shares
-                }
-                
-                # Add timestamp if present
-                if vault.HasField('created_at'):
-                    result['vault']['created_at'] = {
-                        'seconds': vault.created_at.seconds,
-                        'nanos': vault.created_at.nanos,
-                        'datetime': datetime.fromtimestamp(vault.created_at.seconds).isoformat()
-                    }
-            
-            return result
-            
+                    write_atomic(dest, packed, mode=source.stat().st_mode & 0o777, verify=verify)
+                except (PackError, OSError) as e:
+                    totals['failed'] += 1
+                    if not args.json:
+                        print(f"❌ {source}: {e}")
+                    continue
+                totals['vult_bytes'] += len(original)
+                totals['pack_bytes'] += len(packed)
+                if not args.json:
+                    print(f"📦 {source} → {dest} ({len(original):,} → {len(packed):,} bytes)")
+        
+        saved = 1 - totals['pack_bytes'] / totals['vult_bytes'] if totals['vult_bytes'] else 0
+        if args.json:
+            print(json.dumps(dict(totals, saved=round(saved, 4)), indent=2))
+        else:
+            change = f"{saved:.0%} smaller" if saved >= 0 else f"{-saved:.0%} larger"
+            print(f"📦 Packed {totals['files'] - totals['failed']} file(s): {totals['vult_bytes']:,} → "
+                  f"{totals['pack_bytes']:,} bytes ({change}), {totals['failed']} failed")
+        return 0 if totals['failed'] == 0 else 1
+    
+    @staticmethod
+    def unpack(args):
+        """Rebuild .vult files from .vultpack files, checking each against its stored digest"""
+        counts = Counter()
+        for entry in args.paths:
+            root = Path(entry) if Path(entry).is_dir() else None
+            for source in iter_vault_files([entry], pattern='*' + PACK_SUFFIX, packs=False):
+                dest = source.with_name(source.name[:-len(PACK_SUFFIX)] + '.vult') \
+                    if source.name.endswith(PACK_SUFFIX) else source.with_name(source.name + '.vult')
+                if args.output_dir:
+                    dest = Path(args.output_dir) / (dest.relative_to(root) if root else dest.name)
+                try:
+                    original = unpack(source.read_bytes())
+                    if dest.exists():
+                        existing = dest.read_bytes()
+                        if existing == original:
+                            counts['identical'] += 1
+                            if not args.json:
+                                print(f"✅ {dest} already matches {source}")
+                            continue
+                        if not args.force:
+                            raise PackError('exists', f"{dest} exists and differs (use --force to replace it)")
+                    write_atomic(dest, original, mode=source.stat().st_mode & 0o777)
+                except (PackError, OSError) as e:
+                    counts['failed'] += 1
+                    if not args.json:
+                        print(f"❌ {source}: {e}")
+                    continue
+                counts['written'] += 1
+                if not args.json:
+                    print(f"📂 {source} → {dest}")
+        
+        if args.json:
+            print(json.dumps({'written': counts['written'], 'identical': counts['identical'],
+                              'failed': counts['failed']}, indent=2))
+        else:
+            print(f"📂 Unpacked {counts['written']} file(s), {counts['identical']} already present, "
+                  f"{counts['failed']} failed")
+        return 0 if counts['failed'] == 0 else 1
+    
+    @staticmethod
+    def bundle(args):
+        """Create, list or extract vault bundles"""
+        try:
+            if args.bundle_action == 'create':
+                return VaultCommands._bundle_create(args)
+            elif args.bundle_action == 'ls':
+                return VaultCommands._bundle_ls(args)
+            elif args.bundle_action == 'extract':
+                return VaultCommands._bundle_extract(args)
+        except (BundleError, PackError, OSError) as e:
+            print(f"Error: {e}")
+            return 1
+        print("No bundle action specified. Use --help for usage.")
+        return 1
+    
+    @staticmethod
+    def _bundle_create(args):
+        """Bundle vault files, indexing each by public key, party id and name where it can be opened"""
+        sources = []
+        for entry in args.paths:
+            root = Path(entry) if Path(entry).is_dir() else None
+            for source in iter_vault_files([entry]):
+                member = source.relative_to(root) if root else Path(source.name)
+                if member.name.endswith(PACK_SUFFIX):
+                    member = member.with_name(member.name[:-len(PACK_SUFFIX)] + '.vult')
+                sources.append((source, member.as_posix()))
+        if not sources:
+            print("Error: No vault files found")
+            return 1
+        
+        members = []
+        unindexed = []
+        loaded = load_vaults([source for source, _ in sources], password=args.password,
+                             fields=['name', 'public_key_ecdsa', 'local_party_id'])
+        for (source, name), (_, data) in zip(sources, loaded):
+            raw = source.read_bytes()
+            member = {'member': name, 'data': raw if is_pack(raw) else pack(raw)}
+            if isinstance(data, VaultLoadError):
+                if data.reason not in ('encrypted', 'decrypt'):
+                    raise BundleError(data.reason, f"{source}: {data}")
+                # Still bundled, but only reachable by member name
+                member['encrypted'] = True
+                unindexed.append(name)
+            else:
+                vault = data.get('vault', {})
+                member['encrypted'] = data['container']['is_encrypted']
+                member['vault_name'] = vault.get('name')
+                member['public_key_ecdsa'] = vault.get('public_key_ecdsa')
+                member['local_party_id'] = vault.get('local_party_id')
+            members.append(member)
+        
+        data = write_bundle(members)
+        output = Path(args.output)
+        
+        def verify(written):
+            check = Bundle(written)
+            try:
+                for entry, member in zip(check.members, members):
+                    if check.read(entry) != member['data']:
+                        raise BundleError('verify', f"Member {entry['member']} was not written intact")
+            finally:
+                check.close()
+        
+        write_atomic(output, data, verify=verify)
+        if args.json:
+            print(json.dumps({'bundle': str(output), 'members': len(members), 'bytes': len(data),
+                              'unindexed': unindexed}, indent=2))
+        else:
+            for name in unindexed:
+                print(f"⚠️  {name}: encrypted and no credential opens it; reachable by member name only")
+            print(f"📚 Bundled {len(members)} vault(s) into {output} ({len(data):,} bytes)")
+        return 0
+    
+    @staticmethod
+    def _bundle_ls(args):
+        """List bundle members from the footer index alone"""
+        bundle = open_bundle(args.bundle)
+        if args.json:
+            print(json.dumps(bundle.members, indent=2))
+            return 0
+        print(f"📚 {args.bundle}: {len(bundle.members)} member(s)")
+        for entry in bundle.members:
+            lock = '🔒' if entry.get('encrypted') else '  '
+            key = (entry.get('public_key_ecdsa') or '')[:16]
+            print(f"  {lock} {entry['member']:<40} {entry.get('vault_name') or '-':<24} "
+                  f"{entry.get('local_party_id') or '-':<24} {key or '-':<16} {entry['length']:>8,} bytes")
+        return 0
+    
+    @staticmethod
+    def _bundle_extract(args):
+        """Write members back out as their original .vult files"""
+        bundle = open_bundle(args.bundle)
+        entries = [bundle.select(selector) for selector in args.members] if args.members else bundle.members
+        output_dir = Path(args.output_dir)
+        counts = Counter()
+        for entry in entries:
+            member = Path(entry['member'])
+            if member.is_absolute() or '..' in member.parts:
+                raise BundleError('member', f"Refusing to extract {entry['member']} outside {output_dir}")
+            dest = output_dir / member
+            try:
+                original = bundle.original(entry)
+                if dest.exists():
+                    if dest.read_bytes() == original:
+                        counts['identical'] += 1
+                        if not args.json:
+                            print(f"✅ {dest} already matches {entry['member']}")
+                        continue
+                    if not args.force:
+                        raise BundleError('exists', f"{dest} exists and differs (use --force to replace it)")
+                write_atomic(dest, original)
+            except (BundleError, OSError) as e:
+                counts['failed'] += 1
+                if not args.json:
+                    print(f"❌ {entry['member']}: {e}")
+                continue
+            counts['written'] += 1
+            if not args.json:
+                print(f"📂 {entry['member']} → {dest}")
+        
+        if args.json:
+            print(json.dumps({'written': counts['written'], 'identical': counts['identical'],
+                              'failed': counts['failed']}, indent=2))
+        else:
+            print(f"📂 Extracted {counts['written']} member(s), {counts['identical']} already present, "
+                  f"{counts['failed']} failed")
+        return 0 if counts['failed'] == 0 else 1
+    
+    @staticmethod
+    def _load_vault(file_path, password=None, json_mode=False, fields=None):
+        """Load and parse vault file, return structured data (None on failure)"""
+        try:
+            return load_vault(file_path, password=password, json_mode=json_mode, fields=fields)
+        except VaultLoadError as e:
+            print(f"Error: {e}")
+            return None
         except Exception as e:
             print(f"Error loading vault: {e}")
             return None
@@ -308,7 +1276,7 @@ class VaultCommands:
         print(f"=== Vault Analysis: {file_info.get('path', 'Unknown')} ===")
         print(f"File Size: {file_info.get('size_chars', 0)} chars → {file_info.get('size_bytes', 0)} bytes")
         print(f"Container Version: {container.get('version', 'Unknown')}")
-        print(f"Encrypted: {'Yes' if container.get('is_encrypted') else 'No'}")
+        print(f"Encrypted: {'Yes (' + container.get('scheme', 'unknown') + ')' if container.get('is_encrypted') else 'No'}")
         
         if vault:
             print(f"\n📁 Vault Name: '{vault.get('name', 'Unnamed')}'")
@@ -0,0 +1,295 @@
+"""
+Vault container codecs for vultitool
+Registry of (container version, encryption scheme) -> KDF + cipher used to open and seal vault payloads
+"""
+
+import hashlib
+import os
+import struct
+
+from timings import span
+
+try:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from cryptography.exceptions import InvalidTag
+    CRYPTO_AVAILABLE = True
+except ImportError:
+    CRYPTO_AVAILABLE = False
+
+SCHEME_NONE = 'none'
+SCHEME_AES_GCM_SHA256 = 'aes-256-gcm+sha256'
+SCHEME_AES_GCM_SCRYPT = 'aes-256-gcm+scrypt'
+
+# Draft container version for scrypt-keyed payloads. Vultisig apps do not
+# write it; it sits far above their version numbers so a future official
+# version cannot be mistaken for it.
+SCRYPT_DRAFT_VERSION = 1000
+
+# The encryption scheme each container version implies when is_encrypted is
+# set (VaultContainer has no scheme field). Version 0 is the proto3 default
+# written by containers that never set it.
+VERSION_SCHEMES = {
+    0: SCHEME_AES_GCM_SHA256,
+    1: SCHEME_AES_GCM_SHA256,
+    SCRYPT_DRAFT_VERSION: SCHEME_AES_GCM_SCRYPT,
+}
+
+
+class CodecError(Exception):
+    """Raised for unsupported containers, malformed payloads or failed decryption; reason is a short machine-readable tag"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+class Sha256Kdf:
+    """Vultisig's password KDF: the AES key is SHA-256(password), with no salt or work factor"""
+
+    name = 'sha256'
+    salted = False
+
+    def new_params(self):
+        return {}
+
+    def encode_params(self, params):
+        return b''
+
+    def split(self, payload):
+        """Separate the KDF parameters stored in a payload from the cipher body"""
+        return {}, payload
+
+    def derive(self, password, params):
+        return hashlib.sha256(password.encode()).digest()
+
+    def describe(self, params=None):
+        return 'sha256'
+
+
+class ScryptKdf:
+    """
+    Memory-hard scrypt KDF with per-payload parameters
+
+    A payload starts with log2(N), r, p and the salt length (one byte each)
+    and the salt, so the work factor can be raised for new files without
+    breaking old ones.
+    Memory use is 128 * r * N bytes.
+    """
+
+    name = 'scrypt'
+    salted = True
+
+    _HEADER = struct.Struct('>BBB')
+    # Refuse parameters that would make a hostile file exhaust memory or time (N=2^22, r=32 is 16 GiB)
+    MAX_LOG2_N = 22
+    MAX_R = 32
+    MAX_P = 16
+    MAX_MEMORY = 1 << 31
+
+    def __init__(self, log2_n=15, r=8, p=1, salt_size=16):
+        self.log2_n = log2_n
+        self.r = r
+        self.p = p
+        self.salt_size = salt_size
+
+    def new_params(self, **overrides):
+        params = {'log2_n': self.log2_n, 'r': self.r, 'p': self.p, 'salt': os.urandom(self.salt_size)}
+        params.update(overrides)
+        self._check(params)
+        return params
+
+    def encode_params(self, params):
+        return self._HEADER.pack(params['log2_n'], params['r'], params['p']) + bytes([len(params['salt'])]) + params['salt']
+
+    def split(self, payload):
+        header_size = self._HEADER.size + 1
+        if len(payload) < header_size:
+            raise CodecError('payload', "Payload too short for scrypt parameters")
+        log2_n, r, p = self._HEADER.unpack_from(payload)
+        salt_size = payload[self._HEADER.size]
+        if len(payload) < header_size + salt_size:
+            raise CodecError('payload', "Payload too short for scrypt salt")
+        params = {'log2_n': log2_n, 'r': r, 'p': p, 'salt': payload[header_size:header_size + salt_size]}
+        self._check(params)
+        return params, payload[header_size + salt_size:]
+
+    def derive(self, password, params):
+        return hashlib.scrypt(password.encode(), salt=params['salt'], n=1 << params['log2_n'], r=params['r'],
+                              p=params['p'], maxmem=self.memory(params) + (1 << 20), dklen=32)
+
+    def memory(self, params):
+        """Bytes of memory one derivation needs"""
+        return 128 * params['r'] * (1 << params['log2_n'])
+
+    def describe(self, params=None):
+        params = params or {'log2_n': self.log2_n, 'r': self.r, 'p': self.p}
+        return f"scrypt(N=2^{params['log2_n']}, r={params['r']}, p={params['p']})"
+
+    def _check(self, params):
+        if not (1 <= params['log2_n'] <= self.MAX_LOG2_N and 1 <= params['r'] <= self.MAX_R
+                and 1 <= params['p'] <= self.MAX_P):
+            raise CodecError('payload', f"scrypt parameters out of range: {self.describe(params)}")
+        if self.memory(params) > self.MAX_MEMORY:
+            raise CodecError('payload', f"scrypt parameters need more than {self.MAX_MEMORY >> 20} MiB: "
+                                        f"{self.describe(params)}")
+        if not params['salt']:
+            raise CodecError('payload', "scrypt salt is empty")
+
+
+class AesGcm:
+    """AES-256-GCM over nonce || ciphertext || tag, as Go's gcm.Seal/gcm.Open lay it out"""
+
+    name = 'aes-256-gcm'
+    NONCE_SIZE = 12
+    TAG_SIZE = 16
+
+    def open(self, key, body):
+        if not CRYPTO_AVAILABLE:
+            raise CodecError('crypto', "cryptography library not available. Install with: pip install cryptography")
+        if len(body) < self.NONCE_SIZE + self.TAG_SIZE:
+            raise CodecError('payload', "ciphertext too short")
+        try:
+            return AESGCM(key).decrypt(body[:self.NONCE_SIZE], body[self.NONCE_SIZE:], None)
+        except InvalidTag:
+            raise CodecError('decrypt', "authentication failed (wrong password or corrupt payload)")
+
+    def seal(self, key, plaintext):
+        if not CRYPTO_AVAILABLE:
+            raise CodecError('crypto', "cryptography library not available. Install with: pip install cryptography")
+        nonce = os.urandom(self.NONCE_SIZE)
+        return nonce + AESGCM(key).encrypt(nonce, plaintext, None)
+
+
+class Codec:
+    """How one (container version, scheme) pair turns a password and a payload into Vault bytes"""
+
+    def __init__(self, version, scheme, kdf, cipher, description, draft=False):
+        self.version = version
+        self.scheme = scheme
+        self.kdf = kdf
+        self.cipher = cipher
+        self.description = description
+        self.draft = draft
+
+    @property
+    def name(self):
+        return f"v{self.version}/{self.scheme}"
+
+    @property
+    def encrypted(self):
+        return self.cipher is not None
+
+    def decrypt(self, payload, password):
+        """
+        Open an encrypted payload with a password
+
+        Raises:
+            CodecError: If the payload is malformed or authentication fails
+        """
+        params, body = self.kdf.split(payload)
+        with span('decrypt.kdf'):
+            key = self.kdf.derive(password, params)
+        with span('decrypt.cipher'):
+            return self.cipher.open(key, body)
+
+    def decrypt_with_key(self, payload, key):
+        """
+        Open a payload with an already-derived key; only unsalted KDFs have one key per password
+
+        Raises:
+            CodecError: If the KDF is salted, the payload is malformed or authentication fails
+        """
+        if self.kdf.salted:
+            raise CodecError('key', f"{self.name} derives a key per file; a stored key cannot open it")
+        params, body = self.kdf.split(payload)
+        with span('decrypt.cipher'):
+            return self.cipher.open(key, body)
+
+    def encrypt(self, plaintext, password, **kdf_params):
+        """Seal Vault bytes under a password, with fresh KDF parameters (overridable for salted KDFs)"""
+        params = self.kdf.new_params(**kdf_params) if kdf_params else self.kdf.new_params()
+        key = self.kdf.derive(password, params)
+        return self.kdf.encode_params(params) + self.cipher.seal(key, plaintext)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'version': self.version,
+            'scheme': self.scheme,
+            'kdf': self.kdf.describe() if self.kdf else None,
+            'cipher': self.cipher.name if self.cipher else None,
+            'description': self.description,
+            'draft': self.draft,
+        }
+
+
+class PlainCodec(Codec):
+    """An unencrypted container: the payload is the Vault itself"""
+
+    def __init__(self, version):
+        super().__init__(version, SCHEME_NONE, None, None, "Unencrypted vault")
+
+    def decrypt(self, payload, password=None):
+        return payload
+
+    def decrypt_with_key(self, payload, key):
+        return payload
+
+    def encrypt(self, plaintext, password=None, **kdf_params):
+        return plaintext
+
+
+# Registry of all known codecs keyed by (container version, scheme)
+CODECS = {}
+
+
+def register(codec):
+    """Add a codec to the registry"""
+    key = (codec.version, codec.scheme)
+    if key in CODECS:
+        raise ValueError(f"Duplicate codec: {codec.name}")
+    CODECS[key] = codec
+    return codec
+
+
+def codec_for(version, is_encrypted):
+    """
+    The codec for a container, by direct lookup (no trial decryption)
+
+    An unencrypted payload is read as-is whatever the container version.
+
+    Raises:
+        CodecError: If an encrypted container's version is not supported
+    """
+    if not is_encrypted:
+        return CODECS.get((version, SCHEME_NONE)) or PlainCodec(version)
+    codec = CODECS.get((version, VERSION_SCHEMES.get(version)))
+    if codec is None:
+        raise CodecError('codec', f"Unsupported encrypted container version {version} "
+                                  f"(supported: {', '.join(str(v) for v in sorted(VERSION_SCHEMES))})")
+    return codec
+
+
+def codec_named(name):
+    """
+    Look up a codec by its 'v<version>/<scheme>' name
+
+    Raises:
+        CodecError: If no codec has that name
+    """
+    for codec in CODECS.values():
+        if codec.name == name:
+            return codec
+    raise CodecError('codec', f"Unknown codec '{name}' (see 'doctor codecs')")
+
+
+for _version in (0, 1):
+    register(PlainCodec(_version))
+    register(Codec(_version, SCHEME_AES_GCM_SHA256, Sha256Kdf(), AesGcm(),
+                   "Vultisig vault encryption: AES-256-GCM keyed by SHA-256(password)"))
+register(PlainCodec(SCRYPT_DRAFT_VERSION))
+register(Codec(SCRYPT_DRAFT_VERSION, SCHEME_AES_GCM_SCRYPT, ScryptKdf(), AesGcm(),
+               "AES-256-GCM keyed by scrypt with per-file salt and work factor", draft=True))
+
+# The codec vultitool seals new encrypted vaults with, matching the Vultisig apps
+DEFAULT_CODEC = CODECS[(1, SCHEME_AES_GCM_SHA256)]
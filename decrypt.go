@@ -0,0 +1,133 @@
+package main
+
+import (
+	"bufio"
+	"crypto/aes"
+	"crypto/cipher"
+	"crypto/sha256"
+	"encoding/binary"
+	"errors"
+	"fmt"
+	"io"
+)
+
+// Largest request or response frame the worker accepts (a vault is a few tens of KB)
+const maxFrameSize = 64 << 20
+
+const (
+	statusOK    byte = 0
+	statusError byte = 1
+)
+
+// decryptVault mirrors VaultDecryptor in commands/crypto.py (and mobile-tss-lib):
+// AES-256-GCM keyed by SHA-256(password), with the nonce prepended to the ciphertext.
+func decryptVault(gcm cipher.AEAD, data []byte) ([]byte, error) {
+	nonceSize := gcm.NonceSize()
+	if len(data) < nonceSize+gcm.Overhead() {
+		return nil, errors.New("ciphertext too short")
+	}
+	nonce, ciphertext := data[:nonceSize], data[nonceSize:]
+	plaintext, err := gcm.Open(nil, nonce, ciphertext, nil)
+	if err != nil {
+		return nil, fmt.Errorf("decryption failed: %w", err)
+	}
+	// GCM authenticates the ciphertext, so plaintext that opens is the vault that was sealed
+	return plaintext, nil
+}
+
+// newVaultCipher derives the AES-GCM cipher for a vault password
+func newVaultCipher(password string) (cipher.AEAD, error) {
+	key := sha256.Sum256([]byte(password))
+	block, err := aes.NewCipher(key[:])
+	if err != nil {
+		return nil, err
+	}
+	return cipher.NewGCM(block)
+}
+
+// readFrame reads one 4-byte big-endian length-prefixed frame; io.EOF means a clean end of input
+func readFrame(r io.Reader) ([]byte, error) {
+	var header [4]byte
+	if _, err := io.ReadFull(r, header[:]); err != nil {
+		if err == io.ErrUnexpectedEOF {
+			return nil, errors.New("truncated frame header")
+		}
+		return nil, err
+	}
+	size := binary.BigEndian.Uint32(header[:])
+	if size > maxFrameSize {
+		return nil, fmt.Errorf("frame of %d bytes exceeds the %d byte limit", size, maxFrameSize)
+	}
+	frame := make([]byte, size)
+	if _, err := io.ReadFull(r, frame); err != nil {
+		return nil, errors.New("truncated frame")
+	}
+	return frame, nil
+}
+
+func writeFrame(w io.Writer, status byte, body []byte) error {
+	var header [5]byte
+	binary.BigEndian.PutUint32(header[:4], uint32(len(body)+1))
+	header[4] = status
+	if _, err := w.Write(header[:]); err != nil {
+		return err
+	}
+	_, err := w.Write(body)
+	return err
+}
+
+// serveDecrypt runs the batch decryption worker until its input ends.
+//
+// Each request frame is a 2-byte big-endian password length, the password and the
+// encrypted vault bytes (the base64-decoded VaultContainer.vault). Each response
+// frame, in request order, is a status byte followed by the plaintext Vault protobuf
+// (status 0) or an error message (status 1). Requests may be pipelined; responses
+// are flushed whenever the worker has caught up with its input.
+func serveDecrypt(in io.Reader, out io.Writer) error {
+	reader := bufio.NewReaderSize(in, 1<<16)
+	writer := bufio.NewWriterSize(out, 1<<16)
+	defer writer.Flush()
+
+	// Batches almost always share one password, so keep the last derived cipher
+	var lastPassword string
+	var lastCipher cipher.AEAD
+
+	for {
+		request, err := readFrame(reader)
+		if err == io.EOF {
+			return nil
+		}
+		if err != nil {
+			writeFrame(writer, statusError, []byte(err.Error()))
+			return err
+		}
+
+		var body []byte
+		status := statusOK
+		if len(request) < 2 || int(binary.BigEndian.Uint16(request))+2 > len(request) {
+			status, body = statusError, []byte("malformed request")
+		} else {
+			passwordLen := int(binary.BigEndian.Uint16(request))
+			password := string(request[2 : 2+passwordLen])
+			if lastCipher == nil || password != lastPassword {
+				lastCipher, err = newVaultCipher(password)
+				lastPassword = password
+			}
+			if err == nil {
+				body, err = decryptVault(lastCipher, request[2+passwordLen:])
+			}
+			if err != nil {
+				status, body = statusError, []byte(err.Error())
+			}
+		}
+
+		if err := writeFrame(writer, status, body); err != nil {
+			return err
+		}
+		if reader.Buffered() == 0 {
+			if err := writer.Flush(); err != nil {
+				return err
+			}
+		}
+	}
+}
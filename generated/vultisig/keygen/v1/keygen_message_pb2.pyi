@@ -0,0 +1,24 @@
+from vultisig.keygen.v1 import lib_type_message_pb2 as _lib_type_message_pb2
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Optional as _Optional, Union as _Union
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class KeygenMessage(_message.Message):
+    __slots__ = ["encryption_key_hex", "hex_chain_code", "lib_type", "service_name", "session_id", "use_vultisig_relay", "vault_name"]
+    ENCRYPTION_KEY_HEX_FIELD_NUMBER: _ClassVar[int]
+    HEX_CHAIN_CODE_FIELD_NUMBER: _ClassVar[int]
+    LIB_TYPE_FIELD_NUMBER: _ClassVar[int]
+    SERVICE_NAME_FIELD_NUMBER: _ClassVar[int]
+    SESSION_ID_FIELD_NUMBER: _ClassVar[int]
+    USE_VULTISIG_RELAY_FIELD_NUMBER: _ClassVar[int]
+    VAULT_NAME_FIELD_NUMBER: _ClassVar[int]
+    encryption_key_hex: str
+    hex_chain_code: str
+    lib_type: _lib_type_message_pb2.LibType
+    service_name: str
+    session_id: str
+    use_vultisig_relay: bool
+    vault_name: str
+    def __init__(self, session_id: _Optional[str] = ..., hex_chain_code: _Optional[str] = ..., service_name: _Optional[str] = ..., encryption_key_hex: _Optional[str] = ..., use_vultisig_relay: bool = ..., vault_name: _Optional[str] = ..., lib_type: _Optional[_Union[_lib_type_message_pb2.LibType, str]] = ...) -> None: ...
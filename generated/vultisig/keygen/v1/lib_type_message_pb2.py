@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: vultisig/keygen/v1/lib_type_message.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n)vultisig/keygen/v1/lib_type_message.proto\x12\x12vultisig.keygen.v1*/\n\x07LibType\x12\x11\n\rLIB_TYPE_GG20\x10\x00\x12\x11\n\rLIB_TYPE_DKLS\x10\x01\x42R\n\x12vultisig.keygen.v1Z7github.com/vultisig/commondata/go/vultisig/keygen/v1;v1\xba\x02\x02VSb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'vultisig.keygen.v1.lib_type_message_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'\n\022vultisig.keygen.v1Z7github.com/vultisig/commondata/go/vultisig/keygen/v1;v1\272\002\002VS'
+  _LIBTYPE._serialized_start=65
+  _LIBTYPE._serialized_end=112
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,10 @@
+from google.protobuf.internal import enum_type_wrapper as _enum_type_wrapper
+from google.protobuf import descriptor as _descriptor
+from typing import ClassVar as _ClassVar
+
+DESCRIPTOR: _descriptor.FileDescriptor
+LIB_TYPE_DKLS: LibType
+LIB_TYPE_GG20: LibType
+
+class LibType(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = []
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: vultisig/keygen/v1/reshare_message.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from vultisig.keygen.v1 import lib_type_message_pb2 as vultisig_dot_keygen_dot_v1_dot_lib__type__message__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n(vultisig/keygen/v1/reshare_message.proto\x12\x12vultisig.keygen.v1\x1a)vultisig/keygen/v1/lib_type_message.proto\"\x98\x02\n\x0eReshareMessage\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x16\n\x0ehex_chain_code\x18\x02 \x01(\t\x12\x14\n\x0cservice_name\x18\x03 \x01(\t\x12\x18\n\x10public_key_ecdsa\x18\x04 \x01(\t\x12\x13\n\x0bold_parties\x18\x05 \x03(\t\x12\x1a\n\x12\x65ncryption_key_hex\x18\x06 \x01(\t\x12\x1a\n\x12use_vultisig_relay\x18\x07 \x01(\x08\x12\x1a\n\x12old_reshare_prefix\x18\x08 \x01(\t\x12\x12\n\nvault_name\x18\t \x01(\t\x12-\n\x08lib_type\x18\x14 \x01(\x0e\x32\x1b.vultisig.keygen.v1.LibTypeBR\n\x12vultisig.keygen.v1Z7github.com/vultisig/commondata/go/vultisig/keygen/v1;v1\xba\x02\x02VSb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'vultisig.keygen.v1.reshare_message_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'\n\022vultisig.keygen.v1Z7github.com/vultisig/commondata/go/vultisig/keygen/v1;v1\272\002\002VS'
+  _RESHAREMESSAGE._serialized_start=108
+  _RESHAREMESSAGE._serialized_end=388
+# @@protoc_insertion_point(module_scope)
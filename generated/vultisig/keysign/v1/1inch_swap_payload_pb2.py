@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: vultisig/keysign/v1/1inch_swap_payload.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from vultisig.keysign.v1 import coin_pb2 as vultisig_dot_keysign_dot_v1_dot_coin__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n,vultisig/keysign/v1/1inch_swap_payload.proto\x12\x13vultisig.keysign.v1\x1a\x1evultisig/keysign/v1/coin.proto\"}\n\x12OneInchTransaction\x12\x0c\n\x04\x66rom\x18\x01 \x01(\t\x12\n\n\x02to\x18\x02 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\t\x12\r\n\x05value\x18\x04 \x01(\t\x12\x11\n\tgas_price\x18\x05 \x01(\t\x12\x0b\n\x03gas\x18\x06 \x01(\x03\x12\x10\n\x08swap_fee\x18\x07 \x01(\t\"W\n\x0cOneInchQuote\x12\x12\n\ndst_amount\x18\x01 \x01(\t\x12\x33\n\x02tx\x18\x02 \x01(\x0b\x32\'.vultisig.keysign.v1.OneInchTransaction\"\xd0\x01\n\x12OneInchSwapPayload\x12,\n\tfrom_coin\x18\x01 \x01(\x0b\x32\x19.vultisig.keysign.v1.Coin\x12*\n\x07to_coin\x18\x02 \x01(\x0b\x32\x19.vultisig.keysign.v1.Coin\x12\x13\n\x0b\x66rom_amount\x18\x03 \x01(\t\x12\x19\n\x11to_amount_decimal\x18\x04 \x01(\t\x12\x30\n\x05quote\x18\x05 \x01(\x0b\x32!.vultisig.keysign.v1.OneInchQuoteBT\n\x13vultisig.keysign.v1Z8github.com/vultisig/commondata/go/vultisig/keysign/v1;v1\xba\x02\x02VSb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'vultisig.keysign.v1.1inch_swap_payload_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'\n\023vultisig.keysign.v1Z8github.com/vultisig/commondata/go/vultisig/keysign/v1;v1\272\002\002VS'
+  _ONEINCHTRANSACTION._serialized_start=101
+  _ONEINCHTRANSACTION._serialized_end=226
+  _ONEINCHQUOTE._serialized_start=228
+  _ONEINCHQUOTE._serialized_end=315
+  _ONEINCHSWAPPAYLOAD._serialized_start=318
+  _ONEINCHSWAPPAYLOAD._serialized_end=526
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,45 @@
+from vultisig.keysign.v1 import coin_pb2 as _coin_pb2
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Mapping as _Mapping, Optional as _Optional, Union as _Union
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class OneInchQuote(_message.Message):
+    __slots__ = ["dst_amount", "tx"]
+    DST_AMOUNT_FIELD_NUMBER: _ClassVar[int]
+    TX_FIELD_NUMBER: _ClassVar[int]
+    dst_amount: str
+    tx: OneInchTransaction
+    def __init__(self, dst_amount: _Optional[str] = ..., tx: _Optional[_Union[OneInchTransaction, _Mapping]] = ...) -> None: ...
+
+class OneInchSwapPayload(_message.Message):
+    __slots__ = ["from_amount", "from_coin", "quote", "to_amount_decimal", "to_coin"]
+    FROM_AMOUNT_FIELD_NUMBER: _ClassVar[int]
+    FROM_COIN_FIELD_NUMBER: _ClassVar[int]
+    QUOTE_FIELD_NUMBER: _ClassVar[int]
+    TO_AMOUNT_DECIMAL_FIELD_NUMBER: _ClassVar[int]
+    TO_COIN_FIELD_NUMBER: _ClassVar[int]
+    from_amount: str
+    from_coin: _coin_pb2.Coin
+    quote: OneInchQuote
+    to_amount_decimal: str
+    to_coin: _coin_pb2.Coin
+    def __init__(self, from_coin: _Optional[_Union[_coin_pb2.Coin, _Mapping]] = ..., to_coin: _Optional[_Union[_coin_pb2.Coin, _Mapping]] = ..., from_amount: _Optional[str] = ..., to_amount_decimal: _Optional[str] = ..., quote: _Optional[_Union[OneInchQuote, _Mapping]] = ...) -> None: ...
+
+class OneInchTransaction(_message.Message):
+    __slots__ = ["data", "gas", "gas_price", "swap_fee", "to", "value"]
+    DATA_FIELD_NUMBER: _ClassVar[int]
+    FROM_FIELD_NUMBER: _ClassVar[int]
+    GAS_FIELD_NUMBER: _ClassVar[int]
+    GAS_PRICE_FIELD_NUMBER: _ClassVar[int]
+    SWAP_FEE_FIELD_NUMBER: _ClassVar[int]
+    TO_FIELD_NUMBER: _ClassVar[int]
+    VALUE_FIELD_NUMBER: _ClassVar[int]
+    data: str
+    gas: int
+    gas_price: str
+    swap_fee: str
+    to: str
+    value: str
+    def __init__(self, to: _Optional[str] = ..., data: _Optional[str] = ..., value: _Optional[str] = ..., gas_price: _Optional[str] = ..., gas: _Optional[int] = ..., swap_fee: _Optional[str] = ..., **kwargs) -> None: ...
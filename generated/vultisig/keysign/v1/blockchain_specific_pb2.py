@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: vultisig/keysign/v1/blockchain_specific.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n-vultisig/keysign/v1/blockchain_specific.proto\x12\x13vultisig.keysign.v1\"9\n\x0cUTXOSpecific\x12\x10\n\x08\x62yte_fee\x18\x01 \x01(\t\x12\x17\n\x0fsend_max_amount\x18\x02 \x01(\x08\"N\n\x14\x43\x61rdanoChainSpecific\x12\x10\n\x08\x62yte_fee\x18\x01 \x01(\x03\x12\x17\n\x0fsend_max_amount\x18\x02 \x01(\x08\x12\x0b\n\x03ttl\x18\x03 \x01(\x04\"g\n\x10\x45thereumSpecific\x12\x1b\n\x13max_fee_per_gas_wei\x18\x01 \x01(\t\x12\x14\n\x0cpriority_fee\x18\x02 \x01(\t\x12\r\n\x05nonce\x18\x03 \x01(\x03\x12\x11\n\tgas_limit\x18\x04 \x01(\t\"\x9e\x01\n\x11THORChainSpecific\x12\x16\n\x0e\x61\x63\x63ount_number\x18\x01 \x01(\x04\x12\x10\n\x08sequence\x18\x02 \x01(\x04\x12\x0b\n\x03\x66\x65\x65\x18\x03 \x01(\x04\x12\x12\n\nis_deposit\x18\x04 \x01(\x08\x12>\n\x10transaction_type\x18\x05 \x01(\x0e\x32$.vultisig.keysign.v1.TransactionType\"Q\n\x11MAYAChainSpecific\x12\x16\n\x0e\x61\x63\x63ount_number\x18\x01 \x01(\x04\x12\x10\n\x08sequence\x18\x02 \x01(\x04\x12\x12\n\nis_deposit\x18\x03 \x01(\x08\"\xad\x02\n\x0e\x43osmosSpecific\x12\x16\n\x0e\x61\x63\x63ount_number\x18\x01 \x01(\x04\x12\x10\n\x08sequence\x18\x02 \x01(\x04\x12\x0b\n\x03gas\x18\x03 \x01(\x04\x12>\n\x10transaction_type\x18\x04 \x01(\x0e\x32$.vultisig.keysign.v1.TransactionType\x12G\n\x10ibc_denom_traces\x18\x05 \x01(\x0b\x32(.vultisig.keysign.v1.CosmosIbcDenomTraceH\x00\x88\x01\x01\x12\x39\n\x08ibc_info\x18\x06 \x01(\x0b\x32\".vultisig.keysign.v1.CosmosIbcInfoH\x01\x88\x01\x01\x42\x13\n\x11_ibc_denom_tracesB\x0b\n\t_ibc_info\"M\n\x13\x43osmosIbcDenomTrace\x12\x0c\n\x04path\x18\x01 \x01(\t\x12\x12\n\nbase_denom\x18\x02 \x01(\t\x12\x14\n\x0clatest_block\x18\x03 \x01(\t\"n\n\rCosmosIbcInfo\x12\x13\n\x0bsource_port\x18\x01 \x01(\t\x12\x16\n\x0esource_channel\x18\x02 \x01(\t\x12\x17\n\x0frevision_number\x18\x03 \x01(\x04\x12\x17\n\x0frevision_height\x18\x04 \x01(\x04\"\x81\x02\n\x0eSolanaSpecific\x12\x19\n\x11recent_block_hash\x18\x01 \x01(\t\x12\x14\n\x0cpriority_fee\x18\x02 \x01(\t\x12*\n\x1d\x66rom_token_associated_address\x18\x03 \x01(\tH\x00\x88\x01\x01\x12(\n\x1bto_token_associated_address\x18\x04 \x01(\tH\x01\x88\x01\x01\x12\x17\n\nprogram_id\x18\x05 \x01(\x08H\x02\x88\x01\x01\x42 \n\x1e_from_token_associated_addressB\x1e\n\x1c_to_token_associated_addressB\r\n\x0b_program_id\"\xa3\x01\n\x10PolkadotSpecific\x12\x19\n\x11recent_block_hash\x18\x01 \x01(\t\x12\r\n\x05nonce\x18\x02 \x01(\x04\x12\x1c\n\x14\x63urrent_block_number\x18\x03 \x01(\t\x12\x14\n\x0cspec_version\x18\x04 \x01(\r\x12\x1b\n\x13transaction_version\x18\x05 \x01(\r\x12\x14\n\x0cgenesis_hash\x18\x06 \x01(\t\"\x84\x01\n\x07SuiCoin\x12\x11\n\tcoin_type\x18\x01 \x01(\t\x12\x16\n\x0e\x63oin_object_id\x18\x02 \x01(\t\x12\x0f\n\x07version\x18\x03 \x01(\t\x12\x0e\n\x06\x64igest\x18\x04 \x01(\t\x12\x0f\n\x07\x62\x61lance\x18\x05 \x01(\t\x12\x1c\n\x14previous_transaction\x18\x06 \x01(\t\"W\n\x0bSuiSpecific\x12\x1b\n\x13reference_gas_price\x18\x01 \x01(\t\x12+\n\x05\x63oins\x18\x02 \x03(\x0b\x32\x1c.vultisig.keysign.v1.SuiCoin\"f\n\x0bTonSpecific\x12\x17\n\x0fsequence_number\x18\x01 \x01(\x04\x12\x11\n\texpire_at\x18\x02 \x01(\x04\x12\x12\n\nbounceable\x18\x03 \x01(\x08\x12\x17\n\x0fsend_max_amount\x18\x04 \x01(\x08\"M\n\x0eRippleSpecific\x12\x10\n\x08sequence\x18\x01 \x01(\x04\x12\x0b\n\x03gas\x18\x02 \x01(\x04\x12\x1c\n\x14last_ledger_sequence\x18\x03 \x01(\x04\"\x93\x02\n\x0cTronSpecific\x12\x11\n\ttimestamp\x18\x01 \x01(\x04\x12\x12\n\nexpiration\x18\x02 \x01(\x04\x12\x1e\n\x16\x62lock_header_timestamp\x18\x03 \x01(\x04\x12\x1b\n\x13\x62lock_header_number\x18\x04 \x01(\x04\x12\x1c\n\x14\x62lock_header_version\x18\x05 \x01(\x04\x12!\n\x19\x62lock_header_tx_trie_root\x18\x06 \x01(\t\x12 \n\x18\x62lock_header_parent_hash\x18\x07 \x01(\t\x12$\n\x1c\x62lock_header_witness_address\x18\x08 \x01(\t\x12\x16\n\x0egas_estimation\x18\t \x01(\x04*\xc0\x02\n\x0fTransactionType\x12 \n\x1cTRANSACTION_TYPE_UNSPECIFIED\x10\x00\x12\x19\n\x15TRANSACTION_TYPE_VOTE\x10\x01\x12\x1d\n\x19TRANSACTION_TYPE_PROPOSAL\x10\x02\x12!\n\x1dTRANSACTION_TYPE_IBC_TRANSFER\x10\x03\x12\x1f\n\x1bTRANSACTION_TYPE_THOR_MERGE\x10\x04\x12!\n\x1dTRANSACTION_TYPE_THOR_UNMERGE\x10\x05\x12 \n\x1cTRANSACTION_TYPE_TON_DEPOSIT\x10\x06\x12!\n\x1dTRANSACTION_TYPE_TON_WITHDRAW\x10\x07\x12%\n!TRANSACTION_TYPE_GENERIC_CONTRACT\x10\x08\x42T\n\x13vultisig.keysign.v1Z8github.com/vultisig/commondata/go/vultisig/keysign/v1;v1\xba\x02\x02VSb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'vultisig.keysign.v1.blockchain_specific_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'\n\023vultisig.keysign.v1Z8github.com/vultisig/commondata/go/vultisig/keysign/v1;v1\272\002\002VS'
+  _TRANSACTIONTYPE._serialized_start=2165
+  _TRANSACTIONTYPE._serialized_end=2485
+  _UTXOSPECIFIC._serialized_start=70
+  _UTXOSPECIFIC._serialized_end=127
+  _CARDANOCHAINSPECIFIC._serialized_start=129
+  _CARDANOCHAINSPECIFIC._serialized_end=207
+  _ETHEREUMSPECIFIC._serialized_start=209
+  _ETHEREUMSPECIFIC._serialized_end=312
+  _THORCHAINSPECIFIC._serialized_start=315
+  _THORCHAINSPECIFIC._serialized_end=473
+  _MAYACHAINSPECIFIC._serialized_start=475
+  _MAYACHAINSPECIFIC._serialized_end=556
+  _COSMOSSPECIFIC._serialized_start=559
+  _COSMOSSPECIFIC._serialized_end=860
+  _COSMOSIBCDENOMTRACE._serialized_start=862
+  _COSMOSIBCDENOMTRACE._serialized_end=939
+  _COSMOSIBCINFO._serialized_start=941
+  _COSMOSIBCINFO._serialized_end=1051
+  _SOLANASPECIFIC._serialized_start=1054
+  _SOLANASPECIFIC._serialized_end=1311
+  _POLKADOTSPECIFIC._serialized_start=1314
+  _POLKADOTSPECIFIC._serialized_end=1477
+  _SUICOIN._serialized_start=1480
+  _SUICOIN._serialized_end=1612
+  _SUISPECIFIC._serialized_start=1614
+  _SUISPECIFIC._serialized_end=1701
+  _TONSPECIFIC._serialized_start=1703
+  _TONSPECIFIC._serialized_end=1805
+  _RIPPLESPECIFIC._serialized_start=1807
+  _RIPPLESPECIFIC._serialized_end=1884
+  _TRONSPECIFIC._serialized_start=1887
+  _TRONSPECIFIC._serialized_end=2162
+# @@protoc_insertion_point(module_scope)
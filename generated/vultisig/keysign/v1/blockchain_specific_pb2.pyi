@@ -0,0 +1,209 @@
+from google.protobuf.internal import containers as _containers
+from google.protobuf.internal import enum_type_wrapper as _enum_type_wrapper
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Mapping, Optional as _Optional, Union as _Union
+
+DESCRIPTOR: _descriptor.FileDescriptor
+TRANSACTION_TYPE_GENERIC_CONTRACT: TransactionType
+TRANSACTION_TYPE_IBC_TRANSFER: TransactionType
+TRANSACTION_TYPE_PROPOSAL: TransactionType
+TRANSACTION_TYPE_THOR_MERGE: TransactionType
+TRANSACTION_TYPE_THOR_UNMERGE: TransactionType
+TRANSACTION_TYPE_TON_DEPOSIT: TransactionType
+TRANSACTION_TYPE_TON_WITHDRAW: TransactionType
+TRANSACTION_TYPE_UNSPECIFIED: TransactionType
+TRANSACTION_TYPE_VOTE: TransactionType
+
+class CardanoChainSpecific(_message.Message):
+    __slots__ = ["byte_fee", "send_max_amount", "ttl"]
+    BYTE_FEE_FIELD_NUMBER: _ClassVar[int]
+    SEND_MAX_AMOUNT_FIELD_NUMBER: _ClassVar[int]
+    TTL_FIELD_NUMBER: _ClassVar[int]
+    byte_fee: int
+    send_max_amount: bool
+    ttl: int
+    def __init__(self, byte_fee: _Optional[int] = ..., send_max_amount: bool = ..., ttl: _Optional[int] = ...) -> None: ...
+
+class CosmosIbcDenomTrace(_message.Message):
+    __slots__ = ["base_denom", "latest_block", "path"]
+    BASE_DENOM_FIELD_NUMBER: _ClassVar[int]
+    LATEST_BLOCK_FIELD_NUMBER: _ClassVar[int]
+    PATH_FIELD_NUMBER: _ClassVar[int]
+    base_denom: str
+    latest_block: str
+    path: str
+    def __init__(self, path: _Optional[str] = ..., base_denom: _Optional[str] = ..., latest_block: _Optional[str] = ...) -> None: ...
+
+class CosmosIbcInfo(_message.Message):
+    __slots__ = ["revision_height", "revision_number", "source_channel", "source_port"]
+    REVISION_HEIGHT_FIELD_NUMBER: _ClassVar[int]
+    REVISION_NUMBER_FIELD_NUMBER: _ClassVar[int]
+    SOURCE_CHANNEL_FIELD_NUMBER: _ClassVar[int]
+    SOURCE_PORT_FIELD_NUMBER: _ClassVar[int]
+    revision_height: int
+    revision_number: int
+    source_channel: str
+    source_port: str
+    def __init__(self, source_port: _Optional[str] = ..., source_channel: _Optional[str] = ..., revision_number: _Optional[int] = ..., revision_height: _Optional[int] = ...) -> None: ...
+
+class CosmosSpecific(_message.Message):
+    __slots__ = ["account_number", "gas", "ibc_denom_traces", "ibc_info", "sequence", "transaction_type"]
+    ACCOUNT_NUMBER_FIELD_NUMBER: _ClassVar[int]
+    GAS_FIELD_NUMBER: _ClassVar[int]
+    IBC_DENOM_TRACES_FIELD_NUMBER: _ClassVar[int]
+    IBC_INFO_FIELD_NUMBER: _ClassVar[int]
+    SEQUENCE_FIELD_NUMBER: _ClassVar[int]
+    TRANSACTION_TYPE_FIELD_NUMBER: _ClassVar[int]
+    account_number: int
+    gas: int
+    ibc_denom_traces: CosmosIbcDenomTrace
+    ibc_info: CosmosIbcInfo
+    sequence: int
+    transaction_type: TransactionType
+    def __init__(self, account_number: _Optional[int] = ..., sequence: _Optional[int] = ..., gas: _Optional[int] = ..., transaction_type: _Optional[_Union[TransactionType, str]] = ..., ibc_denom_traces: _Optional[_Union[CosmosIbcDenomTrace, _Mapping]] = ..., ibc_info: _Optional[_Union[CosmosIbcInfo, _Mapping]] = ...) -> None: ...
+
+class EthereumSpecific(_message.Message):
+    __slots__ = ["gas_limit", "max_fee_per_gas_wei", "nonce", "priority_fee"]
+    GAS_LIMIT_FIELD_NUMBER: _ClassVar[int]
+    MAX_FEE_PER_GAS_WEI_FIELD_NUMBER: _ClassVar[int]
+    NONCE_FIELD_NUMBER: _ClassVar[int]
+    PRIORITY_FEE_FIELD_NUMBER: _ClassVar[int]
+    gas_limit: str
+    max_fee_per_gas_wei: str
+    nonce: int
+    priority_fee: str
+    def __init__(self, max_fee_per_gas_wei: _Optional[str] = ..., priority_fee: _Optional[str] = ..., nonce: _Optional[int] = ..., gas_limit: _Optional[str] = ...) -> None: ...
+
+class MAYAChainSpecific(_message.Message):
+    __slots__ = ["account_number", "is_deposit", "sequence"]
+    ACCOUNT_NUMBER_FIELD_NUMBER: _ClassVar[int]
+    IS_DEPOSIT_FIELD_NUMBER: _ClassVar[int]
+    SEQUENCE_FIELD_NUMBER: _ClassVar[int]
+    account_number: int
+    is_deposit: bool
+    sequence: int
+    def __init__(self, account_number: _Optional[int] = ..., sequence: _Optional[int] = ..., is_deposit: bool = ...) -> None: ...
+
+class PolkadotSpecific(_message.Message):
+    __slots__ = ["current_block_number", "genesis_hash", "nonce", "recent_block_hash", "spec_version", "transaction_version"]
+    CURRENT_BLOCK_NUMBER_FIELD_NUMBER: _ClassVar[int]
+    GENESIS_HASH_FIELD_NUMBER: _ClassVar[int]
+    NONCE_FIELD_NUMBER: _ClassVar[int]
+    RECENT_BLOCK_HASH_FIELD_NUMBER: _ClassVar[int]
+    SPEC_VERSION_FIELD_NUMBER: _ClassVar[int]
+    TRANSACTION_VERSION_FIELD_NUMBER: _ClassVar[int]
+    current_block_number: str
+    genesis_hash: str
+    nonce: int
+    recent_block_hash: str
+    spec_version: int
+    transaction_version: int
+    def __init__(self, recent_block_hash: _Optional[str] = ..., nonce: _Optional[int] = ..., current_block_number: _Optional[str] = ..., spec_version: _Optional[int] = ..., transaction_version: _Optional[int] = ..., genesis_hash: _Optional[str] = ...) -> None: ...
+
+class RippleSpecific(_message.Message):
+    __slots__ = ["gas", "last_ledger_sequence", "sequence"]
+    GAS_FIELD_NUMBER: _ClassVar[int]
+    LAST_LEDGER_SEQUENCE_FIELD_NUMBER: _ClassVar[int]
+    SEQUENCE_FIELD_NUMBER: _ClassVar[int]
+    gas: int
+    last_ledger_sequence: int
+    sequence: int
+    def __init__(self, sequence: _Optional[int] = ..., gas: _Optional[int] = ..., last_ledger_sequence: _Optional[int] = ...) -> None: ...
+
+class SolanaSpecific(_message.Message):
+    __slots__ = ["from_token_associated_address", "priority_fee", "program_id", "recent_block_hash", "to_token_associated_address"]
+    FROM_TOKEN_ASSOCIATED_ADDRESS_FIELD_NUMBER: _ClassVar[int]
+    PRIORITY_FEE_FIELD_NUMBER: _ClassVar[int]
+    PROGRAM_ID_FIELD_NUMBER: _ClassVar[int]
+    RECENT_BLOCK_HASH_FIELD_NUMBER: _ClassVar[int]
+    TO_TOKEN_ASSOCIATED_ADDRESS_FIELD_NUMBER: _ClassVar[int]
+    from_token_associated_address: str
+    priority_fee: str
+    program_id: bool
+    recent_block_hash: str
+    to_token_associated_address: str
+    def __init__(self, recent_block_hash: _Optional[str] = ..., priority_fee: _Optional[str] = ..., from_token_associated_address: _Optional[str] = ..., to_token_associated_address: _Optional[str] = ..., program_id: bool = ...) -> None: ...
+
+class SuiCoin(_message.Message):
+    __slots__ = ["balance", "coin_object_id", "coin_type", "digest", "previous_transaction", "version"]
+    BALANCE_FIELD_NUMBER: _ClassVar[int]
+    COIN_OBJECT_ID_FIELD_NUMBER: _ClassVar[int]
+    COIN_TYPE_FIELD_NUMBER: _ClassVar[int]
+    DIGEST_FIELD_NUMBER: _ClassVar[int]
+    PREVIOUS_TRANSACTION_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    balance: str
+    coin_object_id: str
+    coin_type: str
+    digest: str
+    previous_transaction: str
+    version: str
+    def __init__(self, coin_type: _Optional[str] = ..., coin_object_id: _Optional[str] = ..., version: _Optional[str] = ..., digest: _Optional[str] = ..., balance: _Optional[str] = ..., previous_transaction: _Optional[str] = ...) -> None: ...
+
+class SuiSpecific(_message.Message):
+    __slots__ = ["coins", "reference_gas_price"]
+    COINS_FIELD_NUMBER: _ClassVar[int]
+    REFERENCE_GAS_PRICE_FIELD_NUMBER: _ClassVar[int]
+    coins: _containers.RepeatedCompositeFieldContainer[SuiCoin]
+    reference_gas_price: str
+    def __init__(self, reference_gas_price: _Optional[str] = ..., coins: _Optional[_Iterable[_Union[SuiCoin, _Mapping]]] = ...) -> None: ...
+
+class THORChainSpecific(_message.Message):
+    __slots__ = ["account_number", "fee", "is_deposit", "sequence", "transaction_type"]
+    ACCOUNT_NUMBER_FIELD_NUMBER: _ClassVar[int]
+    FEE_FIELD_NUMBER: _ClassVar[int]
+    IS_DEPOSIT_FIELD_NUMBER: _ClassVar[int]
+    SEQUENCE_FIELD_NUMBER: _ClassVar[int]
+    TRANSACTION_TYPE_FIELD_NUMBER: _ClassVar[int]
+    account_number: int
+    fee: int
+    is_deposit: bool
+    sequence: int
+    transaction_type: TransactionType
+    def __init__(self, account_number: _Optional[int] = ..., sequence: _Optional[int] = ..., fee: _Optional[int] = ..., is_deposit: bool = ..., transaction_type: _Optional[_Union[TransactionType, str]] = ...) -> None: ...
+
+class TonSpecific(_message.Message):
+    __slots__ = ["bounceable", "expire_at", "send_max_amount", "sequence_number"]
+    BOUNCEABLE_FIELD_NUMBER: _ClassVar[int]
+    EXPIRE_AT_FIELD_NUMBER: _ClassVar[int]
+    SEND_MAX_AMOUNT_FIELD_NUMBER: _ClassVar[int]
+    SEQUENCE_NUMBER_FIELD_NUMBER: _ClassVar[int]
+    bounceable: bool
+    expire_at: int
+    send_max_amount: bool
+    sequence_number: int
+    def __init__(self, sequence_number: _Optional[int] = ..., expire_at: _Optional[int] = ..., bounceable: bool = ..., send_max_amount: bool = ...) -> None: ...
+
+class TronSpecific(_message.Message):
+    __slots__ = ["block_header_number", "block_header_parent_hash", "block_header_timestamp", "block_header_tx_trie_root", "block_header_version", "block_header_witness_address", "expiration", "gas_estimation", "timestamp"]
+    BLOCK_HEADER_NUMBER_FIELD_NUMBER: _ClassVar[int]
+    BLOCK_HEADER_PARENT_HASH_FIELD_NUMBER: _ClassVar[int]
+    BLOCK_HEADER_TIMESTAMP_FIELD_NUMBER: _ClassVar[int]
+    BLOCK_HEADER_TX_TRIE_ROOT_FIELD_NUMBER: _ClassVar[int]
+    BLOCK_HEADER_VERSION_FIELD_NUMBER: _ClassVar[int]
+    BLOCK_HEADER_WITNESS_ADDRESS_FIELD_NUMBER: _ClassVar[int]
+    EXPIRATION_FIELD_NUMBER: _ClassVar[int]
+    GAS_ESTIMATION_FIELD_NUMBER: _ClassVar[int]
+    TIMESTAMP_FIELD_NUMBER: _ClassVar[int]
+    block_header_number: int
+    block_header_parent_hash: str
+    block_header_timestamp: int
+    block_header_tx_trie_root: str
+    block_header_version: int
+    block_header_witness_address: str
+    expiration: int
+    gas_estimation: int
+    timestamp: int
+    def __init__(self, timestamp: _Optional[int] = ..., expiration: _Optional[int] = ..., block_header_timestamp: _Optional[int] = ..., block_header_number: _Optional[int] = ..., block_header_version: _Optional[int] = ..., block_header_tx_trie_root: _Optional[str] = ..., block_header_parent_hash: _Optional[str] = ..., block_header_witness_address: _Optional[str] = ..., gas_estimation: _Optional[int] = ...) -> None: ...
+
+class UTXOSpecific(_message.Message):
+    __slots__ = ["byte_fee", "send_max_amount"]
+    BYTE_FEE_FIELD_NUMBER: _ClassVar[int]
+    SEND_MAX_AMOUNT_FIELD_NUMBER: _ClassVar[int]
+    byte_fee: str
+    send_max_amount: bool
+    def __init__(self, byte_fee: _Optional[str] = ..., send_max_amount: bool = ...) -> None: ...
+
+class TransactionType(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = []
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: vultisig/keysign/v1/coin.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1evultisig/keysign/v1/coin.proto\x12\x13vultisig.keysign.v1\"\xbc\x01\n\x04\x43oin\x12\r\n\x05\x63hain\x18\x01 \x01(\t\x12\x0e\n\x06ticker\x18\x02 \x01(\t\x12\x0f\n\x07\x61\x64\x64ress\x18\x03 \x01(\t\x12\x18\n\x10\x63ontract_address\x18\x04 \x01(\t\x12\x10\n\x08\x64\x65\x63imals\x18\x05 \x01(\x05\x12\x19\n\x11price_provider_id\x18\x06 \x01(\t\x12\x17\n\x0fis_native_token\x18\x07 \x01(\x08\x12\x16\n\x0ehex_public_key\x18\x08 \x01(\t\x12\x0c\n\x04logo\x18\t \x01(\tBT\n\x13vultisig.keysign.v1Z8github.com/vultisig/commondata/go/vultisig/keysign/v1;v1\xba\x02\x02VSb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'vultisig.keysign.v1.coin_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'\n\023vultisig.keysign.v1Z8github.com/vultisig/commondata/go/vultisig/keysign/v1;v1\272\002\002VS'
+  _COIN._serialized_start=56
+  _COIN._serialized_end=244
+# @@protoc_insertion_point(module_scope)
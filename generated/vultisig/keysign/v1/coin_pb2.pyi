@@ -0,0 +1,27 @@
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Optional as _Optional
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class Coin(_message.Message):
+    __slots__ = ["address", "chain", "contract_address", "decimals", "hex_public_key", "is_native_token", "logo", "price_provider_id", "ticker"]
+    ADDRESS_FIELD_NUMBER: _ClassVar[int]
+    CHAIN_FIELD_NUMBER: _ClassVar[int]
+    CONTRACT_ADDRESS_FIELD_NUMBER: _ClassVar[int]
+    DECIMALS_FIELD_NUMBER: _ClassVar[int]
+    HEX_PUBLIC_KEY_FIELD_NUMBER: _ClassVar[int]
+    IS_NATIVE_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    LOGO_FIELD_NUMBER: _ClassVar[int]
+    PRICE_PROVIDER_ID_FIELD_NUMBER: _ClassVar[int]
+    TICKER_FIELD_NUMBER: _ClassVar[int]
+    address: str
+    chain: str
+    contract_address: str
+    decimals: int
+    hex_public_key: str
+    is_native_token: bool
+    logo: str
+    price_provider_id: str
+    ticker: str
+    def __init__(self, chain: _Optional[str] = ..., ticker: _Optional[str] = ..., address: _Optional[str] = ..., contract_address: _Optional[str] = ..., decimals: _Optional[int] = ..., price_provider_id: _Optional[str] = ..., is_native_token: bool = ..., hex_public_key: _Optional[str] = ..., logo: _Optional[str] = ...) -> None: ...
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: vultisig/keysign/v1/custom_message_payload.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n0vultisig/keysign/v1/custom_message_payload.proto\x12\x13vultisig.keysign.v1\"u\n\x14\x43ustomMessagePayload\x12\x0e\n\x06method\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x1e\n\x16vault_public_key_ecdsa\x18\x03 \x01(\t\x12\x1c\n\x14vault_local_party_id\x18\x04 \x01(\tBT\n\x13vultisig.keysign.v1Z8github.com/vultisig/commondata/go/vultisig/keysign/v1;v1\xba\x02\x02VSb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'vultisig.keysign.v1.custom_message_payload_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'\n\023vultisig.keysign.v1Z8github.com/vultisig/commondata/go/vultisig/keysign/v1;v1\272\002\002VS'
+  _CUSTOMMESSAGEPAYLOAD._serialized_start=73
+  _CUSTOMMESSAGEPAYLOAD._serialized_end=190
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,17 @@
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Optional as _Optional
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class CustomMessagePayload(_message.Message):
+    __slots__ = ["message", "method", "vault_local_party_id", "vault_public_key_ecdsa"]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    METHOD_FIELD_NUMBER: _ClassVar[int]
+    VAULT_LOCAL_PARTY_ID_FIELD_NUMBER: _ClassVar[int]
+    VAULT_PUBLIC_KEY_ECDSA_FIELD_NUMBER: _ClassVar[int]
+    message: str
+    method: str
+    vault_local_party_id: str
+    vault_public_key_ecdsa: str
+    def __init__(self, method: _Optional[str] = ..., message: _Optional[str] = ..., vault_public_key_ecdsa: _Optional[str] = ..., vault_local_party_id: _Optional[str] = ...) -> None: ...
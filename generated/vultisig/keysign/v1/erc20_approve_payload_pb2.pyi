@@ -0,0 +1,13 @@
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Optional as _Optional
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class Erc20ApprovePayload(_message.Message):
+    __slots__ = ["amount", "spender"]
+    AMOUNT_FIELD_NUMBER: _ClassVar[int]
+    SPENDER_FIELD_NUMBER: _ClassVar[int]
+    amount: str
+    spender: str
+    def __init__(self, amount: _Optional[str] = ..., spender: _Optional[str] = ...) -> None: ...
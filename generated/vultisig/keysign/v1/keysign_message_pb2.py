@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: vultisig/keysign/v1/keysign_message.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+vultisig_dot_keysign_dot_v1_dot_1inch__swap__payload__pb2 = __import__('importlib').import_module('vultisig.keysign.v1.1inch_swap_payload_pb2')
+from vultisig.keysign.v1 import blockchain_specific_pb2 as vultisig_dot_keysign_dot_v1_dot_blockchain__specific__pb2
+from vultisig.keysign.v1 import coin_pb2 as vultisig_dot_keysign_dot_v1_dot_coin__pb2
+from vultisig.keysign.v1 import custom_message_payload_pb2 as vultisig_dot_keysign_dot_v1_dot_custom__message__payload__pb2
+from vultisig.keysign.v1 import erc20_approve_payload_pb2 as vultisig_dot_keysign_dot_v1_dot_erc20__approve__payload__pb2
+from vultisig.keysign.v1 import kyberswap_swap_payload_pb2 as vultisig_dot_keysign_dot_v1_dot_kyberswap__swap__payload__pb2
+from vultisig.keysign.v1 import thorchain_swap_payload_pb2 as vultisig_dot_keysign_dot_v1_dot_thorchain__swap__payload__pb2
+from vultisig.keysign.v1 import utxo_info_pb2 as vultisig_dot_keysign_dot_v1_dot_utxo__info__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n)vultisig/keysign/v1/keysign_message.proto\x12\x13vultisig.keysign.v1\x1a,vultisig/keysign/v1/1inch_swap_payload.proto\x1a-vultisig/keysign/v1/blockchain_specific.proto\x1a\x1evultisig/keysign/v1/coin.proto\x1a\x30vultisig/keysign/v1/custom_message_payload.proto\x1a/vultisig/keysign/v1/erc20_approve_payload.proto\x1a\x30vultisig/keysign/v1/kyberswap_swap_payload.proto\x1a\x30vultisig/keysign/v1/thorchain_swap_payload.proto\x1a#vultisig/keysign/v1/utxo_info.proto\"\xaf\x02\n\x0eKeysignMessage\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x14\n\x0cservice_name\x18\x02 \x01(\t\x12\x1a\n\x12\x65ncryption_key_hex\x18\x04 \x01(\t\x12<\n\x0fkeysign_payload\x18\x05 \x01(\x0b\x32#.vultisig.keysign.v1.KeysignPayload\x12\x1a\n\x12use_vultisig_relay\x18\x06 \x01(\x08\x12\x12\n\npayload_id\x18\x07 \x01(\t\x12N\n\x16\x63ustom_message_payload\x18\x08 \x01(\x0b\x32).vultisig.keysign.v1.CustomMessagePayloadH\x00\x88\x01\x01\x42\x19\n\x17_custom_message_payload\"\xb5\x0b\n\x0eKeysignPayload\x12\'\n\x04\x63oin\x18\x01 \x01(\x0b\x32\x19.vultisig.keysign.v1.Coin\x12\x12\n\nto_address\x18\x02 \x01(\t\x12\x11\n\tto_amount\x18\x03 \x01(\t\x12:\n\rutxo_specific\x18\x04 \x01(\x0b\x32!.vultisig.keysign.v1.UTXOSpecificH\x00\x12\x42\n\x11\x65thereum_specific\x18\x05 \x01(\x0b\x32%.vultisig.keysign.v1.EthereumSpecificH\x00\x12\x44\n\x12thorchain_specific\x18\x06 \x01(\x0b\x32&.vultisig.keysign.v1.THORChainSpecificH\x00\x12?\n\rmaya_specific\x18\x07 \x01(\x0b\x32&.vultisig.keysign.v1.MAYAChainSpecificH\x00\x12>\n\x0f\x63osmos_specific\x18\x08 \x01(\x0b\x32#.vultisig.keysign.v1.CosmosSpecificH\x00\x12>\n\x0fsolana_specific\x18\t \x01(\x0b\x32#.vultisig.keysign.v1.SolanaSpecificH\x00\x12\x42\n\x11polkadot_specific\x18\n \x01(\x0b\x32%.vultisig.keysign.v1.PolkadotSpecificH\x00\x12;\n\x0fsuiche_specific\x18\x0b \x01(\x0b\x32 .vultisig.keysign.v1.SuiSpecificH\x00\x12\x38\n\x0cton_specific\x18\x0c \x01(\x0b\x32 .vultisig.keysign.v1.TonSpecificH\x00\x12>\n\x0fripple_specific\x18\r \x01(\x0b\x32#.vultisig.keysign.v1.RippleSpecificH\x00\x12:\n\rtron_specific\x18\x0e \x01(\x0b\x32!.vultisig.keysign.v1.TronSpecificH\x00\x12<\n\x07\x63\x61rdano\x18\x0f \x01(\x0b\x32).vultisig.keysign.v1.CardanoChainSpecificH\x00\x12\x30\n\tutxo_info\x18\x14 \x03(\x0b\x32\x1d.vultisig.keysign.v1.UtxoInfo\x12\x11\n\x04memo\x18\x15 \x01(\tH\x02\x88\x01\x01\x12K\n\x16thorchain_swap_payload\x18\x16 \x01(\x0b\x32).vultisig.keysign.v1.THORChainSwapPayloadH\x01\x12K\n\x16mayachain_swap_payload\x18\x17 \x01(\x0b\x32).vultisig.keysign.v1.THORChainSwapPayloadH\x01\x12G\n\x14oneinch_swap_payload\x18\x18 \x01(\x0b\x32\'.vultisig.keysign.v1.OneInchSwapPayloadH\x01\x12G\n\x16kyberswap_swap_payload\x18\x19 \x01(\x0b\x32%.vultisig.keysign.v1.KyberSwapPayloadH\x01\x12L\n\x15\x65rc20_approve_payload\x18\x1e \x01(\x0b\x32(.vultisig.keysign.v1.Erc20ApprovePayloadH\x03\x88\x01\x01\x12\x1e\n\x16vault_public_key_ecdsa\x18\x1f \x01(\t\x12\x1c\n\x14vault_local_party_id\x18  \x01(\t\x12\x10\n\x08lib_type\x18! \x01(\tB\x15\n\x13\x62lockchain_specificB\x0e\n\x0cswap_payloadB\x07\n\x05_memoB\x18\n\x16_erc20_approve_payloadBT\n\x13vultisig.keysign.v1Z8github.com/vultisig/commondata/go/vultisig/keysign/v1;v1\xba\x02\x02VSb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'vultisig.keysign.v1.keysign_message_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'\n\023vultisig.keysign.v1Z8github.com/vultisig/commondata/go/vultisig/keysign/v1;v1\272\002\002VS'
+  _KEYSIGNMESSAGE._serialized_start=428
+  _KEYSIGNMESSAGE._serialized_end=731
+  _KEYSIGNPAYLOAD._serialized_start=734
+  _KEYSIGNPAYLOAD._serialized_end=2195
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,86 @@
+from vultisig.keysign.v1 import 1inch_swap_payload_pb2 as _1inch_swap_payload_pb2
+from vultisig.keysign.v1 import blockchain_specific_pb2 as _blockchain_specific_pb2
+from vultisig.keysign.v1 import coin_pb2 as _coin_pb2
+from vultisig.keysign.v1 import custom_message_payload_pb2 as _custom_message_payload_pb2
+from vultisig.keysign.v1 import erc20_approve_payload_pb2 as _erc20_approve_payload_pb2
+from vultisig.keysign.v1 import kyberswap_swap_payload_pb2 as _kyberswap_swap_payload_pb2
+from vultisig.keysign.v1 import thorchain_swap_payload_pb2 as _thorchain_swap_payload_pb2
+from vultisig.keysign.v1 import utxo_info_pb2 as _utxo_info_pb2
+from google.protobuf.internal import containers as _containers
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Mapping, Optional as _Optional, Union as _Union
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class KeysignMessage(_message.Message):
+    __slots__ = ["custom_message_payload", "encryption_key_hex", "keysign_payload", "payload_id", "service_name", "session_id", "use_vultisig_relay"]
+    CUSTOM_MESSAGE_PAYLOAD_FIELD_NUMBER: _ClassVar[int]
+    ENCRYPTION_KEY_HEX_FIELD_NUMBER: _ClassVar[int]
+    KEYSIGN_PAYLOAD_FIELD_NUMBER: _ClassVar[int]
+    PAYLOAD_ID_FIELD_NUMBER: _ClassVar[int]
+    SERVICE_NAME_FIELD_NUMBER: _ClassVar[int]
+    SESSION_ID_FIELD_NUMBER: _ClassVar[int]
+    USE_VULTISIG_RELAY_FIELD_NUMBER: _ClassVar[int]
+    custom_message_payload: _custom_message_payload_pb2.CustomMessagePayload
+    encryption_key_hex: str
+    keysign_payload: KeysignPayload
+    payload_id: str
+    service_name: str
+    session_id: str
+    use_vultisig_relay: bool
+    def __init__(self, session_id: _Optional[str] = ..., service_name: _Optional[str] = ..., encryption_key_hex: _Optional[str] = ..., keysign_payload: _Optional[_Union[KeysignPayload, _Mapping]] = ..., use_vultisig_relay: bool = ..., payload_id: _Optional[str] = ..., custom_message_payload: _Optional[_Union[_custom_message_payload_pb2.CustomMessagePayload, _Mapping]] = ...) -> None: ...
+
+class KeysignPayload(_message.Message):
+    __slots__ = ["cardano", "coin", "cosmos_specific", "erc20_approve_payload", "ethereum_specific", "kyberswap_swap_payload", "lib_type", "maya_specific", "mayachain_swap_payload", "memo", "oneinch_swap_payload", "polkadot_specific", "ripple_specific", "solana_specific", "suiche_specific", "thorchain_specific", "thorchain_swap_payload", "to_address", "to_amount", "ton_specific", "tron_specific", "utxo_info", "utxo_specific", "vault_local_party_id", "vault_public_key_ecdsa"]
+    CARDANO_FIELD_NUMBER: _ClassVar[int]
+    COIN_FIELD_NUMBER: _ClassVar[int]
+    COSMOS_SPECIFIC_FIELD_NUMBER: _ClassVar[int]
+    ERC20_APPROVE_PAYLOAD_FIELD_NUMBER: _ClassVar[int]
+    ETHEREUM_SPECIFIC_FIELD_NUMBER: _ClassVar[int]
+    KYBERSWAP_SWAP_PAYLOAD_FIELD_NUMBER: _ClassVar[int]
+    LIB_TYPE_FIELD_NUMBER: _ClassVar[int]
+    MAYACHAIN_SWAP_PAYLOAD_FIELD_NUMBER: _ClassVar[int]
+    MAYA_SPECIFIC_FIELD_NUMBER: _ClassVar[int]
+    MEMO_FIELD_NUMBER: _ClassVar[int]
+    ONEINCH_SWAP_PAYLOAD_FIELD_NUMBER: _ClassVar[int]
+    POLKADOT_SPECIFIC_FIELD_NUMBER: _ClassVar[int]
+    RIPPLE_SPECIFIC_FIELD_NUMBER: _ClassVar[int]
+    SOLANA_SPECIFIC_FIELD_NUMBER: _ClassVar[int]
+    SUICHE_SPECIFIC_FIELD_NUMBER: _ClassVar[int]
+    THORCHAIN_SPECIFIC_FIELD_NUMBER: _ClassVar[int]
+    THORCHAIN_SWAP_PAYLOAD_FIELD_NUMBER: _ClassVar[int]
+    TON_SPECIFIC_FIELD_NUMBER: _ClassVar[int]
+    TO_ADDRESS_FIELD_NUMBER: _ClassVar[int]
+    TO_AMOUNT_FIELD_NUMBER: _ClassVar[int]
+    TRON_SPECIFIC_FIELD_NUMBER: _ClassVar[int]
+    UTXO_INFO_FIELD_NUMBER: _ClassVar[int]
+    UTXO_SPECIFIC_FIELD_NUMBER: _ClassVar[int]
+    VAULT_LOCAL_PARTY_ID_FIELD_NUMBER: _ClassVar[int]
+    VAULT_PUBLIC_KEY_ECDSA_FIELD_NUMBER: _ClassVar[int]
+    cardano: _blockchain_specific_pb2.CardanoChainSpecific
+    coin: _coin_pb2.Coin
+    cosmos_specific: _blockchain_specific_pb2.CosmosSpecific
+    erc20_approve_payload: _erc20_approve_payload_pb2.Erc20ApprovePayload
+    ethereum_specific: _blockchain_specific_pb2.EthereumSpecific
+    kyberswap_swap_payload: _kyberswap_swap_payload_pb2.KyberSwapPayload
+    lib_type: str
+    maya_specific: _blockchain_specific_pb2.MAYAChainSpecific
+    mayachain_swap_payload: _thorchain_swap_payload_pb2.THORChainSwapPayload
+    memo: str
+    oneinch_swap_payload: _1inch_swap_payload_pb2.OneInchSwapPayload
+    polkadot_specific: _blockchain_specific_pb2.PolkadotSpecific
+    ripple_specific: _blockchain_specific_pb2.RippleSpecific
+    solana_specific: _blockchain_specific_pb2.SolanaSpecific
+    suiche_specific: _blockchain_specific_pb2.SuiSpecific
+    thorchain_specific: _blockchain_specific_pb2.THORChainSpecific
+    thorchain_swap_payload: _thorchain_swap_payload_pb2.THORChainSwapPayload
+    to_address: str
+    to_amount: str
+    ton_specific: _blockchain_specific_pb2.TonSpecific
+    tron_specific: _blockchain_specific_pb2.TronSpecific
+    utxo_info: _containers.RepeatedCompositeFieldContainer[_utxo_info_pb2.UtxoInfo]
+    utxo_specific: _blockchain_specific_pb2.UTXOSpecific
+    vault_local_party_id: str
+    vault_public_key_ecdsa: str
+    def __init__(self, coin: _Optional[_Union[_coin_pb2.Coin, _Mapping]] = ..., to_address: _Optional[str] = ..., to_amount: _Optional[str] = ..., utxo_specific: _Optional[_Union[_blockchain_specific_pb2.UTXOSpecific, _Mapping]] = ..., ethereum_specific: _Optional[_Union[_blockchain_specific_pb2.EthereumSpecific, _Mapping]] = ..., thorchain_specific: _Optional[_Union[_blockchain_specific_pb2.THORChainSpecific, _Mapping]] = ..., maya_specific: _Optional[_Union[_blockchain_specific_pb2.MAYAChainSpecific, _Mapping]] = ..., cosmos_specific: _Optional[_Union[_blockchain_specific_pb2.CosmosSpecific, _Mapping]] = ..., solana_specific: _Optional[_Union[_blockchain_specific_pb2.SolanaSpecific, _Mapping]] = ..., polkadot_specific: _Optional[_Union[_blockchain_specific_pb2.PolkadotSpecific, _Mapping]] = ..., suiche_specific: _Optional[_Union[_blockchain_specific_pb2.SuiSpecific, _Mapping]] = ..., ton_specific: _Optional[_Union[_blockchain_specific_pb2.TonSpecific, _Mapping]] = ..., ripple_specific: _Optional[_Union[_blockchain_specific_pb2.RippleSpecific, _Mapping]] = ..., tron_specific: _Optional[_Union[_blockchain_specific_pb2.TronSpecific, _Mapping]] = ..., cardano: _Optional[_Union[_blockchain_specific_pb2.CardanoChainSpecific, _Mapping]] = ..., utxo_info: _Optional[_Iterable[_Union[_utxo_info_pb2.UtxoInfo, _Mapping]]] = ..., memo: _Optional[str] = ..., thorchain_swap_payload: _Optional[_Union[_thorchain_swap_payload_pb2.THORChainSwapPayload, _Mapping]] = ..., mayachain_swap_payload: _Optional[_Union[_thorchain_swap_payload_pb2.THORChainSwapPayload, _Mapping]] = ..., oneinch_swap_payload: _Optional[_Union[_1inch_swap_payload_pb2.OneInchSwapPayload, _Mapping]] = ..., kyberswap_swap_payload: _Optional[_Union[_kyberswap_swap_payload_pb2.KyberSwapPayload, _Mapping]] = ..., erc20_approve_payload: _Optional[_Union[_erc20_approve_payload_pb2.Erc20ApprovePayload, _Mapping]] = ..., vault_public_key_ecdsa: _Optional[str] = ..., vault_local_party_id: _Optional[str] = ..., lib_type: _Optional[str] = ...) -> None: ...
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: vultisig/keysign/v1/thorchain_swap_payload.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from vultisig.keysign.v1 import coin_pb2 as vultisig_dot_keysign_dot_v1_dot_coin__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n0vultisig/keysign/v1/thorchain_swap_payload.proto\x12\x13vultisig.keysign.v1\x1a\x1evultisig/keysign/v1/coin.proto\"\x8a\x03\n\x14THORChainSwapPayload\x12\x14\n\x0c\x66rom_address\x18\x01 \x01(\t\x12,\n\tfrom_coin\x18\x02 \x01(\x0b\x32\x19.vultisig.keysign.v1.Coin\x12*\n\x07to_coin\x18\x03 \x01(\x0b\x32\x19.vultisig.keysign.v1.Coin\x12\x15\n\rvault_address\x18\x04 \x01(\t\x12\x1b\n\x0erouter_address\x18\x05 \x01(\tH\x00\x88\x01\x01\x12\x13\n\x0b\x66rom_amount\x18\x06 \x01(\t\x12\x19\n\x11to_amount_decimal\x18\x07 \x01(\t\x12\x17\n\x0fto_amount_limit\x18\x08 \x01(\t\x12\x1a\n\x12streaming_interval\x18\t \x01(\t\x12\x1a\n\x12streaming_quantity\x18\n \x01(\t\x12\x17\n\x0f\x65xpiration_time\x18\x0b \x01(\x04\x12\x14\n\x0cis_affiliate\x18\x0c \x01(\x08\x12\x0b\n\x03\x66\x65\x65\x18\r \x01(\tB\x11\n\x0f_router_addressBT\n\x13vultisig.keysign.v1Z8github.com/vultisig/commondata/go/vultisig/keysign/v1;v1\xba\x02\x02VSb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'vultisig.keysign.v1.thorchain_swap_payload_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'\n\023vultisig.keysign.v1Z8github.com/vultisig/commondata/go/vultisig/keysign/v1;v1\272\002\002VS'
+  _THORCHAINSWAPPAYLOAD._serialized_start=106
+  _THORCHAINSWAPPAYLOAD._serialized_end=500
+# @@protoc_insertion_point(module_scope)
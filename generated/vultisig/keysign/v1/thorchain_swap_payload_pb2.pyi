@@ -0,0 +1,36 @@
+from vultisig.keysign.v1 import coin_pb2 as _coin_pb2
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Mapping as _Mapping, Optional as _Optional, Union as _Union
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class THORChainSwapPayload(_message.Message):
+    __slots__ = ["expiration_time", "fee", "from_address", "from_amount", "from_coin", "is_affiliate", "router_address", "streaming_interval", "streaming_quantity", "to_amount_decimal", "to_amount_limit", "to_coin", "vault_address"]
+    EXPIRATION_TIME_FIELD_NUMBER: _ClassVar[int]
+    FEE_FIELD_NUMBER: _ClassVar[int]
+    FROM_ADDRESS_FIELD_NUMBER: _ClassVar[int]
+    FROM_AMOUNT_FIELD_NUMBER: _ClassVar[int]
+    FROM_COIN_FIELD_NUMBER: _ClassVar[int]
+    IS_AFFILIATE_FIELD_NUMBER: _ClassVar[int]
+    ROUTER_ADDRESS_FIELD_NUMBER: _ClassVar[int]
+    STREAMING_INTERVAL_FIELD_NUMBER: _ClassVar[int]
+    STREAMING_QUANTITY_FIELD_NUMBER: _ClassVar[int]
+    TO_AMOUNT_DECIMAL_FIELD_NUMBER: _ClassVar[int]
+    TO_AMOUNT_LIMIT_FIELD_NUMBER: _ClassVar[int]
+    TO_COIN_FIELD_NUMBER: _ClassVar[int]
+    VAULT_ADDRESS_FIELD_NUMBER: _ClassVar[int]
+    expiration_time: int
+    fee: str
+    from_address: str
+    from_amount: str
+    from_coin: _coin_pb2.Coin
+    is_affiliate: bool
+    router_address: str
+    streaming_interval: str
+    streaming_quantity: str
+    to_amount_decimal: str
+    to_amount_limit: str
+    to_coin: _coin_pb2.Coin
+    vault_address: str
+    def __init__(self, from_address: _Optional[str] = ..., from_coin: _Optional[_Union[_coin_pb2.Coin, _Mapping]] = ..., to_coin: _Optional[_Union[_coin_pb2.Coin, _Mapping]] = ..., vault_address: _Optional[str] = ..., router_address: _Optional[str] = ..., from_amount: _Optional[str] = ..., to_amount_decimal: _Optional[str] = ..., to_amount_limit: _Optional[str] = ..., streaming_interval: _Optional[str] = ..., streaming_quantity: _Optional[str] = ..., expiration_time: _Optional[int] = ..., is_affiliate: bool = ..., fee: _Optional[str] = ...) -> None: ...
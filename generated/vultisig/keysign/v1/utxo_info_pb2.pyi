@@ -0,0 +1,15 @@
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Optional as _Optional
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class UtxoInfo(_message.Message):
+    __slots__ = ["amount", "hash", "index"]
+    AMOUNT_FIELD_NUMBER: _ClassVar[int]
+    HASH_FIELD_NUMBER: _ClassVar[int]
+    INDEX_FIELD_NUMBER: _ClassVar[int]
+    amount: int
+    hash: str
+    index: int
+    def __init__(self, hash: _Optional[str] = ..., amount: _Optional[int] = ..., index: _Optional[int] = ...) -> None: ...
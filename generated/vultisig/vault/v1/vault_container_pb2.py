@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: vultisig/vault/v1/vault_container.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\'vultisig/vault/v1/vault_container.proto\x12\x11vultisig.vault.v1\"F\n\x0eVaultContainer\x12\x0f\n\x07version\x18\x01 \x01(\x04\x12\r\n\x05vault\x18\x02 \x01(\t\x12\x14\n\x0cis_encrypted\x18\x03 \x01(\x08\x42P\n\x11vultisig.vault.v1Z6github.com/vultisig/commondata/go/vultisig/vault/v1;v1\xba\x02\x02VSb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'vultisig.vault.v1.vault_container_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'\n\021vultisig.vault.v1Z6github.com/vultisig/commondata/go/vultisig/vault/v1;v1\272\002\002VS'
+  _VAULTCONTAINER._serialized_start=62
+  _VAULTCONTAINER._serialized_end=132
+# @@protoc_insertion_point(module_scope)
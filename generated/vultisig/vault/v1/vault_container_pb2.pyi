@@ -0,0 +1,15 @@
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Optional as _Optional
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class VaultContainer(_message.Message):
+    __slots__ = ["is_encrypted", "vault", "version"]
+    IS_ENCRYPTED_FIELD_NUMBER: _ClassVar[int]
+    VAULT_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    is_encrypted: bool
+    vault: str
+    version: int
+    def __init__(self, version: _Optional[int] = ..., vault: _Optional[str] = ..., is_encrypted: bool = ...) -> None: ...
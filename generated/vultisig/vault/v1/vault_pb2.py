@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: vultisig/vault/v1/vault.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
+from vultisig.keygen.v1 import lib_type_message_pb2 as vultisig_dot_keygen_dot_v1_dot_lib__type__message__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1dvultisig/vault/v1/vault.proto\x12\x11vultisig.vault.v1\x1a\x1fgoogle/protobuf/timestamp.proto\x1a)vultisig/keygen/v1/lib_type_message.proto\"\xea\x02\n\x05Vault\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x18\n\x10public_key_ecdsa\x18\x02 \x01(\t\x12\x18\n\x10public_key_eddsa\x18\x03 \x01(\t\x12\x0f\n\x07signers\x18\x04 \x03(\t\x12.\n\ncreated_at\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x16\n\x0ehex_chain_code\x18\x06 \x01(\t\x12\x35\n\nkey_shares\x18\x07 \x03(\x0b\x32!.vultisig.vault.v1.Vault.KeyShare\x12\x16\n\x0elocal_party_id\x18\x08 \x01(\t\x12\x16\n\x0ereshare_prefix\x18\t \x01(\t\x12-\n\x08lib_type\x18\n \x01(\x0e\x32\x1b.vultisig.keygen.v1.LibType\x1a\x30\n\x08KeyShare\x12\x12\n\npublic_key\x18\x01 \x01(\t\x12\x10\n\x08keyshare\x18\x02 \x01(\tBP\n\x11vultisig.vault.v1Z6github.com/vultisig/commondata/go/vultisig/vault/v1;v1\xba\x02\x02VSb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'vultisig.vault.v1.vault_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'\n\021vultisig.vault.v1Z6github.com/vultisig/commondata/go/vultisig/vault/v1;v1\272\002\002VS'
+  _VAULT._serialized_start=129
+  _VAULT._serialized_end=491
+  _VAULT_KEYSHARE._serialized_start=443
+  _VAULT_KEYSHARE._serialized_end=491
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,39 @@
+from google.protobuf import timestamp_pb2 as _timestamp_pb2
+from vultisig.keygen.v1 import lib_type_message_pb2 as _lib_type_message_pb2
+from google.protobuf.internal import containers as _containers
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Mapping, Optional as _Optional, Union as _Union
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class Vault(_message.Message):
+    __slots__ = ["created_at", "hex_chain_code", "key_shares", "lib_type", "local_party_id", "name", "public_key_ecdsa", "public_key_eddsa", "reshare_prefix", "signers"]
+    class KeyShare(_message.Message):
+        __slots__ = ["keyshare", "public_key"]
+        KEYSHARE_FIELD_NUMBER: _ClassVar[int]
+        PUBLIC_KEY_FIELD_NUMBER: _ClassVar[int]
+        keyshare: str
+        public_key: str
+        def __init__(self, public_key: _Optional[str] = ..., keyshare: _Optional[str] = ...) -> None: ...
+    CREATED_AT_FIELD_NUMBER: _ClassVar[int]
+    HEX_CHAIN_CODE_FIELD_NUMBER: _ClassVar[int]
+    KEY_SHARES_FIELD_NUMBER: _ClassVar[int]
+    LIB_TYPE_FIELD_NUMBER: _ClassVar[int]
+    LOCAL_PARTY_ID_FIELD_NUMBER: _ClassVar[int]
+    NAME_FIELD_NUMBER: _ClassVar[int]
+    PUBLIC_KEY_ECDSA_FIELD_NUMBER: _ClassVar[int]
+    PUBLIC_KEY_EDDSA_FIELD_NUMBER: _ClassVar[int]
+    RESHARE_PREFIX_FIELD_NUMBER: _ClassVar[int]
+    SIGNERS_FIELD_NUMBER: _ClassVar[int]
+    created_at: _timestamp_pb2.Timestamp
+    hex_chain_code: str
+    key_shares: _containers.RepeatedCompositeFieldContainer[Vault.KeyShare]
+    lib_type: _lib_type_message_pb2.LibType
+    local_party_id: str
+    name: str
+    public_key_ecdsa: str
+    public_key_eddsa: str
+    reshare_prefix: str
+    signers: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, name: _Optional[str] = ..., public_key_ecdsa: _Optional[str] = ..., public_key_eddsa: _Optional[str] = ..., signers: _Optional[_Iterable[str]] = ..., created_at: _Optional[_Union[_timestamp_pb2.Timestamp, _Mapping]] = ..., hex_chain_code: _Optional[str] = ..., key_shares: _Optional[_Iterable[_Union[Vault.KeyShare, _Mapping]]] = ..., local_party_id: _Optional[str] = ..., reshare_prefix: _Optional[str] = ..., lib_type: _Optional[_Union[_lib_type_message_pb2.LibType, str]] = ...) -> None: ...
@@ -2,6 +2,7 @@ module vultitool
 
 go 1.24
 
-require github.com/vultisig/commondata v0.0.0-20250710214228-61d9ed8f7778
-
-require google.golang.org/protobuf v1.34.2 // indirect
+require (
+	github.com/vultisig/commondata v0.0.0-20250710214228-61d9ed8f7778
+	google.golang.org/protobuf v1.34.2
+)
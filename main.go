@@ -1,10 +1,15 @@
 package main
 
 import (
+	"encoding/base64"
+	"flag"
 	"fmt"
 	"io"
 	"os"
 	"strings"
+
+	vault "github.com/vultisig/commondata/go/vultisig/vault/v1"
+	"google.golang.org/protobuf/proto"
 )
 
 func getVersion() string {
@@ -23,8 +28,6 @@ func getVersion() string {
 }
 
 func main() {
-	fmt.Println("vultitool - Vault decryption utility")
-	
 	if len(os.Args) < 2 {
 		printUsage()
 		os.Exit(1)
@@ -34,8 +37,7 @@ func main() {
 	
 	switch command {
 	case "decrypt":
-		// TODO: Implement decrypt command
-		fmt.Println("Decrypt command not yet implemented")
+		os.Exit(runDecrypt(os.Args[2:]))
 	case "version", "-v", "--version":
 		fmt.Printf("vultitool-go %s\n", getVersion())
 	case "help", "-h", "--help":
@@ -47,16 +49,91 @@ func main() {
 	}
 }
 
+// runDecrypt decrypts one .vult file, or serves framed decryption requests with --serve
+func runDecrypt(args []string) int {
+	flags := flag.NewFlagSet("decrypt", flag.ContinueOnError)
+	serve := flags.Bool("serve", false, "Run as a batch worker speaking the framed protocol on stdin/stdout")
+	password := flags.String("password", "", "Vault password")
+	flags.StringVar(password, "p", "", "Vault password (shorthand)")
+	// Accept flags before or after the file name
+	var positional []string
+	for {
+		if err := flags.Parse(args); err != nil {
+			return 2
+		}
+		if flags.NArg() == 0 {
+			break
+		}
+		positional = append(positional, flags.Arg(0))
+		args = flags.Args()[1:]
+	}
+
+	if *serve {
+		if err := serveDecrypt(os.Stdin, os.Stdout); err != nil {
+			fmt.Fprintf(os.Stderr, "Error: %v\n", err)
+			return 1
+		}
+		return 0
+	}
+
+	if len(positional) != 1 {
+		fmt.Fprintln(os.Stderr, "Usage: vultitool-go decrypt <file.vult> [--password PASSWORD]")
+		fmt.Fprintln(os.Stderr, "       vultitool-go decrypt --serve")
+		return 2
+	}
+	vaultBytes, err := decryptFile(positional[0], *password)
+	if err != nil {
+		fmt.Fprintf(os.Stderr, "Error: %v\n", err)
+		return 1
+	}
+	// Same form as the vault field of an unencrypted container
+	fmt.Println(base64.StdEncoding.EncodeToString(vaultBytes))
+	return 0
+}
+
+// decryptFile returns the Vault protobuf bytes of a .vult file, decrypting them if needed
+func decryptFile(path string, password string) ([]byte, error) {
+	content, err := os.ReadFile(path)
+	if err != nil {
+		return nil, err
+	}
+	raw, err := base64.StdEncoding.DecodeString(strings.TrimSpace(string(content)))
+	if err != nil {
+		return nil, fmt.Errorf("failed to decode vault container: %w", err)
+	}
+	var container vault.VaultContainer
+	if err := proto.Unmarshal(raw, &container); err != nil {
+		return nil, fmt.Errorf("failed to decode vault container: %w", err)
+	}
+	vaultBytes, err := base64.StdEncoding.DecodeString(container.GetVault())
+	if err != nil {
+		return nil, fmt.Errorf("failed to decode vault payload: %w", err)
+	}
+	if !container.GetIsEncrypted() {
+		return vaultBytes, nil
+	}
+	if password == "" {
+		return nil, fmt.Errorf("vault is encrypted and no password was provided")
+	}
+	gcm, err := newVaultCipher(password)
+	if err != nil {
+		return nil, err
+	}
+	return decryptVault(gcm, vaultBytes)
+}
+
 func printUsage() {
+	fmt.Println("vultitool - Vault decryption utility")
 	fmt.Println("Usage: vultitool <command> [options]")
 	fmt.Println("")
 	fmt.Println("Commands:")
-	fmt.Println("  decrypt    Decrypt a vault file")
+	fmt.Println("  decrypt    Decrypt a vault file, or serve batch requests with --serve")
 	fmt.Println("  version    Show version information")
 	fmt.Println("  help       Show this help message")
 	fmt.Println("")
 	fmt.Println("Examples:")
-	fmt.Println("  vultitool decrypt vault.json")
+	fmt.Println("  vultitool decrypt vault.vult --password secret")
+	fmt.Println("  vultitool decrypt --serve")
 	fmt.Println("  vultitool version")
 	fmt.Println("  vultitool help")
 }
@@ -7,15 +7,16 @@ import base64
 import sys
 from pathlib import Path
 
-# Add generated protobuf path and commands path
-sys.path.insert(0, str(Path(__file__).parent / "generated"))
+# Add commands path
 sys.path.insert(0, str(Path(__file__).parent / "commands"))
 
-from vultisig.vault.v1.vault_container_pb2 import VaultContainer
-from vultisig.vault.v1.vault_pb2 import Vault
-from crypto_fixed import VaultDecryptor
+from schema import message_class
+from crypto import VaultDecryptor
 
-def test_decrypt_vault(vault_path: str, password: str):
+VaultContainer = message_class('vultisig.vault.v1.VaultContainer')
+Vault = message_class('vultisig.vault.v1.Vault')
+
+def test_decrypt_vault(vault_path: str = "tests/fixtures/qa-fast-share2of2.vult", password: str = "vulticli01"):
     """Test decrypting a vault file"""
     
     print(f"🔓 Testing decryption of {vault_path}")
@@ -60,26 +61,20 @@ def test_decrypt_vault(vault_path: str, password: str):
             print(f"📊 First 32 bytes (hex): {decrypted_data[:32].hex()}")
             print()
             
-            # Validate the decrypted data
-            if decryptor.validate_decrypted_data(decrypted_data):
-                print("✅ Decrypted data appears valid")
+            # Parse as Vault protobuf; GCM has already authenticated the plaintext
+            try:
+                vault = Vault()
+                vault.ParseFromString(decrypted_data)
+                
+                print(f"🎉 Successfully parsed decrypted vault!")
+                print(f"   Name: {vault.name}")
+                print(f"   Public Key ECDSA: {vault.public_key_ecdsa}")
+                print(f"   Signers: {len(vault.signers)}")
+                print(f"   Key Shares: {len(vault.key_shares)}")
+                
+            except Exception as e:
+                print(f"❌ Failed to parse as Vault protobuf: {e}")
                 
-                # Try to parse as Vault protobuf
-                try:
-                    vault = Vault()
-                    vault.ParseFromString(decrypted_data)
-                    
-                    print(f"🎉 Successfully parsed decrypted vault!")
-                    print(f"   Name: {vault.name}")
-                    print(f"   Public Key ECDSA: {vault.public_key_ecdsa}")
-                    print(f"   Signers: {len(vault.signers)}")
-                    print(f"   Key Shares: {len(vault.key_shares)}")
-                    
-                except Exception as e:
-                    print(f"❌ Failed to parse as Vault protobuf: {e}")
-                    
-            else:
-                print("❌ Decrypted data validation failed")
         else:
             print("❌ Decryption failed - none of the methods worked")
             print("💡 This might indicate:")
@@ -4,11 +4,17 @@ Vultitool Self-Test Suite
 Comprehensive testing for .vult file parsing and vultitool functionality
 """
 
+import os
 import sys
 import json
 import subprocess
 import tempfile
 import base64
+import re
+import time
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
@@ -116,11 +122,15 @@ class VultitoolTester:
             if details:
                 print(f"       Details: {details}")
     
-    def run_vultitool_command(self, args: List[str]) -> Tuple[int, str, str]:
+    def run_vultitool_command(self, args: List[str], env: Optional[Dict] = None,
+                              input: Optional[str] = None) -> Tuple[int, str, str]:
         """Run vultitool command and return (exit_code, stdout, stderr)"""
         try:
             cmd = ["./vultitool"] + args
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            if env is not None:
+                env = dict(os.environ, **env)
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30, env=env,
+                                    input=input)
             return result.returncode, result.stdout, result.stderr
         except subprocess.TimeoutExpired:
             return -1, "", "Command timed out"
@@ -405,6 +415,1324 @@ class VultitoolTester:
         )
         return success
     
+    def test_batch_validation(self) -> bool:
+        """Test directory-scale validation with aggregated per-rule counts"""
+        cmd = ["vault", "scan", "tests/fixtures", "--json", "--password", "vulticli01"]
+        exit_code, stdout, stderr = self.run_vultitool_command(cmd)
+        
+        try:
+            summary = json.loads(stdout)
+        except json.JSONDecodeError as e:
+            self.log_result("Batch scan", False, "Scan output is not valid JSON", str(e))
+            return False
+        
+        expected_files = len(self.test_files)
+        success = (exit_code == 0 and summary.get("files") == expected_files
+                   and summary.get("passed") == expected_files and summary.get("encrypted") == 1)
+        self.log_result(
+            "Batch scan",
+            success,
+            f"Scanned {summary.get('files')} files, {summary.get('passed')} passed" if success else "Unexpected scan summary",
+            json.dumps(summary) if not success else ""
+        )
+        return success
+    
+    def test_rule_selection(self) -> bool:
+        """Test --rules selection and per-rule reporting"""
+        results = []
+        
+        # Selecting strict rules explicitly should flag the 2-of-3 share layout
+        exit_code, stdout, stderr = self.run_vultitool_command(
+            ["vault", "validate", "tests/fixtures/qa-secure-share1of3.vult", "--rules", "name-present,signer-share-count"])
+        results.append(("strict_rule_selected", exit_code == 1 and "[signer-share-count]" in stdout))
+        
+        # Unknown rule names should be rejected
+        exit_code, stdout, stderr = self.run_vultitool_command(
+            ["vault", "validate", "tests/fixtures/testGG20-part1of2.vult", "--rules", "no-such-rule"])
+        results.append(("unknown_rule_rejected", exit_code != 0 and "Unknown rule" in stdout))
+        
+        # Every registered rule should pass on the unencrypted fixtures
+        exit_code, stdout, stderr = self.run_vultitool_command(
+            ["vault", "validate", "tests/fixtures/testGG20-part1of2.vult", "tests/fixtures/testDKLS-1of2.vult",
+             "--rules", "all", "--json"])
+        try:
+            summary = json.loads(stdout)["summary"]
+            all_rules_ok = summary["passed"] == 2 and not summary["rule_hits"].get("ecdsa-key-format")
+        except (json.JSONDecodeError, KeyError):
+            all_rules_ok = False
+        results.append(("all_rules_batch", all_rules_ok))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Rule selection",
+            all_passed,
+            "Rule selection works correctly" if all_passed else "Rule selection issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_keycheck(self) -> bool:
+        """Test curve point validation of vault and ad-hoc public keys"""
+        results = []
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(
+            ["vault", "keycheck", "tests/fixtures", "--json", "--password", "vulticli01"])
+        try:
+            report = json.loads(stdout)
+            results.append(("fixture_keys_valid", exit_code == 0 and report["invalid"] == 0 and report["keys"] > 0))
+        except (json.JSONDecodeError, KeyError):
+            results.append(("fixture_keys_valid", False))
+        
+        # Flipping the last byte of a valid key moves x off the curve
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as tmp_file:
+            tmp_file.write("0267db81657a956f364167c3986a426b448a74ac0db2092f6665c4c202b37f6f1d\n")
+            tmp_file.write("0267db81657a956f364167c3986a426b448a74ac0db2092f6665c4c202b37f6f1e\n")
+            tmp_path = tmp_file.name
+        try:
+            exit_code, stdout, stderr = self.run_vultitool_command(["vault", "keycheck", "--keys-file", tmp_path, "--json"])
+            report = json.loads(stdout)
+            results.append(("corrupt_key_detected", exit_code == 1 and report["invalid_by_reason"] == {"not-on-curve": 1}))
+        except (json.JSONDecodeError, KeyError):
+            results.append(("corrupt_key_detected", False))
+        finally:
+            Path(tmp_path).unlink()
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Key point validation",
+            all_passed,
+            "Curve point checks work correctly" if all_passed else "Curve point check issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_address_derivation(self) -> bool:
+        """Test watch-only address derivation from vault public key and chain code"""
+        filename = "tests/fixtures/testGG20-part1of2.vult"
+        results = []
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(
+            ["vault", "derive", filename, "--chain", "bitcoin,ethereum", "--count", "3", "--json"])
+        try:
+            records = [json.loads(line) for line in stdout.splitlines() if line.strip()]
+        except json.JSONDecodeError:
+            records = []
+        results.append(("record_count", exit_code == 0 and len(records) == 6))
+        by_path = {(r["chain"], r["path"]): r["address"] for r in records}
+        results.append(("bitcoin_regression", by_path.get(("bitcoin", "m/84'/0'/0'/0/0")) == "bc1qvn203p8pp30fk945eywrjey937qpaanha8hc4r"))
+        results.append(("ethereum_regression", by_path.get(("ethereum", "m/44'/60'/0'/0/0")) == "0x55a7Ea16A40f8c908CbC935D229eBe4C6658e90D"))
+        
+        # A shifted range must reproduce the same addresses from the cached account node
+        exit_code, stdout, stderr = self.run_vultitool_command(
+            ["vault", "derive", filename, "--path", "m/44'/60'/0'/0/i", "--chain", "ethereum", "--start", "2", "--json"])
+        try:
+            shifted = json.loads(stdout.splitlines()[0])
+            results.append(("range_consistent", shifted["address"] == by_path.get(("ethereum", "m/44'/60'/0'/0/2"))))
+        except (json.JSONDecodeError, IndexError, KeyError):
+            results.append(("range_consistent", False))
+        
+        # A marked placeholder keeps its marker in reported paths and derives as unmarked
+        exit_code, stdout, stderr = self.run_vultitool_command(
+            ["vault", "derive", filename, "--path", "m/44'/60'/0'/0/i'", "--chain", "ethereum", "--count", "2", "--json"])
+        try:
+            marked = [json.loads(line) for line in stdout.splitlines()]
+            results.append(("marked_placeholder", [r["path"] for r in marked] == ["m/44'/60'/0'/0/0'", "m/44'/60'/0'/0/1'"]
+                            and marked[0]["address"] == by_path.get(("ethereum", "m/44'/60'/0'/0/0"))))
+        except (json.JSONDecodeError, IndexError, KeyError):
+            results.append(("marked_placeholder", False))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Address derivation",
+            all_passed,
+            "Derived addresses match" if all_passed else "Address derivation issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_address_index(self) -> bool:
+        """Test building an address index and reverse lookups against it"""
+        results = []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index_path = str(Path(tmpdir) / "addresses.idx")
+            build = ["vault", "index-addresses", "tests/fixtures/testGG20-part1of2.vult",
+                     "tests/fixtures/testGG20-part2of2.vult", "--index", index_path,
+                     "--chain", "bitcoin,ethereum", "--count", "3", "--jobs", "1"]
+            exit_code, stdout, stderr = self.run_vultitool_command(build)
+            results.append(("build", exit_code == 0 and "Vaults: 1 (1 new" in stdout))
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "whose", "bc1qvn203p8pp30fk945eywrjey937qpaanha8hc4r", "--index", index_path, "--json"])
+            try:
+                match = json.loads(stdout)["matches"][0]
+                results.append(("lookup", exit_code == 0 and match["vault"] == "Test private key vault"
+                                and match["path"] == "m/84'/0'/0'/0/0"))
+            except (json.JSONDecodeError, IndexError, KeyError):
+                results.append(("lookup", False))
+            
+            # Addresses are matched case-insensitively where the encoding allows it
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "whose", "0x55a7ea16a40f8c908cbc935d229ebe4c6658e90d", "--index", index_path])
+            results.append(("lookup_lowercase_eth", exit_code == 0 and "Test private key vault" in stdout))
+            
+            # Re-running on the same vaults must not derive anything again
+            exit_code, stdout, stderr = self.run_vultitool_command(build)
+            results.append(("incremental", exit_code == 0 and "(0 new, 0 derived)" in stdout))
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "whose", "bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq", "--index", index_path])
+            results.append(("unknown_address", exit_code != 0))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Address index",
+            all_passed,
+            "Address index lookups work" if all_passed else "Address index issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_keysign_decode(self) -> bool:
+        """Test decoding keysign messages and payloads in every supported encoding"""
+        filename = "tests/fixtures/keysign-samples.txt"
+        results = []
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(["keysign", "decode", filename, "--summary"])
+        try:
+            rows = [json.loads(line) for line in stdout.splitlines() if line.strip()]
+        except json.JSONDecodeError:
+            rows = []
+        results.append(("all_decoded", exit_code == 0 and len(rows) == 4 and not any("error" in r for r in rows)))
+        if len(rows) == 4:
+            results.append(("xz_message", rows[0]["encoding"] == ["base64", "xz"] and rows[0]["utxo_count"] == 2))
+            results.append(("deep_link_swap", rows[1]["encoding"][0] == "link"
+                            and rows[1]["swap_payload"] == "thorchain_swap_payload"))
+            results.append(("bare_payload", rows[2]["type"] == "KeysignPayload"
+                            and rows[2]["blockchain_specific"] == "ethereum_specific"))
+            results.append(("gzip_custom_message", rows[3]["encoding"] == ["base64", "gzip"]
+                            and rows[3]["custom_method"] == "personal_sign"))
+        
+        # Full output carries the oneof variant fields tagged with their type
+        exit_code, stdout, stderr = self.run_vultitool_command(["keysign", "decode", filename])
+        try:
+            payload = json.loads(stdout.splitlines()[0])["message"]["keysign_payload"]
+            results.append(("oneof_fields", payload["blockchain_specific"] == {"type": "utxo_specific", "byte_fee": "12"}))
+        except (json.JSONDecodeError, IndexError, KeyError):
+            results.append(("oneof_fields", False))
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # A raw protobuf file is decoded as a single payload
+            raw_path = Path(tmpdir) / "payload.bin"
+            raw_path.write_bytes(base64.b64decode(Path(filename).read_text().splitlines()[2]))
+            exit_code, stdout, stderr = self.run_vultitool_command(["keysign", "decode", str(raw_path), "--summary"])
+            try:
+                row = json.loads(stdout)
+                results.append(("raw_file", exit_code == 0 and row["encoding"] == [] and row["ticker"] == "ETH"))
+            except (json.JSONDecodeError, KeyError):
+                results.append(("raw_file", False))
+            
+            bad_path = Path(tmpdir) / "bad.txt"
+            bad_path.write_text("bm90IGEgcGF5bG9hZA==\n")
+            exit_code, stdout, stderr = self.run_vultitool_command(["keysign", "decode", str(bad_path)])
+            results.append(("bad_payload", exit_code != 0 and '"error"' in stdout))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Keysign decode",
+            all_passed,
+            "Keysign payloads decoded" if all_passed else "Keysign decode issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_keysign_encode(self) -> bool:
+        """Test building framed KeysignPayloads from payout rows and decoding them back"""
+        rows_file = "tests/fixtures/payouts-sample.csv"
+        vault_file = "tests/fixtures/testGG20-part1of2.vult"
+        results = []
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for framing in ["lines", "varint", "u32"]:
+                out_path = str(Path(tmpdir) / f"payloads.{framing}")
+                exit_code, stdout, stderr = self.run_vultitool_command(
+                    ["keysign", "encode", rows_file, "--vault", vault_file, "--framing", framing, "-o", out_path])
+                encoded = exit_code == 0
+                exit_code, stdout, stderr = self.run_vultitool_command(
+                    ["keysign", "decode", out_path, "--framing", framing, "--summary"])
+                try:
+                    rows = [json.loads(line) for line in stdout.splitlines() if line.strip()]
+                except json.JSONDecodeError:
+                    rows = []
+                results.append((f"roundtrip_{framing}", encoded and exit_code == 0 and len(rows) == 4))
+                if framing == "lines" and len(rows) == 4:
+                    # Coin addresses are derived from the vault; decimal amounts become base units
+                    results.append(("btc_payload", rows[0]["from_address"] == "bc1qvn203p8pp30fk945eywrjey937qpaanha8hc4r"
+                                    and rows[0]["to_amount"] == "150000" and rows[0]["utxo_count"] == 2))
+                    results.append(("rune_amount", rows[2]["to_amount"] == "250000000"))
+            
+            # One bad row rejects the whole batch and nothing is written
+            bad_rows = Path(tmpdir) / "bad.ndjson"
+            bad_rows.write_text(
+                '{"chain": "ethereum", "to_address": "0x60790246e37D154e02beaF2b9Fb27F93a26A6B3f", "to_amount": "5"}\n'
+                '{"chain": "bitcoin", "to_address": "tb1qw508d6qejxtdg4y5r3zarvary0c5xw7kxpjzsx", "amount": "0.000000001"}\n')
+            out_path = Path(tmpdir) / "bad.out"
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["keysign", "encode", str(bad_rows), "--vault", vault_file, "-o", str(out_path)])
+            results.append(("batch_rejected", exit_code != 0 and not out_path.exists()
+                            and "Row 2" in stderr and "decimal places" in stderr))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Keysign encode",
+            all_passed,
+            "Keysign payloads built and round-tripped" if all_passed else "Keysign encode issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_utxo_stats(self) -> bool:
+        """Test UTXO analytics over payloads built by keysign encode"""
+        vault_file = "tests/fixtures/testGG20-part1of2.vult"
+        txid_a, txid_b, txid_c = "aa" * 32, "bb" * 32, "cc" * 32
+        results = []
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            rows = Path(tmpdir) / "consolidate.ndjson"
+            rows.write_text(
+                json.dumps({"chain": "bitcoin", "to_address": "bc1q0pap5flkh45w8zz2ew9xpf884me55g65l7vqcu",
+                            "to_amount": "50000", "byte_fee": "10",
+                            "utxos": f"{txid_a}:0:100000;{txid_b}:1:300"}) + "\n" +
+                json.dumps({"chain": "bitcoin", "to_address": "bc1q0pap5flkh45w8zz2ew9xpf884me55g65l7vqcu",
+                            "to_amount": "50000", "utxos": f"{txid_a}:0:100000;{txid_c}:0:2000000"}) + "\n")
+            payloads = Path(tmpdir) / "payloads.txt"
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["keysign", "encode", str(rows), "--vault", vault_file, "--compress", "xz", "-o", str(payloads)])
+            results.append(("encode", exit_code == 0))
+            
+            reports = []
+            for extra in [[], ["--no-numpy"]]:
+                exit_code, stdout, stderr = self.run_vultitool_command(
+                    ["keysign", "utxo-stats", str(payloads), "--json", "--fee-rates", "1,10"] + extra)
+                try:
+                    reports.append(json.loads(stdout))
+                except json.JSONDecodeError:
+                    reports.append({})
+            report = reports[0]
+            try:
+                results.append(("totals", report["utxos"] == 4 and report["total"] == 2200300))
+                results.append(("dust", report["dust"]["count"] == 1 and report["dust"]["amount"] == 300))
+                results.append(("conflicts", report["duplicates"]["across_payloads"] == 1
+                                and report["duplicates"]["examples"] == [f"{txid_a}:0"]))
+                # 2 payloads x (11 + 2 inputs x 68 + 2 outputs x 31) vbytes
+                results.append(("vbytes", report["fees"][1]["vbytes"] == 418 and report["fees"][1]["fee"] == 4180))
+                results.append(("uneconomic", report["fees"][0]["uneconomic_utxos"] == 0
+                                and report["fees"][1]["uneconomic_utxos"] == 1))
+            except (KeyError, IndexError):
+                results.append(("report", False))
+            # The NumPy and pure-Python paths must agree exactly
+            results.append(("implementations_agree", reports[0] == reports[1]))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "UTXO statistics",
+            all_passed,
+            "UTXO statistics correct" if all_passed else "UTXO statistics issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_keygen_lineage(self) -> bool:
+        """Test keygen/reshare decoding and joining sessions to vault files"""
+        sessions = "tests/fixtures/keygen-sessions.txt"
+        results = []
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(["keygen", "decode", sessions])
+        try:
+            rows = [json.loads(line) for line in stdout.splitlines() if line.strip()]
+        except json.JSONDecodeError:
+            rows = []
+        results.append(("all_decoded", exit_code == 0 and len(rows) == 4))
+        if len(rows) == 4:
+            results.append(("keygen_detected", rows[0]["type"] == "KeygenMessage"
+                            and rows[0]["message"]["vault_name"] == "Test private key vault"))
+            results.append(("reshare_detected", [r["type"] for r in rows[1:]] == ["ReshareMessage"] * 3
+                            and rows[1]["encoding"] == ["link", "base64"]
+                            and rows[2]["message"]["old_reshare_prefix"] == "b7e21d04"))
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(
+            ["vault", "lineage", "tests/fixtures/testGG20-part1of2.vult", "tests/fixtures/testGG20-part2of2.vult",
+             "tests/fixtures/testDKLS-1of2.vult", "--sessions", sessions, "--json"])
+        try:
+            report = json.loads(stdout)
+            vaults = report["vaults"]
+            results.append(("only_referenced_vaults", exit_code == 0 and len(vaults) == 1))
+            generations = vaults[0]["generations"]
+            results.append(("generation_chain", [g["reshare_prefix"] for g in generations] == ["", "b7e21d04", "?"]
+                            and len(generations[0]["files"]) == 2 and not generations[1]["catalogued"]))
+            first = vaults[0]["reshares"][0]
+            results.append(("party_change", first["parent"] == "" and first["child"] == "b7e21d04"
+                            and first["added"] == ["MacBook-3F1"] and first["removed"] == []
+                            and not first["party_mismatch"]))
+            results.append(("keygen_origin", len(vaults[0]["keygen_sessions"]) == 1))
+            results.append(("unmatched", [u["session_id"][:8] for u in report["unmatched"]] == ["0d5a9c3e"]))
+        except (json.JSONDecodeError, KeyError, IndexError):
+            results.append(("lineage_report", False))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Keygen lineage",
+            all_passed,
+            "Keygen decoding and lineage correct" if all_passed else "Keygen lineage issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_proto_decode(self) -> bool:
+        """Test generic decoding from the shipped descriptor set"""
+        results = []
+        
+        # The descriptor set must cover every message declared under proto/
+        exit_code, stdout, stderr = self.run_vultitool_command(["proto", "types", "--json"])
+        try:
+            types = set(json.loads(stdout))
+        except json.JSONDecodeError:
+            types = set()
+        declared = set()
+        for proto_file in Path("proto").glob("**/*.proto"):
+            text = proto_file.read_text()
+            package = re.search(r"^package\s+([\w.]+);", text, re.M).group(1)
+            declared.update(f"{package}.{name}" for name in re.findall(r"^message\s+(\w+)", text, re.M))
+        results.append(("protoset_current", exit_code == 0 and bool(declared) and declared <= types))
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(
+            ["proto", "decode", "--type", "vultisig.vault.v1.VaultContainer", "tests/fixtures/qa-fast-share2of2.vult"])
+        try:
+            row = json.loads(stdout)
+            results.append(("full_name", exit_code == 0 and row["type"] == "vultisig.vault.v1.VaultContainer"
+                            and row["message"]["is_encrypted"] is True))
+        except (json.JSONDecodeError, KeyError):
+            results.append(("full_name", False))
+        
+        # Short names resolve when unique; the bare KeysignPayload sample is not a KeysignMessage
+        exit_code, stdout, stderr = self.run_vultitool_command(
+            ["proto", "decode", "--type", "KeysignMessage", "tests/fixtures/keysign-samples.txt"])
+        try:
+            rows = [json.loads(line) for line in stdout.splitlines() if line.strip()]
+            results.append(("short_name", exit_code == 1 and len(rows) == 4
+                            and rows[0]["message"]["keysign_payload"]["coin"]["ticker"] == "BTC"
+                            and rows[2]["error"] == "protobuf"))
+        except (json.JSONDecodeError, KeyError):
+            results.append(("short_name", False))
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(["proto", "decode", "--type", "NoSuchMessage"])
+        results.append(("unknown_type", exit_code != 0 and "Unknown message type" in stderr))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Descriptor-set decoding",
+            all_passed,
+            "Descriptor-set decoding correct" if all_passed else "Descriptor-set decoding issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_go_backend(self) -> bool:
+        """Test batch loading through the Go decryption workers and the backend benchmark"""
+        results = []
+        scan = ["vault", "scan", "tests/fixtures", "--password", "vulticli01", "--json"]
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(scan + ["--backend", "go", "--go-workers", "2"])
+        if Path("vultitool-go").exists():
+            # Both backends must produce identical scan results
+            _, python_stdout, _ = self.run_vultitool_command(scan)
+            results.append(("backends_agree", exit_code == 0 and stdout == python_stdout))
+        else:
+            results.append(("missing_binary_reported", exit_code != 0 and "vultitool-go not found" in stdout))
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(["doctor", "bench", "--count", "5", "--json"])
+        try:
+            report = json.loads(stdout)
+            python_run = report["results"][0]
+            results.append(("bench_python", exit_code == 0 and python_run["backend"] == "python"
+                            and python_run["vaults"] == 5 and python_run["failed"] == 0))
+            results.append(("bench_go_listed", report["results"][1]["backend"] == "go"))
+        except (json.JSONDecodeError, KeyError, IndexError):
+            results.append(("bench_report", False))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Go decryption backend",
+            all_passed,
+            "Go backend handling correct" if all_passed else "Go backend issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_credentials(self) -> bool:
+        """Test password files and the credential agent for unattended encrypted batches"""
+        results = []
+        vault = "tests/fixtures/qa-fast-share2of2.vult"
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            password_file = Path(tmpdir) / "passwords.yaml"
+            password_file.write_text("path:*qa-fast-share2of2.vult: vulticli01\nname:Some Other Vault: wrong\n")
+            password_file.chmod(0o600)
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "scan", vault, "--password-file", str(password_file), "--json"])
+            try:
+                report = json.loads(stdout)
+                results.append(("password_file_scan", exit_code == 0 and report["loaded"] == 1))
+            except (json.JSONDecodeError, KeyError):
+                results.append(("password_file_scan", False))
+            
+            # A name selector is only accepted once the decrypted vault confirms it
+            password_file.write_text("name:Some Other Vault: vulticli01\n")
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "scan", vault, "--password-file", str(password_file), "--json"])
+            try:
+                report = json.loads(stdout)
+                results.append(("name_selector_confirmed", report["loaded"] == 0
+                                and report["load_errors"] == {"decrypt": 1}))
+            except (json.JSONDecodeError, KeyError):
+                results.append(("name_selector_confirmed", False))
+            
+            socket_path = str(Path(tmpdir) / "agent" / "agent.sock")
+            agent = subprocess.Popen(["./vultitool", "agent", "start", "--socket", socket_path, "--ttl", "60"],
+                                     stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+            try:
+                results.append(("agent_export_line", socket_path in agent.stdout.readline()))
+                results.append(("socket_private", (os.stat(socket_path).st_mode & 0o077) == 0))
+                
+                exit_code, _, _ = self.run_vultitool_command(
+                    ["agent", "add", "path:*qa-fast-share2of2.vult", "--stdin", "--socket", socket_path],
+                    input="vulticli01\n")
+                _, stdout, _ = self.run_vultitool_command(["agent", "list", "--json", "--socket", socket_path])
+                listed = json.loads(stdout) if stdout.startswith("[") else []
+                results.append(("agent_add_list", exit_code == 0 and len(listed) == 1
+                                and "vulticli01" not in stdout))
+                
+                agent_env = {"VULTITOOL_AGENT_SOCK": socket_path}
+                exit_code, stdout, _ = self.run_vultitool_command(["vault", "validate", vault], env=agent_env)
+                results.append(("agent_validate", exit_code == 0 and "validation passed" in stdout))
+                
+                exit_code, _, _ = self.run_vultitool_command(["agent", "clear", "--socket", socket_path])
+                exit_code, stdout, _ = self.run_vultitool_command(["vault", "scan", vault, "--json"], env=agent_env)
+                results.append(("agent_cleared", exit_code != 0 and '"encrypted": 1' in stdout))
+                
+                exit_code, _, _ = self.run_vultitool_command(["agent", "stop", "--socket", socket_path])
+                agent.wait(timeout=10)
+                results.append(("agent_stop", exit_code == 0 and not Path(socket_path).exists()))
+            except (OSError, subprocess.TimeoutExpired):
+                results.append(("agent_lifecycle", False))
+            finally:
+                if agent.poll() is None:
+                    agent.kill()
+                agent.stdout.close()
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Credential agent",
+            all_passed,
+            "Credential sources handled correctly" if all_passed else "Credential source issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_codecs(self) -> bool:
+        """Test container codec dispatch and the per-codec benchmark"""
+        results = []
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(["doctor", "codecs", "--json"])
+        try:
+            names = [codec["name"] for codec in json.loads(stdout)]
+            results.append(("registry", exit_code == 0 and "v1/aes-256-gcm+sha256" in names
+                            and "v1000/aes-256-gcm+scrypt" in names))
+        except (json.JSONDecodeError, KeyError, TypeError):
+            results.append(("registry", False))
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(
+            ["doctor", "codecs", "--bench", "--count", "2", "--scrypt-log2n", "10", "--json"])
+        try:
+            runs = json.loads(stdout)["results"]
+            results.append(("bench_roundtrip", exit_code == 0 and len(runs) == 2
+                            and all(run["roundtrip"] for run in runs)))
+            results.append(("bench_scrypt_cost", runs[1]["kdf_memory_bytes"] == 128 * 8 * 1024))
+        except (json.JSONDecodeError, KeyError, IndexError):
+            results.append(("bench_report", False))
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(
+            ["vault", "parse", "tests/fixtures/qa-fast-share2of2.vult", "--password", "vulticli01", "--json"])
+        try:
+            results.append(("scheme_reported", json.loads(stdout)["container"]["scheme"] == "aes-256-gcm+sha256"))
+        except (json.JSONDecodeError, KeyError):
+            results.append(("scheme_reported", False))
+        
+        # An encrypted container with an unknown version is rejected without trying a password
+        payload = base64.b64encode(bytes(range(48)))
+        container = b"\x08\x07\x12" + bytes([len(payload)]) + payload + b"\x18\x01"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            vault_path = Path(tmpdir) / "future.vult"
+            vault_path.write_text(base64.b64encode(container).decode())
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "scan", str(vault_path), "--password", "vulticli01", "--json"])
+            try:
+                report = json.loads(stdout)
+                results.append(("unsupported_version", report["load_errors"] == {"codec": 1}))
+            except (json.JSONDecodeError, KeyError):
+                results.append(("unsupported_version", False))
+            
+            # An unencrypted container is read whatever its version (a later field 1 overrides the version)
+            plain = base64.b64decode(Path("tests/fixtures/testGG20-part1of2.vult").read_text().strip()) + b"\x08\x02"
+            vault_path.write_text(base64.b64encode(plain).decode())
+            exit_code, stdout, stderr = self.run_vultitool_command(["vault", "parse", str(vault_path), "--json"])
+            try:
+                parsed = json.loads(stdout)
+                results.append(("plain_any_version", exit_code == 0 and parsed["container"]["version"] == 2
+                                and parsed["vault"]["name"] != ""))
+            except (json.JSONDecodeError, KeyError):
+                results.append(("plain_any_version", False))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Container codecs",
+            all_passed,
+            "Codec dispatch correct" if all_passed else "Codec dispatch issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_rekey(self) -> bool:
+        """Test bulk rekey, encrypt and decrypt-out with journaling and verified atomic writes"""
+        results = []
+        fixture = Path("tests/fixtures/qa-fast-share2of2.vult")
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_dir = Path(tmpdir) / "in"
+            source_dir.mkdir()
+            for i in range(3):
+                (source_dir / f"share{i}.vult").write_text(fixture.read_text())
+            output_dir = Path(tmpdir) / "out"
+            journal = Path(tmpdir) / "rekey.journal"
+            rekey = ["vault", "rekey", str(source_dir), "--output-dir", str(output_dir), "--password", "vulticli01",
+                     "--new-password", "rotated", "--journal", str(journal), "--jobs", "2"]
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(rekey)
+            results.append(("rekey_written", exit_code == 0 and len(list(output_dir.glob("*.vult"))) == 3
+                            and not list(output_dir.glob(".*.tmp"))))
+            exit_code, stdout, stderr = self.run_vultitool_command(rekey)
+            results.append(("journal_resume", exit_code == 0 and "3 skipped by journal" in stdout))
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "scan", str(output_dir), "--password", "rotated", "--json"])
+            try:
+                results.append(("new_password_opens", json.loads(stdout)["loaded"] == 3))
+            except (json.JSONDecodeError, KeyError):
+                results.append(("new_password_opens", False))
+            
+            # In place: a wrong current password leaves the file untouched, a rerun reports it as done
+            target = source_dir / "share0.vult"
+            original = target.read_text()
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "rekey", str(target), "--in-place", "--password", "wrong", "--new-password", "rotated"])
+            results.append(("wrong_password_untouched", exit_code != 0 and target.read_text() == original))
+            in_place = ["vault", "rekey", str(target), "--in-place", "--password", "vulticli01",
+                        "--new-password", "rotated", "--json"]
+            exit_code, stdout, stderr = self.run_vultitool_command(in_place)
+            first = json.loads(stdout) if stdout.startswith("{") else {}
+            exit_code, stdout, stderr = self.run_vultitool_command(in_place)
+            second = json.loads(stdout) if stdout.startswith("{") else {}
+            results.append(("in_place_idempotent", first.get("status") == "done" and second.get("status") == "already"))
+            
+            # Round trip through the scrypt codec and back out to an unencrypted container
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "rekey", str(target), "--in-place", "--password", "rotated", "--new-password", "scrypted",
+                 "--codec", "v1000/aes-256-gcm+scrypt", "--scrypt-log2n", "10"])
+            plain_dir = Path(tmpdir) / "plain"
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "decrypt-out", str(target), "--output-dir", str(plain_dir), "--password", "scrypted"])
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "parse", str(plain_dir / "share0.vult"), "--json"])
+            try:
+                data = json.loads(stdout)
+                results.append(("scrypt_decrypt_out", not data["container"]["is_encrypted"]
+                                and data["vault"]["name"] == "vulticli01"
+                                and (plain_dir / "share0.vult").stat().st_mode & 0o077 == 0))
+            except (json.JSONDecodeError, KeyError):
+                results.append(("scrypt_decrypt_out", False))
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "encrypt", str(plain_dir), "--in-place", "--new-password", "again"])
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "validate", str(plain_dir / "share0.vult"), "--password", "again"])
+            results.append(("encrypt", exit_code == 0 and "validation passed" in stdout))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Vault rekey",
+            all_passed,
+            "Container rewriting correct" if all_passed else "Container rewriting issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_pack(self) -> bool:
+        """Test lossless .vultpack sidecars and reading them in place of .vult files"""
+        results = []
+        fixtures = ["tests/fixtures/qa-fast-share2of2.vult", "tests/fixtures/testGG20-part1of2.vult"]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            work = Path(tmpdir) / "vaults"
+            work.mkdir()
+            for fixture in fixtures:
+                (work / Path(fixture).name).write_bytes(Path(fixture).read_bytes())
+            # A trailing newline must survive the round trip too
+            (work / "newline.vult").write_bytes(Path(fixtures[1]).read_bytes() + b"\n")
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(["vault", "pack", str(work), "--json"])
+            try:
+                report = json.loads(stdout)
+                results.append(("packed_smaller", exit_code == 0 and report["files"] == 3
+                                and report["pack_bytes"] < report["vult_bytes"] * 0.6))
+            except (json.JSONDecodeError, KeyError):
+                results.append(("packed_smaller", False))
+            
+            restored = Path(tmpdir) / "restored"
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "unpack", str(work), "--output-dir", str(restored)])
+            results.append(("byte_for_byte", exit_code == 0 and all(
+                (restored / name).read_bytes() == (work / name).read_bytes()
+                for name in ("qa-fast-share2of2.vult", "testGG20-part1of2.vult", "newline.vult"))))
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "parse", str(work / "qa-fast-share2of2.vultpack"), "--password", "vulticli01", "--json"])
+            try:
+                data = json.loads(stdout)
+                results.append(("loader_reads_pack", data["file_info"]["format"] == "pack"
+                                and data["vault"]["name"] == "vulticli01"))
+            except (json.JSONDecodeError, KeyError):
+                results.append(("loader_reads_pack", False))
+            
+            # Directory scans read each sidecar instead of its .vult
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "scan", str(work), "--password", "vulticli01", "--ndjson"])
+            paths = [json.loads(line)["path"] for line in stdout.splitlines() if line.startswith("{")]
+            results.append(("scan_prefers_sidecars", len(paths) == 3
+                            and all(path.endswith(".vultpack") for path in paths)))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Vault packs",
+            all_passed,
+            "Pack round trip correct" if all_passed else "Pack round trip issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_bundle(self) -> bool:
+        """Test .vultb bundles and reading single members by selector"""
+        results = []
+        fixtures = ["tests/fixtures/qa-fast-share2of2.vult", "tests/fixtures/testGG20-part1of2.vult",
+                    "tests/fixtures/testGG20-part2of2.vult"]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bundle = str(Path(tmpdir) / "team.vultb")
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "bundle", "create", bundle, *fixtures, "--password", "vulticli01", "--json"])
+            try:
+                report = json.loads(stdout)
+                results.append(("create", exit_code == 0 and report["members"] == 3 and not report["unindexed"]))
+            except (json.JSONDecodeError, KeyError):
+                results.append(("create", False))
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(["vault", "bundle", "ls", bundle, "--json"])
+            try:
+                members = json.loads(stdout)
+                results.append(("index", [m["local_party_id"] for m in members] == ["Server-97859", "Pixel 5a-a9b", "iPhone-EC4"]))
+            except (json.JSONDecodeError, KeyError, TypeError):
+                results.append(("index", False))
+            
+            # Members are addressed by party id, vault name or public key, combined with ','
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "parse", bundle + "#name:Test private key vault,party:iPhone-EC4", "--json"])
+            try:
+                data = json.loads(stdout)
+                results.append(("parse_member", data["vault"]["local_party_id"] == "iPhone-EC4"))
+            except (json.JSONDecodeError, KeyError):
+                results.append(("parse_member", False))
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "parse", bundle + "#name:Test private key vault"])
+            results.append(("ambiguous_rejected", exit_code != 0 and "several members" in stdout))
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "validate", bundle + "#qa-fast-share2of2", "--password", "vulticli01"])
+            results.append(("validate_member", exit_code == 0))
+            
+            out = Path(tmpdir) / "out"
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "bundle", "extract", bundle, "--output-dir", str(out)])
+            results.append(("extract_exact", exit_code == 0 and all(
+                (out / Path(f).name).read_bytes() == Path(f).read_bytes() for f in fixtures)))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Vault bundles",
+            all_passed,
+            "Bundle members readable" if all_passed else "Bundle issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_timings(self) -> bool:
+        """Test per-stage timing spans for single loads and batches"""
+        results = []
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            report_path = Path(tmpdir) / "timings.json"
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["--timings", "--timings-json", str(report_path), "vault", "parse",
+                 "tests/fixtures/qa-fast-share2of2.vult", "--password", "vulticli01", "--json"])
+            try:
+                json.loads(stdout)
+                report = json.loads(report_path.read_text())
+                stages = report["stages"]
+                results.append(("single_stages", report["files"] == 1 and all(
+                    stage in stages for stage in ("load", "read", "decode.base64", "decrypt.kdf",
+                                                  "decrypt.cipher", "vault.parse", "vault.keyshares", "export"))))
+                results.append(("stdout_clean", "Stage timings" in stderr))
+            except (json.JSONDecodeError, KeyError, OSError):
+                results.append(("single_stages", False))
+                results.append(("stdout_clean", False))
+            
+            # The environment variable turns timings on too; batches report histograms
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "scan", "tests/fixtures", "--json"], env={"VULTITOOL_TIMINGS": str(report_path)})
+            try:
+                report = json.loads(report_path.read_text())
+                load = report["stages"]["load"]
+                results.append(("batch_histogram", report["files"] > 1 and load["count"] == report["files"]
+                                and sum(load["histogram_us_log2"]) == load["count"] and "p95" in stderr))
+            except (json.JSONDecodeError, KeyError, OSError):
+                results.append(("batch_histogram", False))
+        
+        # Off by default: nothing is reported
+        exit_code, stdout, stderr = self.run_vultitool_command(
+            ["vault", "parse", "tests/fixtures/testGG20-part1of2.vult", "--summary"], env={"VULTITOOL_TIMINGS": ""})
+        results.append(("off_by_default", exit_code == 0 and "Stage timings" not in stdout + stderr))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Stage timings",
+            all_passed,
+            "Timing spans reported" if all_passed else "Timing issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_profile(self) -> bool:
+        """Test doctor profile around another vultitool command"""
+        results = []
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out = Path(tmpdir) / "prof"
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["doctor", "profile", "--output-dir", str(out), "--",
+                 "vault", "parse", "tests/fixtures/testGG20-part1of2.vult", "--json"])
+            try:
+                # The profiled command's own output is untouched
+                results.append(("command_output", json.loads(stdout)["vault"]["name"] == "Test private key vault"))
+                report = json.loads((out / "profile.json").read_text())
+                results.append(("cpu_and_alloc", report["exit_code"] == 0 and report["top_functions"]
+                                and report["top_allocations"] and report["alloc_peak_bytes"] > 0
+                                and (out / "cpu.pstats").exists()))
+                lines = (out / "stacks.collapsed").read_text().splitlines()
+                results.append(("collapsed_stacks", bool(lines) and all(
+                    line.startswith("main (vultitool.py") and line.rsplit(" ", 1)[1].isdigit() for line in lines)))
+            except (json.JSONDecodeError, KeyError, OSError):
+                results.append(("command_output", False))
+                results.append(("cpu_and_alloc", False))
+                results.append(("collapsed_stacks", False))
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["doctor", "profile", "--sample", "--output-dir", str(out), "--",
+                 "vault", "parse", "tests/fixtures/missing.vult"])
+            try:
+                report = json.loads((out / "profile.json").read_text())
+                results.append(("sample_mode", report["mode"] == "sample" and "top_functions" not in report
+                                and report["alloc_peak_bytes"] is None))
+            except (json.JSONDecodeError, KeyError, OSError):
+                results.append(("sample_mode", False))
+            results.append(("exit_code_passed_through", exit_code == 1))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Doctor profile",
+            all_passed,
+            "Profiles written" if all_passed else "Profile issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_metrics(self) -> bool:
+        """Test Prometheus metrics written for the textfile collector"""
+        results = []
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            textfile = Path(tmpdir) / "vultitool.prom"
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["--metrics-textfile", str(textfile), "vault", "scan", "tests/fixtures", "--strict"])
+            try:
+                lines = textfile.read_text().splitlines()
+                samples = {line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+                           for line in lines if line and not line.startswith("#")}
+                files = sum(v for k, v in samples.items() if k.startswith("vultitool_files_total{"))
+                results.append(("files_counted", files == len(list(Path("tests/fixtures").glob("*.vult")))))
+                results.append(("failures_by_reason", samples.get('vultitool_load_failures_total{reason="encrypted"}') == 1))
+                results.append(("findings_by_rule", any(k.startswith("vultitool_rule_findings_total{rule=") for k in samples)))
+                results.append(("stage_histogram", samples.get('vultitool_stage_duration_seconds_bucket{stage="load",le="+Inf"}')
+                                == samples.get('vultitool_stage_duration_seconds_count{stage="load"}') == files))
+                results.append(("run_gauges", samples.get('vultitool_run_exit_code{command="vault scan"}') == exit_code
+                                and samples.get("vultitool_bytes_decoded_total", 0) > 0))
+            except (OSError, ValueError):
+                results.extend([("files_counted", False), ("failures_by_reason", False)])
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(
+            ["--metrics-listen", "localhost:notaport", "vault", "scan", "tests/fixtures"])
+        results.append(("bad_listen_rejected", exit_code == 1 and "metrics" in stderr))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Prometheus metrics",
+            all_passed,
+            "Metrics exported" if all_passed else "Metrics issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_health_probes(self) -> bool:
+        """Test concurrent doctor health probes and their JSON report"""
+        results = []
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(["doctor", "health", "--json"])
+        try:
+            report = json.loads(stdout)
+            probes = {p["name"]: p for p in report["probes"]}
+            results.append(("all_probes", {"cli", "schema", "python", "fixtures", "go-binary", "go-modules"} <= set(probes)))
+            results.append(("timed", all(isinstance(p["duration_ms"], float) for p in probes.values())))
+            healthy = all(p["status"] == "pass" for p in probes.values())
+            results.append(("verdict", report["status"] == ("pass" if healthy else "fail")
+                            and exit_code == (0 if healthy else 1)))
+        except (json.JSONDecodeError, KeyError):
+            results.extend([("all_probes", False), ("timed", False), ("verdict", False)])
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(["doctor", "health", "--json", "--only", "schema,fixtures"])
+        try:
+            report = json.loads(stdout)
+            results.append(("only", exit_code == 0 and [p["name"] for p in report["probes"]] == ["schema", "fixtures"]))
+        except (json.JSONDecodeError, KeyError):
+            results.append(("only", False))
+        
+        # A hanging probe is reported as timed out without holding up the rest
+        with tempfile.TemporaryDirectory() as tmpdir:
+            slow = Path(tmpdir) / "slow-go"
+            slow.write_text("#!/bin/sh\nsleep 5\n")
+            slow.chmod(0o755)
+            started = time.time()
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["doctor", "health", "--json", "--timeout", "0.5"], env={"VULTITOOL_GO": str(slow)})
+            elapsed = time.time() - started
+            try:
+                probes = {p["name"]: p for p in json.loads(stdout)["probes"]}
+                results.append(("timeout", exit_code == 1 and probes["go-binary"]["status"] == "timeout"
+                                and probes["schema"]["status"] == "pass" and elapsed < 4))
+            except (json.JSONDecodeError, KeyError):
+                results.append(("timeout", False))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Health probes",
+            all_passed,
+            "Probes ran concurrently" if all_passed else "Health probe issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_bench_baseline(self) -> bool:
+        """Test saving a benchmark baseline and comparing stage timings against it"""
+        results = []
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            saved = Path(tmpdir) / "baseline.json"
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["doctor", "bench", "--backend", "python", "--count", "3", "--repeat", "3", "--save", str(saved)])
+            try:
+                base = json.loads(saved.read_text())
+                env = base["environment"]
+                results.append(("save", exit_code == 0 and base["format"] == 1 and base["rounds"] == 3))
+                results.append(("environment", {"version", "protobuf_backend", "python", "cpu"} <= set(env)))
+                results.append(("stages", {"load", "decrypt.cipher", "vault.fields", "export.json", "export.yaml"}
+                                <= set(base["stages"])
+                                and all(len(s["rounds"]) == 3 for s in base["stages"].values())))
+            except (OSError, json.JSONDecodeError, KeyError):
+                base = None
+                results.extend([("save", False), ("environment", False), ("stages", False)])
+            
+            # Unchanged code against a baseline saved moments before: drift and small stages must not fail it
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["doctor", "bench", "--backend", "python", "--count", "3", "--repeat", "3", "--compare", str(saved)])
+            results.append(("self_compare", exit_code == 0 and "No stage regressed" in stdout))
+            
+            if base is not None:
+                # Against a baseline 100x faster with no spread, every stage is a significant regression
+                # (the calibration stays, as the machine itself is no faster)
+                fast = Path(tmpdir) / "fast.json"
+                calibration = base["stages"].pop("calibration", None)
+                for stage in base["stages"].values():
+                    stage["rounds"] = [stage["mean_us"] / 100] * len(stage["rounds"])
+                    stage["mean_us"] /= 100
+                    stage["stdev_us"] = 0.0
+                base["stages"]["calibration"] = calibration
+                fast.write_text(json.dumps(base))
+                exit_code, stdout, stderr = self.run_vultitool_command(
+                    ["doctor", "bench", "--backend", "python", "--count", "3", "--repeat", "3",
+                     "--compare", str(fast), "--json"])
+                try:
+                    verdicts = {row["stage"]: row["verdict"] for row in json.loads(stdout)["comparison"]["stages"]}
+                    results.append(("regression", exit_code == 1 and verdicts["load"] == "regression"))
+                except (json.JSONDecodeError, KeyError):
+                    results.append(("regression", False))
+                
+                # ...and against one 100x slower, none is
+                slow = Path(tmpdir) / "slow.json"
+                for name, stage in base["stages"].items():
+                    if name != "calibration":
+                        stage["rounds"] = [stage["mean_us"] * 10000] * len(stage["rounds"])
+                        stage["mean_us"] *= 10000
+                slow.write_text(json.dumps(base))
+                exit_code, stdout, stderr = self.run_vultitool_command(
+                    ["doctor", "bench", "--backend", "python", "--count", "3", "--repeat", "3",
+                     "--compare", str(slow)])
+                results.append(("no_regression", exit_code == 0 and "No stage regressed" in stdout))
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["doctor", "bench", "--backend", "python", "--count", "3", "--compare", str(Path(tmpdir) / "missing.json")])
+            results.append(("missing_baseline", exit_code == 1 and "Cannot read baseline" in stdout))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Bench baselines",
+            all_passed,
+            "Baselines saved and compared" if all_passed else "Bench baseline issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_checkpoint_resume(self) -> bool:
+        """Test resuming a checkpointed scan after an interruption without duplicating output"""
+        results = []
+        fixtures = sorted(Path("tests/fixtures").glob("*.vult"))
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            vaults = Path(tmpdir) / "vaults"
+            vaults.mkdir()
+            journal = str(Path(tmpdir) / "scan.ckpt")
+            output = Path(tmpdir) / "scan.ndjson"
+            for fixture in fixtures[:3]:
+                (vaults / fixture.name).write_bytes(fixture.read_bytes())
+            
+            args = ["vault", "scan", str(vaults), "--checkpoint", journal, "--output", str(output), "--json"]
+            exit_code, stdout, stderr = self.run_vultitool_command(args)
+            results.append(("first_run", len(output.read_text().splitlines()) == 3))
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(args)
+            results.append(("needs_resume", exit_code == 1 and "--resume" in stdout))
+            
+            # More work arrives, and the run is cut off mid-write: a torn journal entry and an unacknowledged result
+            for fixture in fixtures[3:]:
+                (vaults / fixture.name).write_bytes(fixture.read_bytes())
+            with open(journal, "ab") as f:
+                f.write(b"E\x00\x01")
+            with open(output, "a") as f:
+                f.write('{"path": "unacknowledged"}\n')
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(args + ["--resume"])
+            try:
+                summary = json.loads(stdout)
+                paths = [json.loads(line)["path"] for line in output.read_text().splitlines()]
+                results.append(("skipped_finished", "3 file(s) already finished" in stderr))
+                results.append(("exactly_once", len(paths) == len(fixtures) == len(set(paths))
+                                and "unacknowledged" not in paths))
+                results.append(("summary", summary["files"] == len(fixtures)))
+            except (json.JSONDecodeError, KeyError):
+                results.extend([("skipped_finished", False), ("exactly_once", False), ("summary", False)])
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "scan", str(Path(tmpdir)), "--checkpoint", journal, "--resume"])
+            results.append(("other_job", exit_code == 1 and "different job" in stdout))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Checkpoint resume",
+            all_passed,
+            "Scans resumed exactly once" if all_passed else "Checkpoint issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_shard_merge(self) -> bool:
+        """Test sharded scans and merging their partial results"""
+        results = []
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            full = Path(tmpdir) / "full.json"
+            self.run_vultitool_command(["vault", "scan", "tests/fixtures", "--partial", str(full), "--json"])
+            partials = []
+            files = 0
+            for index in range(3):
+                partial = Path(tmpdir) / f"shard{index}.json"
+                exit_code, stdout, stderr = self.run_vultitool_command(
+                    ["vault", "scan", "tests/fixtures", "--shard", f"{index}/3", "--partial", str(partial), "--json"])
+                try:
+                    files += json.loads(stdout)["files"]
+                except (json.JSONDecodeError, KeyError):
+                    pass
+                partials.append(str(partial))
+            
+            try:
+                expected = json.loads(full.read_text())
+                results.append(("partition", files == expected["summary"]["files"]))
+                
+                # Merging is associative: pairwise then the rest, in another order, equals one merge
+                step = Path(tmpdir) / "step.json"
+                merged = Path(tmpdir) / "merged.json"
+                self.run_vultitool_command(["vault", "merge", partials[2], partials[0], "-o", str(step)])
+                exit_code, stdout, stderr = self.run_vultitool_command(
+                    ["vault", "merge", str(step), partials[1], "-o", str(merged), "--json"])
+                report = json.loads(stdout)
+                combined = json.loads(merged.read_text())
+                results.append(("complete", report["complete"] and report["shards"] == [0, 1, 2]))
+                results.append(("same_as_unsharded", all(combined[key] == expected[key]
+                                                         for key in ("summary", "groups", "catalog"))))
+            except (OSError, json.JSONDecodeError, KeyError):
+                results.extend([("partition", False), ("complete", False), ("same_as_unsharded", False)])
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(["vault", "merge", partials[0], partials[0]])
+            results.append(("overlap_refused", exit_code == 1 and "more than one partial" in stdout))
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(["vault", "scan", "tests/fixtures", "--shard", "3/3"])
+            results.append(("bad_shard", exit_code == 1 and "Invalid shard" in stdout))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Shard merge",
+            all_passed,
+            "Shards merged to the unsharded result" if all_passed else "Shard merge issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_io_depth(self) -> bool:
+        """Test the overlapped (asyncio) loader gives the same batch results as serial reads"""
+        results = []
+        
+        outputs = {}
+        for depth in ("1", "4"):
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "scan", "tests/fixtures", "tests/fixtures/missing.vult", "--ndjson", "--io-depth", depth])
+            outputs[depth] = stdout.splitlines()
+        results.append(("same_records", len(outputs["1"]) > 1 and outputs["1"] == outputs["4"]))
+        try:
+            results.append(("missing_reported", json.loads(outputs["4"][-1])["error"] == "missing"))
+        except (json.JSONDecodeError, KeyError, IndexError):
+            results.append(("missing_reported", False))
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(["vault", "scan", "tests/fixtures", "--io-depth", "auto", "--json"])
+        try:
+            results.append(("auto", json.loads(stdout)["files"] == len(outputs["1"]) - 1))
+        except (json.JSONDecodeError, KeyError):
+            results.append(("auto", False))
+        
+        exit_code, stdout, stderr = self.run_vultitool_command(["vault", "scan", "tests/fixtures", "--io-depth", "0"])
+        results.append(("bad_depth", exit_code != 0 and "--io-depth" in stderr))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Overlapped reads",
+            all_passed,
+            "Overlapped loader matches serial" if all_passed else "Overlapped loader issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_s3_source(self) -> bool:
+        """Test scanning an s3:// source against a local S3-compatible endpoint"""
+        results = []
+        objects = {f"shares/{p.name}": p.read_bytes() for p in sorted(Path("tests/fixtures").glob("*.vult"))}
+        stats = {"get": 0, "list": 0, "not_modified": 0, "unavailable": 1, "unsigned": 0}
+        
+        class FakeS3(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, *args):
+                pass
+            
+            def reply(self, status, body=b"", etag=None):
+                self.send_response(status)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def do_GET(self):
+                path, _, query = self.path.partition("?")
+                params = dict(p.split("=", 1) for p in query.split("&") if p)
+                key = path.split("/", 2)[2] if path.count("/") > 1 else ""
+                if not self.headers.get("Authorization", "").startswith("AWS4-HMAC-SHA256 Credential=test/"):
+                    stats["unsigned"] += 1
+                    return self.reply(403)
+                if not key:
+                    # Two keys per page, to exercise continuation tokens
+                    stats["list"] += 1
+                    keys = sorted(k for k in objects if k.startswith(params.get("prefix", "").replace("%2F", "/")))
+                    start = int(params.get("continuation-token", "0"))
+                    items = "".join(f"<Contents><Key>{k}</Key><ETag>\"{hashlib.md5(objects[k]).hexdigest()}\"</ETag>"
+                                    f"<Size>{len(objects[k])}</Size></Contents>" for k in keys[start:start + 2])
+                    more = start + 2 < len(keys)
+                    token = f"<NextContinuationToken>{start + 2}</NextContinuationToken>" if more else ""
+                    return self.reply(200, (f'<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">{items}'
+                                            f"<IsTruncated>{str(more).lower()}</IsTruncated>{token}</ListBucketResult>").encode())
+                if key not in objects:
+                    return self.reply(404, b"<Error><Code>NoSuchKey</Code></Error>")
+                if stats["unavailable"]:
+                    stats["unavailable"] -= 1
+                    return self.reply(503)
+                etag = f'"{hashlib.md5(objects[key]).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    stats["not_modified"] += 1
+                    return self.reply(304, etag=etag)
+                stats["get"] += 1
+                self.reply(200, objects[key], etag)
+        
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeS3)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                env = {"AWS_ENDPOINT_URL_S3": f"http://127.0.0.1:{server.server_port}", "AWS_ACCESS_KEY_ID": "test",
+                       "AWS_SECRET_ACCESS_KEY": "secret", "VULTITOOL_S3_CACHE": str(Path(tmpdir) / "cache")}
+                exit_code, stdout, stderr = self.run_vultitool_command(
+                    ["vault", "scan", "s3://corpus/shares/", "--ndjson"], env=env)
+                exit_code, local, stderr = self.run_vultitool_command(["vault", "scan", "tests/fixtures", "--ndjson"])
+                try:
+                    remote = [json.loads(line) for line in stdout.splitlines()]
+                    expected = [json.loads(line) for line in local.splitlines()]
+                    results.append(("paginated_listing", stats["list"] == (len(objects) + 1) // 2))
+                    results.append(("same_records", len(remote) == len(objects) and
+                                    [dict(r, path=None) for r in remote] == [dict(r, path=None) for r in expected]))
+                    results.append(("retried", stats["unavailable"] == 0 and stats["get"] == len(objects)))
+                except json.JSONDecodeError:
+                    results.extend([("paginated_listing", False), ("same_records", False), ("retried", False)])
+                
+                # Unchanged ETags: the rerun lists but fetches nothing
+                self.run_vultitool_command(["vault", "scan", "s3://corpus/shares/", "--json"], env=env)
+                results.append(("etag_cache", stats["get"] == len(objects)))
+                
+                # A single object: the cached ETag is revalidated with If-None-Match
+                exit_code, stdout, stderr = self.run_vultitool_command(
+                    ["vault", "parse", "s3://corpus/shares/testGG20-part1of2.vult", "--json"], env=env)
+                try:
+                    results.append(("single_object", exit_code == 0 and stats["not_modified"] == 1 and
+                                    json.loads(stdout)["file_info"]["path"] == "s3://corpus/shares/testGG20-part1of2.vult"))
+                except (json.JSONDecodeError, KeyError):
+                    results.append(("single_object", False))
+                
+                exit_code, stdout, stderr = self.run_vultitool_command(
+                    ["vault", "parse", "s3://corpus/shares/nope.vult"], env=env)
+                results.append(("missing_object", exit_code == 1 and "NoSuchKey" in stdout))
+                
+                # Without VULTITOOL_S3_CACHE, every object is fetched again and nothing is kept on disk
+                home = Path(tmpdir) / "home"
+                uncached = {key: value for key, value in env.items() if key != "VULTITOOL_S3_CACHE"}
+                uncached.update(HOME=str(home), XDG_CACHE_HOME=str(home / ".cache"))
+                saved_cache = os.environ.pop("VULTITOOL_S3_CACHE", None)
+                try:
+                    gets = stats["get"]
+                    self.run_vultitool_command(["vault", "scan", "s3://corpus/shares/", "--json"], env=uncached)
+                finally:
+                    if saved_cache is not None:
+                        os.environ["VULTITOOL_S3_CACHE"] = saved_cache
+                results.append(("cache_opt_in", stats["get"] == gets + len(objects) and not home.exists()))
+                results.append(("signed", stats["unsigned"] == 0))
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "S3 source",
+            all_passed,
+            "Scanned an s3:// source" if all_passed else "S3 source issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
+    def test_sort_groupby(self) -> bool:
+        """Test external sort and group-by over NDJSON scan records"""
+        results = []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            records_file = Path(tmpdir) / "scan.ndjson"
+            self.run_vultitool_command(["vault", "scan", "tests/fixtures", "--output", str(records_file)])
+            lines = records_file.read_text().splitlines(keepends=True)
+            by_key = lambda line: json.loads(line).get("public_key_ecdsa") or ""
+            
+            # A tiny memory budget spills a run every record or two
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "sort", str(records_file), "--key", "public_key_ecdsa", "--memory", "1K"])
+            results.append(("sorted_stable", exit_code == 0 and len(lines) == 9 and
+                            stdout.splitlines(keepends=True) == sorted(lines, key=by_key)))
+            results.append(("spilled", "run(s) spilled" in stderr))
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "sort", "-", "-k", "public_key_ecdsa", "--reverse"], input="".join(lines))
+            results.append(("reverse_stdin", stdout.splitlines(keepends=True) == sorted(lines, key=by_key, reverse=True)))
+            
+            # Enough runs to need more than one merge pass
+            many = Path(tmpdir) / "many.ndjson"
+            rows = [json.dumps({"path": f"v{i}.vult", "name": f"vault-{(i * 7919) % 500:03d}", "files": i % 3})
+                    for i in range(3000)]
+            many.write_text("".join(row + "\n" for row in rows))
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "sort", str(many), "-k", "name,files", "-S", "4K", "-o", str(many)])
+            expected = sorted(rows, key=lambda row: (json.loads(row)["name"], json.loads(row)["files"]))
+            results.append(("multi_pass_in_place", exit_code == 0 and "in 2 pass(es)" in stderr and
+                            many.read_text().splitlines() == expected))
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(
+                ["vault", "groupby", str(records_file), "-k", "public_key_ecdsa", "-c", "local_party_id,path",
+                 "--min-count", "2", "-S", "1K"])
+            try:
+                groups = [json.loads(line) for line in stdout.splitlines()]
+                results.append(("groupby", exit_code == 0 and len(groups) == 3 and
+                                [g["count"] for g in groups] == [2, 3, 2] and
+                                all(len(g["path"]) == g["count"] for g in groups) and
+                                [g["public_key_ecdsa"] for g in groups] == sorted(g["public_key_ecdsa"] for g in groups)))
+            except (json.JSONDecodeError, KeyError):
+                results.append(("groupby", False))
+            
+            exit_code, stdout, stderr = self.run_vultitool_command(["vault", "sort", "-k", "name"], input='{"name":\n')
+            results.append(("bad_record", exit_code == 1 and "<stdin>:1: not a JSON record" in stderr))
+        
+        all_passed = all(result[1] for result in results)
+        self.log_result(
+            "Sort and group-by",
+            all_passed,
+            "Sorted and grouped scan records" if all_passed else "Sort/group-by issues",
+            "; ".join([f"{test}: {'✓' if passed else '✗'}" for test, passed in results])
+        )
+        return all_passed
+    
     def run_all_tests(self) -> bool:
         """Run all self-tests"""
         print("=== Vultitool Self-Test Suite ===")
@@ -453,6 +1781,52 @@ class VultitoolTester:
         self.test_missing_file_handling()
         print()
         
+        # Test 7: Batch validation
+        print("7. Testing batch validation...")
+        self.test_batch_validation()
+        self.test_rule_selection()
+        self.test_keycheck()
+        self.test_go_backend()
+        self.test_credentials()
+        self.test_codecs()
+        self.test_rekey()
+        self.test_pack()
+        self.test_bundle()
+        self.test_timings()
+        self.test_profile()
+        self.test_metrics()
+        self.test_health_probes()
+        self.test_bench_baseline()
+        self.test_checkpoint_resume()
+        self.test_shard_merge()
+        self.test_io_depth()
+        self.test_s3_source()
+        self.test_sort_groupby()
+        print()
+        
+        # Test 8: Key derivation
+        print("8. Testing address derivation...")
+        self.test_address_derivation()
+        self.test_address_index()
+        print()
+        
+        # Test 9: Keysign payloads
+        print("9. Testing keysign decoding...")
+        self.test_keysign_decode()
+        self.test_keysign_encode()
+        self.test_utxo_stats()
+        print()
+        
+        # Test 10: Keygen sessions
+        print("10. Testing keygen session lineage...")
+        self.test_keygen_lineage()
+        print()
+        
+        # Test 11: Descriptor set
+        print("11. Testing descriptor-set decoding...")
+        self.test_proto_decode()
+        print()
+        
         # Summary
         total_tests = self.passed_tests + self.failed_tests
         pass_rate = (self.passed_tests / total_tests * 100) if total_tests > 0 else 0
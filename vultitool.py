@@ -12,6 +12,12 @@ sys.path.insert(0, str(Path(__file__).parent / "commands"))
 
 from vault import VaultCommands
 from doctor import DoctorCommands
+from keysign import KeysignCommands
+from keygen import KeygenCommands
+from proto import ProtoCommands
+from agent import AgentCommands
+import timings
+import metrics
 
 
 def get_version():
@@ -25,8 +31,8 @@ def get_version():
     except Exception:
         return "unknown"
 
-def main():
-    """Main entry point for vultitool"""
+def main(argv=None):
+    """Main entry point for vultitool; argv defaults to sys.argv[1:]"""
     parser = argparse.ArgumentParser(
         description="vultitool - Command-line tools for Vultisig vault files",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -36,6 +42,12 @@ Examples:
   vultitool vault inspect my-vault.vult --show-keyshares
   vultitool vault validate my-vault.vult --strict
   vultitool vault export my-vault.vult output.json --format json
+  vultitool keysign decode relay.log --summary
+  vultitool vault lineage vaults/ --sessions reshares.log
+  vultitool proto decode --type vultisig.vault.v1.VaultContainer my-vault.vult
+  eval $(vultitool agent start --daemon) && vultitool agent add 'vaults/*.vult'
+  vultitool --timings vault scan vaults/
+  vultitool doctor profile -- vault parse my-vault.vult --json
   vultitool doctor check
         """
     )
@@ -43,6 +55,16 @@ Examples:
     # Add version flag
     parser.add_argument('--version', '-v', action='version', 
                        version=f'vultitool {get_version()}')
+    parser.add_argument('--timings', action='store_true',
+                        help=f'Print per-stage load timings to stderr (or set {timings.ENV_VAR}=1)')
+    parser.add_argument('--timings-json', metavar='FILE',
+                        help=f'Also write the timings as JSON (or set {timings.ENV_VAR}=FILE)')
+    parser.add_argument('--metrics-listen', metavar='[HOST:]PORT',
+                        help='Serve Prometheus metrics on /metrics while the command runs (host defaults to 127.0.0.1)')
+    parser.add_argument('--metrics-textfile', metavar='FILE',
+                        help='Write Prometheus metrics to FILE periodically and at exit (node_exporter textfile collector)')
+    parser.add_argument('--metrics-interval', type=float, default=15.0, metavar='SECONDS',
+                        help='Seconds between --metrics-textfile writes')
     
     # Create subparsers for different commands
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
@@ -51,6 +73,22 @@ Examples:
     vault_parser = subparsers.add_parser('vault', help='Vault file operations')
     VaultCommands.setup_parser(vault_parser)
     
+    # Keysign commands
+    keysign_parser = subparsers.add_parser('keysign', help='Keysign message operations')
+    KeysignCommands.setup_parser(keysign_parser)
+    
+    # Keygen commands
+    keygen_parser = subparsers.add_parser('keygen', help='Keygen and reshare message operations')
+    KeygenCommands.setup_parser(keygen_parser)
+    
+    # Proto commands
+    proto_parser = subparsers.add_parser('proto', help='Decode any message type in the descriptor set')
+    ProtoCommands.setup_parser(proto_parser)
+    
+    # Agent commands
+    agent_parser = subparsers.add_parser('agent', help='Hold vault passwords for unattended batch runs')
+    AgentCommands.setup_parser(agent_parser)
+    
     # Doctor commands
     doctor_parser = subparsers.add_parser('doctor', help='System diagnostics')
     DoctorCommands.setup_parser(doctor_parser)
@@ -59,11 +97,37 @@ Examples:
     help_parser = subparsers.add_parser('help', help='Show help information')
     
     # Parse arguments
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
-    # Route to appropriate command handler
+    timings.configure(args.timings, args.timings_json)
+    action = getattr(args, f"{args.command}_action", None) if args.command else None
+    try:
+        metrics.configure(args.metrics_listen, args.metrics_textfile, args.metrics_interval,
+                          command=' '.join(filter(None, [args.command, action])))
+    except (ValueError, OSError) as e:
+        print(f"Error: Cannot export metrics: {e}", file=sys.stderr)
+        return 1
+    exit_code = 1
+    try:
+        exit_code = _dispatch(parser, args)
+        return exit_code
+    finally:
+        metrics.finish(exit_code)
+        timings.finish()
+
+
+def _dispatch(parser, args):
+    """Route to the command handler"""
     if args.command == 'vault':
         return VaultCommands.handle(args)
+    elif args.command == 'keysign':
+        return KeysignCommands.handle(args)
+    elif args.command == 'keygen':
+        return KeygenCommands.handle(args)
+    elif args.command == 'proto':
+        return ProtoCommands.handle(args)
+    elif args.command == 'agent':
+        return AgentCommands.handle(args)
     elif args.command == 'doctor':
         return DoctorCommands.handle(args)
     elif args.command == 'help':